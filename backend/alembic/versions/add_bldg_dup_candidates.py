@@ -0,0 +1,43 @@
+"""add building_duplicate_candidates table for admin duplicate building list
+
+Revision ID: add_bldg_dup_candidates
+Revises: add_vote_tallies
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_bldg_dup_candidates'
+down_revision = 'add_vote_tallies'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'building_duplicate_candidates',
+        sa.Column('building1_id', sa.Integer(), nullable=False),
+        sa.Column('building2_id', sa.Integer(), nullable=False),
+        sa.Column('similarity', sa.Float(), nullable=False),
+        sa.Column('address_score', sa.Float(), nullable=True),
+        sa.Column('name_score', sa.Float(), nullable=True),
+        sa.Column('attribute_score', sa.Float(), nullable=True),
+        sa.Column('computed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['building1_id'], ['buildings.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['building2_id'], ['buildings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('building1_id', 'building2_id')
+    )
+    op.create_index('idx_bdc_similarity', 'building_duplicate_candidates', [sa.text('similarity DESC')])
+    op.create_index('idx_bdc_building2', 'building_duplicate_candidates', ['building2_id'])
+
+    # 空のままにする（未計算の間、建物重複候補の一覧は都度計算に切り替わる。
+    # 次回のスクレイピング完了時か POST /admin/duplicate-buildings/recalculate で計算される）
+
+
+def downgrade():
+    op.drop_index('idx_bdc_building2', table_name='building_duplicate_candidates')
+    op.drop_index('idx_bdc_similarity', table_name='building_duplicate_candidates')
+    op.drop_table('building_duplicate_candidates')
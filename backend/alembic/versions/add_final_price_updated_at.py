@@ -0,0 +1,25 @@
+"""add final_price_updated_at to master_properties
+
+Revision ID: add_final_price_updated_at
+Revises: add_stats_snapshots
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_final_price_updated_at'
+down_revision = 'add_stats_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 最終販売価格の設定・クリア日時（販売再開時にNULLへ戻す）
+    op.add_column('master_properties', sa.Column('final_price_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('master_properties', 'final_price_updated_at')
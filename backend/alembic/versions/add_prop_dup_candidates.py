@@ -0,0 +1,122 @@
+"""add property_duplicate_candidates table for admin duplicate property list
+
+Revision ID: add_prop_dup_candidates
+Revises: add_bldg_dup_candidates
+Create Date: 2026-10-16 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_prop_dup_candidates'
+down_revision = 'add_bldg_dup_candidates'
+branch_labels = None
+depends_on = None
+
+
+# 間取りの基本部分（例: 2LDK+S → 2LDK, 3SLDK → 3LDK, 1DK → 1DK, 3LD → 3LDK。1S+S等はそのまま）
+# （このリビジョン時点の式で固定。models.py の定義を変えてもここは変えない）
+BASE_LAYOUT_SQL = (
+    "CASE WHEN regexp_replace(layout, '^[0-9]+S\\+S$', '') = '' THEN layout "
+    "ELSE regexp_replace(regexp_replace(regexp_replace(regexp_replace("
+    "layout, '\\+[A-Z]+', '', 'g'), "
+    "'([0-9]+)S(LDK|DK|K)', '\\1\\2', 'g'), "
+    "'([0-9]+)LD$', '\\1LDK', 'g'), "
+    "'([0-9]+)K$', '\\1DK', 'g') END"
+)
+
+# 既存の物件から重複候補を作成するSQL（このリビジョン時点の処理内容で固定）
+# 同じ建物・階・面積（1㎡単位で切り捨て）・基本間取りの販売中物件が2件以上あるグループを候補とし、
+# グループIDはグループ内の最小の物件ID。最後に全件更新として更新履歴を記録する
+_HAS_ACTIVE_LISTING = (
+    "EXISTS (SELECT 1 FROM property_listings pl "
+    "WHERE pl.master_property_id = mp.id AND pl.is_active = true)"
+)
+
+BACKFILL_SQL = [
+    f"""
+    INSERT INTO property_duplicate_candidates
+        (master_property_id, building_id, floor_number, area, layout, group_size)
+    SELECT mp.id, mp.building_id, mp.floor_number, mp.area, mp.layout, 0
+    FROM master_properties mp
+    WHERE mp.building_id IS NOT NULL AND {_HAS_ACTIVE_LISTING}
+    """,
+    """
+    UPDATE property_duplicate_candidates c
+    SET group_id = g.group_id, group_size = g.group_size
+    FROM (
+        SELECT master_property_id,
+               MIN(master_property_id) OVER w AS group_id,
+               COUNT(*) OVER w AS group_size
+        FROM property_duplicate_candidates
+        WINDOW w AS (PARTITION BY building_id, floor_number, rounded_area, base_layout)
+    ) g
+    WHERE c.master_property_id = g.master_property_id
+    """,
+    "DELETE FROM property_duplicate_candidates WHERE group_size < 2",
+    f"""
+    INSERT INTO property_duplicate_candidate_runs
+        (started_at, completed_at, is_full, building_count, candidate_count)
+    SELECT now(), now(), true,
+           (SELECT COUNT(DISTINCT mp.building_id) FROM master_properties mp WHERE {_HAS_ACTIVE_LISTING}),
+           (SELECT COUNT(*) FROM property_duplicate_candidates)
+    """,
+]
+
+
+def upgrade():
+    op.create_table(
+        'property_duplicate_candidates',
+        sa.Column('master_property_id', sa.Integer(), nullable=False),
+        sa.Column('building_id', sa.Integer(), nullable=False),
+        sa.Column('floor_number', sa.Integer(), nullable=True),
+        sa.Column('area', sa.Float(), nullable=True),
+        sa.Column('layout', sa.String(length=20), nullable=True),
+        sa.Column('rounded_area', sa.Integer(),
+                  sa.Computed('CAST(FLOOR(area) AS INTEGER)', persisted=True), nullable=True),
+        sa.Column('base_layout', sa.String(length=20),
+                  sa.Computed(BASE_LAYOUT_SQL, persisted=True), nullable=True),
+        sa.Column('group_id', sa.Integer(), nullable=True),
+        sa.Column('group_size', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['master_property_id'], ['master_properties.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['building_id'], ['buildings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('master_property_id')
+    )
+    op.create_index('idx_pdc_group_size', 'property_duplicate_candidates',
+                    [sa.text('group_size DESC'), 'group_id'])
+    op.create_index('idx_pdc_group_id', 'property_duplicate_candidates', ['group_id'])
+    op.create_index('idx_pdc_building_id', 'property_duplicate_candidates', ['building_id'])
+
+    op.create_table(
+        'property_duplicate_candidate_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('is_full', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('building_count', sa.Integer(), nullable=True),
+        sa.Column('candidate_count', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_pdcr_completed_at', 'property_duplicate_candidate_runs', ['completed_at'])
+
+    # 差分更新で変更のあった建物を探すためのインデックス
+    op.create_index('idx_master_properties_updated_at', 'master_properties', ['updated_at'])
+    op.create_index('idx_property_listings_updated_at', 'property_listings', ['updated_at'])
+
+    # 既存の物件から重複候補を作成し、更新履歴も記録する
+    for statement in BACKFILL_SQL:
+        op.execute(sa.text(statement))
+
+
+def downgrade():
+    op.drop_index('idx_property_listings_updated_at', table_name='property_listings')
+    op.drop_index('idx_master_properties_updated_at', table_name='master_properties')
+    op.drop_index('idx_pdcr_completed_at', table_name='property_duplicate_candidate_runs')
+    op.drop_table('property_duplicate_candidate_runs')
+    op.drop_index('idx_pdc_building_id', table_name='property_duplicate_candidates')
+    op.drop_index('idx_pdc_group_id', table_name='property_duplicate_candidates')
+    op.drop_index('idx_pdc_group_size', table_name='property_duplicate_candidates')
+    op.drop_table('property_duplicate_candidates')
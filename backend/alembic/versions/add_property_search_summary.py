@@ -0,0 +1,193 @@
+"""add property_search_summary table for property list queries
+
+Revision ID: add_property_search_summary
+Revises: add_trgm_search_idx
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_property_search_summary'
+down_revision = 'add_trgm_search_idx'
+branch_labels = None
+depends_on = None
+
+# 既存物件の集計を投入するSQL（このリビジョン時点の集計内容で固定）
+REBUILD_SQL = """
+    INSERT INTO property_search_summary (
+        master_property_id, building_id, listing_count, has_active_listing,
+        has_listing, active_source_sites, all_source_sites, active_last_confirmed_at,
+        all_last_confirmed_at, active_delisted_at, all_delisted_at,
+        active_station_info, all_station_info, earliest_published_at,
+        latest_price_update, latest_price_update_time, has_price_change, current_price,
+        final_price, display_price, area, built_year, tsubo_price, sort_updated_at,
+        is_sold, refreshed_at
+    )
+    SELECT
+        mp.id,
+        mp.building_id,
+        COALESCE(l.listing_count, 0),
+        COALESCE(l.has_active_listing, FALSE),
+        l.master_property_id IS NOT NULL,
+        l.active_source_sites,
+        l.all_source_sites,
+        l.active_last_confirmed_at,
+        l.all_last_confirmed_at,
+        l.active_delisted_at,
+        l.all_delisted_at,
+        l.active_station_info,
+        l.all_station_info,
+        l.earliest_published_at,
+        pc.latest_price_update,
+        pc.latest_price_update_time,
+        pc.master_property_id IS NOT NULL,
+        mp.current_price,
+        mp.final_price,
+        CASE
+            -- 掲載がすべて終了した販売終了物件は最終価格
+            WHEN NOT COALESCE(l.has_active_listing, FALSE)
+                 AND mp.sold_at IS NOT NULL AND COALESCE(mp.final_price, 0) <> 0
+                THEN mp.final_price
+            WHEN COALESCE(mp.current_price, 0) <> 0 THEN mp.current_price
+            -- current_priceがない場合は掲載中の掲載価格の多数決（同数の場合は最小値）
+            ELSE (
+                SELECT pl.current_price
+                FROM property_listings pl
+                WHERE pl.master_property_id = mp.id
+                  AND pl.is_active = TRUE
+                  AND COALESCE(pl.current_price, 0) <> 0
+                GROUP BY pl.current_price
+                ORDER BY COUNT(*) DESC, pl.current_price ASC
+                LIMIT 1
+            )
+        END,
+        mp.area,
+        b.built_year,
+        CASE WHEN mp.area > 0
+            THEN COALESCE(mp.current_price, mp.final_price) / (mp.area / 3.30578)
+        END,
+        COALESCE(pc.latest_price_update, l.earliest_published_at),
+        mp.sold_at IS NOT NULL,
+        NOW()
+    FROM master_properties mp
+    JOIN buildings b ON b.id = mp.building_id
+    LEFT JOIN (
+        SELECT
+            master_property_id,
+            COUNT(DISTINCT id) FILTER (WHERE is_active) AS listing_count,
+            BOOL_OR(is_active) AS has_active_listing,
+            STRING_AGG(DISTINCT CAST(source_site AS VARCHAR), ',') FILTER (WHERE is_active) AS active_source_sites,
+            STRING_AGG(DISTINCT CAST(source_site AS VARCHAR), ',') AS all_source_sites,
+            MAX(last_confirmed_at) FILTER (WHERE is_active) AS active_last_confirmed_at,
+            MAX(last_confirmed_at) AS all_last_confirmed_at,
+            MAX(delisted_at) FILTER (WHERE is_active) AS active_delisted_at,
+            MAX(delisted_at) AS all_delisted_at,
+            MAX(listing_station_info) FILTER (WHERE is_active) AS active_station_info,
+            MAX(listing_station_info) AS all_station_info,
+            MIN(COALESCE(first_published_at, published_at, first_seen_at)) AS earliest_published_at
+        FROM property_listings
+        WHERE TRUE
+        GROUP BY master_property_id
+    ) l ON l.master_property_id = mp.id
+    LEFT JOIN (
+        SELECT
+            master_property_id,
+            MAX(change_date) AS latest_price_update,
+            MAX(created_at) AS latest_price_update_time
+        FROM property_price_changes
+        WHERE TRUE
+        GROUP BY master_property_id
+    ) pc ON pc.master_property_id = mp.id
+    WHERE TRUE
+    ON CONFLICT (master_property_id) DO UPDATE SET
+        building_id = EXCLUDED.building_id,
+        listing_count = EXCLUDED.listing_count,
+        has_active_listing = EXCLUDED.has_active_listing,
+        has_listing = EXCLUDED.has_listing,
+        active_source_sites = EXCLUDED.active_source_sites,
+        all_source_sites = EXCLUDED.all_source_sites,
+        active_last_confirmed_at = EXCLUDED.active_last_confirmed_at,
+        all_last_confirmed_at = EXCLUDED.all_last_confirmed_at,
+        active_delisted_at = EXCLUDED.active_delisted_at,
+        all_delisted_at = EXCLUDED.all_delisted_at,
+        active_station_info = EXCLUDED.active_station_info,
+        all_station_info = EXCLUDED.all_station_info,
+        earliest_published_at = EXCLUDED.earliest_published_at,
+        latest_price_update = EXCLUDED.latest_price_update,
+        latest_price_update_time = EXCLUDED.latest_price_update_time,
+        has_price_change = EXCLUDED.has_price_change,
+        current_price = EXCLUDED.current_price,
+        final_price = EXCLUDED.final_price,
+        display_price = EXCLUDED.display_price,
+        area = EXCLUDED.area,
+        built_year = EXCLUDED.built_year,
+        tsubo_price = EXCLUDED.tsubo_price,
+        sort_updated_at = EXCLUDED.sort_updated_at,
+        is_sold = EXCLUDED.is_sold,
+        refreshed_at = EXCLUDED.refreshed_at
+"""
+
+
+def upgrade():
+    op.create_table(
+        'property_search_summary',
+        sa.Column('master_property_id', sa.Integer(), nullable=False),
+        sa.Column('building_id', sa.Integer(), nullable=False),
+        sa.Column('listing_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('has_active_listing', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('has_listing', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('active_source_sites', sa.Text(), nullable=True),
+        sa.Column('all_source_sites', sa.Text(), nullable=True),
+        sa.Column('active_last_confirmed_at', sa.DateTime(), nullable=True),
+        sa.Column('all_last_confirmed_at', sa.DateTime(), nullable=True),
+        sa.Column('active_delisted_at', sa.DateTime(), nullable=True),
+        sa.Column('all_delisted_at', sa.DateTime(), nullable=True),
+        sa.Column('active_station_info', sa.Text(), nullable=True),
+        sa.Column('all_station_info', sa.Text(), nullable=True),
+        sa.Column('earliest_published_at', sa.DateTime(), nullable=True),
+        sa.Column('latest_price_update', sa.Date(), nullable=True),
+        sa.Column('latest_price_update_time', sa.DateTime(), nullable=True),
+        sa.Column('has_price_change', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('current_price', sa.Integer(), nullable=True),
+        sa.Column('final_price', sa.Integer(), nullable=True),
+        sa.Column('display_price', sa.Integer(), nullable=True),
+        sa.Column('area', sa.Float(), nullable=True),
+        sa.Column('built_year', sa.Integer(), nullable=True),
+        sa.Column('tsubo_price', sa.Float(), nullable=True),
+        sa.Column('sort_updated_at', sa.DateTime(), nullable=True),
+        sa.Column('is_sold', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['master_property_id'], ['master_properties.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['building_id'], ['buildings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('master_property_id')
+    )
+
+    # 一覧の各ソート順に対応する複合インデックス
+    op.execute("""
+        CREATE INDEX idx_pss_active_updated ON property_search_summary
+        (has_active_listing, sort_updated_at DESC NULLS LAST,
+         latest_price_update_time DESC NULLS LAST, master_property_id DESC)
+    """)
+    op.create_index('idx_pss_active_price', 'property_search_summary',
+                    ['has_active_listing', 'current_price', 'master_property_id'])
+    op.create_index('idx_pss_active_area', 'property_search_summary',
+                    ['has_active_listing', 'area', 'master_property_id'])
+    op.create_index('idx_pss_active_built_year', 'property_search_summary',
+                    ['has_active_listing', 'built_year', 'master_property_id'])
+    op.create_index('idx_pss_active_published', 'property_search_summary',
+                    ['has_active_listing', 'earliest_published_at', 'master_property_id'])
+    op.execute("""
+        CREATE INDEX idx_pss_active_tsubo_price ON property_search_summary
+        (has_active_listing, tsubo_price DESC NULLS LAST, master_property_id DESC)
+    """)
+    op.create_index('idx_pss_building', 'property_search_summary', ['building_id'])
+
+    # 既存物件の集計を投入
+    op.execute(sa.text(REBUILD_SQL))
+
+
+def downgrade():
+    op.drop_table('property_search_summary')
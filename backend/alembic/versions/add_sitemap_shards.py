@@ -0,0 +1,35 @@
+"""add sitemap_shards table for precomputed sitemap files
+
+Revision ID: add_sitemap_shards
+Revises: add_prop_dup_candidates
+Create Date: 2026-10-16 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_sitemap_shards'
+down_revision = 'add_prop_dup_candidates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'sitemap_shards',
+        sa.Column('shard_number', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('url_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('lastmod', sa.DateTime(), nullable=True),
+        sa.Column('generated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('shard_number')
+    )
+
+    # 空のままにする（生成済みのファイルがない間、APIはその場で生成して返す。
+    # 次回のスクレイピング完了後に生成される）
+
+
+def downgrade():
+    op.drop_table('sitemap_shards')
@@ -0,0 +1,36 @@
+"""add stats_snapshots table for precomputed statistics
+
+Revision ID: add_stats_snapshots
+Revises: add_sitemap_shards
+Create Date: 2026-10-16 23:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_stats_snapshots'
+down_revision = 'add_sitemap_shards'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'stats_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.Column('stats', sa.JSON(), nullable=False),
+        sa.Column('listing_status_stats', sa.JSON(), nullable=False),
+        sa.Column('duration_ms', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_stats_snapshots_computed_at', 'stats_snapshots', ['computed_at'])
+
+    # 空のままにする（スナップショットがない場合、最初のリクエストで計算して保存する）
+
+
+def downgrade():
+    op.drop_index('idx_stats_snapshots_computed_at', table_name='stats_snapshots')
+    op.drop_table('stats_snapshots')
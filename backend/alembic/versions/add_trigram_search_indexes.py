@@ -0,0 +1,44 @@
+"""add pg_trgm GIN indexes for building name search
+
+Revision ID: add_trgm_search_idx
+Revises: add_listing_status_opt
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_trgm_search_idx'
+down_revision = 'add_listing_status_opt'
+branch_labels = None
+depends_on = None
+
+
+# (インデックス名, テーブル, カラム)
+TRIGRAM_INDEXES = [
+    ('idx_buildings_normalized_name_trgm', 'buildings', 'normalized_name'),
+    ('idx_buildings_reading_trgm', 'buildings', 'reading'),
+    ('idx_building_listing_names_normalized_trgm', 'building_listing_names', 'normalized_name'),
+    ('idx_building_listing_names_canonical_trgm', 'building_listing_names', 'canonical_name'),
+]
+
+
+def upgrade():
+    # 部分一致検索（ILIKE '%...%'）と類似度検索のためにpg_trgmを有効化
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for index_name, table_name, column_name in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            postgresql_using='gin',
+            postgresql_ops={column_name: 'gin_trgm_ops'}
+        )
+
+
+def downgrade():
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
+    # 拡張は他で使われている可能性があるため削除しない
@@ -0,0 +1,115 @@
+"""add property_vote_tallies / building_vote_tallies tables for majority vote
+
+Revision ID: add_vote_tallies
+Revises: add_property_search_summary
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_vote_tallies'
+down_revision = 'add_property_search_summary'
+branch_labels = None
+depends_on = None
+
+
+def _int_vote(column):
+    # 0とNULLは票にならない
+    return f"NULLIF({column}, 0)::text"
+
+
+def _float_vote(column):
+    # Pythonの str(float) と同じく整数値は '70.0' の形にする
+    return (f"CASE WHEN {column} IS NULL OR {column} = 0 THEN NULL "
+            f"WHEN {column} = trunc({column}) THEN trunc({column})::numeric::text || '.0' "
+            f"ELSE {column}::text END")
+
+
+def _text_vote(column):
+    # 空文字とNULLは票にならない
+    return f"NULLIF({column}, '')"
+
+
+# 既存の掲載から投入する票（このリビジョン時点の集計内容で固定）: (フィールド, 値の式)
+PROPERTY_VOTES = [
+    ('floor_numbers', _int_vote('pl.listing_floor_number')),
+    ('areas', _float_vote('pl.listing_area')),
+    ('layouts', _text_vote('pl.listing_layout')),
+    ('directions', _text_vote('pl.listing_direction')),
+    ('balcony_areas', _float_vote('pl.listing_balcony_area')),
+    ('management_fees', _int_vote('pl.management_fee')),
+    ('repair_funds', _int_vote('pl.repair_fund')),
+    ('parking_infos', _text_vote('pl.listing_parking_info')),
+    ('addresses', _text_vote('pl.listing_address')),
+    ('prices', _int_vote('pl.current_price')),
+    ('building_names', _text_vote('pl.listing_building_name')),
+]
+
+BUILDING_VOTES = [
+    ('addresses', _text_vote('pl.listing_address')),
+    ('total_floors', _int_vote('pl.listing_total_floors')),
+    ('built_years', _int_vote('pl.listing_built_year')),
+    ('built_months', _int_vote('pl.listing_built_month')),
+    ('structures', _text_vote('pl.listing_building_structure')),
+    ('basement_floors', _int_vote('pl.listing_basement_floors')),
+    ('station_infos', _text_vote('pl.listing_station_info')),
+    ('total_units', _int_vote('pl.listing_total_units')),
+]
+
+
+def _backfill_sql(table, id_column, owner_expr, votes, join=''):
+    values = ',\n            '.join(f"('{field}', {expression})" for field, expression in votes)
+    return f"""
+        INSERT INTO {table} ({id_column}, field, source_site, value, listing_count, active_count)
+        SELECT {owner_expr}, v.field, pl.source_site, v.value,
+               COUNT(*), COUNT(*) FILTER (WHERE pl.is_active)
+        FROM property_listings pl
+        {join}
+        CROSS JOIN LATERAL (VALUES
+            {values}
+        ) AS v(field, value)
+        WHERE {owner_expr} IS NOT NULL AND v.value IS NOT NULL
+        GROUP BY {owner_expr}, v.field, pl.source_site, v.value
+    """
+
+
+def upgrade():
+    op.create_table(
+        'property_vote_tallies',
+        sa.Column('master_property_id', sa.Integer(), nullable=False),
+        sa.Column('field', sa.String(length=30), nullable=False),
+        sa.Column('source_site', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.Text(), nullable=False),
+        sa.Column('listing_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['master_property_id'], ['master_properties.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('master_property_id', 'field', 'source_site', 'value')
+    )
+    op.create_table(
+        'building_vote_tallies',
+        sa.Column('building_id', sa.Integer(), nullable=False),
+        sa.Column('field', sa.String(length=30), nullable=False),
+        sa.Column('source_site', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.Text(), nullable=False),
+        sa.Column('listing_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('active_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['building_id'], ['buildings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('building_id', 'field', 'source_site', 'value')
+    )
+
+    # 既存の掲載から票集計を投入
+    op.execute(sa.text(_backfill_sql(
+        'property_vote_tallies', 'master_property_id', 'pl.master_property_id', PROPERTY_VOTES
+    )))
+    op.execute(sa.text(_backfill_sql(
+        'building_vote_tallies', 'building_id', 'mp.building_id', BUILDING_VOTES,
+        join='JOIN master_properties mp ON mp.id = pl.master_property_id'
+    )))
+
+
+def downgrade():
+    op.drop_table('building_vote_tallies')
+    op.drop_table('property_vote_tallies')
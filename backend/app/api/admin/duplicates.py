@@ -3,13 +3,16 @@
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_, text
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, or_, and_, text, select
 from sqlalchemy.exc import OperationalError
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+from collections import Counter
 from datetime import datetime
 import json
+import os
+import time
 
 from ...database import get_db
 from ...api.auth import get_admin_user
@@ -18,9 +21,16 @@ from ...models import (
     BuildingMergeHistory, PropertyMergeHistory,
     BuildingMergeExclusion, PropertyMergeExclusion,
     BuildingExternalId, BuildingListingName,
-    PropertyBookmark, PropertyPriceChange
+    PropertyBookmark, PropertyPriceChange, BuildingDuplicateCandidate, PropertyDuplicateCandidate
 )
 from ...utils.enhanced_building_matcher import EnhancedBuildingMatcher
+from ...utils.building_duplicate_candidates import (
+    STORE_MIN_SIMILARITY, build_listing_name_aliases, load_building_duplicate_candidates,
+    rebuild_building_duplicate_candidates
+)
+from ...utils.property_duplicate_candidates import (
+    get_last_completed_run, refresh_property_duplicate_candidates, update_property_duplicate_candidates
+)
 from ...utils.majority_vote_updater import MajorityVoteUpdater
 from ...utils.building_listing_name_manager import BuildingListingNameManager
 from ...utils.property_utils import update_earliest_listing_date
@@ -69,74 +79,492 @@ class PropertyMergeRequest(BaseModel):
     secondary_property_id: int
 
 
-@router.get("/duplicate-buildings")
-async def get_duplicate_buildings(
-    search: Optional[str] = Query(None, description="検索キーワード"),
-    min_similarity: float = Query(0.7, description="類似度の閾値"),
-    limit: int = Query(30, ge=1, le=100),
-    db: Session = Depends(get_db)
-):
-    """建物の重複候補を取得（改善版）"""
-    import re
-    import time
-    from ...utils.enhanced_building_matcher import EnhancedBuildingMatcher
+def _group_duplicate_buildings(similarity_graph, buildings_with_count, excluded_pairs):
+    """類似度グラフから重複建物グループを作成（除外ペアを考慮して類似度の高いペアから貪欲にまとめる）
+
+    Args:
+        similarity_graph: {建物ID: {建物ID: 類似度}}（閾値以上のペアのみ）
+        buildings_with_count: [(建物, 物件数), ...]
+        excluded_pairs: 除外ペアのセット（両方向）
+
+    Returns:
+        重複グループのリスト（信頼度順）
+    """
+    def find_connected_components(graph):
+        """グラフから連結成分を見つける（深さ優先探索）"""
+        visited = set()
+        components = []
+        
+        def dfs(node, component):
+            visited.add(node)
+            component.add(node)
+            for neighbor in graph.get(node, {}):
+                if neighbor not in visited:
+                    dfs(neighbor, component)
+        
+        for node in graph:
+            if node not in visited:
+                component = set()
+                dfs(node, component)
+                if len(component) > 1:  # 単独の建物は除外
+                    components.append(component)
+        
+        return components
     
-    # 処理時間測定開始
-    start_time = time.time()
-    phase_times = {}
+    # 連結成分を見つける
+    connected_components = find_connected_components(similarity_graph)
     
-    # フェーズ1: Matcherの初期化
-    phase_start = time.time()
+    buildings_by_id = {building.id: (building, count) for building, count in buildings_with_count}
+    duplicate_groups = []
     
-    # ロガーのインポート
-    import logging
-    logger = logging.getLogger(__name__)
+    # まず全ての建物ペアの類似度を収集（除外ペアを除く）
+    all_valid_pairs = []
+    processed_pairs = set()
     
-    # EnhancedBuildingMatcherのインスタンスを作成（まだキャッシュなし）
-    matcher = None  # 後で建物リスト取得後に初期化
-    phase_times['matcher_init'] = time.time() - phase_start
+    for component in connected_components:
+        building_ids = list(component)
+        for i in range(len(building_ids)):
+            for j in range(i + 1, len(building_ids)):
+                bid1, bid2 = building_ids[i], building_ids[j]
+                pair_key = (min(bid1, bid2), max(bid1, bid2))
+                
+                # 既に処理済みのペアはスキップ
+                if pair_key in processed_pairs:
+                    continue
+                processed_pairs.add(pair_key)
+                
+                # 除外ペアはスキップ
+                if pair_key in excluded_pairs or (pair_key[1], pair_key[0]) in excluded_pairs:
+                    continue
+                
+                # 類似度を取得
+                sim = similarity_graph.get(bid1, {}).get(bid2, 0)
+                if sim > 0:
+                    all_valid_pairs.append((sim, bid1, bid2))
     
-    # フェーズ2: 建物データの取得
-    phase_start = time.time()
+    # 類似度の高い順にソート
+    all_valid_pairs.sort(reverse=True)
     
-    # 検索条件がある場合は通常通り処理
-    if search:
-        # ベースクエリ
-        base_query = db.query(
-            Building,
-            func.count(MasterProperty.id).label('property_count')
-        ).outerjoin(
-            MasterProperty, Building.id == MasterProperty.building_id
-        ).group_by(Building.id).having(
-            func.count(MasterProperty.id) > 0  # 物件がある建物のみ
-        )
-        
-        # BuildingListingNameを使用した検索
-        from ...models import BuildingListingName
-        from ...utils.building_name_normalizer import canonicalize_building_name
-        
-        # 検索語を正規化
-        canonical_search = canonicalize_building_name(search)
-        
-        # BuildingListingNameから該当する建物IDを取得
-        matching_building_ids = db.query(BuildingListingName.building_id).filter(
-            BuildingListingName.canonical_name.ilike(f"%{canonical_search}%")
-        ).distinct().subquery()
+    # 貪欲アルゴリズムで最適なペアから順にグループを作成
+    used_buildings = set()
+    pair_groups = {}  # 各建物がどのグループに属するか
+    
+    for sim, bid1, bid2 in all_valid_pairs:
+        # 両方とも未使用の場合、新しいグループを作成
+        if bid1 not in used_buildings and bid2 not in used_buildings:
+            new_group = {bid1, bid2}
+            pair_groups[bid1] = new_group
+            pair_groups[bid2] = new_group
+            used_buildings.update(new_group)
+        # 片方が既にグループに属している場合
+        elif bid1 in used_buildings and bid2 not in used_buildings:
+            group = pair_groups[bid1]
+            # グループの全メンバーとの除外関係をチェック
+            can_add = True
+            for member in group:
+                if (bid2, member) in excluded_pairs or (member, bid2) in excluded_pairs:
+                    can_add = False
+                    break
+            if can_add:
+                group.add(bid2)
+                pair_groups[bid2] = group
+                used_buildings.add(bid2)
+        elif bid2 in used_buildings and bid1 not in used_buildings:
+            group = pair_groups[bid2]
+            # グループの全メンバーとの除外関係をチェック
+            can_add = True
+            for member in group:
+                if (bid1, member) in excluded_pairs or (member, bid1) in excluded_pairs:
+                    can_add = False
+                    break
+            if can_add:
+                group.add(bid1)
+                pair_groups[bid1] = group
+                used_buildings.add(bid1)
+        # 両方が異なるグループに属している場合
+        elif pair_groups.get(bid1) != pair_groups.get(bid2):
+            group1 = pair_groups[bid1]
+            group2 = pair_groups[bid2]
+            # グループの統合が可能かチェック
+            can_merge = True
+            for m1 in group1:
+                for m2 in group2:
+                    if (m1, m2) in excluded_pairs or (m2, m1) in excluded_pairs:
+                        can_merge = False
+                        break
+                if not can_merge:
+                    break
+            
+            if can_merge:
+                # グループを統合（大きい方に小さい方を統合）
+                if len(group1) >= len(group2):
+                    group1.update(group2)
+                    for bid in group2:
+                        pair_groups[bid] = group1
+                else:
+                    group2.update(group1)
+                    for bid in group1:
+                        pair_groups[bid] = group2
+    
+    # グループを重複なく収集
+    unique_groups = []
+    seen_groups = set()
+    for group in pair_groups.values():
+        group_id = frozenset(group)
+        if group_id not in seen_groups and len(group) > 1:
+            seen_groups.add(group_id)
+            unique_groups.append(group)
+    
+    # 各グループをDuplicateGroup形式に変換
+    for group in unique_groups:
+        building_ids = list(group)
         
-        # Building.normalized_name または BuildingListingNameでマッチ
-        base_query = base_query.filter(
-            or_(
-                Building.normalized_name.ilike(f"%{search}%"),
-                Building.id.in_(matching_building_ids)
-            )
-        )
+        # グループ内の建物情報を取得
+        group_buildings = []
+        for building_id in building_ids:
+            building_info = buildings_by_id.get(building_id)
+            
+            if building_info:
+                group_buildings.append({
+                    "id": building_info[0].id,
+                    "normalized_name": building_info[0].normalized_name,
+                    "address": building_info[0].address,
+                    "total_floors": building_info[0].total_floors,
+                    "total_units": building_info[0].total_units if hasattr(building_info[0], 'total_units') else None,
+                    "built_year": building_info[0].built_year,
+                    "built_month": building_info[0].built_month,
+                    "property_count": building_info[1] or 0
+                })
         
-        buildings_with_count = base_query.order_by(
-            Building.normalized_name,
-            Building.id  # 同じ名前内でもID順で安定したソート
-        ).all()
+        if len(group_buildings) > 1:
+            # グループ内で最も類似度の高い中心となる建物を選択
+            # 他の全ての建物との平均類似度が最も高い建物をprimaryとする
+            best_primary_id = None
+            best_avg_similarity = -1
+            
+            for building in group_buildings:
+                total_sim = 0
+                count = 0
+                for other_building in group_buildings:
+                    if building["id"] != other_building["id"]:
+                        sim = similarity_graph.get(building["id"], {}).get(other_building["id"], 0)
+                        total_sim += sim
+                        count += 1
+                
+                if count > 0:
+                    avg_sim = total_sim / count
+                    # 平均類似度が同じ場合は物件数を考慮
+                    if avg_sim > best_avg_similarity or (avg_sim == best_avg_similarity and building["property_count"] > group_buildings[0]["property_count"]):
+                        best_avg_similarity = avg_sim
+                        best_primary_id = building["id"]
+            
+            # 最適なプライマリを設定
+            if best_primary_id:
+                primary = next(b for b in group_buildings if b["id"] == best_primary_id)
+                other_buildings = [b for b in group_buildings if b["id"] != best_primary_id]
+            else:
+                # フォールバック：物件数が最も多い建物をprimaryとする
+                group_buildings.sort(key=lambda x: x["property_count"], reverse=True)
+                primary = group_buildings[0]
+                other_buildings = group_buildings[1:]
+            
+            candidates = []
+            
+            # 他の建物をcandidatesとして追加（類似度の高い順）
+            for building in other_buildings:
+                similarity = similarity_graph.get(primary["id"], {}).get(building["id"], 0)
+                building["similarity"] = round(similarity, 3)
+                building["is_excluded"] = False
+                candidates.append(building)
+            
+            # 類似度でソート（高い順）
+            candidates.sort(key=lambda x: -x["similarity"])
+            
+            duplicate_groups.append({
+                "primary": primary,
+                "candidates": candidates,
+                "total_candidates": len(candidates),
+                "excluded_count": 0,
+                "group_info": f"最適化グループ: 合計{len(group_buildings)}件の建物"
+            })
+
+    _sort_duplicate_groups(duplicate_groups)
+    return duplicate_groups
+
+
+# 重複グループを信頼度でソート（高信頼度のものを優先）
+# 属性が完全に一致する建物（住所、階数、戸数、築年が同じ）を優先
+def _calculate_group_confidence(group):
+    """グループの信頼度スコアを計算
+
+    以下の要素を考慮：
+    1. グループ内の平均類似度（最重要）
+    2. グループ内の最高類似度
+    3. 属性の一致度
+    4. グループサイズ（小さいグループを優先）
+    """
+    primary = group["primary"]
+    candidates = group.get("candidates", [])
+
+    if not candidates:
+        return 0
+
+    # 1. 平均類似度（最重要: 0〜1.0）
+    similarities = [c.get("similarity", 0) for c in candidates]
+    avg_similarity = sum(similarities) / len(similarities) if similarities else 0
+
+    # 2. 最高類似度（0〜0.3のボーナス）
+    max_similarity = max(similarities) if similarities else 0
+    max_sim_bonus = max_similarity * 0.3
+
+    # 3. グループサイズペナルティ（小さいグループを優先: 最大-0.2）
+    # 2つの建物（最適） = 0、3つ = -0.05、4つ = -0.1、5つ以上 = -0.2
+    group_size = len(candidates) + 1
+    if group_size == 2:
+        size_penalty = 0
+    elif group_size == 3:
+        size_penalty = -0.05
+    elif group_size == 4:
+        size_penalty = -0.1
     else:
-        # 検索条件がない場合：重複の可能性が高い建物群を効率的に見つける
+        size_penalty = -0.2
+
+    # 4. 属性一致ボーナス（最大0.5）
+    attribute_bonus = 0
+    for candidate in candidates:
+        # 属性一致のカウント
+        matches = 0
+
+        # 住所の比較（丁目レベルまでの一致を確認）
+        primary_addr = primary.get("address", "")
+        candidate_addr = candidate.get("address", "")
+        if primary_addr and candidate_addr:
+            import re
+            # 住所から丁目部分までを抽出
+            def extract_district(addr):
+                match = re.match(r'^(.*?[区市町村][^0-9０-９一二三四五六七八九十\-－]*)', addr)
+                if match:
+                    return match.group(1)
+                match = re.match(r'^(.*?[\d０-９一二三四五六七八九十\-－]', addr)
+                if match:
+                    return match.group(1)
+                return addr
+
+            primary_district = extract_district(primary_addr)
+            candidate_district = extract_district(candidate_addr)
+
+            if primary_addr == candidate_addr or primary_district == candidate_district:
+                matches += 1
+
+        # 階数の一致
+        if (primary.get("total_floors") and 
+            primary.get("total_floors") == candidate.get("total_floors")):
+            matches += 1
+
+        # 戸数の一致
+        if (primary.get("total_units") and 
+            primary.get("total_units") == candidate.get("total_units")):
+            matches += 1
+
+        # 築年の一致（±1年の誤差を許容）
+        if (primary.get("built_year") and candidate.get("built_year") and
+            abs(primary.get("built_year") - candidate.get("built_year")) <= 1):
+            matches += 1
+
+        # 属性一致度に応じたボーナス
+        if matches == 4:
+            attribute_bonus = max(attribute_bonus, 0.5)  # 完全一致
+        elif matches >= 3:
+            attribute_bonus = max(attribute_bonus, 0.3)
+        elif matches >= 2:
+            attribute_bonus = max(attribute_bonus, 0.15)
+        elif matches >= 1:
+            attribute_bonus = max(attribute_bonus, 0.05)
+
+    # 総合スコア = 平均類似度 + 最高類似度ボーナス + 属性ボーナス + サイズペナルティ
+    total_score = avg_similarity + max_sim_bonus + attribute_bonus + size_penalty
+
+    # デバッグ情報をグループに追加
+    group["_debug_score"] = {
+        "avg_similarity": round(avg_similarity, 3),
+        "max_similarity": round(max_similarity, 3),
+        "attribute_bonus": round(attribute_bonus, 3),
+        "size_penalty": round(size_penalty, 3),
+        "total": round(total_score, 3)
+    }
+
+    return total_score
+
+
+def _sort_duplicate_groups(duplicate_groups):
+    """重複グループを信頼度でソート（高信頼度のものを優先）"""
+    # 信頼度でソート（降順）、同じ信頼度の場合は建物名→建物IDで安定ソート
+    duplicate_groups.sort(
+        key=lambda g: (
+            -_calculate_group_confidence(g),  # 信頼度（降順）
+            g.get("primary", {}).get("normalized_name", ""),  # 建物名（昇順）
+            g.get("primary", {}).get("id", 0)  # 建物ID（昇順）
+        )
+    )
+
+
+def _use_precomputed_duplicate_buildings(min_similarity: float) -> bool:
+    """事前計算した建物重複候補を使うか（保存している類似度の下限より低い閾値は都度計算）"""
+    if os.getenv('DUPLICATE_BUILDINGS_USE_PRECOMPUTED', 'true').lower() != 'true':
+        return False
+    return min_similarity >= STORE_MIN_SIMILARITY
+
+
+def _get_precomputed_duplicate_buildings(db: Session, min_similarity: float, limit: int) -> Optional[Dict[str, Any]]:
+    """事前計算した重複候補から建物の重複グループを取得（まだ計算されていない場合はNone）"""
+    start_time = time.time()
+    phase_times = {}
+
+    phase_start = time.time()
+    computed_at = db.query(func.max(BuildingDuplicateCandidate.computed_at)).scalar()
+    if computed_at is None:
+        return None
+
+    similarity_graph = load_building_duplicate_candidates(db, min_similarity)
+
+    # 除外ペアは類似度グラフから外す（除外設定は計算後に追加されることがあるため読み込み時に反映）
+    excluded_pairs = set()
+    for building1_id, building2_id in db.query(
+        BuildingMergeExclusion.building1_id, BuildingMergeExclusion.building2_id
+    ):
+        excluded_pairs.add((building1_id, building2_id))
+        excluded_pairs.add((building2_id, building1_id))
+        similarity_graph.get(building1_id, {}).pop(building2_id, None)
+        similarity_graph.get(building2_id, {}).pop(building1_id, None)
+    phase_times['candidate_fetch'] = time.time() - phase_start
+
+    phase_start = time.time()
+    building_ids = [building_id for building_id, neighbors in similarity_graph.items() if neighbors]
+    buildings_with_count = []
+    if building_ids:
+        buildings_with_count = db.query(
+            Building,
+            func.count(MasterProperty.id).label('property_count')
+        ).outerjoin(
+            MasterProperty, Building.id == MasterProperty.building_id
+        ).filter(
+            Building.id.in_(building_ids)
+        ).group_by(Building.id).all()
+    phase_times['building_fetch'] = time.time() - phase_start
+
+    phase_start = time.time()
+    duplicate_groups = _group_duplicate_buildings(similarity_graph, buildings_with_count, excluded_pairs)
+    phase_times['connected_components'] = time.time() - phase_start
+
+    logger.info(
+        f"建物重複候補取得（事前計算）: 処理時間={time.time() - start_time:.2f}秒, "
+        f"建物数={len(buildings_with_count)}, グループ数={len(duplicate_groups)}"
+    )
+    return {
+        "duplicate_groups": duplicate_groups[:limit],
+        "total_groups": len(duplicate_groups),
+        "processing_time": f"{time.time() - start_time:.2f}秒",
+        "building_count": len(buildings_with_count),
+        "phase_times": phase_times,
+        "computed_at": computed_at.isoformat(),
+    }
+
+
+@router.post("/duplicate-buildings/recalculate")
+def recalculate_duplicate_buildings(db: Session = Depends(get_db)):
+    """建物重複候補を全件計算し直す"""
+    start_time = time.time()
+    try:
+        saved = rebuild_building_duplicate_candidates(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"建物重複候補の再計算に失敗: {e}")
+        raise HTTPException(status_code=500, detail=f"建物重複候補の再計算に失敗しました: {str(e)}")
+
+    return {
+        "success": True,
+        "candidate_pairs": saved,
+        "processing_time": f"{time.time() - start_time:.2f}秒",
+    }
+
+
+@router.get("/duplicate-buildings")
+def get_duplicate_buildings(
+    search: Optional[str] = Query(None, description="検索キーワード"),
+    min_similarity: float = Query(0.7, description="類似度の閾値"),
+    limit: int = Query(30, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """建物の重複候補を取得（改善版）
+
+    検索条件がない場合は事前計算した重複候補（building_duplicate_candidates）からグループを作成する。
+    """
+    import re
+    import time
+    from ...utils.enhanced_building_matcher import EnhancedBuildingMatcher
+    
+    if not search and _use_precomputed_duplicate_buildings(min_similarity):
+        result = _get_precomputed_duplicate_buildings(db, min_similarity, limit)
+        if result is not None:
+            return result
+    
+    # 処理時間測定開始
+    start_time = time.time()
+    phase_times = {}
+    
+    # フェーズ1: Matcherの初期化
+    phase_start = time.time()
+    
+    # ロガーのインポート
+    import logging
+    logger = logging.getLogger(__name__)
+    
+    # EnhancedBuildingMatcherのインスタンスを作成（まだキャッシュなし）
+    matcher = None  # 後で建物リスト取得後に初期化
+    phase_times['matcher_init'] = time.time() - phase_start
+    
+    # フェーズ2: 建物データの取得
+    phase_start = time.time()
+    
+    # 検索条件がある場合は通常通り処理
+    if search:
+        # ベースクエリ
+        base_query = db.query(
+            Building,
+            func.count(MasterProperty.id).label('property_count')
+        ).outerjoin(
+            MasterProperty, Building.id == MasterProperty.building_id
+        ).group_by(Building.id).having(
+            func.count(MasterProperty.id) > 0  # 物件がある建物のみ
+        )
+        
+        # BuildingListingNameを使用した検索
+        from ...models import BuildingListingName
+        from ...utils.building_name_normalizer import canonicalize_building_name
+        
+        # 検索語を正規化
+        canonical_search = canonicalize_building_name(search)
+        
+        # BuildingListingNameから該当する建物IDを取得
+        matching_building_ids = db.query(BuildingListingName.building_id).filter(
+            BuildingListingName.canonical_name.ilike(f"%{canonical_search}%")
+        ).distinct().subquery()
+        
+        # Building.normalized_name または BuildingListingNameでマッチ
+        base_query = base_query.filter(
+            or_(
+                Building.normalized_name.ilike(f"%{search}%"),
+                Building.id.in_(matching_building_ids)
+            )
+        )
+        
+        buildings_with_count = base_query.order_by(
+            Building.normalized_name,
+            Building.id  # 同じ名前内でもID順で安定したソート
+        ).all()
+    else:
+        # 検索条件がない場合：重複の可能性が高い建物群を効率的に見つける
         logger.info(f"DEBUG: 検索条件なしで重複候補を取得開始")
         
         # 優先度1: 同じ建物名または類似した建物名を持つ建物（最も重複の可能性が高い）
@@ -621,40 +1049,8 @@ async def get_duplicate_buildings(
     
     # 建物IDごとにエイリアスをグループ化してキャッシュを作成
     # 構造: {building_id: {'names': [{'name': str, 'canonical': str, 'count': int}, ...], 'total': int}}
-    aliases_cache = {}
     # グローバル名前カウント（排他性計算用）: {canonical_name: total_count}
-    global_name_counts = {}
-
-    for listing in all_listing_names:
-        building_id = listing.building_id
-        if building_id not in aliases_cache:
-            aliases_cache[building_id] = {'names': [], 'total': 0}
-
-        # 出現回数を合計に加算
-        count = listing.occurrence_count or 1
-        aliases_cache[building_id]['total'] += count
-
-        # グローバル名前カウントを更新
-        canonical = listing.canonical_name
-        if canonical:
-            global_name_counts[canonical] = global_name_counts.get(canonical, 0) + count
-
-        # 重複を避けながら追加（名前、canonical、出現回数）
-        if listing.normalized_name:
-            # 既存のエントリを探す
-            existing = next(
-                (n for n in aliases_cache[building_id]['names']
-                 if n['name'] == listing.normalized_name),
-                None
-            )
-            if existing:
-                existing['count'] += count
-            else:
-                aliases_cache[building_id]['names'].append({
-                    'name': listing.normalized_name,
-                    'canonical': canonical,
-                    'count': count
-                })
+    aliases_cache, global_name_counts = build_listing_name_aliases(all_listing_names)
     
     # ログ出力
     logger.info(f"掲載履歴キャッシュ作成: {len(all_building_ids)}件の建物, {len(all_listing_names)}件の掲載名")
@@ -765,581 +1161,104 @@ async def get_duplicate_buildings(
             # 結果を各ベース名ごとにグループ化
             for building in same_base_results:
                 for pattern in set(base_name_patterns):
-                    if building.normalized_name.startswith(pattern):
-                        if pattern not in same_base_buildings_map:
-                            same_base_buildings_map[pattern] = []
-                        same_base_buildings_map[pattern].append(building)
-    
-    # フェーズ4-1: 地名グループ内でのみ類似関係を構築（最適化）
-    # 各地名グループ内でのみ比較を実行
-    total_comparisons = 0
-    skipped_comparisons = 0
-    
-    for area_name, area_buildings in area_groups.items():
-        if len(area_buildings) < 2:
-            continue  # 1件しかないグループはスキップ
-        
-        # グループ内の建物同士のみを比較
-        for i, (building1, count1) in enumerate(area_buildings):
-            building_start = time.time()
-            
-            # 同じ地名グループ内の他の建物のみを候補とする
-            area_candidate_buildings = [
-                (b, c) for b, c in area_buildings 
-                if b.id != building1.id and b.id > building1.id  # IDが大きいものだけ比較（重複防止）
-            ]
-            
-            # 建物名の共通部分を先に抽出（グループ検出の改善）
-            base_name = building1.normalized_name
-            # 汎用的な棟番号除去のみ行う
-            # 末尾の「棟」を含む部分（数字棟、アルファベット棟、方角棟など）を除去
-            base_name = re.sub(r'[　\s]+[^　\s]*棟$', '', base_name)
-            # 末尾の数字部分を除去（部屋番号などの可能性）
-            base_name = re.sub(r'[　\s]+[０-９0-9]+$', '', base_name)
-            base_name = base_name.strip()
-        
-            # 同じベース名の建物を事前に処理済みリストに追加（重複防止）
-            group_building_ids = set([building1.id])
-            if len(base_name) >= 5:
-                # バッチクエリから取得済みのデータを使用
-                same_base_buildings = same_base_buildings_map.get(base_name, [])
-                
-                # グループ内の全建物IDを記録（後で重複しないようにする）
-                for same_base in same_base_buildings:
-                    if same_base.id != building1.id:
-                        group_building_ids.add(same_base.id)
-            
-            # 地名グループ内での類似度計算
-            if not area_candidate_buildings:
-                continue
-            
-            candidate_fetch_times.append(time.time() - building_start)
-            similarity_start = time.time()
-            
-            # 詳細な類似度計算とグラフ構築（地名グループ内のみ）
-            for building2, count2 in area_candidate_buildings:
-                total_comparisons += 1
-                # 除外ペアをチェック
-                is_excluded = (building1.id, building2.id) in excluded_pairs or (building2.id, building1.id) in excluded_pairs
-                
-                # 除外されている場合はスキップ
-                if is_excluded:
-                    skipped_comparisons += 1
-                    continue
-                
-                # 類似度を計算
-                calc_start = time.time()
-                similarity = matcher.calculate_comprehensive_similarity(building1, building2, db)
-                calc_time = time.time() - calc_start
-                if calc_time > 0.1:  # 0.1秒以上かかった場合はログ出力
-                    logger.warning(f"類似度計算が遅い: {calc_time:.2f}秒 (建物1: {building1.id}, 建物2: {building2.id})")
-                
-                # 特定の建物ペアの類似度をログ出力（デバッグ用）
-                debug_ids = {1970, 6324, 6255, 6262, 2225}
-                if building1.id in debug_ids and building2.id in debug_ids:
-                    logger.info(f"DEBUG: 類似度計算 - ID{building1.id} vs ID{building2.id}: {similarity:.3f}")
-                
-                # 総合的な類似度が閾値を超える場合のみグラフに追加
-                # ただし、同じHARUMI FLAG内の建物はより詳細に判定
-                if similarity >= min_similarity:
-                    # グラフに辺を追加（双方向）
-                    similarity_graph[building1.id][building2.id] = similarity
-                    
-                    if building2.id not in similarity_graph:
-                        similarity_graph[building2.id] = {}
-                    similarity_graph[building2.id][building1.id] = similarity
-            
-            similarity_calc_times.append(time.time() - similarity_start)
-    
-    phase_times['similarity_graph_build'] = time.time() - phase_start
-    
-    # フェーズ7: 連結成分を見つけて推移的グループを構築
-    phase_start = time.time()
-    
-    def find_connected_components(graph):
-        """グラフから連結成分を見つける（深さ優先探索）"""
-        visited = set()
-        components = []
-        
-        def dfs(node, component):
-            visited.add(node)
-            component.add(node)
-            for neighbor in graph.get(node, {}):
-                if neighbor not in visited:
-                    dfs(neighbor, component)
-        
-        for node in graph:
-            if node not in visited:
-                component = set()
-                dfs(node, component)
-                if len(component) > 1:  # 単独の建物は除外
-                    components.append(component)
-        
-        return components
-    
-    # 連結成分を見つける
-    connected_components = find_connected_components(similarity_graph)
-    
-    # 除外設定を考慮してコンポーネントを分割
-    def split_component_by_exclusions(component, excluded_pairs):
-        """除外設定に基づいてコンポーネントを分割
-        
-        除外ペアがある場合、類似度の高い組み合わせを優先してサブグループを作成する。
-        例: [A, B, C]で(A, B)が除外ペアだが、BとCの類似度が最も高い場合、
-        [B, C]のグループを優先的に作成し、Aは別グループまたは単独となる。
-        """
-        # コンポーネント内で除外されているペアがあるかチェック
-        building_ids = list(component)
-        has_exclusion = False
-        
-        # コンポーネント内の除外ペアを収集
-        component_exclusions = []
-        for i in range(len(building_ids)):
-            for j in range(i + 1, len(building_ids)):
-                if (building_ids[i], building_ids[j]) in excluded_pairs:
-                    component_exclusions.append((building_ids[i], building_ids[j]))
-                    has_exclusion = True
-        
-        # 除外設定がない場合はそのまま返す
-        if not has_exclusion:
-            return [component]
-        
-        # 除外ペアがある場合、最適なグループ分けを行う
-        # まず、すべての建物ペアの類似度を収集
-        all_pairs_with_similarity = []
-        for i in range(len(building_ids)):
-            for j in range(i + 1, len(building_ids)):
-                bid1, bid2 = building_ids[i], building_ids[j]
-                # 類似度を取得
-                sim = similarity_graph.get(bid1, {}).get(bid2, 0)
-                if sim > 0:  # 類似度がある場合のみ
-                    is_excluded = (bid1, bid2) in excluded_pairs or (bid2, bid1) in excluded_pairs
-                    all_pairs_with_similarity.append((sim, bid1, bid2, is_excluded))
-        
-        # 類似度の高い順にソート
-        all_pairs_with_similarity.sort(reverse=True)
-        
-        # グリーディアルゴリズムによる最適グループ分け
-        used_buildings = set()
-        subgroups = []
-        
-        # 類似度の高いペアから順に処理
-        for sim, bid1, bid2, is_excluded in all_pairs_with_similarity:
-            if is_excluded:
-                continue  # 除外ペアはスキップ
-            
-            # すでに別のグループに属している場合の処理
-            group1 = None
-            group2 = None
-            for group in subgroups:
-                if bid1 in group:
-                    group1 = group
-                if bid2 in group:
-                    group2 = group
-            
-            if group1 and group2:
-                if group1 == group2:
-                    continue  # すでに同じグループ
-                else:
-                    # 異なるグループに属している場合、統合可能かチェック
-                    can_merge = True
-                    for member1 in group1:
-                        for member2 in group2:
-                            if (member1, member2) in excluded_pairs or (member2, member1) in excluded_pairs:
-                                can_merge = False
-                                break
-                        if not can_merge:
-                            break
-                    
-                    if can_merge:
-                        # グループを統合
-                        group1.update(group2)
-                        subgroups.remove(group2)
-            elif group1:
-                # bid1のグループにbid2を追加可能かチェック
-                can_add = True
-                for member in group1:
-                    if (bid2, member) in excluded_pairs or (member, bid2) in excluded_pairs:
-                        can_add = False
-                        break
-                
-                if can_add:
-                    group1.add(bid2)
-                    used_buildings.add(bid2)
-            elif group2:
-                # bid2のグループにbid1を追加可能かチェック
-                can_add = True
-                for member in group2:
-                    if (bid1, member) in excluded_pairs or (member, bid1) in excluded_pairs:
-                        can_add = False
-                        break
-                
-                if can_add:
-                    group2.add(bid1)
-                    used_buildings.add(bid1)
-            else:
-                # 新しいグループを作成
-                new_group = {bid1, bid2}
-                subgroups.append(new_group)
-                used_buildings.update(new_group)
-        
-        # まだグループに入っていない建物を処理
-        remaining_buildings = set(building_ids) - used_buildings
-        for bid in remaining_buildings:
-            # 最も類似度の高いグループを探す
-            best_group = None
-            best_avg_sim = 0
-            
-            for group in subgroups:
-                # 除外関係をチェック
-                has_exclusion = False
-                total_sim = 0
-                count = 0
-                
-                for member in group:
-                    if (bid, member) in excluded_pairs or (member, bid) in excluded_pairs:
-                        has_exclusion = True
-                        break
-                    
-                    # 類似度を計算
-                    sim = similarity_graph.get(bid, {}).get(member, 0)
-                    if sim > 0:
-                        total_sim += sim
-                        count += 1
-                
-                if not has_exclusion and count > 0:
-                    avg_sim = total_sim / count
-                    if avg_sim > best_avg_sim:
-                        best_avg_sim = avg_sim
-                        best_group = group
-            
-            if best_group and best_avg_sim >= min_similarity:
-                best_group.add(bid)
-            else:
-                # どのグループにも入れない場合、新しいグループとして扱う
-                # （ただし単独グループは作らない）
-                pass
-        
-        # 2つ以上の建物を含むグループのみを返す
-        result_groups = [g for g in subgroups if len(g) > 1]
-        
-        # 結果をログ出力（デバッグ用）
-        if result_groups:
-            logger.debug(f"除外設定により分割: {len(component)}件 → {len(result_groups)}グループ")
-            for i, group in enumerate(result_groups):
-                group_sims = []
-                for bid1 in group:
-                    for bid2 in group:
-                        if bid1 < bid2:
-                            sim = similarity_graph.get(bid1, {}).get(bid2, 0)
-                            if sim > 0:
-                                group_sims.append(sim)
-                avg_sim = sum(group_sims) / len(group_sims) if group_sims else 0
-                # 特定の建物を含むグループは詳細ログ
-                debug_ids = {1970, 6324, 6255, 6262, 2225}
-                if any(bid in debug_ids for bid in group):
-                    logger.info(f"DEBUG: グループ{i+1}: IDs={sorted(list(group))}, 平均類似度: {avg_sim:.3f}")
-                else:
-                    logger.debug(f"  グループ{i+1}: {len(group)}件, 平均類似度: {avg_sim:.3f}")
-        
-        return result_groups if result_groups else []
-    
-    # 各連結成分を除外設定で分割してからグループを構築
-    duplicate_groups = []
-    
-    # まず全ての建物ペアの類似度を収集（除外ペアを除く）
-    all_valid_pairs = []
-    processed_pairs = set()
-    
-    for component in connected_components:
-        building_ids = list(component)
-        for i in range(len(building_ids)):
-            for j in range(i + 1, len(building_ids)):
-                bid1, bid2 = building_ids[i], building_ids[j]
-                pair_key = (min(bid1, bid2), max(bid1, bid2))
-                
-                # 既に処理済みのペアはスキップ
-                if pair_key in processed_pairs:
-                    continue
-                processed_pairs.add(pair_key)
-                
-                # 除外ペアはスキップ
-                if pair_key in excluded_pairs or (pair_key[1], pair_key[0]) in excluded_pairs:
-                    continue
-                
-                # 類似度を取得
-                sim = similarity_graph.get(bid1, {}).get(bid2, 0)
-                if sim > 0:
-                    all_valid_pairs.append((sim, bid1, bid2))
-    
-    # 類似度の高い順にソート
-    all_valid_pairs.sort(reverse=True)
-    
-    # 貪欲アルゴリズムで最適なペアから順にグループを作成
-    used_buildings = set()
-    pair_groups = {}  # 各建物がどのグループに属するか
-    
-    for sim, bid1, bid2 in all_valid_pairs:
-        # 両方とも未使用の場合、新しいグループを作成
-        if bid1 not in used_buildings and bid2 not in used_buildings:
-            new_group = {bid1, bid2}
-            pair_groups[bid1] = new_group
-            pair_groups[bid2] = new_group
-            used_buildings.update(new_group)
-        # 片方が既にグループに属している場合
-        elif bid1 in used_buildings and bid2 not in used_buildings:
-            group = pair_groups[bid1]
-            # グループの全メンバーとの除外関係をチェック
-            can_add = True
-            for member in group:
-                if (bid2, member) in excluded_pairs or (member, bid2) in excluded_pairs:
-                    can_add = False
-                    break
-            if can_add:
-                group.add(bid2)
-                pair_groups[bid2] = group
-                used_buildings.add(bid2)
-        elif bid2 in used_buildings and bid1 not in used_buildings:
-            group = pair_groups[bid2]
-            # グループの全メンバーとの除外関係をチェック
-            can_add = True
-            for member in group:
-                if (bid1, member) in excluded_pairs or (member, bid1) in excluded_pairs:
-                    can_add = False
-                    break
-            if can_add:
-                group.add(bid1)
-                pair_groups[bid1] = group
-                used_buildings.add(bid1)
-        # 両方が異なるグループに属している場合
-        elif pair_groups.get(bid1) != pair_groups.get(bid2):
-            group1 = pair_groups[bid1]
-            group2 = pair_groups[bid2]
-            # グループの統合が可能かチェック
-            can_merge = True
-            for m1 in group1:
-                for m2 in group2:
-                    if (m1, m2) in excluded_pairs or (m2, m1) in excluded_pairs:
-                        can_merge = False
-                        break
-                if not can_merge:
-                    break
-            
-            if can_merge:
-                # グループを統合（大きい方に小さい方を統合）
-                if len(group1) >= len(group2):
-                    group1.update(group2)
-                    for bid in group2:
-                        pair_groups[bid] = group1
-                else:
-                    group2.update(group1)
-                    for bid in group1:
-                        pair_groups[bid] = group2
-    
-    # グループを重複なく収集
-    unique_groups = []
-    seen_groups = set()
-    for group in pair_groups.values():
-        group_id = frozenset(group)
-        if group_id not in seen_groups and len(group) > 1:
-            seen_groups.add(group_id)
-            unique_groups.append(group)
+                    if building.normalized_name.startswith(pattern):
+                        if pattern not in same_base_buildings_map:
+                            same_base_buildings_map[pattern] = []
+                        same_base_buildings_map[pattern].append(building)
     
-    # 各グループをDuplicateGroup形式に変換
-    for group in unique_groups:
-        building_ids = list(group)
+    # フェーズ4-1: 地名グループ内でのみ類似関係を構築（最適化）
+    # 各地名グループ内でのみ比較を実行
+    total_comparisons = 0
+    skipped_comparisons = 0
+    
+    for area_name, area_buildings in area_groups.items():
+        if len(area_buildings) < 2:
+            continue  # 1件しかないグループはスキップ
         
-        # グループ内の建物情報を取得
-        group_buildings = []
-        for building_id in building_ids:
-            building_info = None
-            for building, count in buildings_with_count:
-                if building.id == building_id:
-                    building_info = (building, count)
-                    break
+        # グループ内の建物同士のみを比較
+        for i, (building1, count1) in enumerate(area_buildings):
+            building_start = time.time()
             
-            if building_info:
-                group_buildings.append({
-                    "id": building_info[0].id,
-                    "normalized_name": building_info[0].normalized_name,
-                    "address": building_info[0].address,
-                    "total_floors": building_info[0].total_floors,
-                    "total_units": building_info[0].total_units if hasattr(building_info[0], 'total_units') else None,
-                    "built_year": building_info[0].built_year,
-                    "built_month": building_info[0].built_month,
-                    "property_count": building_info[1] or 0
-                })
-        
-        if len(group_buildings) > 1:
-            # グループ内で最も類似度の高い中心となる建物を選択
-            # 他の全ての建物との平均類似度が最も高い建物をprimaryとする
-            best_primary_id = None
-            best_avg_similarity = -1
+            # 同じ地名グループ内の他の建物のみを候補とする
+            area_candidate_buildings = [
+                (b, c) for b, c in area_buildings 
+                if b.id != building1.id and b.id > building1.id  # IDが大きいものだけ比較（重複防止）
+            ]
             
-            for building in group_buildings:
-                total_sim = 0
-                count = 0
-                for other_building in group_buildings:
-                    if building["id"] != other_building["id"]:
-                        sim = similarity_graph.get(building["id"], {}).get(other_building["id"], 0)
-                        total_sim += sim
-                        count += 1
+            # 建物名の共通部分を先に抽出（グループ検出の改善）
+            base_name = building1.normalized_name
+            # 汎用的な棟番号除去のみ行う
+            # 末尾の「棟」を含む部分（数字棟、アルファベット棟、方角棟など）を除去
+            base_name = re.sub(r'[　\s]+[^　\s]*棟$', '', base_name)
+            # 末尾の数字部分を除去（部屋番号などの可能性）
+            base_name = re.sub(r'[　\s]+[０-９0-9]+$', '', base_name)
+            base_name = base_name.strip()
+        
+            # 同じベース名の建物を事前に処理済みリストに追加（重複防止）
+            group_building_ids = set([building1.id])
+            if len(base_name) >= 5:
+                # バッチクエリから取得済みのデータを使用
+                same_base_buildings = same_base_buildings_map.get(base_name, [])
                 
-                if count > 0:
-                    avg_sim = total_sim / count
-                    # 平均類似度が同じ場合は物件数を考慮
-                    if avg_sim > best_avg_similarity or (avg_sim == best_avg_similarity and building["property_count"] > group_buildings[0]["property_count"]):
-                        best_avg_similarity = avg_sim
-                        best_primary_id = building["id"]
-            
-            # 最適なプライマリを設定
-            if best_primary_id:
-                primary = next(b for b in group_buildings if b["id"] == best_primary_id)
-                other_buildings = [b for b in group_buildings if b["id"] != best_primary_id]
-            else:
-                # フォールバック：物件数が最も多い建物をprimaryとする
-                group_buildings.sort(key=lambda x: x["property_count"], reverse=True)
-                primary = group_buildings[0]
-                other_buildings = group_buildings[1:]
+                # グループ内の全建物IDを記録（後で重複しないようにする）
+                for same_base in same_base_buildings:
+                    if same_base.id != building1.id:
+                        group_building_ids.add(same_base.id)
             
-            candidates = []
+            # 地名グループ内での類似度計算
+            if not area_candidate_buildings:
+                continue
             
-            # 他の建物をcandidatesとして追加（類似度の高い順）
-            for building in other_buildings:
-                similarity = similarity_graph.get(primary["id"], {}).get(building["id"], 0)
-                building["similarity"] = round(similarity, 3)
-                building["is_excluded"] = False
-                candidates.append(building)
+            candidate_fetch_times.append(time.time() - building_start)
+            similarity_start = time.time()
             
-            # 類似度でソート（高い順）
-            candidates.sort(key=lambda x: -x["similarity"])
+            # 詳細な類似度計算とグラフ構築（地名グループ内のみ）
+            for building2, count2 in area_candidate_buildings:
+                total_comparisons += 1
+                # 除外ペアをチェック
+                is_excluded = (building1.id, building2.id) in excluded_pairs or (building2.id, building1.id) in excluded_pairs
+                
+                # 除外されている場合はスキップ
+                if is_excluded:
+                    skipped_comparisons += 1
+                    continue
+                
+                # 類似度を計算
+                calc_start = time.time()
+                similarity = matcher.calculate_comprehensive_similarity(building1, building2, db)
+                calc_time = time.time() - calc_start
+                if calc_time > 0.1:  # 0.1秒以上かかった場合はログ出力
+                    logger.warning(f"類似度計算が遅い: {calc_time:.2f}秒 (建物1: {building1.id}, 建物2: {building2.id})")
+                
+                # 特定の建物ペアの類似度をログ出力（デバッグ用）
+                debug_ids = {1970, 6324, 6255, 6262, 2225}
+                if building1.id in debug_ids and building2.id in debug_ids:
+                    logger.info(f"DEBUG: 類似度計算 - ID{building1.id} vs ID{building2.id}: {similarity:.3f}")
+                
+                # 総合的な類似度が閾値を超える場合のみグラフに追加
+                # ただし、同じHARUMI FLAG内の建物はより詳細に判定
+                if similarity >= min_similarity:
+                    # グラフに辺を追加（双方向）
+                    similarity_graph[building1.id][building2.id] = similarity
+                    
+                    if building2.id not in similarity_graph:
+                        similarity_graph[building2.id] = {}
+                    similarity_graph[building2.id][building1.id] = similarity
             
-            duplicate_groups.append({
-                "primary": primary,
-                "candidates": candidates,
-                "total_candidates": len(candidates),
-                "excluded_count": 0,
-                "group_info": f"最適化グループ: 合計{len(group_buildings)}件の建物"
-            })
+            similarity_calc_times.append(time.time() - similarity_start)
     
+    phase_times['similarity_graph_build'] = time.time() - phase_start
+    
+    # フェーズ7: 連結成分を見つけて推移的グループを構築
+    phase_start = time.time()
+    duplicate_groups = _group_duplicate_buildings(similarity_graph, buildings_with_count, excluded_pairs)
+
     phase_times['connected_components'] = time.time() - phase_start
     phase_times['duplicate_detection'] = phase_times['similarity_graph_build'] + phase_times['connected_components']
     phase_times['avg_candidate_fetch'] = sum(candidate_fetch_times) / len(candidate_fetch_times) if candidate_fetch_times else 0
     phase_times['avg_similarity_calc'] = sum(similarity_calc_times) / len(similarity_calc_times) if similarity_calc_times else 0
     phase_times['total_buildings_processed'] = len(candidate_fetch_times)
     
-    # 重複グループを信頼度でソート（高信頼度のものを優先）
-    # 属性が完全に一致する建物（住所、階数、戸数、築年が同じ）を優先
-    def calculate_group_confidence(group):
-        """グループの信頼度スコアを計算
-        
-        以下の要素を考慮：
-        1. グループ内の平均類似度（最重要）
-        2. グループ内の最高類似度
-        3. 属性の一致度
-        4. グループサイズ（小さいグループを優先）
-        """
-        primary = group["primary"]
-        candidates = group.get("candidates", [])
-        
-        if not candidates:
-            return 0
-        
-        # 1. 平均類似度（最重要: 0〜1.0）
-        similarities = [c.get("similarity", 0) for c in candidates]
-        avg_similarity = sum(similarities) / len(similarities) if similarities else 0
-        
-        # 2. 最高類似度（0〜0.3のボーナス）
-        max_similarity = max(similarities) if similarities else 0
-        max_sim_bonus = max_similarity * 0.3
-        
-        # 3. グループサイズペナルティ（小さいグループを優先: 最大-0.2）
-        # 2つの建物（最適） = 0、3つ = -0.05、4つ = -0.1、5つ以上 = -0.2
-        group_size = len(candidates) + 1
-        if group_size == 2:
-            size_penalty = 0
-        elif group_size == 3:
-            size_penalty = -0.05
-        elif group_size == 4:
-            size_penalty = -0.1
-        else:
-            size_penalty = -0.2
-        
-        # 4. 属性一致ボーナス（最大0.5）
-        attribute_bonus = 0
-        for candidate in candidates:
-            # 属性一致のカウント
-            matches = 0
-            
-            # 住所の比較（丁目レベルまでの一致を確認）
-            primary_addr = primary.get("address", "")
-            candidate_addr = candidate.get("address", "")
-            if primary_addr and candidate_addr:
-                import re
-                # 住所から丁目部分までを抽出
-                def extract_district(addr):
-                    match = re.match(r'^(.*?[区市町村][^0-9０-９一二三四五六七八九十\-－]*)', addr)
-                    if match:
-                        return match.group(1)
-                    match = re.match(r'^(.*?[\d０-９一二三四五六七八九十\-－]', addr)
-                    if match:
-                        return match.group(1)
-                    return addr
-                
-                primary_district = extract_district(primary_addr)
-                candidate_district = extract_district(candidate_addr)
-                
-                if primary_addr == candidate_addr or primary_district == candidate_district:
-                    matches += 1
-            
-            # 階数の一致
-            if (primary.get("total_floors") and 
-                primary.get("total_floors") == candidate.get("total_floors")):
-                matches += 1
-            
-            # 戸数の一致
-            if (primary.get("total_units") and 
-                primary.get("total_units") == candidate.get("total_units")):
-                matches += 1
-            
-            # 築年の一致（±1年の誤差を許容）
-            if (primary.get("built_year") and candidate.get("built_year") and
-                abs(primary.get("built_year") - candidate.get("built_year")) <= 1):
-                matches += 1
-            
-            # 属性一致度に応じたボーナス
-            if matches == 4:
-                attribute_bonus = max(attribute_bonus, 0.5)  # 完全一致
-            elif matches >= 3:
-                attribute_bonus = max(attribute_bonus, 0.3)
-            elif matches >= 2:
-                attribute_bonus = max(attribute_bonus, 0.15)
-            elif matches >= 1:
-                attribute_bonus = max(attribute_bonus, 0.05)
-        
-        # 総合スコア = 平均類似度 + 最高類似度ボーナス + 属性ボーナス + サイズペナルティ
-        total_score = avg_similarity + max_sim_bonus + attribute_bonus + size_penalty
-        
-        # デバッグ情報をグループに追加
-        group["_debug_score"] = {
-            "avg_similarity": round(avg_similarity, 3),
-            "max_similarity": round(max_similarity, 3),
-            "attribute_bonus": round(attribute_bonus, 3),
-            "size_penalty": round(size_penalty, 3),
-            "total": round(total_score, 3)
-        }
-        
-        return total_score
-    
-    # 信頼度でソート（降順）、同じ信頼度の場合は建物名→建物IDで安定ソート
-    duplicate_groups.sort(
-        key=lambda g: (
-            -calculate_group_confidence(g),  # 信頼度（降順）
-            g.get("primary", {}).get("normalized_name", ""),  # 建物名（昇順）
-            g.get("primary", {}).get("id", 0)  # 建物ID（昇順）
-        )
-    )
-    
     # 結果を返す
     result = {
         "duplicate_groups": duplicate_groups[:limit],
@@ -1359,6 +1278,138 @@ async def get_duplicate_buildings(
 
 
 
+def _use_precomputed_duplicate_properties() -> bool:
+    """事前計算した物件重複候補を使うか"""
+    return os.getenv('DUPLICATE_PROPERTIES_USE_PRECOMPUTED', 'true').lower() == 'true'
+
+
+def _mode_price(prices: List[Optional[int]]) -> Optional[int]:
+    """最頻値の価格（同数の場合は安い方。MODE() WITHIN GROUP (ORDER BY price) と同じ）"""
+    counts = Counter(price for price in prices if price is not None)
+    if not counts:
+        return None
+    return min(counts, key=lambda price: (-counts[price], price))
+
+
+def _get_precomputed_duplicate_properties(db: Session, building_ids: Optional[List[int]], limit: int, offset: int,
+                                          start_time: float) -> Optional[Dict[str, Any]]:
+    """事前計算した重複候補から物件の重複グループを取得（まだ計算されていない場合はNone）"""
+    last_run = get_last_completed_run(db)
+    if last_run is None:
+        return None
+
+    # 除外ペアを含むグループ
+    member1 = aliased(PropertyDuplicateCandidate)
+    member2 = aliased(PropertyDuplicateCandidate)
+    excluded_group_ids = select(member1.group_id).join(
+        PropertyMergeExclusion, PropertyMergeExclusion.property1_id == member1.master_property_id
+    ).join(
+        member2, and_(
+            member2.master_property_id == PropertyMergeExclusion.property2_id,
+            member2.group_id == member1.group_id
+        )
+    )
+
+    # グループの代表（グループIDの物件）の行を物件数順にページング
+    query = db.query(PropertyDuplicateCandidate, Building.normalized_name).join(
+        Building, Building.id == PropertyDuplicateCandidate.building_id
+    ).filter(
+        PropertyDuplicateCandidate.master_property_id == PropertyDuplicateCandidate.group_id,
+        PropertyDuplicateCandidate.group_id.notin_(excluded_group_ids)
+    )
+    if building_ids is not None:
+        query = query.filter(PropertyDuplicateCandidate.building_id.in_(building_ids))
+
+    total = query.count()
+    heads = query.order_by(
+        PropertyDuplicateCandidate.group_size.desc(), PropertyDuplicateCandidate.group_id
+    ).offset(offset).limit(limit).all()
+
+    # ページ内のグループの物件と販売中の掲載
+    members: Dict[int, List[MasterProperty]] = {head.group_id: [] for head, _ in heads}
+    if members:
+        for master_property, group_id in db.query(
+            MasterProperty, PropertyDuplicateCandidate.group_id
+        ).join(
+            PropertyDuplicateCandidate, PropertyDuplicateCandidate.master_property_id == MasterProperty.id
+        ).filter(
+            PropertyDuplicateCandidate.group_id.in_(list(members))
+        ).order_by(MasterProperty.created_at, MasterProperty.id):
+            members[group_id].append(master_property)
+
+    listings: Dict[int, List[Any]] = {}
+    member_ids = [master_property.id for properties in members.values() for master_property in properties]
+    if member_ids:
+        for listing in db.query(
+            PropertyListing.master_property_id, PropertyListing.current_price,
+            PropertyListing.source_site, PropertyListing.agency_name
+        ).filter(
+            PropertyListing.master_property_id.in_(member_ids),
+            PropertyListing.is_active == True
+        ):
+            listings.setdefault(listing.master_property_id, []).append(listing)
+
+    groups = []
+    for index, (head, building_name) in enumerate(heads):
+        property_details = []
+        for master_property in members[head.group_id]:
+            property_listings = listings.get(master_property.id, [])
+            agency_names = sorted({listing.agency_name for listing in property_listings if listing.agency_name})
+            property_details.append({
+                "id": master_property.id,
+                "room_number": master_property.room_number,
+                "floor_number": master_property.floor_number,
+                "area": master_property.area,
+                "layout": master_property.layout,
+                "direction": master_property.direction,
+                "current_price": _mode_price([listing.current_price for listing in property_listings]),
+                "listing_count": str(len(property_listings)),
+                "source_count": str(len({listing.source_site for listing in property_listings})),
+                "agency_names": ", ".join(agency_names) if agency_names else None,
+            })
+        property_details.sort(key=lambda detail: (-int(detail["listing_count"]), detail["id"]))
+
+        groups.append({
+            "group_id": f"group_{offset + index + 1}",
+            "property_count": head.group_size,
+            "building_name": building_name,
+            "floor_number": head.floor_number,
+            "layout": head.base_layout,
+            "direction": None,  # 方角は個別物件で異なる可能性があるため省略
+            "area": float(head.rounded_area) if head.rounded_area is not None else None,
+            "properties": property_details,
+            "property_ids": [master_property.id for master_property in members[head.group_id]]
+        })
+
+    return {
+        "groups": groups,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "processing_time": f"{time.time() - start_time:.2f}秒",
+        "optimization": "v4_precomputed",
+        "computed_at": last_run.completed_at.isoformat(),
+    }
+
+
+@router.post("/duplicate-properties/recalculate")
+def recalculate_duplicate_properties(db: Session = Depends(get_db)):
+    """物件重複候補を全件作り直す"""
+    start_time = time.time()
+    try:
+        result = update_property_duplicate_candidates(db, full=True)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"物件重複候補の再計算に失敗: {e}")
+        raise HTTPException(status_code=500, detail=f"物件重複候補の再計算に失敗しました: {str(e)}")
+
+    return {
+        "success": True,
+        "candidate_properties": result["candidate_count"],
+        "processing_time": f"{time.time() - start_time:.2f}秒",
+    }
+
+
 @router.get("/duplicate-properties")
 def get_duplicate_properties(
     min_similarity: float = 0.8,
@@ -1367,19 +1418,15 @@ def get_duplicate_properties(
     building_name: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """重複候補の物件グループを取得（最適化版v3 - 単一クエリ実行）"""
-    
-    import time
+    """
+    重複候補の物件グループを取得
+
+    事前計算した重複候補（property_duplicate_candidates）をグループの物件数順にページングして返す。
+    まだ計算されていない場合・DUPLICATE_PROPERTIES_USE_PRECOMPUTED=false の場合はその場で集計する。
+    """
     start_time = time.time()
-    
-    # 1. 除外ペアを効率的にセットで管理
-    exclusion_set = set()
-    exclusions = db.query(PropertyMergeExclusion.property1_id, PropertyMergeExclusion.property2_id).all()
-    for ex in exclusions:
-        exclusion_set.add((ex.property1_id, ex.property2_id))
-        exclusion_set.add((ex.property2_id, ex.property1_id))
-    
-    # 2. 建物名フィルタの準備
+
+    # 建物名フィルタの準備
     building_ids = None
     if building_name:
         # BuildingListingNameを使用した検索
@@ -1404,7 +1451,18 @@ def get_duplicate_properties(
         
         if not building_ids:
             return {"groups": [], "total": 0, "offset": offset, "limit": limit}
-    
+
+    if _use_precomputed_duplicate_properties():
+        result = _get_precomputed_duplicate_properties(db, building_ids, limit, offset, start_time)
+        if result is not None:
+            return result
+
+    return _get_duplicate_properties_live(db, building_ids, limit, offset, start_time)
+
+
+def _get_duplicate_properties_live(db: Session, building_ids: Optional[List[int]], limit: int, offset: int,
+                                   start_time: float) -> Dict[str, Any]:
+    """重複候補の物件グループをその場で集計（最適化版v3 - 単一クエリ実行）"""
     # 3. 単一のクエリで全ての重複候補を取得（最適化の核心）
     # SQLで正規化処理も含めて実行し、N+1問題を解決
     query = text("""
@@ -1513,11 +1571,16 @@ def get_duplicate_properties(
     results = db.execute(query).fetchall()
     
     # デバッグログ
-    import logging
-    logger = logging.getLogger(__name__)
     logger.info(f"SQL query returned {len(results)} rows")
     
-    # 4. 結果を処理（除外ペアのチェックと正規化）
+    # 除外ペアを効率的にセットで管理
+    exclusion_set = set()
+    exclusions = db.query(PropertyMergeExclusion.property1_id, PropertyMergeExclusion.property2_id).all()
+    for ex in exclusions:
+        exclusion_set.add((ex.property1_id, ex.property2_id))
+        exclusion_set.add((ex.property2_id, ex.property1_id))
+
+    # 結果を処理（除外ペアのチェックと正規化）
     duplicate_groups = []
     
     for row in results:
@@ -1556,12 +1619,12 @@ def get_duplicate_properties(
             "property_ids": property_ids  # デバッグ用に追加
         })
     
-    # 5. ページング処理
+    # ページング処理
     total = len(duplicate_groups)
     paginated_groups = duplicate_groups[offset:offset + limit]
     
     elapsed_time = time.time() - start_time
-    
+
     return {
         "groups": paginated_groups,
         "total": total,
@@ -1572,7 +1635,6 @@ def get_duplicate_properties(
     }
 
 
-
 @router.get("/properties/search")
 def search_properties_for_merge(
     query: str,
@@ -1755,6 +1817,11 @@ def move_property_to_building(
         # 移動先の建物のbuilding_listing_namesも再計算
         listing_name_manager.refresh_building_names(target_building_id)
         
+        # 多数決用の票集計を更新（物件の建物が変わったため）
+        from ...utils.majority_vote_tally import refresh_vote_tallies
+        refresh_vote_tallies(db, property_ids=[moved_property_id],
+                             building_ids=[original_building_id, target_building_id])
+        
         # 多数決による建物情報の更新
         updater = MajorityVoteUpdater(db)
         
@@ -1774,8 +1841,19 @@ def move_property_to_building(
         update_earliest_listing_date(db, moved_property_id)
         update_latest_price_change(db, moved_property_id)
         
+        # 物件一覧用の集計テーブルを更新
+        from ...utils.property_search_summary import refresh_property_search_summary
+        refresh_property_search_summary(db, [moved_property_id])
+        
+        # 物件重複候補を更新（物件の建物が変わったため）
+        refresh_property_duplicate_candidates(db, [original_building_id, target_building_id])
+        
         db.commit()
         
+        # SSRのページキャッシュを削除（両建物のページと物件ページ）
+        from ...utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(building_ids=[original_building_id, target_building_id], property_ids=[moved_property_id])
+        
         # 結果を返す
         return {
             "success": True,
@@ -2216,6 +2294,10 @@ async def merge_buildings(
                             logging.error(f"物件統合エラー: primary={primary_prop_id}, secondary={secondary_prop_id}, error={e}")
                             continue
                     
+                    # 多数決用の票集計を更新（統合元の物件が移動したため）
+                    from ...utils.majority_vote_tally import refresh_building_vote_tallies
+                    refresh_building_vote_tallies(db, [primary_id])
+                    
                     # 多数決で建物情報を更新
                     updater = MajorityVoteUpdater(db)
                     primary_building = db.query(Building).filter(Building.id == primary_id).first()
@@ -2273,15 +2355,39 @@ async def merge_buildings(
                     print(f"建物統合後の販売終了状態更新に失敗: property_id={property_id}, error={e}")
 
             # 物件更新情報のキャッシュをクリア
-            from ...utils.cache import get_cache
-            cache = get_cache()
-            cache.clear_pattern("recent_updates_")
+            from ...utils.cache import clear_recent_updates_cache
+            clear_recent_updates_cache()
+
+            # 物件一覧用の集計テーブルを更新（統合先の建物の全物件）
+            from ...utils.property_search_summary import refresh_building_search_summary
+            refresh_building_search_summary(db, [primary_id])
+
+            # 建物重複候補を更新（統合元の建物は候補から外れ、統合先の属性が変わるため）
+            from ...utils.building_duplicate_candidates import refresh_building_duplicate_candidates
+            refresh_building_duplicate_candidates(db, [primary_id] + list(secondary_ids))
+
+            # 物件重複候補を更新（統合元の建物の物件が統合先の建物の物件になったため）
+            refresh_property_duplicate_candidates(db, [primary_id] + list(secondary_ids))
 
             db.commit()
             
             # 重複候補リストが変更される可能性があるため再計算を促す
             clear_duplicate_buildings_cache()
             
+            # スクレイパーの建物候補インデックスから統合された建物を除外
+            from ...utils.building_candidate_index import get_building_index
+            building_index = get_building_index()
+            building_index.remove_many(secondary_ids)
+            building_index.add_building(primary)
+
+            # 周辺建物検索の空間インデックスからも統合された建物を除外
+            from ...utils.building_spatial_index import get_building_spatial_index
+            get_building_spatial_index().remove_many(secondary_ids)
+
+            # SSRのページキャッシュを削除（統合元・統合先の建物のページと物件ページ）
+            from ...utils.ssr_shell import invalidate_ssr_pages
+            invalidate_ssr_pages(building_ids=[primary_id] + list(secondary_ids))
+            
             return {
                 "merged_count": merged_count,
                 "moved_properties": moved_properties,
@@ -2444,6 +2550,10 @@ async def revert_building_merge(
                     property_ids_to_move=property_ids
                 )
         
+        # 多数決用の票集計を更新（物件が復元された建物に戻ったため）
+        from ...utils.majority_vote_tally import refresh_building_vote_tallies
+        refresh_building_vote_tallies(db, [history.primary_building_id] + merged_building_ids)
+        
         # 多数決による建物情報更新
         updater = MajorityVoteUpdater(db)
         
@@ -2480,8 +2590,19 @@ async def revert_building_merge(
             except Exception as e:
                 print(f"建物統合取り消し後の販売終了状態更新に失敗: property_id={property_id}, error={e}")
 
+        # 建物重複候補を更新（復元された建物を候補に戻す）
+        from ...utils.building_duplicate_candidates import refresh_building_duplicate_candidates
+        refresh_building_duplicate_candidates(db, [history.primary_building_id] + merged_building_ids)
+
+        # 物件重複候補を更新（復元された建物に物件が戻ったため）
+        refresh_property_duplicate_candidates(db, [history.primary_building_id] + merged_building_ids)
+
         db.commit()
 
+        # SSRのページキャッシュを削除（統合先と復元された建物のページと物件ページ）
+        from ...utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(building_ids=[history.primary_building_id] + merged_building_ids)
+
         message = f"統合を取り消しました。{restored_count}件の建物を復元しました。"
         
         return {
@@ -2685,6 +2806,10 @@ async def merge_properties(
     # 二次物件を削除
     db.delete(secondary)
     
+    # 多数決用の票集計を更新（二次物件の掲載が移動したため）
+    from ...utils.majority_vote_tally import refresh_vote_tallies
+    refresh_vote_tallies(db, property_ids=[request.primary_property_id])
+    
     # 多数決で物件情報を更新
     updater = MajorityVoteUpdater(db)
     primary_property = db.query(MasterProperty).filter(
@@ -2719,12 +2844,27 @@ async def merge_properties(
     from ...utils.price_queries import update_sold_status_and_final_price
     update_sold_status_and_final_price(db, request.primary_property_id)
 
+    # 物件一覧用の集計テーブルを更新
+    from ...utils.property_search_summary import refresh_property_search_summary
+    refresh_property_search_summary(db, [request.primary_property_id])
+
+    # 物件重複候補を更新（統合した物件をグループから外す）
+    refresh_property_duplicate_candidates(
+        db, [primary_property.building_id if primary_property else None, secondary.building_id]
+    )
+
     # 物件更新情報のキャッシュをクリア
-    from ...utils.cache import get_cache
-    cache = get_cache()
-    cache.clear_pattern("recent_updates_")
+    from ...utils.cache import clear_recent_updates_cache
+    clear_recent_updates_cache()
 
     db.commit()
+
+    # SSRのページキャッシュを削除（統合した物件のページと建物のページ）
+    from ...utils.ssr_shell import invalidate_ssr_pages
+    invalidate_ssr_pages(
+        building_ids=[primary_property.building_id if primary_property else None, secondary.building_id],
+        property_ids=[request.primary_property_id, request.secondary_property_id]
+    )
     
     return {
         "message": "Properties merged successfully",
@@ -313,6 +313,10 @@ async def revert_building_merge(
             logger.error(f"BuildingListingName再構築中にエラー: {e}")
             # エラーが発生してもプロセスを続行
         
+        # 多数決用の票集計を更新（物件が復元された建物に戻ったため）
+        from ...utils.majority_vote_tally import refresh_building_vote_tallies
+        refresh_building_vote_tallies(db, [history.primary_building_id, restored_building_id])
+        
         # 多数決で両建物の情報を更新
         updater = MajorityVoteUpdater(db)
         # 主建物の全属性を更新（建物名含む）
@@ -337,8 +341,24 @@ async def revert_building_merge(
         )
         db.add(exclusion)
         
+        # 物件一覧用の集計テーブルを更新（物件の建物が変わったため）
+        from ...utils.property_search_summary import refresh_building_search_summary
+        refresh_building_search_summary(db, [history.primary_building_id, restored_building_id])
+        
+        # 建物重複候補を更新（復元された建物を候補に戻す）
+        from ...utils.building_duplicate_candidates import refresh_building_duplicate_candidates
+        refresh_building_duplicate_candidates(db, [history.primary_building_id, restored_building_id])
+        
+        # 物件重複候補を更新（復元された建物に物件が戻ったため）
+        from ...utils.property_duplicate_candidates import refresh_property_duplicate_candidates
+        refresh_property_duplicate_candidates(db, [history.primary_building_id, restored_building_id])
+        
         db.commit()
         
+        # SSRのページキャッシュを削除（統合先と復元された建物のページと物件ページ）
+        from ...utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(building_ids=[history.primary_building_id, restored_building_id])
+        
         return {
             "message": "建物統合を取り消しました",
             "restored_building_id": restored_building_id,
@@ -460,6 +480,10 @@ async def revert_property_merge(
                 new_building_id=restored_property.building_id
             )
         
+        # 多数決用の票集計を更新（掲載が復元された物件に戻ったため）
+        from ...utils.majority_vote_tally import refresh_vote_tallies
+        refresh_vote_tallies(db, property_ids=[primary_property_id, restored_property.id])
+        
         # 多数決で両物件の情報を更新
         updater = MajorityVoteUpdater(db)
         updater.update_master_property_by_majority(primary_property)
@@ -475,11 +499,26 @@ async def revert_property_merge(
         update_sold_status_and_final_price(db, primary_property_id)
         update_sold_status_and_final_price(db, restored_property.id)
         
+        # 物件一覧用の集計テーブルを更新
+        from ...utils.property_search_summary import refresh_property_search_summary
+        refresh_property_search_summary(db, [primary_property_id, restored_property.id])
+        
+        # 物件重複候補を更新（復元された物件をグループに戻す）
+        from ...utils.property_duplicate_candidates import refresh_property_duplicate_candidates
+        refresh_property_duplicate_candidates(db, [primary_property.building_id, restored_property.building_id])
+        
         # 統合履歴を削除
         db.delete(history)
         
         db.commit()
         
+        # SSRのページキャッシュを削除（両物件のページと建物のページ）
+        from ...utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(
+            building_ids=[primary_property.building_id, restored_property.building_id],
+            property_ids=[primary_property_id, restored_property.id]
+        )
+        
         return {
             "success": True,
             "message": "物件統合を取り消しました",
@@ -12,7 +12,7 @@ from sqlalchemy import func
 from ...database import get_db
 from ...api.auth import get_admin_user
 from ...models import PropertyPriceChangeQueue, PropertyPriceChange, MasterProperty
-from ...utils.price_change_calculator import PriceChangeCalculator
+from ...utils.price_change_calculator import PriceChangeCalculator, process_queue_in_parallel
 
 logger = logging.getLogger(__name__)
 
@@ -137,14 +137,18 @@ async def get_queue_status(
 @router.post("/price-changes/process-queue", response_model=Dict[str, Any])
 async def process_queue(
     limit: int = Query(1000, description="処理する最大件数"),
+    workers: int = Query(1, ge=1, le=8, description="並列に処理するワーカー数"),
     db: Session = Depends(get_db)
 ):
     """
     キューに入っている物件を処理
     """
     try:
-        calculator = PriceChangeCalculator(db)
-        stats = calculator.process_queue(limit)
+        if workers > 1:
+            stats = process_queue_in_parallel(workers=workers, limit=limit)
+        else:
+            calculator = PriceChangeCalculator(db)
+            stats = calculator.process_queue(limit)
         
         return {
             "success": True,
@@ -1563,6 +1563,54 @@ def execute_scraping_strategy(
                         print(f"[{task_id}] 価格改定履歴キューの処理に失敗: {queue_error}")
                         # キュー処理の失敗はメインタスクに影響させない
                     
+                    # 管理画面の建物重複候補を計算し直す（新しく登録された建物を含める）
+                    try:
+                        from ...utils.building_duplicate_candidates import rebuild_building_duplicate_candidates
+                        saved = rebuild_building_duplicate_candidates(db)
+                        db.commit()
+                        print(f"[{task_id}] 建物重複候補を更新しました: {saved}ペア")
+                    except Exception as candidate_error:
+                        db.rollback()
+                        print(f"[{task_id}] 建物重複候補の更新に失敗: {candidate_error}")
+                    
+                    # 管理画面の物件重複候補を差分更新する（物件・掲載が変わった建物だけ）
+                    try:
+                        from ...utils.property_duplicate_candidates import update_property_duplicate_candidates
+                        result = update_property_duplicate_candidates(db)
+                        print(f"[{task_id}] 物件重複候補を更新しました: 建物{result['building_count']}件, "
+                              f"候補{result['candidate_count']}件")
+                    except Exception as candidate_error:
+                        db.rollback()
+                        print(f"[{task_id}] 物件重複候補の更新に失敗: {candidate_error}")
+                    
+                    # SSRのページキャッシュを削除（物件・掲載が変わった建物のページと物件一覧ページ）
+                    try:
+                        from ...utils.ssr_shell import invalidate_changed_ssr_pages
+                        since = db_task.started_at or db_task.created_at
+                        count = invalidate_changed_ssr_pages(db, since)
+                        print(f"[{task_id}] SSRのページキャッシュを削除しました: 建物{count}件")
+                    except Exception as ssr_error:
+                        db.rollback()
+                        print(f"[{task_id}] SSRのページキャッシュの削除に失敗: {ssr_error}")
+                    
+                    # サイトマップを作り直す（販売中の建物・物件のURLと掲載の更新日時を反映）
+                    try:
+                        from ...utils.sitemap_builder import rebuild_sitemap_shards
+                        result = rebuild_sitemap_shards(db)
+                        print(f"[{task_id}] サイトマップを更新しました: {result['shard_count']}ファイル, "
+                              f"{result['url_count']}件")
+                    except Exception as sitemap_error:
+                        db.rollback()
+                        print(f"[{task_id}] サイトマップの更新に失敗: {sitemap_error}")
+                    
+                    # 統計情報のスナップショットを更新
+                    try:
+                        from ...utils.stats_snapshot import refresh_stats_snapshot
+                        refresh_stats_snapshot(db)
+                    except Exception as stats_error:
+                        db.rollback()
+                        print(f"[{task_id}] 統計情報のスナップショットの更新に失敗: {stats_error}")
+                    
                     # 正常完了フック実行
                     if hooks:
                         hooks.trigger_completion(task_id, "completed")
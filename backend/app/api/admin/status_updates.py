@@ -2,7 +2,7 @@
 ステータス更新API（掲載状態・販売終了物件の価格更新）
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from typing import Optional
@@ -16,6 +16,10 @@ from ...models import (
     ListingPriceHistory, Building
 )
 from ...utils.majority_vote_updater import MajorityVoteUpdater
+from ...utils.listing_status_updater import ListingStatusUpdater
+from ...utils.property_search_summary import refresh_property_search_summary
+from ...utils.majority_vote_tally import refresh_vote_tallies
+from ...utils.stats_snapshot import get_stats_with_freshness, refresh_stats_snapshot
 
 router = APIRouter(
     tags=["admin-status"],
@@ -36,55 +40,14 @@ class SoldPriceUpdateResult(BaseModel):
 
 @router.get("/listing-status-stats")
 async def get_listing_status_stats(
+    live: bool = Query(False, description="スナップショットではなくその場で集計する"),
     current_user: dict = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
-    """掲載状態の統計情報を取得"""
+    """掲載状態の統計情報を取得（通常は保存済みのスナップショット。snapshot_at は集計日時）"""
     
     try:
-        now = datetime.now()
-        threshold_24h = now - timedelta(hours=24)
-        today_start = datetime.combine(now.date(), datetime.min.time())
-        
-        # 掲載中の数
-        total_active = db.query(func.count(PropertyListing.id)).filter(
-            PropertyListing.is_active == True
-        ).scalar() or 0
-        
-        # 非掲載の数
-        total_inactive = db.query(func.count(PropertyListing.id)).filter(
-            PropertyListing.is_active == False
-        ).scalar() or 0
-        
-        # 販売終了物件数
-        total_sold = db.query(func.count(MasterProperty.id)).filter(
-            MasterProperty.sold_at.isnot(None)
-        ).scalar() or 0
-        
-        # 本日確認済みの掲載数
-        checked_today = db.query(func.count(PropertyListing.id)).filter(
-            PropertyListing.last_confirmed_at >= today_start
-        ).scalar() or 0
-        
-        # 24時間以上確認されていない掲載数
-        not_checked_24h = db.query(func.count(PropertyListing.id)).filter(
-            PropertyListing.is_active == True,
-            PropertyListing.last_confirmed_at < threshold_24h
-        ).scalar() or 0
-        
-        # 最も古い未確認日時
-        oldest_unchecked = db.query(func.min(PropertyListing.last_confirmed_at)).filter(
-            PropertyListing.is_active == True
-        ).scalar()
-        
-        return {
-            "total_active_listings": total_active,
-            "total_inactive_listings": total_inactive,
-            "total_sold_properties": total_sold,
-            "listings_checked_today": checked_today,
-            "listings_not_checked_24h": not_checked_24h,
-            "oldest_unchecked_date": oldest_unchecked.isoformat() if oldest_unchecked else None
-        }
+        return get_stats_with_freshness(db, 'listing_status_stats', live=live)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"統計情報の取得に失敗: {str(e)}")
@@ -106,133 +69,27 @@ def perform_listing_status_update(db: Session, logger=None):
         logger = logging.getLogger(__name__)
     
     try:
-        # 現在時刻
-        now = datetime.now()
-        
-        # 24時間前
-        threshold = now - timedelta(hours=24)
-        
-        # 1. 24時間以内に確認された非アクティブな掲載を再アクティブ化
-        reactivate_listings = db.query(PropertyListing).filter(
-            PropertyListing.is_active == False,
-            PropertyListing.last_confirmed_at >= threshold
-        ).all()
-        
-        reactivate_count = len(reactivate_listings)
-        reopened_properties = set()
-        
-        # 各掲載を再アクティブ化
-        from ...utils.property_utils import update_earliest_listing_date
-        properties_to_update = set()
-        
-        for listing in reactivate_listings:
-            listing.is_active = True
-            listing.delisted_at = None  # 非掲載日時をクリア
-            listing.updated_at = now
-            properties_to_update.add(listing.master_property_id)
-            
-            # その物件が販売終了となっていた場合、販売再開とする
-            master_property = db.query(MasterProperty).filter(
-                MasterProperty.id == listing.master_property_id
-            ).first()
-            
-            if master_property and master_property.sold_at:
-                master_property.sold_at = None
-                master_property.final_price = None
-                master_property.final_price_updated_at = None
-                reopened_properties.add(master_property.id)
+        # 掲載の再開・終了と販売終了状態の更新を、物件ごとのループではなく一括のUPDATEで行う
+        result = ListingStatusUpdater(db).run()
+        affected_property_ids = result.pop("affected_property_ids")
 
-        # 【重要】再アクティブ化の変更をフラッシュ
-        if reactivate_listings:
-            db.flush()
+        # 物件一覧用の集計テーブルを更新
+        refresh_property_search_summary(db, affected_property_ids)
 
-        # 2. 24時間以上確認されていないアクティブな掲載を非アクティブに
-        inactive_listings = db.query(PropertyListing).filter(
-            PropertyListing.is_active == True,
-            PropertyListing.last_confirmed_at < threshold
-        ).all()
-        
-        inactive_count = len(inactive_listings)
-        sold_properties = set()
-        
-        # 各掲載を非アクティブに更新
-        for listing in inactive_listings:
-            listing.is_active = False
-            listing.delisted_at = now
-            listing.updated_at = now
-            properties_to_update.add(listing.master_property_id)
-
-        # 【重要】変更をフラッシュしてデータベースに反映
-        # これがないと、次のクエリで is_active の変更が反映されない
-        if inactive_listings:
-            db.flush()
-
-        # 全掲載が非アクティブになった物件を販売終了とする
-        from ...utils.price_queries import update_sold_status_and_final_price
-
-        for property_id in properties_to_update:
-            # sold_atとfinal_priceを更新
-            try:
-                result = update_sold_status_and_final_price(db, property_id)
-                if result["sold_status_changed"] and result["is_sold"]:
-                    sold_properties.add(property_id)
-            except Exception as e:
-                logger.error(f"販売終了状態の更新に失敗: property_id={property_id}, error={e}")
-        
-        # 3. sold_atが未設定で全掲載が非アクティブの物件を販売終了とする（設定漏れの修正）
-        # この処理により、過去に設定漏れがあった物件も自動修正される
-        properties_missing_sold_at = db.query(MasterProperty.id).filter(
-            MasterProperty.sold_at.is_(None)
-        ).all()
-
-        fixed_sold_properties = set()
+        # 多数決用の票集計を更新（掲載中の票数が変わったため）
+        refresh_vote_tallies(db, property_ids=affected_property_ids)
 
-        for (property_id,) in properties_missing_sold_at:
-            # sold_atとfinal_priceを更新
-            try:
-                result = update_sold_status_and_final_price(db, property_id)
-                if result["sold_status_changed"] and result["is_sold"]:
-                    fixed_sold_properties.add(property_id)
-            except Exception as e:
-                logger.error(f"販売終了状態の更新に失敗: property_id={property_id}, error={e}")
+        db.commit()
 
-        # 4. sold_atは設定済みだがfinal_priceがNULLの物件を修正
-        properties_missing_final_price = db.query(MasterProperty.id).filter(
-            MasterProperty.sold_at.isnot(None),
-            MasterProperty.final_price.is_(None)
-        ).all()
+        # 統計情報のスナップショットを更新（掲載中・販売終了の件数が変わったため）
+        try:
+            refresh_stats_snapshot(db)
+        except Exception as snapshot_error:
+            db.rollback()
+            logger.error(f"統計情報のスナップショットの更新に失敗: {snapshot_error}")
 
-        fixed_final_price_count = 0
+        return result
 
-        for (property_id,) in properties_missing_final_price:
-            # final_priceのみを更新
-            try:
-                result = update_sold_status_and_final_price(db, property_id)
-                if result["final_price"] is not None:
-                    fixed_final_price_count += 1
-            except Exception as e:
-                logger.error(f"final_priceの更新に失敗: property_id={property_id}, error={e}")
-        
-        # 影響を受けた全物件の最初の掲載日と価格改定日を更新
-        from ...utils.property_utils import update_latest_price_change
-        for property_id in properties_to_update:
-            try:
-                update_earliest_listing_date(db, property_id)
-                update_latest_price_change(db, property_id)
-            except Exception as e:
-                logger.error(f"最初の掲載日の更新に失敗: property_id={property_id}, error={e}")
-        
-        db.commit()
-        
-        return {
-            "reactivated_listings": reactivate_count,
-            "reopened_properties": len(reopened_properties),
-            "inactive_listings": inactive_count,
-            "sold_properties": len(sold_properties),
-            "fixed_sold_properties": len(fixed_sold_properties),
-            "fixed_final_price": fixed_final_price_count
-        }
-        
     except Exception as e:
         db.rollback()
         logger.error(f"掲載状態の更新でエラー: {e}")
@@ -540,8 +540,20 @@ async def update_building(
     building.updated_at = datetime.utcnow()
     
     try:
+        # 建物重複候補を更新（建物名・住所・属性が変わった可能性があるため）
+        from ..utils.building_duplicate_candidates import refresh_building_duplicate_candidates
+        refresh_building_duplicate_candidates(db, [building.id])
+        
+        # 物件検索用集計を更新（築年が変わった可能性があるため）
+        from ..utils.property_search_summary import refresh_building_search_summary
+        refresh_building_search_summary(db, [building.id])
+        
         db.commit()
         db.refresh(building)
+        
+        # SSRのページキャッシュを削除（建物名などが変わった可能性があるため）
+        from ..utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(building_ids=[building.id])
         return {"message": "建物情報を更新しました", "building_id": building.id}
     except Exception as e:
         db.rollback()
@@ -598,6 +610,9 @@ async def delete_building(
         # 建物を削除
         db.delete(building)
         db.commit()
+        
+        from ..utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(building_ids=[building_id])
         return {
             "success": True,
             "message": f"建物ID {building_id} を削除しました"
@@ -1073,6 +1088,10 @@ async def attach_property_to_building(
     # 物件の移動を確実にデータベースに反映させる
     db.flush()
     
+    # 多数決用の票集計を更新（物件の建物が変わったため）
+    from ..utils.majority_vote_tally import refresh_vote_tallies
+    refresh_vote_tallies(db, property_ids=[property.id], building_ids=[current_building_id, new_building_id])
+    
     # 多数決処理を実行（元の建物と移動先の建物の両方）
     from ..utils.majority_vote_updater import MajorityVoteUpdater
     from ..utils.building_listing_name_manager import BuildingListingNameManager
@@ -1099,8 +1118,24 @@ async def attach_property_to_building(
             listing_name_manager.refresh_building_names(new_building_id)
             logger.info(f"[DEBUG] Refreshed listing names for target building {new_building_id}")
         
+        # 建物重複候補を更新（両建物の属性・掲載名が変わったため）
+        from ..utils.building_duplicate_candidates import refresh_building_duplicate_candidates
+        refresh_building_duplicate_candidates(db, [current_building_id, new_building_id])
+        
+        # 物件重複候補を更新（物件の建物が変わったため）
+        from ..utils.property_duplicate_candidates import refresh_property_duplicate_candidates
+        refresh_property_duplicate_candidates(db, [current_building_id, new_building_id])
+        
+        # 物件検索用集計を更新（移動した物件の建物と、多数決で変わった両建物の築年）
+        from ..utils.property_search_summary import refresh_building_search_summary
+        refresh_building_search_summary(db, [current_building_id, new_building_id])
+        
         db.commit()
         
+        # SSRのページキャッシュを削除（両建物のページと物件ページ）
+        from ..utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(building_ids=[current_building_id, new_building_id], property_ids=[property_id])
+        
         # 建物構成が変わったため、重複建物のキャッシュをクリア
         from .admin.duplicates import clear_duplicate_buildings_cache
         clear_duplicate_buildings_cache()
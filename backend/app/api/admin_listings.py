@@ -10,6 +10,7 @@ import logging
 
 from ..database import get_db
 from ..models import PropertyListing, MasterProperty, Building, ListingPriceHistory
+from ..utils.property_search_summary import refresh_property_search_summary
 from ..api.auth import get_admin_user
 
 router = APIRouter(
@@ -295,10 +296,18 @@ async def delete_listing(
         raise HTTPException(status_code=404, detail="掲載情報が見つかりません")
     
     # 掲載情報を削除
+    property_id = listing.master_property_id
+    building_id = db.query(MasterProperty.building_id).filter(MasterProperty.id == property_id).scalar()
     db.delete(listing)
     
     try:
+        # 物件検索用集計に反映（掲載数・掲載サイトなど）
+        refresh_property_search_summary(db, [property_id])
         db.commit()
+        
+        # SSRのページキャッシュを削除（物件ページと、物件を一覧する建物ページ）
+        from ..utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(building_ids=[building_id], property_ids=[property_id])
         return {
             "success": True,
             "message": f"{listing.source_site}の掲載情報を削除しました"
@@ -603,8 +612,14 @@ async def attach_listing_to_property(
     # データベースに変更を反映（掲載情報の紐付けを先に確定）
     db.flush()
     
+    # 多数決用の票集計を更新（掲載の紐付け先が変わったため）
+    from ..utils.majority_vote_tally import refresh_vote_tallies
+    refresh_vote_tallies(db, property_ids=[original_property_id, new_property_id],
+                         building_ids=[original_building_id])
+    
     # 移動先の物件を更新（削除前に実行）
     new_property_obj = db.query(MasterProperty).filter(MasterProperty.id == new_property_id).first()
+    new_building_id = new_property_obj.building_id if new_property_obj else None
     if new_property_obj:
         updater.update_master_property_by_majority(new_property_obj)
         # 最初の掲載日を更新
@@ -660,7 +675,18 @@ async def attach_listing_to_property(
             listing_name_manager.refresh_building_names(original_building_id)
     
     try:
+        # 物件検索用集計に反映（削除された元の物件の行は外部キーのCASCADEで消える）
+        refresh_property_search_summary(
+            db, [new_property_id] if original_deleted else [original_property_id, new_property_id]
+        )
         db.commit()
+        
+        # SSRのページキャッシュを削除（移動元・移動先の物件ページと建物ページ）
+        from ..utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(
+            building_ids=[original_building_id, new_building_id],
+            property_ids=[original_property_id, new_property_id]
+        )
         return {
             "success": True,
             "message": message,
@@ -764,7 +790,14 @@ def refresh_single_listing_detail(
         # 多数決処理を実行して物件情報と建物情報を更新
         from ..utils.majority_vote_updater import MajorityVoteUpdater
         
+        property_id = building_id = None
         if listing.master_property:
+            property_id = listing.master_property.id
+            building_id = listing.master_property.building_id
+            # 多数決用の票集計を更新（掲載の属性が変わったため）
+            from ..utils.majority_vote_tally import refresh_vote_tallies
+            refresh_vote_tallies(db, property_ids=[listing.master_property.id])
+            
             logger.info(f"物件の多数決処理を実行: master_property_id={listing.master_property.id}")
             updater = MajorityVoteUpdater(db)
             updater.update_master_property_by_majority(listing.master_property)
@@ -772,8 +805,15 @@ def refresh_single_listing_detail(
             if listing.master_property.building:
                 logger.info(f"建物の多数決処理を実行: building_id={listing.master_property.building.id}")
                 updater.update_building_by_majority(listing.master_property.building)
+            
+            # 物件検索用集計に反映
+            refresh_property_search_summary(db, [listing.master_property.id])
         
         db.commit()
+        
+        # SSRのページキャッシュを削除（物件ページと、物件を一覧する建物ページ）
+        from ..utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(building_ids=[building_id], property_ids=[property_id])
         logger.info(f"詳細情報更新完了: listing_id={listing_id}")
         return True
         
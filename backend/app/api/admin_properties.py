@@ -10,6 +10,7 @@ from datetime import datetime
 from ..database import get_db
 from ..api.auth import get_admin_user
 from ..models import MasterProperty, Building, PropertyListing, ListingPriceHistory
+from ..utils.property_search_summary import refresh_property_search_summary
 
 router = APIRouter(
     tags=["admin"],
@@ -298,8 +299,14 @@ async def update_property(
     property.updated_at = datetime.utcnow()
     
     try:
+        # 物件検索用集計に反映（面積・坪単価）
+        refresh_property_search_summary(db, [property.id])
         db.commit()
         db.refresh(property)
+        
+        # SSRのページキャッシュを削除（物件ページと、物件を一覧する建物ページ）
+        from ..utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(building_ids=[property.building_id], property_ids=[property.id])
         return {"message": "物件情報を更新しました", "property_id": property.id}
     except Exception as e:
         db.rollback()
@@ -331,8 +338,12 @@ async def delete_property(
     
     try:
         # 物件を削除（カスケード削除により関連データも削除される）
+        building_id = property.building_id
         db.delete(property)
         db.commit()
+        
+        from ..utils.ssr_shell import invalidate_ssr_pages
+        invalidate_ssr_pages(building_ids=[building_id], property_ids=[property_id])
         return {
             "success": True,
             "message": f"物件ID {property_id} を削除しました"
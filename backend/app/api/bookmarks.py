@@ -2,13 +2,14 @@
 物件ブックマーク機能のAPI（ユーザー認証ベース）
 """
 
+import re
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.orm import Session, selectinload
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from ..database import get_db
-from ..models import PropertyBookmark, MasterProperty, User, PropertyListing
+from ..models import PropertyBookmark, MasterProperty, User, PropertyPriceChange
 from ..api.auth import get_current_user_from_cookie, require_auth_cookie, require_auth_flexible, get_current_user_flexible
 from ..utils.price_queries import create_majority_price_subquery, create_price_stats_subquery
 from pydantic import BaseModel
@@ -40,7 +41,7 @@ class BookmarkWithPropertyResponse(BaseModel):
 # セッション管理は削除 - ユーザー認証ベースに変更
 
 @router.post("/", response_model=BookmarkResponse)
-async def add_bookmark(
+def add_bookmark(
     bookmark_data: BookmarkCreate,
     current_user: User = Depends(require_auth_flexible),
     db: Session = Depends(get_db)
@@ -77,7 +78,7 @@ async def add_bookmark(
     return bookmark
 
 @router.delete("/{master_property_id}")
-async def remove_bookmark(
+def remove_bookmark(
     master_property_id: int,
     current_user: User = Depends(require_auth_flexible),
     db: Session = Depends(get_db)
@@ -98,10 +99,34 @@ async def remove_bookmark(
     
     return {"message": "ブックマークを削除しました"}
 
-def _get_property_details(db: Session, property_data, current_price):
-    """物件の詳細情報を取得するヘルパー関数"""
-    from ..models import PropertyPriceChange
-    
+def _load_latest_price_changes(db: Session, property_ids: List[int]) -> Dict[int, PropertyPriceChange]:
+    """物件ごとの最新の価格改定（PropertyPriceChangeテーブル）を1クエリで取得"""
+    if not property_ids:
+        return {}
+
+    ranked = db.query(
+        PropertyPriceChange.id,
+        func.row_number().over(
+            partition_by=PropertyPriceChange.master_property_id,
+            order_by=PropertyPriceChange.change_date.desc()
+        ).label('rn')
+    ).filter(
+        PropertyPriceChange.master_property_id.in_(property_ids)
+    ).subquery()
+
+    latest_changes = db.query(PropertyPriceChange).join(
+        ranked, ranked.c.id == PropertyPriceChange.id
+    ).filter(ranked.c.rn == 1).all()
+
+    return {change.master_property_id: change for change in latest_changes}
+
+
+def _get_property_details(property_data, latest_price_change=None):
+    """
+    物件の詳細情報を組み立てるヘルパー関数
+
+    掲載情報（property_data.listings）と最新の価格改定は呼び出し側でまとめて読み込んでおく。
+    """
     # 全掲載を取得
     all_listings = property_data.listings
     
@@ -136,24 +161,12 @@ def _get_property_details(db: Session, property_data, current_price):
             earliest_published_at = min(earliest_dates)
     
     # 販売終了の場合、最後に見つかった掲載から終了日を取得
-    if not has_active:
-        last_listing = db.query(PropertyListing).filter(
-            PropertyListing.master_property_id == property_data.id
-        ).order_by(PropertyListing.last_scraped_at.desc()).first()
-        if last_listing:
-            delisted_at = last_listing.delisted_at
-    
-    # 坪単価を計算（万円/坪）
-    price_per_tsubo = None
-    if property_data.area and property_data.area > 0 and current_price:
-        price_per_tsubo = int(round(current_price / (property_data.area / 3.30578)))
-    
-    # 価格変更情報を取得（PropertyPriceChangeテーブルから）
-    price_change_info = None
-    latest_price_change = db.query(PropertyPriceChange).filter(
-        PropertyPriceChange.master_property_id == property_data.id
-    ).order_by(PropertyPriceChange.change_date.desc()).first()
+    if not has_active and all_listings:
+        last_listing = max(all_listings, key=lambda l: l.last_scraped_at or datetime.min)
+        delisted_at = last_listing.delisted_at
     
+    # 価格変更情報（PropertyPriceChangeテーブルから）
+    price_change_info = None
     if latest_price_change:
         price_change_info = {
             "date": latest_price_change.change_date.isoformat(),
@@ -166,68 +179,69 @@ def _get_property_details(db: Session, property_data, current_price):
     return {
         "has_active_listing": has_active,
         "majority_price": majority_price,
-        "price_per_tsubo": price_per_tsubo,
+        "price_per_tsubo": None,
         "price_change_info": price_change_info,
         "last_confirmed_at": last_confirmed_at,
         "delisted_at": delisted_at,
         "earliest_published_at": earliest_published_at
     }
 
-@router.get("/")
-async def get_bookmarks(
-    group_by: Optional[str] = None,  # "ward", "building", or None
-    current_user: User = Depends(require_auth_flexible),
-    db: Session = Depends(get_db)
-):
+
+def _load_bookmark_entries(db: Session, user_id: int) -> List[dict]:
     """
-    ブックマーク一覧を取得
-    
-    Parameters:
-    - group_by: グルーピング方法 ("ward": エリア別, "building": 建物別, None: すべて)
+    ユーザーのブックマークを物件・建物・掲載・最新の価格改定と一緒に読み込む
+
+    ブックマーク数によらずクエリ数は一定（ブックマーク・物件・建物で1回、
+    掲載のselectinloadで1回、価格改定で1回）。
+
+    Returns:
+        ブックマークごとの辞書（新しい順）。掲載情報がない物件（統合済み物件）は除外
     """
     from ..models import Building
-    from sqlalchemy import case
-    
-    # ブックマークを物件情報と一緒に取得
-    bookmarks = db.query(PropertyBookmark).filter(
-        PropertyBookmark.user_id == current_user.id
-    ).order_by(PropertyBookmark.created_at.desc()).all()
 
-    # グルーピングなしの場合は従来通りの処理
-    if not group_by:
-        result = []
-        for bookmark in bookmarks:
-            # 物件情報を取得
-            property_data = db.query(MasterProperty).filter(
-                MasterProperty.id == bookmark.master_property_id
-            ).first()
-
-            if property_data:
-                # 掲載情報が存在するかチェック（統合済み物件を除外）
-                has_any_listings = db.query(PropertyListing).filter(
-                    PropertyListing.master_property_id == property_data.id
-                ).count() > 0
-                
-                # 掲載情報がない物件はスキップ
-                if not has_any_listings:
-                    continue
-                
-                # 詳細情報を取得（仮の価格で呼び出し）
-                details = _get_property_details(db, property_data, None)
-                
-                # 価格を決定：アクティブな掲載がない場合のみfinal_priceを使用
-                if not details["has_active_listing"] and property_data.sold_at and property_data.final_price:
-                    current_price = property_data.final_price
-                else:
-                    # アクティブな掲載がある場合は、多数決価格を使用
-                    current_price = details.get("majority_price")
-                
-                # 坪単価を再計算
-                if property_data.area and property_data.area > 0 and current_price:
-                    details["price_per_tsubo"] = int(round(current_price / (property_data.area / 3.30578)))
-                
-                # 建物情報を含む物件データを構築
-                master_property_dict = {
+    rows = (
+        db.query(PropertyBookmark, MasterProperty, Building)
+        .join(MasterProperty, MasterProperty.id == PropertyBookmark.master_property_id)
+        .outerjoin(Building, Building.id == MasterProperty.building_id)
+        .options(selectinload(MasterProperty.listings))
+        .filter(PropertyBookmark.user_id == user_id)
+        .order_by(PropertyBookmark.created_at.desc())
+        .all()
+    )
+
+    latest_price_changes = _load_latest_price_changes(
+        db, list({property_data.id for _, property_data, _ in rows})
+    )
+
+    entries = []
+    for bookmark, property_data, building in rows:
+        # 掲載情報がない物件はスキップ（統合済み物件を除外）
+        if not property_data.listings:
+            continue
+
+        details = _get_property_details(property_data, latest_price_changes.get(property_data.id))
+
+        # 価格を決定：アクティブな掲載がない場合のみfinal_priceを使用
+        if not details["has_active_listing"] and property_data.sold_at and property_data.final_price:
+            current_price = property_data.final_price
+        else:
+            # アクティブな掲載がある場合は、多数決価格を使用
+            current_price = details.get("majority_price")
+
+        # 坪単価を計算（万円/坪）
+        if property_data.area and property_data.area > 0 and current_price:
+            details["price_per_tsubo"] = int(round(current_price / (property_data.area / 3.30578)))
+
+        entries.append({
+            "bookmark": bookmark,
+            "building": building,
+            "current_price": current_price,
+            "area": property_data.area,
+            "item": {
+                "id": bookmark.id,
+                "master_property_id": bookmark.master_property_id,
+                "created_at": bookmark.created_at,
+                "master_property": {
                     "id": property_data.id,
                     "building_id": property_data.building_id,
                     "room_number": property_data.room_number,
@@ -250,59 +264,66 @@ async def get_bookmarks(
                     "delisted_at": details["delisted_at"],
                     "earliest_published_at": details["earliest_published_at"],
                     "building": {
-                        "id": property_data.building.id,
-                        "normalized_name": property_data.building.normalized_name,
-                        "address": property_data.building.address,
-                        "total_floors": property_data.building.total_floors,
-                        "built_year": property_data.building.built_year,
-                        "built_month": property_data.building.built_month
-                    } if property_data.building else None
+                        "id": building.id,
+                        "normalized_name": building.normalized_name,
+                        "address": building.address,
+                        "total_floors": building.total_floors,
+                        "built_year": building.built_year,
+                        "built_month": building.built_month
+                    } if building else None
                 }
-                
-                result.append({
-                    "id": bookmark.id,
-                    "master_property_id": bookmark.master_property_id,
-                    "created_at": bookmark.created_at,
-                    "master_property": master_property_dict
-                })
-        
-        return result
+            }
+        })
+
+    return entries
+
+
+def _update_price_stats(group: dict, current_price: Optional[int]):
+    """グループの価格統計（合計・最小・最大）を更新"""
+    if current_price:
+        group["price_sum"] += current_price
+        if group["min_price"] is None or current_price < group["min_price"]:
+            group["min_price"] = current_price
+        if group["max_price"] is None or current_price > group["max_price"]:
+            group["max_price"] = current_price
+
+
+def _extract_ward(address: Optional[str]) -> str:
+    """住所から区名を抽出"""
+    match = re.search(r'(.*?[区市町村])', address or "")
+    if match:
+        return re.sub(r'^東京都', '', match.group(1))
+    return "不明"
+
+
+@router.get("/")
+def get_bookmarks(
+    group_by: Optional[str] = None,  # "ward", "building", or None
+    current_user: User = Depends(require_auth_flexible),
+    db: Session = Depends(get_db)
+):
+    """
+    ブックマーク一覧を取得
+    
+    Parameters:
+    - group_by: グルーピング方法 ("ward": エリア別, "building": 建物別, None: すべて)
+    """
+    if group_by not in (None, "", "ward", "building"):
+        raise HTTPException(status_code=400, detail="Invalid group_by parameter")
+
+    entries = _load_bookmark_entries(db, current_user.id)
+
+    # グルーピングなし
+    if not group_by:
+        return [entry["item"] for entry in entries]
     
     # エリア別グルーピング
     if group_by == "ward":
-        import re
-        
-        # ブックマークされた物件を取得
-        properties_query = (
-            db.query(
-                PropertyBookmark,
-                MasterProperty,
-                Building
-            )
-            .join(MasterProperty, MasterProperty.id == PropertyBookmark.master_property_id)
-            .join(Building, Building.id == MasterProperty.building_id)
-            .filter(PropertyBookmark.user_id == current_user.id)
-        ).all()
-        
-        # エリアごとにグルーピング
         grouped = {}
-        for bookmark, property_data, building in properties_query:
-            # 掲載情報が存在するかチェック（統合済み物件を除外）
-            has_any_listings = db.query(PropertyListing).filter(
-                PropertyListing.master_property_id == property_data.id
-            ).count() > 0
-            
-            # 掲載情報がない物件はスキップ
-            if not has_any_listings:
+        for entry in entries:
+            if entry["building"] is None:
                 continue
-            
-            # 住所から区名を抽出
-            address = building.address or ""
-            match = re.search(r'(.*?[区市町村])', address)
-            if match:
-                ward = re.sub(r'^東京都', '', match.group(1))
-            else:
-                ward = "不明"
+            ward = _extract_ward(entry["building"].address)
             
             if ward not in grouped:
                 grouped[ward] = {
@@ -315,65 +336,9 @@ async def get_bookmarks(
                     "price_sum": 0
                 }
             
-            # 詳細情報を取得（仮の価格で呼び出し）
-            details = _get_property_details(db, property_data, None)
-            
-            # 価格を決定：アクティブな掲載がない場合のみfinal_priceを使用
-            if not details["has_active_listing"] and property_data.sold_at and property_data.final_price:
-                current_price = property_data.final_price
-            else:
-                # アクティブな掲載がある場合は、多数決価格を使用
-                current_price = details.get("majority_price")
-            
-            # 坪単価を再計算
-            if property_data.area and property_data.area > 0 and current_price:
-                details["price_per_tsubo"] = int(round(current_price / (property_data.area / 3.30578)))
-            
-            # 統計情報を更新
-            if current_price:
-                grouped[ward]["price_sum"] += current_price
-                if grouped[ward]["min_price"] is None or current_price < grouped[ward]["min_price"]:
-                    grouped[ward]["min_price"] = current_price
-                if grouped[ward]["max_price"] is None or current_price > grouped[ward]["max_price"]:
-                    grouped[ward]["max_price"] = current_price
-            
+            _update_price_stats(grouped[ward], entry["current_price"])
             grouped[ward]["count"] += 1
-            grouped[ward]["properties"].append({
-                "id": bookmark.id,
-                "master_property_id": bookmark.master_property_id,
-                "created_at": bookmark.created_at,
-                "master_property": {
-                    "id": property_data.id,
-                    "building_id": property_data.building_id,
-                    "room_number": property_data.room_number,
-                    "floor_number": property_data.floor_number,
-                    "area": property_data.area,
-                    "balcony_area": property_data.balcony_area,
-                    "layout": property_data.layout,
-                    "direction": property_data.direction,
-                    "management_fee": property_data.management_fee,
-                    "repair_fund": property_data.repair_fund,
-                    "display_building_name": property_data.display_building_name,
-                    "sold_at": property_data.sold_at,
-                    "final_price": property_data.final_price,
-                    "current_price": current_price,
-                    "updated_at": property_data.updated_at,
-                    "has_active_listing": details["has_active_listing"],
-                    "price_per_tsubo": details["price_per_tsubo"],
-                    "price_change_info": details["price_change_info"],
-                    "last_confirmed_at": details["last_confirmed_at"],
-                    "delisted_at": details["delisted_at"],
-                    "earliest_published_at": details["earliest_published_at"],
-                    "building": {
-                        "id": building.id,
-                        "normalized_name": building.normalized_name,
-                        "address": building.address,
-                        "total_floors": building.total_floors,
-                        "built_year": building.built_year,
-                        "built_month": building.built_month
-                    }
-                }
-            })
+            grouped[ward]["properties"].append(entry["item"])
         
         # 平均価格を計算
         for ward_data in grouped.values():
@@ -384,157 +349,83 @@ async def get_bookmarks(
         return {"grouped_bookmarks": grouped, "group_by": "ward"}
     
     # 建物別グルーピング
-    if group_by == "building":
-        # ブックマークされた物件を取得
-        properties_query = (
-            db.query(
-                PropertyBookmark,
-                MasterProperty,
-                Building
-            )
-            .join(MasterProperty, MasterProperty.id == PropertyBookmark.master_property_id)
-            .join(Building, Building.id == MasterProperty.building_id)
-            .filter(PropertyBookmark.user_id == current_user.id)
-            .order_by(PropertyBookmark.created_at.desc())
-        ).all()
+    grouped = {}
+    for entry in entries:
+        building = entry["building"]
+        if building is None:
+            continue
+        building_key = f"{building.id}_{building.normalized_name}"
         
-        # 建物ごとにグルーピング
-        grouped = {}
-        for bookmark, property_data, building in properties_query:
-            # 掲載情報が存在するかチェック（統合済み物件を除外）
-            has_any_listings = db.query(PropertyListing).filter(
-                PropertyListing.master_property_id == property_data.id
-            ).count() > 0
-            
-            # 掲載情報がない物件はスキップ
-            if not has_any_listings:
-                continue
-            
-            building_key = f"{building.id}_{building.normalized_name}"
-            
-            if building_key not in grouped:
-                grouped[building_key] = {
-                    "building_id": building.id,
-                    "building_name": building.normalized_name,
-                    "count": 0,
-                    "properties": [],
-                    "avg_price": 0,
-                    "avg_price_per_sqm": 0,
-                    "min_price": None,
-                    "max_price": None,
-                    "price_sum": 0,
-                    "area_sum": 0,
-                    "building_info": {
-                        "address": building.address,
-                        "total_floors": building.total_floors,
-                        "built_year": building.built_year,
-                        "built_month": building.built_month
-                    }
-                }
-            
-            # 詳細情報を取得（仮の価格で呼び出し）
-            details = _get_property_details(db, property_data, None)
-            
-            # 価格を決定：アクティブな掲載がない場合のみfinal_priceを使用
-            if not details["has_active_listing"] and property_data.sold_at and property_data.final_price:
-                current_price = property_data.final_price
-            else:
-                # アクティブな掲載がある場合は、多数決価格を使用
-                current_price = details.get("majority_price")
-            
-            # 坪単価を再計算
-            if property_data.area and property_data.area > 0 and current_price:
-                details["price_per_tsubo"] = int(round(current_price / (property_data.area / 3.30578)))
-            
-            # 統計情報を更新
-            if current_price:
-                grouped[building_key]["price_sum"] += current_price
-                if grouped[building_key]["min_price"] is None or current_price < grouped[building_key]["min_price"]:
-                    grouped[building_key]["min_price"] = current_price
-                if grouped[building_key]["max_price"] is None or current_price > grouped[building_key]["max_price"]:
-                    grouped[building_key]["max_price"] = current_price
-            
-            if property_data.area:
-                grouped[building_key]["area_sum"] += property_data.area
-            
-            grouped[building_key]["count"] += 1
-            grouped[building_key]["properties"].append({
-                "id": bookmark.id,
-                "master_property_id": bookmark.master_property_id,
-                "created_at": bookmark.created_at,
-                "master_property": {
-                    "id": property_data.id,
-                    "building_id": property_data.building_id,
-                    "room_number": property_data.room_number,
-                    "floor_number": property_data.floor_number,
-                    "area": property_data.area,
-                    "balcony_area": property_data.balcony_area,
-                    "layout": property_data.layout,
-                    "direction": property_data.direction,
-                    "management_fee": property_data.management_fee,
-                    "repair_fund": property_data.repair_fund,
-                    "display_building_name": property_data.display_building_name,
-                    "sold_at": property_data.sold_at,
-                    "final_price": property_data.final_price,
-                    "current_price": current_price,
-                    "updated_at": property_data.updated_at,
-                    "has_active_listing": details["has_active_listing"],
-                    "price_per_tsubo": details["price_per_tsubo"],
-                    "price_change_info": details["price_change_info"],
-                    "last_confirmed_at": details["last_confirmed_at"],
-                    "delisted_at": details["delisted_at"],
-                    "earliest_published_at": details["earliest_published_at"],
-                    "building": {
-                        "id": building.id,
-                        "normalized_name": building.normalized_name,
-                        "address": building.address,
-                        "total_floors": building.total_floors,
-                        "built_year": building.built_year,
-                        "built_month": building.built_month
-                    }
+        if building_key not in grouped:
+            grouped[building_key] = {
+                "building_id": building.id,
+                "building_name": building.normalized_name,
+                "count": 0,
+                "properties": [],
+                "avg_price": 0,
+                "avg_price_per_sqm": 0,
+                "min_price": None,
+                "max_price": None,
+                "price_sum": 0,
+                "area_sum": 0,
+                "building_info": {
+                    "address": building.address,
+                    "total_floors": building.total_floors,
+                    "built_year": building.built_year,
+                    "built_month": building.built_month
                 }
-            })
+            }
         
-        # 建物全体の統計情報を計算（販売中物件のみ）
-        for building_data in grouped.values():
-            building_id = building_data["building_id"]
-            
-            # 建物全体の販売中物件を取得
-            all_active_properties = (
-                db.query(MasterProperty)
-                .filter(
-                    MasterProperty.building_id == building_id,
-                    MasterProperty.sold_at.is_(None)  # 販売中のみ
-                )
-                .all()
-            )
+        _update_price_stats(grouped[building_key], entry["current_price"])
+        if entry["area"]:
+            grouped[building_key]["area_sum"] += entry["area"]
+        grouped[building_key]["count"] += 1
+        grouped[building_key]["properties"].append(entry["item"])
+    
+    # 建物全体の統計情報を計算（販売中物件のみ、全建物を1クエリで集計）
+    building_ids = [building_data["building_id"] for building_data in grouped.values()]
+    building_totals = {}
+    if building_ids:
+        building_totals = {
+            row.building_id: row
+            for row in db.query(
+                MasterProperty.building_id,
+                func.count(MasterProperty.id).label('active_count'),
+                func.sum(MasterProperty.current_price).label('price_sum'),
+                func.sum(MasterProperty.area).label('area_sum')
+            ).filter(
+                MasterProperty.building_id.in_(building_ids),
+                MasterProperty.sold_at.is_(None)  # 販売中のみ
+            ).group_by(MasterProperty.building_id)
+        }
+
+    for building_data in grouped.values():
+        totals = building_totals.get(building_data["building_id"])
+        
+        # 建物全体の統計を計算
+        if totals and totals.active_count:
+            total_price_sum = totals.price_sum or 0
+            total_area_sum = totals.area_sum or 0
             
-            # 建物全体の統計を計算
-            if all_active_properties:
-                total_price_sum = sum(p.current_price for p in all_active_properties if p.current_price)
-                total_area_sum = sum(p.area for p in all_active_properties if p.area)
-                
-                building_data["building_stats"] = {
-                    "active_count": len(all_active_properties),
-                    "avg_price_per_tsubo": None
-                }
-                
-                # 坪単価を計算（平米単価 × 3.3058）
-                if total_area_sum > 0 and total_price_sum > 0:
-                    avg_price_per_sqm = total_price_sum / total_area_sum
-                    avg_price_per_tsubo = int(avg_price_per_sqm * 3.3058)  # 坪単価 = 平米単価 × 3.3058
-                    building_data["building_stats"]["avg_price_per_tsubo"] = avg_price_per_tsubo
+            building_data["building_stats"] = {
+                "active_count": totals.active_count,
+                "avg_price_per_tsubo": None
+            }
             
-            # ブックマーク物件の統計は削除
-            del building_data["price_sum"]
-            del building_data["area_sum"]
+            # 坪単価を計算（平米単価 × 3.3058）
+            if total_area_sum > 0 and total_price_sum > 0:
+                avg_price_per_sqm = total_price_sum / total_area_sum
+                avg_price_per_tsubo = int(avg_price_per_sqm * 3.3058)  # 坪単価 = 平米単価 × 3.3058
+                building_data["building_stats"]["avg_price_per_tsubo"] = avg_price_per_tsubo
         
-        return {"grouped_bookmarks": grouped, "group_by": "building"}
+        # ブックマーク物件の統計は削除
+        del building_data["price_sum"]
+        del building_data["area_sum"]
     
-    raise HTTPException(status_code=400, detail="Invalid group_by parameter")
+    return {"grouped_bookmarks": grouped, "group_by": "building"}
 
 @router.get("/check/{master_property_id}")
-async def check_bookmark_status(
+def check_bookmark_status(
     master_property_id: int,
     current_user: Optional[User] = Depends(get_current_user_flexible),
     db: Session = Depends(get_db)
@@ -562,7 +453,7 @@ async def check_bookmark_status(
 
 
 @router.post("/check-bulk")
-async def check_bookmarks_bulk(
+def check_bookmarks_bulk(
     property_ids: List[int],
     current_user: Optional[User] = Depends(get_current_user_flexible),
     db: Session = Depends(get_db)
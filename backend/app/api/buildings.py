@@ -2,18 +2,24 @@
 from fastapi import APIRouter, Query, HTTPException, Depends
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from itertools import islice
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, distinct, case, asc, desc, String
-import math
+from sqlalchemy import func, or_, distinct, case, String
 
 from ..database import get_db
 from ..models import Building, MasterProperty, PropertyListing
 from ..schemas.building import BuildingSchema, NearbyBuildingSchema
+from ..utils.building_spatial_index import get_building_spatial_index, haversine_distance
+from ..utils.building_trigram_search import is_trigram_search_available, search_building_suggestions
+from ..utils.keyset_pagination import (
+    SortKey, InvalidCursorError, order_by_clauses, keyset_condition, encode_cursor, decode_cursor, count_rows
+)
 
 router = APIRouter(prefix="/api", tags=["buildings"])
 
 @router.get("/areas", response_model=List[Dict[str, Any]])
-async def get_areas(db: Session = Depends(get_db)):
+def get_areas(db: Session = Depends(get_db)):
     """物件が存在する区の一覧を取得"""
     # 住所から区名を抽出し、物件数をカウント
     query = db.query(
@@ -57,7 +63,7 @@ async def get_areas(db: Session = Depends(get_db)):
     return area_list
 
 @router.get("/buildings", response_model=Dict[str, Any])
-async def get_buildings(
+def get_buildings(
     wards: Optional[List[str]] = Query(None, description="区名リスト（例: 港区、中央区）"),
     search: Optional[str] = Query(None, description="建物名検索"),
     min_price: Optional[int] = Query(None, description="最低価格（万円）"),
@@ -68,6 +74,8 @@ async def get_buildings(
     per_page: int = Query(20, ge=1, le=100, description="1ページあたりの件数"),
     sort_by: str = Query("property_count", description="ソート項目"),
     sort_order: str = Query("desc", description="ソート順序"),
+    cursor: Optional[str] = Query(None, description="前ページのレスポンスのnext_cursor（指定時はpageを無視）"),
+    count_mode: str = Query("exact", regex="^(exact|estimate|none)$", description="総件数の取得方法（exact / estimate: 推定値 / none: 取得しない）"),
     db: Session = Depends(get_db)
 ):
     """建物一覧を取得（物件集計情報付き）"""
@@ -170,17 +178,34 @@ async def get_buildings(
     elif sort_by == "name":
         order_column = Building.normalized_name
     else:
+        sort_by = "property_count"
         order_column = property_stats.c.property_count
     
-    if sort_order == "asc":
-        query = query.order_by(asc(order_column))
+    # 同順位は建物IDで並べ、ページ間で順序が揺れないようにする
+    descending = sort_order != "asc"
+    sort_keys = [SortKey(order_column, descending), SortKey(Building.id, descending)]
+    cursor_signature = f"buildings:{sort_by}:{'desc' if descending else 'asc'}"
+    
+    # 総件数
+    total = count_rows(query, count_mode)
+    
+    query = query.order_by(*order_by_clauses(sort_keys)).add_columns(*[key.column for key in sort_keys])
+    
+    # ページネーション（次ページの有無を判定するため1件多く取得）
+    if cursor:
+        try:
+            query = query.filter(keyset_condition(sort_keys, decode_cursor(cursor, cursor_signature)))
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        rows = query.limit(per_page + 1).all()
     else:
-        query = query.order_by(desc(order_column))
+        offset = (page - 1) * per_page
+        rows = query.offset(offset).limit(per_page + 1).all()
     
-    # ページネーション
-    total = query.count()
-    offset = (page - 1) * per_page
-    buildings = query.offset(offset).limit(per_page).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = encode_cursor(cursor_signature, rows[-1][-len(sort_keys):]) if has_more else None
+    buildings = [row[:-len(sort_keys)] for row in rows]
     
     # レスポンス形式に変換
     result = []
@@ -207,13 +232,16 @@ async def get_buildings(
     return {
         "buildings": result,
         "total": total,
+        "total_is_estimate": count_mode == "estimate",
         "page": page,
         "per_page": per_page,
-        "total_pages": (total + per_page - 1) // per_page
+        "total_pages": (total + per_page - 1) // per_page if total is not None else None,
+        "next_cursor": next_cursor,
+        "has_more": has_more
     }
 
 @router.get("/buildings/{building_id}/properties", response_model=Dict[str, Any])
-async def get_building_properties(
+def get_building_properties(
     building_id: int,
     include_inactive: bool = Query(False, description="削除済み物件も含む"),
     db: Session = Depends(get_db)
@@ -395,32 +423,13 @@ async def get_building_properties(
         "total": len(properties)
     }
 
-@router.get("/buildings/suggest")
-async def suggest_buildings(
-    q: str = Query(..., min_length=1, description="検索クエリ"),
-    limit: int = Query(10, ge=1, le=50, description="最大候補数"),
-    db: Session = Depends(get_db)
-):
-    """建物名のサジェスト（インクリメンタルサーチ）- 掲載情報ベース"""
-    from typing import Dict, List, Union
+def _collect_suggest_candidates(db: Session, q: str, search_terms: List[str]) -> Dict[int, Dict[str, Any]]:
+    """サジェスト候補をILIKE検索で収集（pg_trgmが使えない環境用）"""
     from ..models import BuildingListingName
-    
-    if len(q) < 1:
-        return []
-    
-    # 結果を格納する辞書（building_id -> 情報）
-    building_info: Dict[int, Dict[str, Union[str, List[str]]]] = {}
-    
-    # スペース区切りでAND検索対応（ひらがな→カタカナ変換）
-    from ..utils.search_normalizer import normalize_search_text
     from ..utils.building_name_normalizer import canonicalize_building_name
     
-    # 検索語を正規化（ひらがな→カタカナ変換）
-    normalized_q = normalize_search_text(q)
-    search_terms = normalized_q.split()
-    
-    # canonical形式も生成
-    canonical_q = canonicalize_building_name(q)
+    # 結果を格納する辞書（building_id -> 情報）
+    building_info: Dict[int, Dict[str, Any]] = {}
     
     # 1. 建物名で直接検索（AND条件）
     query = db.query(Building)
@@ -551,6 +560,39 @@ async def suggest_buildings(
             if bid in buildings_with_properties
         }
 
+    return building_info
+
+
+@router.get("/buildings/suggest")
+def suggest_buildings(
+    q: str = Query(..., min_length=1, description="検索クエリ"),
+    limit: int = Query(10, ge=1, le=50, description="最大候補数"),
+    db: Session = Depends(get_db)
+):
+    """建物名のサジェスト（インクリメンタルサーチ）- 掲載情報ベース"""
+    if len(q) < 1:
+        return []
+    
+    # スペース区切りでAND検索対応（ひらがな→カタカナ変換）
+    from ..utils.search_normalizer import normalize_search_text
+    from ..utils.building_name_normalizer import canonicalize_building_name
+    
+    # 検索語を正規化（ひらがな→カタカナ変換）
+    normalized_q = normalize_search_text(q)
+    search_terms = normalized_q.split()
+    
+    if is_trigram_search_available(db):
+        # 建物名・読み仮名・掲載名をトライグラムインデックスで1クエリ検索（建物単位で重複除去済み）
+        canonical_terms = [canonicalize_building_name(term) for term in search_terms]
+        building_info = {
+            row["id"]: {"name": row["name"], "matched_by": row["matched_by"], "score": row["score"]}
+            for row in search_building_suggestions(
+                db, q, search_terms, canonical_terms, limit=max(limit * 5, 50)
+            )
+        }
+    else:
+        building_info = _collect_suggest_candidates(db, q, search_terms)
+    
     # 建物名でグループ化して重複をチェック
     name_groups = {}
     for building_id, info in building_info.items():
@@ -628,8 +670,14 @@ async def suggest_buildings(
         
         return score
     
-    # スコアでソート（降順）
-    results.sort(key=lambda item: calculate_score(item), reverse=True)
+    # スコアでソート（降順）。同点の場合はトライグラム類似度の高い順
+    similarity_by_name = {
+        info["name"]: info.get("score", 0) for info in building_info.values()
+    }
+    results.sort(
+        key=lambda item: (calculate_score(item), similarity_by_name.get(item["value"], 0)),
+        reverse=True
+    )
     
     # レガシー対応: 文字列のリストも返せるようにする
     # フロントエンドが新しい形式に対応するまでの暫定措置
@@ -638,7 +686,7 @@ async def suggest_buildings(
     else:  # 明示的に大きな limit が指定された場合は旧形式
         return [r["value"] for r in results[:limit]]
 @router.get("/buildings/{building_id}", response_model=BuildingSchema)
-async def get_building(
+def get_building(
     building_id: int,
     db: Session = Depends(get_db)
 ):
@@ -650,73 +698,26 @@ async def get_building(
     return building
 
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """
-    2点間の距離をメートルで計算（ハバーサイン公式）
-    """
-    R = 6371000  # 地球の半径（メートル）
+# 周辺建物の集計を1回のクエリで読み込む建物数（空間インデックスから近い順に取り出す）
+NEARBY_FETCH_CHUNK_SIZE = 100
 
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
 
-    a = math.sin(delta_lat / 2) ** 2 + \
-        math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+class NearbyBatchRequest(BaseModel):
+    """複数建物の周辺建物取得リクエスト"""
+    building_ids: List[int] = Field(..., min_length=1, max_length=50)
+    radius_meters: int = Field(500, ge=100, le=5000, description="検索半径（メートル）")
+    limit: int = Field(10, ge=1, le=50, description="建物ごとの最大件数")
 
-    return R * c
 
-
-@router.get("/buildings/{building_id}/nearby", response_model=List[Dict[str, Any]])
-async def get_nearby_buildings(
-    building_id: int,
-    radius_meters: int = Query(500, ge=100, le=5000, description="検索半径（メートル）"),
-    limit: int = Query(10, ge=1, le=50, description="最大件数"),
-    db: Session = Depends(get_db)
-):
+def _load_nearby_building_stats(db: Session, building_ids: List[int], loaded: Dict[int, Any]) -> None:
     """
-    指定した建物の周辺建物を取得
+    販売中物件がある建物とその集計を読み込んで loaded に追加（販売中物件がない建物はNone）
 
-    - 座標がない場合はジオコーディングを試みる
-    - 販売中の物件がある建物のみ返す
+    坪単価 = 価格 / (面積 / 3.30578) = 価格 * 3.30578 / 面積
     """
-    # 対象建物を取得
-    building = db.query(Building).filter(Building.id == building_id).first()
-    if not building:
-        raise HTTPException(status_code=404, detail="建物が見つかりません")
-
-    # 座標がない場合はジオコーディングを試みる
-    if not building.latitude or not building.longitude:
-        if building.address:
-            try:
-                from ..services.geocoding_service import GeocodingService
-                geocoding_service = GeocodingService(db)
-                coords = geocoding_service.geocode_building(building)
-                if coords:
-                    building.latitude = coords['latitude']
-                    building.longitude = coords['longitude']
-                    db.commit()
-            except Exception as e:
-                # ジオコーディングエラーは無視
-                pass
-
-    # 座標がない場合は空のリストを返す
-    if not building.latitude or not building.longitude:
-        return []
-
-    # 検索範囲の概算（度単位）
-    # 緯度1度 ≈ 111km、経度1度は緯度によって変わる
-    lat_range = radius_meters / 111000
-    lon_range = radius_meters / (111000 * math.cos(math.radians(building.latitude)))
+    if not building_ids:
+        return
 
-    min_lat = building.latitude - lat_range
-    max_lat = building.latitude + lat_range
-    min_lon = building.longitude - lon_range
-    max_lon = building.longitude + lon_range
-
-    # 販売中物件がある建物をサブクエリで取得（坪単価計算用に面積も取得）
-    # 坪単価 = 価格 / (面積 / 3.30578) = 価格 * 3.30578 / 面積
     active_building_subquery = db.query(
         MasterProperty.building_id,
         func.count(distinct(MasterProperty.id)).label('property_count'),
@@ -737,59 +738,78 @@ async def get_nearby_buildings(
     ).join(
         PropertyListing, MasterProperty.id == PropertyListing.master_property_id
     ).filter(
-        PropertyListing.is_active == True
+        PropertyListing.is_active == True,
+        MasterProperty.building_id.in_(building_ids)
     ).group_by(
         MasterProperty.building_id
     ).subquery()
 
-    # 周辺の建物を検索（座標のある建物のみ）
-    nearby_query = db.query(
+    rows = db.query(
         Building,
         active_building_subquery.c.property_count,
-        active_building_subquery.c.min_price,
-        active_building_subquery.c.max_price,
-        active_building_subquery.c.avg_price,
+        active_building_subquery.c.avg_price_per_tsubo,
         active_building_subquery.c.min_area,
-        active_building_subquery.c.max_area,
-        active_building_subquery.c.avg_price_per_tsubo
+        active_building_subquery.c.max_area
     ).join(
         active_building_subquery, Building.id == active_building_subquery.c.building_id
-    ).filter(
-        Building.id != building_id,  # 自分自身を除外
-        Building.latitude.isnot(None),
-        Building.longitude.isnot(None),
-        Building.latitude >= min_lat,
-        Building.latitude <= max_lat,
-        Building.longitude >= min_lon,
-        Building.longitude <= max_lon
-    )
+    ).all()
+
+    for building_id in building_ids:
+        loaded[building_id] = None
+    for row in rows:
+        loaded[row[0].id] = row
 
-    candidates = nearby_query.all()
 
-    # 正確な距離を計算してフィルタリング
+def _find_nearby_buildings(db: Session, building: Building, radius_meters: int, limit: int,
+                           loaded: Optional[Dict[int, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    空間インデックスで近い順に建物を取り出し、販売中物件がある建物を上限数まで返す
+
+    Args:
+        loaded: 読み込み済みの建物の集計（複数建物の検索で共有し、同じ建物を何度も読み込まない）
+    """
+    if not building.latitude or not building.longitude:
+        return []
+
+    index = get_building_spatial_index()
+    index.ensure_fresh(db)
+    if loaded is None:
+        loaded = {}
+
     nearby_buildings = []
-    for b, prop_count, min_price, max_price, avg_price, min_area, max_area, avg_price_per_tsubo in candidates:
-        distance = calculate_distance(
-            building.latitude, building.longitude,
-            b.latitude, b.longitude
-        )
-        if distance <= radius_meters:
+    candidates = index.iter_nearest(
+        building.latitude, building.longitude, max_distance=radius_meters, exclude_ids=(building.id,)
+    )
+    while len(nearby_buildings) < limit:
+        chunk = [candidate_id for candidate_id, _ in islice(candidates, NEARBY_FETCH_CHUNK_SIZE)]
+        if not chunk:
+            break
+        _load_nearby_building_stats(db, [candidate_id for candidate_id in chunk if candidate_id not in loaded], loaded)
+
+        for candidate_id in chunk:
+            row = loaded.get(candidate_id)
+            if row is None:
+                continue
+            b, prop_count, avg_price_per_tsubo, min_area, max_area = row
+            if not b.latitude or not b.longitude:
+                index.add_building(b)
+                continue
+            # 他のプロセスで座標が更新されてインデックスが古い場合に備えて、DBの座標で距離を確認する
+            distance = haversine_distance(building.latitude, building.longitude, b.latitude, b.longitude)
+            if distance > radius_meters:
+                index.add_building(b)
+                continue
             nearby_buildings.append({
                 "building": b,
-                "distance_meters": round(distance),
+                "distance": distance,
                 "property_count": prop_count or 0,
-                "min_price": min_price,
-                "max_price": max_price,
-                "avg_price": int(avg_price) if avg_price else None,
                 "min_area": float(min_area) if min_area else None,
                 "max_area": float(max_area) if max_area else None,
                 "avg_price_per_tsubo": round(avg_price_per_tsubo) if avg_price_per_tsubo else None
             })
 
-    # 距離順でソート
-    nearby_buildings.sort(key=lambda x: x["distance_meters"])
-
-    # 上限数で制限
+    # 距離順でソートして上限数で制限
+    nearby_buildings.sort(key=lambda x: (x["distance"], x["building"].id))
     nearby_buildings = nearby_buildings[:limit]
 
     # レスポンス形式に変換
@@ -804,7 +824,7 @@ async def get_nearby_buildings(
             "built_year": b.built_year,
             "built_month": b.built_month,
             "station_info": b.station_info,
-            "distance_meters": item["distance_meters"],
+            "distance_meters": round(item["distance"]),
             "property_count": item["property_count"],
             "avg_price_per_tsubo": item["avg_price_per_tsubo"],
             "area_range": {
@@ -815,3 +835,66 @@ async def get_nearby_buildings(
         })
 
     return result
+
+
+@router.get("/buildings/{building_id}/nearby", response_model=List[Dict[str, Any]])
+def get_nearby_buildings(
+    building_id: int,
+    radius_meters: int = Query(500, ge=100, le=5000, description="検索半径（メートル）"),
+    limit: int = Query(10, ge=1, le=50, description="最大件数"),
+    db: Session = Depends(get_db)
+):
+    """
+    指定した建物の周辺建物を取得
+
+    - 座標がない場合はジオコーディングを試みる
+    - 販売中の物件がある建物のみ返す
+    """
+    # 対象建物を取得
+    building = db.query(Building).filter(Building.id == building_id).first()
+    if not building:
+        raise HTTPException(status_code=404, detail="建物が見つかりません")
+
+    # 座標がない場合はジオコーディングを試みる
+    if not building.latitude or not building.longitude:
+        if building.address:
+            try:
+                from ..services.geocoding_service import GeocodingService
+                geocoding_service = GeocodingService(db)
+                coords = geocoding_service.geocode_building(building)
+                if coords:
+                    building.latitude = coords['latitude']
+                    building.longitude = coords['longitude']
+                    db.commit()
+                    get_building_spatial_index().add_building(building)
+            except Exception as e:
+                # ジオコーディングエラーは無視
+                pass
+
+    return _find_nearby_buildings(db, building, radius_meters, limit)
+
+
+@router.post("/buildings/nearby", response_model=Dict[int, List[Dict[str, Any]]])
+def get_nearby_buildings_batch(
+    request: NearbyBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    複数の建物の周辺建物をまとめて取得（建物IDごとの結果）
+
+    - 周辺の建物の集計は建物間で共有して1回だけ読み込む
+    - 存在しない建物・座標がない建物は空のリスト（ジオコーディングは行わない）
+    """
+    building_ids = list(dict.fromkeys(request.building_ids))
+    buildings = {
+        b.id: b for b in db.query(Building).filter(Building.id.in_(building_ids)).all()
+    }
+
+    loaded: Dict[int, Any] = {}
+    results = {}
+    for building_id in building_ids:
+        building = buildings.get(building_id)
+        results[building_id] = _find_nearby_buildings(
+            db, building, request.radius_meters, request.limit, loaded
+        ) if building else []
+    return results
@@ -10,11 +10,14 @@ import re
 from ..database import get_db
 from ..models import Building, MasterProperty, PropertyListing, PropertyPriceChange
 from ..utils.building_filters import apply_building_name_filter, apply_land_rights_filter
+from ..utils.keyset_pagination import (
+    SortKey, InvalidCursorError, order_by_clauses, keyset_condition, encode_cursor, decode_cursor, count_rows
+)
 
 router = APIRouter(prefix="/api", tags=["grouped-properties"])
 
 @router.get("/properties-grouped-by-buildings", response_model=Dict[str, Any])
-async def get_properties_grouped_by_buildings(
+def get_properties_grouped_by_buildings(
     min_price: Optional[int] = Query(None),
     max_price: Optional[int] = Query(None),
     min_area: Optional[float] = Query(None),
@@ -28,6 +31,8 @@ async def get_properties_grouped_by_buildings(
     per_page: int = Query(20, ge=1, le=100),
     include_inactive: bool = Query(False),
     sort_by: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="前ページのレスポンスのnext_cursor（指定時はpageを無視）"),
+    count_mode: str = Query("exact", regex="^(exact|estimate|none)$", description="総件数の取得方法（exact / estimate: 推定値 / none: 取得しない）"),
     db: Session = Depends(get_db)
 ):
     """物件検索結果を建物ごとにグループ化して返す（最適化版）"""
@@ -128,67 +133,55 @@ async def get_properties_grouped_by_buildings(
     )
     
     # 並び替えの適用（第2キーとして建物IDを追加して順序を安定させる）
+    property_count_column = func.count(distinct(MasterProperty.id))
     if sort_by == 'building_age_asc':
         # 築年数が新しい順（築年が大きい順）
-        base_query = base_query.order_by(
-            Building.built_year.desc().nullslast(),
-            Building.id  # 同じ築年の場合は建物IDで順序を固定
-        )
+        sort_keys = [SortKey(Building.built_year, descending=True, nulls_last=True)]
     elif sort_by == 'building_age_desc':
         # 築年数が古い順（築年が小さい順）
-        base_query = base_query.order_by(
-            Building.built_year.asc().nullsfirst(),
-            Building.id
-        )
+        sort_keys = [SortKey(Building.built_year, descending=False, nulls_last=False)]
     elif sort_by == 'total_units_asc':
         # 総戸数が少ない順
-        base_query = base_query.order_by(
-            Building.total_units.asc().nullsfirst(),
-            Building.id
-        )
+        sort_keys = [SortKey(Building.total_units, descending=False, nulls_last=False)]
     elif sort_by == 'total_units_desc':
         # 総戸数が多い順
-        base_query = base_query.order_by(
-            Building.total_units.desc().nullslast(),
-            Building.id
-        )
+        sort_keys = [SortKey(Building.total_units, descending=True, nulls_last=True)]
     elif sort_by == 'property_count_asc':
         # 販売戸数が少ない順
-        base_query = base_query.order_by(
-            func.count(distinct(MasterProperty.id)).asc(),
-            Building.id
-        )
-    elif sort_by == 'property_count_desc':
-        # 販売戸数が多い順
-        base_query = base_query.order_by(
-            func.count(distinct(MasterProperty.id)).desc(),
-            Building.id
-        )
+        sort_keys = [SortKey(property_count_column, descending=False)]
     elif sort_by in ['avg_tsubo_price_asc', 'tsubo_price_asc']:
         # 平均坪単価が安い順
-        base_query = base_query.order_by(
-            tsubo_subq.c.avg_tsubo_price.asc().nullsfirst(),
-            Building.id
-        )
+        sort_keys = [SortKey(tsubo_subq.c.avg_tsubo_price, descending=False, nulls_last=False)]
     elif sort_by in ['avg_tsubo_price_desc', 'tsubo_price_desc']:
         # 平均坪単価が高い順
-        base_query = base_query.order_by(
-            tsubo_subq.c.avg_tsubo_price.desc().nullslast(),
-            Building.id
-        )
+        sort_keys = [SortKey(tsubo_subq.c.avg_tsubo_price, descending=True, nulls_last=True)]
     else:
         # デフォルト：販売戸数が多い順
-        base_query = base_query.order_by(
-            func.count(distinct(MasterProperty.id)).desc(),
-            Building.id
-        )
+        sort_by = 'property_count_desc'
+        sort_keys = [SortKey(property_count_column, descending=True)]
+    sort_keys.append(SortKey(Building.id))  # 同じ値の場合は建物IDで順序を固定
+    cursor_signature = f"grouped:{sort_by}:{int(include_inactive)}"
     
     # 全件数を取得
-    total_query = base_query.subquery()
-    total = db.query(func.count()).select_from(total_query).scalar()
+    total = count_rows(base_query, count_mode)
+    
+    base_query = base_query.order_by(*order_by_clauses(sort_keys)).add_columns(
+        *[key.column for key in sort_keys]
+    )
+    
+    # ページネーション（集計値で並べるため、カーソル条件はHAVINGで適用する）
+    if cursor:
+        try:
+            base_query = base_query.having(keyset_condition(sort_keys, decode_cursor(cursor, cursor_signature)))
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        rows = base_query.limit(per_page + 1).all()
+    else:
+        rows = base_query.offset((page - 1) * per_page).limit(per_page + 1).all()
     
-    # ページネーション
-    buildings = base_query.offset((page - 1) * per_page).limit(per_page).all()
+    has_more = len(rows) > per_page
+    buildings = rows[:per_page]
+    next_cursor = encode_cursor(cursor_signature, buildings[-1][-len(sort_keys):]) if has_more else None
     
     # 建物IDリストを取得
     building_ids = [b.id for b in buildings]
@@ -338,13 +331,16 @@ async def get_properties_grouped_by_buildings(
     return {
         "buildings": result_buildings,
         "total": total,
+        "total_is_estimate": count_mode == "estimate",
         "page": page,
         "per_page": per_page,
-        "total_pages": (total + per_page - 1) // per_page if total > 0 else 0
+        "total_pages": (total + per_page - 1) // per_page if total else (0 if total == 0 else None),
+        "next_cursor": next_cursor,
+        "has_more": has_more
     }
 
 @router.get("/buildings/by-name/{building_name}/properties", response_model=Dict[str, Any])
-async def get_building_properties_by_name(
+def get_building_properties_by_name(
     building_name: str,
     include_inactive: bool = Query(False, description="販売終了物件も含む"),
     db: Session = Depends(get_db)
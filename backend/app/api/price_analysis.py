@@ -3,7 +3,7 @@
 """
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from collections import defaultdict
 
 
@@ -117,7 +117,6 @@ def create_unified_price_timeline(price_records: List[Dict[str, Any]]) -> Dict[s
                     listing_price_history[listing_id]['history'].append((current_date, current_price))
     
     # 全日付の範囲を取得（価格履歴の日付 + 掲載開始日 + 掲載終了日 + 掲載終了日の翌日）
-    from datetime import timedelta
     all_dates = set()
     for listing_data in listing_price_history.values():
         # 価格履歴の日付を追加
@@ -135,81 +134,8 @@ def create_unified_price_timeline(price_records: List[Dict[str, Any]]) -> Dict[s
     if not all_dates:
         return {"timeline": [], "price_changes": []}
     
-    sorted_dates = sorted(all_dates)
-    min_date = sorted_dates[0]
-    max_date = sorted_dates[-1]
-    
-    # 日付ごとに各掲載の価格を集約（価格を持ち越し）
-    # 重要：掲載終了日以降は、その掲載の価格を含めない
-    daily_prices = {}
-    
-    for date_key in sorted_dates:
-        daily_prices[date_key] = {}
-        
-        # 各掲載の価格を確認
-        for listing_id, listing_data in listing_price_history.items():
-            source = listing_data['source']
-            start_date = listing_data['start_date']
-            end_date = listing_data['end_date']
-            
-            # 掲載開始日以降、終了日以前のみ価格を記録
-            is_within_active_period = (
-                start_date and date_key >= start_date and
-                (end_date is None or date_key <= end_date)
-            )
-            
-            if is_within_active_period:
-                # その日以前の最新価格を取得
-                price_for_date = None
-                for hist_date, hist_price in listing_data['history']:
-                    if hist_date <= date_key:
-                        price_for_date = hist_price
-                    else:
-                        break
-                
-                # 価格履歴がある日以降は価格を持ち越す
-                if price_for_date is not None:
-                    # 掲載ごとにユニークなキーを作成
-                    key = f"{source}_{listing_id}"
-                    daily_prices[date_key][key] = price_for_date
-    
-    # タイムラインを作成
-    timeline = []
-    sorted_dates = sorted(daily_prices.keys())
-    
-    for date_key in sorted_dates:
-        sources = daily_prices[date_key]
-        
-        # その日の価格を集計
-        all_prices = list(sources.values())
-        unique_prices = set(all_prices)
-        
-        # 価格データがない日はスキップ
-        if not all_prices:
-            continue
-        
-        # ソース別に価格を集約（表示用）
-        source_prices = {}
-        for key, price in sources.items():
-            source_name = key.split('_')[0]  # listing_idを除去
-            if source_name not in source_prices:
-                source_prices[source_name] = price
-            # 同じソースで複数の価格がある場合は最小値を採用
-            elif price < source_prices[source_name]:
-                source_prices[source_name] = price
-        
-        # 代表価格を決定（最頻値、同数の場合は最小値）
-        price_counts = {p: all_prices.count(p) for p in unique_prices}
-        max_count = max(price_counts.values())
-        most_common_prices = [p for p, c in price_counts.items() if c == max_count]
-        representative_price = min(most_common_prices)
-        
-        timeline.append({
-            "date": str(date_key),
-            "price": representative_price,
-            "sources": source_prices,  # ソース別に集約した価格
-            "has_discrepancy": len(unique_prices) > 1
-        })
+    # 日付順に1回走査してタイムラインを作成（掲載ごとの価格と多数決を差分で更新）
+    timeline = _sweep_price_timeline(listing_price_history, sorted(all_dates))
     
     # 価格変更を検出
     price_changes = []
@@ -283,6 +209,113 @@ def create_unified_price_timeline(price_records: List[Dict[str, Any]]) -> Dict[s
     }
 
 
+def _sweep_price_timeline(listing_price_history: Dict[Any, Dict[str, Any]],
+                          sorted_dates: List[date]) -> List[Dict[str, Any]]:
+    """
+    掲載ごとの価格変更・掲載期間の開始と終了をイベントとして日付順に1回走査し、
+    各日の代表価格（最頻値、同数の場合は最小値）とソース別価格を求める
+
+    - 掲載は開始日以降、終了日以前のみ価格を含める（開始日がない掲載は含めない）
+    - 価格はその日以前の最新の履歴を持ち越す。履歴は先頭から日付がその日以前の間だけ
+      読み進める（日付順でない履歴では、それまでの最大の日付に達した日に価格が変わる）
+    - 多数決は価格ごとの掲載数と、掲載数ごとの価格の集合を差分で更新する
+    """
+    keys = []
+    periods = []
+    window_events = defaultdict(list)   # 日付 → 掲載期間の判定が変わりうる掲載
+    price_events = defaultdict(list)    # 日付 → (掲載, 価格)（履歴の順）
+    for order, (listing_id, listing_data) in enumerate(listing_price_history.items()):
+        keys.append(f"{listing_data['source']}_{listing_id}")
+        start_date = listing_data['start_date']
+        end_date = listing_data['end_date']
+        periods.append((start_date, end_date))
+        if start_date:
+            window_events[start_date].append(order)
+            if end_date is not None:
+                window_events[end_date + timedelta(days=1)].append(order)
+
+        reached_date = None
+        for hist_date, hist_price in listing_data['history']:
+            if reached_date is None or hist_date > reached_date:
+                reached_date = hist_date
+            price_events[reached_date].append((order, hist_price))
+
+    in_window = [False] * len(keys)
+    prices: List[Optional[int]] = [None] * len(keys)
+    active = set()                       # その日の価格に含める掲載
+    price_counts: Dict[int, int] = {}    # 価格 → 掲載数
+    count_prices = defaultdict(set)      # 掲載数 → 価格の集合
+    max_count = 0
+
+    def add(order):
+        nonlocal max_count
+        price = prices[order]
+        count = price_counts.get(price, 0)
+        if count:
+            count_prices[count].discard(price)
+        price_counts[price] = count + 1
+        count_prices[count + 1].add(price)
+        max_count = max(max_count, count + 1)
+        active.add(order)
+
+    def remove(order):
+        nonlocal max_count
+        price = prices[order]
+        count = price_counts[price]
+        count_prices[count].discard(price)
+        if count == max_count and not count_prices[count]:
+            max_count -= 1
+        if count == 1:
+            del price_counts[price]
+        else:
+            price_counts[price] = count - 1
+            count_prices[count - 1].add(price)
+        active.discard(order)
+
+    timeline = []
+    for date_key in sorted_dates:
+        date_price_events = price_events.get(date_key, ())
+        date_window_events = window_events.get(date_key, ())
+        changed = set(date_window_events)
+        changed.update(order for order, _ in date_price_events)
+
+        for order in changed:
+            if order in active:
+                remove(order)
+        for order, price in date_price_events:
+            prices[order] = price
+        for order in date_window_events:
+            start_date, end_date = periods[order]
+            in_window[order] = date_key >= start_date and (end_date is None or date_key <= end_date)
+        for order in changed:
+            if in_window[order] and prices[order] is not None:
+                add(order)
+
+        # 価格データがない日はスキップ
+        if not active:
+            continue
+
+        # ソース別に価格を集約（表示用）
+        source_prices = {}
+        for order in sorted(active):
+            source_name = keys[order].split('_')[0]  # listing_idを除去
+            price = prices[order]
+            if source_name not in source_prices:
+                source_prices[source_name] = price
+            # 同じソースで複数の価格がある場合は最小値を採用
+            elif price < source_prices[source_name]:
+                source_prices[source_name] = price
+
+        timeline.append({
+            "date": str(date_key),
+            "price": min(count_prices[max_count]),
+            "sources": source_prices,  # ソース別に集約した価格
+            "has_discrepancy": len(price_counts) > 1
+        })
+
+    return timeline
+
+
 def analyze_source_price_consistency(price_records: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     ソース間の価格一貫性を分析
@@ -2,21 +2,25 @@
 from fastapi import APIRouter, Query, HTTPException, Depends
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from collections import defaultdict
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_, and_, distinct, String, select, case
+from sqlalchemy import func, or_, and_, select
 
 from ..database import get_db
-from ..models import Building, MasterProperty, PropertyListing, ListingPriceHistory, PropertyPriceChange
+from ..models import Building, MasterProperty, ListingPriceHistory, PropertySearchSummary
 from ..schemas.property import PropertyDetailSchema, MasterPropertySchema, ListingSchema, PriceHistorySchema
 from ..schemas.building import BuildingSchema
 from ..utils.price_queries import create_majority_price_subquery, create_price_stats_subquery, apply_price_filter, get_sold_property_final_price
 from ..utils.building_filters import apply_building_name_filter, apply_building_filters, apply_property_filters, apply_land_rights_filter
+from ..utils.keyset_pagination import (
+    SortKey, InvalidCursorError, order_by_clauses, keyset_condition, encode_cursor, decode_cursor, count_rows
+)
 from .price_analysis import create_unified_price_timeline, analyze_source_price_consistency
 
 router = APIRouter(prefix="/api", tags=["properties"])
 
 @router.get("/properties", response_model=Dict[str, Any])
-async def get_properties(
+def get_properties(
     min_price: Optional[int] = Query(None),
     max_price: Optional[int] = Query(None),
     min_area: Optional[float] = Query(None),
@@ -31,116 +35,76 @@ async def get_properties(
     per_page: int = Query(30, ge=1, le=100),
     sort_by: str = Query("updated_at", description="ソート項目"),
     sort_order: str = Query("desc", description="ソート順序"),
+    cursor: Optional[str] = Query(None, description="前ページのレスポンスのnext_cursor（指定時はpageを無視）"),
+    count_mode: str = Query("exact", regex="^(exact|estimate|none)$", description="総件数の取得方法（exact / estimate: 推定値 / none: 取得しない）"),
     db: Session = Depends(get_db)
 ):
-    """物件一覧を取得（重複排除済み）"""
-    
-    # 掲載情報サブクエリを作成
-    # listing_countは常にアクティブな掲載のみカウント
-    # latest_price_updateとhas_price_changeは常に全掲載を対象
-
-    # 物件レベルの価格改定情報を property_price_changes テーブルから取得
-    # 多数決価格が変更された場合のみ記録されている
-    # 同じ日に複数の変更がある場合は、最新のcreated_atを取得
-    price_change_subquery = db.query(
-        PropertyPriceChange.master_property_id,
-        func.max(PropertyPriceChange.change_date).label('latest_price_change_date'),
-        func.max(PropertyPriceChange.created_at).label('latest_price_change_time'),
-        func.bool_or(True).label('has_price_change')
-    ).group_by(PropertyPriceChange.master_property_id).subquery()
-    
-    # 売出し確認日を全掲載から計算するサブクエリ
-    published_date_subquery = db.query(
-        PropertyListing.master_property_id,
-        func.min(func.coalesce(
-            PropertyListing.first_published_at,
-            PropertyListing.published_at,
-            PropertyListing.first_seen_at
-        )).label('earliest_published_at')
-    ).group_by(PropertyListing.master_property_id).subquery()
-
-    price_subquery = db.query(
-        PropertyListing.master_property_id,
-        func.count(distinct(case((PropertyListing.is_active == True, PropertyListing.id)))).label('listing_count'),
-        func.string_agg(distinct(func.cast(PropertyListing.source_site, String)), ',').label('source_sites'),
-        func.bool_or(PropertyListing.is_active).label('has_active_listing'),
-        func.max(PropertyListing.last_confirmed_at).label('last_confirmed_at'),
-        func.max(PropertyListing.delisted_at).label('delisted_at'),
-        func.max(PropertyListing.listing_station_info).label('station_info')
-    )
+    """
+    物件一覧を取得（重複排除済み）
 
-    if not include_inactive:
-        price_subquery = price_subquery.filter(PropertyListing.is_active == True)
+    掲載情報・価格改定履歴の集計と表示価格は property_search_summary に事前計算されている
+    （utils/property_search_summary.py）。ソート順ごとの複合インデックスを使って読む。
+    cursor を指定するとOFFSETを使わないキーセットページネーションになる。
+    """
+    summary = PropertySearchSummary
 
-    price_subquery = price_subquery.group_by(
-        PropertyListing.master_property_id
-    ).subquery()
+    # 販売終了物件を含む場合は掲載終了分も含めた集計値を返す
+    if include_inactive:
+        source_sites_column = summary.all_source_sites
+        last_confirmed_column = summary.all_last_confirmed_at
+        delisted_column = summary.all_delisted_at
+        station_info_column = summary.all_station_info
+    else:
+        source_sites_column = summary.active_source_sites
+        last_confirmed_column = summary.active_last_confirmed_at
+        delisted_column = summary.active_delisted_at
+        station_info_column = summary.active_station_info
 
-    # price_change_subquery と published_date_subquery を結合
-    combined_subquery = db.query(
-        price_subquery.c.master_property_id,
-        price_subquery.c.listing_count,
-        price_subquery.c.source_sites,
-        price_subquery.c.has_active_listing,
-        price_subquery.c.last_confirmed_at,
-        price_subquery.c.delisted_at,
-        price_subquery.c.station_info,
-        published_date_subquery.c.earliest_published_at,
-        price_change_subquery.c.latest_price_change_date.label('latest_price_update'),
-        price_change_subquery.c.latest_price_change_time.label('latest_price_update_time'),
-        func.coalesce(price_change_subquery.c.has_price_change, False).label('has_price_change')
-    ).outerjoin(
-        published_date_subquery,
-        price_subquery.c.master_property_id == published_date_subquery.c.master_property_id
-    ).outerjoin(
-        price_change_subquery,
-        price_subquery.c.master_property_id == price_change_subquery.c.master_property_id
-    ).subquery()
-    
     # メインクエリ
     query = db.query(
         MasterProperty,
         Building,
-        combined_subquery.c.listing_count,
-        combined_subquery.c.source_sites,
-        combined_subquery.c.has_active_listing,
-        combined_subquery.c.last_confirmed_at,
-        combined_subquery.c.delisted_at,
-        combined_subquery.c.station_info,
-        combined_subquery.c.earliest_published_at,
-        combined_subquery.c.latest_price_update,
-        combined_subquery.c.latest_price_update_time,
-        combined_subquery.c.has_price_change
+        summary.listing_count,
+        source_sites_column,
+        summary.has_active_listing,
+        last_confirmed_column,
+        delisted_column,
+        station_info_column,
+        summary.earliest_published_at,
+        summary.latest_price_update,
+        summary.latest_price_update_time,
+        summary.has_price_change,
+        summary.display_price
+    ).select_from(summary).join(
+        MasterProperty, MasterProperty.id == summary.master_property_id
     ).join(
         Building, MasterProperty.building_id == Building.id
-    ).outerjoin(
-        combined_subquery, MasterProperty.id == combined_subquery.c.master_property_id
     )
     
-    # アクティブフィルタ（has_active_listingベースに変更）
+    # アクティブフィルタ（has_active_listingベース）
     if not include_inactive:
         # アクティブな掲載がある物件のみ表示（sold_atは無視）
-        query = query.filter(combined_subquery.c.has_active_listing == True)
-        query = query.filter(combined_subquery.c.master_property_id.isnot(None))
+        query = query.filter(summary.has_active_listing == True)
     else:
         query = query.filter(
             or_(
-                combined_subquery.c.master_property_id.isnot(None),
-                MasterProperty.sold_at.isnot(None)
+                summary.has_listing == True,
+                summary.is_sold == True
             )
         )
 
-    # 価格フィルタ（has_active_listingベースに変更）
+    # 価格フィルタ（販売中は現在価格、販売終了は最終価格）
     if min_price:
         query = query.filter(
             or_(
                 and_(
-                    combined_subquery.c.has_active_listing == True,
-                    MasterProperty.current_price >= min_price
+                    summary.has_active_listing == True,
+                    summary.current_price >= min_price
                 ),
                 and_(
-                    combined_subquery.c.has_active_listing == False,
-                    MasterProperty.final_price >= min_price
+                    summary.has_listing == True,
+                    summary.has_active_listing == False,
+                    summary.final_price >= min_price
                 )
             )
         )
@@ -148,12 +112,13 @@ async def get_properties(
         query = query.filter(
             or_(
                 and_(
-                    combined_subquery.c.has_active_listing == True,
-                    MasterProperty.current_price <= max_price
+                    summary.has_active_listing == True,
+                    summary.current_price <= max_price
                 ),
                 and_(
-                    combined_subquery.c.has_active_listing == False,
-                    MasterProperty.final_price <= max_price
+                    summary.has_listing == True,
+                    summary.has_active_listing == False,
+                    summary.final_price <= max_price
                 )
             )
         )
@@ -170,117 +135,79 @@ async def get_properties(
     # 権利形態フィルタ
     query = apply_land_rights_filter(query, land_rights_types)
 
-    # 総件数を取得
-    total = query.count()
-
-    # 販売終了物件数を正確にカウント
-    sold_count = 0
-    if include_inactive:
-        # 販売中のみの件数を取得
-        active_only_query = query.filter(
-            combined_subquery.c.has_active_listing == True
-        )
-        active_count = active_only_query.count()
-        # 販売終了 = 全体 - 販売中
-        sold_count = total - active_count
-    
-    # ソート
+    # 総件数と販売終了物件数
+    if count_mode == "exact":
+        # 1回の集計で取得
+        total, active_count = query.with_entities(
+            func.count(summary.master_property_id),
+            func.count(summary.master_property_id).filter(summary.has_active_listing == True)
+        ).order_by(None).one()
+        sold_count = total - active_count if include_inactive else 0
+    else:
+        total = count_rows(query, count_mode)
+        sold_count = 0
+        if include_inactive and total is not None:
+            active_count = count_rows(query.filter(summary.has_active_listing == True), count_mode)
+            sold_count = max(total - active_count, 0)
+        elif include_inactive:
+            sold_count = None
+    
+    # ソート（同順位は物件IDで並べ、ページ間で順序が揺れないようにする）
+    # 物件IDは集計テーブルの主キー（= MasterProperty.id）を使い、ソート用インデックスに載せる
+    descending = sort_order == "desc"
     if sort_by == "price":
-        query = query.order_by(
-            MasterProperty.current_price.desc() if sort_order == "desc" 
-            else MasterProperty.current_price.asc()
-        )
+        sort_keys = [SortKey(summary.current_price, descending)]
     elif sort_by == "area":
-        query = query.order_by(
-            MasterProperty.area.desc() if sort_order == "desc" 
-            else MasterProperty.area.asc()
-        )
+        sort_keys = [SortKey(summary.area, descending)]
     elif sort_by == "building_age":
-        query = query.order_by(
-            Building.built_year.asc() if sort_order == "desc" 
-            else Building.built_year.desc()
-        )
+        # 築年数の降順 = 築年の昇順
+        sort_keys = [SortKey(summary.built_year, not descending)]
     elif sort_by == "earliest_published_at":
-        query = query.order_by(
-            combined_subquery.c.earliest_published_at.desc() if sort_order == "desc"
-            else combined_subquery.c.earliest_published_at.asc()
-        )
+        sort_keys = [SortKey(summary.earliest_published_at, descending)]
     elif sort_by == "tsubo_price":
         # 坪単価で並び替え（価格 / (面積 / 3.30578)）
         # 面積が0の物件は最後に表示
-        tsubo_price_expr = case(
-            (MasterProperty.area > 0, 
-             func.coalesce(MasterProperty.current_price, MasterProperty.final_price) / (MasterProperty.area / 3.30578)),
-            else_=None
-        )
-        if sort_order == "desc":
-            query = query.order_by(tsubo_price_expr.desc().nullslast())
-        else:
-            query = query.order_by(tsubo_price_expr.asc().nullsfirst())
+        sort_keys = [SortKey(summary.tsubo_price, descending, nulls_last=descending)]
     else:  # デフォルト: updated_at (価格改定日または売出確認日)
-        # 価格改定日が存在する場合はそれを優先、なければ売出確認日を使用
+        # 価格改定日が存在する場合はそれを優先、なければ売出確認日を使用（sort_updated_at）
         # 第二ソートキー: 価格改定時刻（同じ日の価格変更を時刻順に並べる）
         # 第三ソートキー: 物件ID（降順、より新しい物件を上に）
-        sort_column = func.coalesce(
-            combined_subquery.c.latest_price_update,
-            combined_subquery.c.earliest_published_at
-        )
-        if sort_order == "desc":
-            query = query.order_by(
-                sort_column.desc().nullslast(),
-                combined_subquery.c.latest_price_update_time.desc().nullslast(),
-                MasterProperty.id.desc()
-            )
-        else:
-            query = query.order_by(
-                sort_column.asc().nullsfirst(),
-                combined_subquery.c.latest_price_update_time.asc().nullsfirst(),
-                MasterProperty.id.asc()
-            )
+        sort_by = "updated_at"
+        sort_keys = [
+            SortKey(summary.sort_updated_at, descending, nulls_last=descending),
+            SortKey(summary.latest_price_update_time, descending, nulls_last=descending),
+        ]
+    sort_keys.append(SortKey(summary.master_property_id, sort_keys[0].descending))
+    cursor_signature = f"properties:{sort_by}:{sort_order}:{int(include_inactive)}"
+
+    query = query.order_by(*order_by_clauses(sort_keys))
+    # カーソル生成用にソートキーの値も取得する
+    query = query.add_columns(*[key.column for key in sort_keys])
+    
+    # ページネーション（次ページの有無を判定するため1件多く取得）
+    if cursor:
+        try:
+            cursor_values = decode_cursor(cursor, cursor_signature)
+            query = query.filter(keyset_condition(sort_keys, cursor_values))
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        rows = query.limit(per_page + 1).all()
+    else:
+        offset = (page - 1) * per_page
+        rows = query.limit(per_page + 1).offset(offset).all()
     
-    # ページネーション
-    offset = (page - 1) * per_page
-    results = query.limit(per_page).offset(offset).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor(cursor_signature, rows[-1][-len(sort_keys):])
+    results = [row[:-len(sort_keys)] for row in rows]
     
     # レスポンスの構築
     properties = []
     for (mp, building, listing_count, source_sites, has_active_listing, 
          last_confirmed_at, delisted_at, station_info, earliest_published_at, 
-         latest_price_update, latest_price_update_time, has_price_change) in results:
-        
-        # 価格を決定：アクティブな掲載がない場合のみfinal_priceを使用
-        if not has_active_listing and mp.sold_at and mp.final_price:
-            display_price = mp.final_price
-        else:
-            # アクティブな掲載がある場合は、current_priceを使用
-            # current_priceがNULLの場合は、アクティブな掲載から多数決価格を計算
-            if mp.current_price:
-                display_price = mp.current_price
-            else:
-                # current_priceがNULLの場合、アクティブな掲載から価格を計算
-                active_listings = db.query(PropertyListing).filter(
-                    PropertyListing.master_property_id == mp.id,
-                    PropertyListing.is_active == True
-                ).all()
-                
-                if active_listings:
-                    # 多数決で価格を決定
-                    price_votes = {}
-                    for listing in active_listings:
-                        if listing.current_price:
-                            price = listing.current_price
-                            if price not in price_votes:
-                                price_votes[price] = 0
-                            price_votes[price] += 1
-                    
-                    if price_votes:
-                        # 最も多い価格を採用（同数の場合は最小値）
-                        sorted_prices = sorted(price_votes.items(), key=lambda x: (-x[1], x[0]))
-                        display_price = sorted_prices[0][0]
-                    else:
-                        display_price = None
-                else:
-                    display_price = None
+         latest_price_update, latest_price_update_time, has_price_change, display_price) in results:
         
         properties.append({
             "id": mp.id,
@@ -319,14 +246,17 @@ async def get_properties(
     return {
         "properties": properties,
         "total": total,
+        "total_is_estimate": count_mode == "estimate",
         "sold_count": sold_count,
         "page": page,
         "per_page": per_page,
-        "total_pages": (total + per_page - 1) // per_page
+        "total_pages": (total + per_page - 1) // per_page if total is not None else None,
+        "next_cursor": next_cursor,
+        "has_more": has_more
     }
 
 @router.get("/recent-updates-count", response_model=Dict[str, Any])
-async def get_recent_updates_count(
+def get_recent_updates_count(
     hours: int = Query(24, ge=1, le=168, description="過去N時間以内の更新"),
     db: Session = Depends(get_db)
 ):
@@ -443,7 +373,7 @@ async def get_recent_updates_count(
     }
 
 @router.get("/properties/{property_id}", response_model=PropertyDetailSchema)
-async def get_property_details(
+def get_property_details(
     property_id: int,
     db: Session = Depends(get_db)
 ):
@@ -474,7 +404,7 @@ async def get_property_details(
     
     # 販売終了物件の場合は非アクティブも含める
     include_inactive = master_property.sold_at is not None
-    info = updater.collect_property_info_from_listings(master_property, include_inactive)
+    info = updater.collect_property_votes(master_property, include_inactive, bool(active_listings))
     
     # 価格を決定
     # master_property.current_priceを使用（多数決で計算済み）
@@ -494,6 +424,13 @@ async def get_property_details(
     # 統合価格履歴を作成（物件単位）
     all_price_records = []
     
+    # 全掲載の価格履歴を1回のクエリで取得（掲載ごとに履歴IDの順）
+    histories_by_listing = defaultdict(list)
+    for history in db.query(ListingPriceHistory).filter(
+        ListingPriceHistory.property_listing_id.in_([listing.id for listing in all_listings])
+    ).order_by(ListingPriceHistory.id):
+        histories_by_listing[history.property_listing_id].append(history)
+    
     # 各掲載の情報を収集
     listing_info = {}
     for listing in all_listings:
@@ -504,12 +441,8 @@ async def get_property_details(
             'start_date': listing.first_seen_at or listing.created_at
         }
         
-        histories = db.query(ListingPriceHistory).filter(
-            ListingPriceHistory.property_listing_id == listing.id
-        ).all()
-        
         # 価格履歴を追加
-        for history in histories:
+        for history in histories_by_listing[listing.id]:
             all_price_records.append({
                 'recorded_at': history.recorded_at,
                 'price': history.price,
@@ -591,11 +524,7 @@ async def get_property_details(
     # 各掲載の価格履歴を取得（フロントエンド互換性のため）
     price_histories_by_listing = {}
     for listing in active_listings:
-        histories = db.query(ListingPriceHistory).filter(
-            ListingPriceHistory.property_listing_id == listing.id
-        ).order_by(
-            ListingPriceHistory.recorded_at.desc()
-        ).all()
+        histories = sorted(histories_by_listing[listing.id], key=lambda h: h.recorded_at, reverse=True)
         
         price_histories_by_listing[listing.id] = [
             PriceHistorySchema.from_orm(h) for h in histories
@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 
 from ..database import get_db
-from ..utils.cache import get_cache
+from ..utils.cache import get_cache, RECENT_UPDATES_TAG
 from ..models import (
     PropertyPriceChange,
     MasterProperty,
@@ -22,7 +22,7 @@ router = APIRouter(prefix="/api", tags=["properties"])
 
 
 @router.get("/properties/recent-updates", response_model=Dict[str, Any])
-async def get_recent_updates_cached(
+def get_recent_updates_cached(
     hours: int = Query(24, ge=1, le=168, description="過去N時間以内の更新"),
     db: Session = Depends(get_db)
 ):
@@ -30,17 +30,19 @@ async def get_recent_updates_cached(
     キャッシュテーブルから価格改定情報を取得（高速版・サーバーサイドキャッシュ対応）
     """
     
-    # サーバーサイドキャッシュをチェック
+    # サーバーサイドキャッシュから取得（30分間有効、同じキーの同時リクエストでは1回だけ集計する）
     cache = get_cache()
-    cache_key = f"recent_updates_{hours}h"
-    cached_data = cache.get(cache_key)
-    
-    if cached_data:
-        # キャッシュヒット
-        cached_data['cache_info']['cache_hit'] = True
-        return cached_data
-    
-    # キャッシュミス - データベースから取得
+    data, cache_hit = cache.get_or_set(
+        f"recent_updates_{hours}h",
+        lambda: _load_recent_updates(db, hours),
+        ttl_seconds=1800,
+        tags=[RECENT_UPDATES_TAG]
+    )
+    return {**data, 'cache_info': {**data['cache_info'], 'cache_hit': cache_hit}}
+
+
+def _load_recent_updates(db: Session, hours: int) -> Dict[str, Any]:
+    """価格改定・新規掲載物件をデータベースから集計（キャッシュミス時）"""
     # 対象期間の開始日（日付ベースで計算）
     from ..utils.datetime_utils import get_utc_now
     # 日本時間での計算
@@ -257,14 +259,11 @@ async def get_recent_updates_cached(
         }
     }
     
-    # サーバーサイドキャッシュに保存（30分間有効）
-    cache.set(cache_key, response_data, ttl_seconds=1800)
-    
     return response_data
 
 
 @router.get("/properties/recent-updates/counts", response_model=Dict[str, Any])
-async def get_recent_updates_counts(
+def get_recent_updates_counts(
     hours: int = Query(24, ge=1, le=168, description="過去N時間以内の更新"),
     db: Session = Depends(get_db)
 ):
@@ -272,16 +271,19 @@ async def get_recent_updates_counts(
     価格改定・新規掲載の件数のみを取得（トップページ用・軽量版）
     """
     
-    # サーバーサイドキャッシュをチェック
+    # サーバーサイドキャッシュから取得（30分間有効）
     cache = get_cache()
-    cache_key = f"recent_updates_counts_{hours}h"
-    cached_data = cache.get(cache_key)
-    
-    if cached_data:
-        cached_data['cache_hit'] = True
-        return cached_data
-    
-    # キャッシュミス - データベースから件数を集計（日付ベースで計算）
+    data, cache_hit = cache.get_or_set(
+        f"recent_updates_counts_{hours}h",
+        lambda: _load_recent_updates_counts(db, hours),
+        ttl_seconds=1800,
+        tags=[RECENT_UPDATES_TAG]
+    )
+    return {**data, 'cache_hit': cache_hit}
+
+
+def _load_recent_updates_counts(db: Session, hours: int) -> Dict[str, Any]:
+    """価格改定・新規掲載の件数をデータベースから集計（日付ベースで計算）"""
     from ..utils.datetime_utils import get_utc_now
     jst_now = get_utc_now()
     # hours=24は「本日」、hours=48は「過去2日間」として日付ベースで計算
@@ -413,7 +415,4 @@ async def get_recent_updates_counts(
         'cache_hit': False
     }
     
-    # サーバーサイドキャッシュに保存（30分間有効）
-    cache.set(cache_key, response_data, ttl_seconds=1800)
-    
     return response_data
@@ -1,73 +1,91 @@
 """sitemap.xmlとrobots.txtを生成するAPIエンドポイント"""
-from fastapi import APIRouter, Depends, Response
+import math
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime
-from typing import List
-import xml.etree.ElementTree as ET
 
-from ..database import get_db
-from ..models import MasterProperty, Building
+from ..database import SessionLocal, get_db
+from ..models import SitemapShard
+from ..utils.sitemap_builder import (
+    BASE_URL, MAX_URLS_PER_SHARD, count_sitemap_urls, iter_shard_xml, iter_sitemap_index_xml
+)
 
 router = APIRouter(tags=["seo"])
 
-BASE_URL = "https://mscan.jp"
+# スクレイピング完了後に生成したファイルを返す（falseで毎回その場で生成）
+SITEMAP_USE_PRECOMPUTED = os.getenv('SITEMAP_USE_PRECOMPUTED', 'true').lower() == 'true'
+
+XML_MEDIA_TYPE = "application/xml"
+
+
+def _use_precomputed(db: Session) -> bool:
+    return SITEMAP_USE_PRECOMPUTED and db.query(SitemapShard.shard_number).first() is not None
+
+
+def _stream_live_shard(shard_number: int):
+    """
+    ファイルをその場で生成してストリーミングする
+
+    レスポンスの送信中もDBから読み込むため、リクエストのセッションとは別のセッションを使う
+    """
+    db = SessionLocal()
+    try:
+        yield from iter_shard_xml(db, shard_number)
+    finally:
+        db.close()
+
 
+@router.get("/sitemap_index.xml")
 @router.get("/sitemap.xml")
-async def get_sitemap(db: Session = Depends(get_db)):
+def get_sitemap_index(db: Session = Depends(get_db)):
+    """
+    サイトマップインデックス（分割したサイトマップの一覧）を返す
+
+    サイトマップは全建物・全物件（販売中の掲載があるもの）と静的ページのURLを含み、
+    MAX_URLS_PER_SHARD 件ごとに /sitemap-{番号}.xml に分割する
     """
-    sitemap.xmlを動的に生成
-    全物件、全建物、静的ページのURLを含める
+    if _use_precomputed(db):
+        shards = [
+            {'shard_number': shard_number, 'lastmod': lastmod}
+            for shard_number, lastmod in db.query(
+                SitemapShard.shard_number, SitemapShard.lastmod
+            ).order_by(SitemapShard.shard_number)
+        ]
+    else:
+        shard_count = max(1, math.ceil(count_sitemap_urls(db) / MAX_URLS_PER_SHARD))
+        shards = [{'shard_number': shard_number} for shard_number in range(1, shard_count + 1)]
+
+    return Response(content="".join(iter_sitemap_index_xml(shards)), media_type=XML_MEDIA_TYPE)
+
+
+@router.get("/sitemap-{shard_number}.xml")
+def get_sitemap_shard(shard_number: int, db: Session = Depends(get_db)):
     """
-    # XML namespaceの定義
-    urlset = ET.Element("urlset")
-    urlset.set("xmlns", "http://www.sitemaps.org/schemas/sitemap/0.9")
-
-    # 静的ページを追加
-    static_pages = [
-        {"loc": f"{BASE_URL}/", "priority": "1.0", "changefreq": "daily"},
-        {"loc": f"{BASE_URL}/transaction-prices", "priority": "0.8", "changefreq": "weekly"},
-    ]
-
-    for page in static_pages:
-        url_elem = ET.SubElement(urlset, "url")
-        loc = ET.SubElement(url_elem, "loc")
-        loc.text = page["loc"]
-        priority = ET.SubElement(url_elem, "priority")
-        priority.text = page["priority"]
-        changefreq = ET.SubElement(url_elem, "changefreq")
-        changefreq.text = page["changefreq"]
-
-    # 全建物のIDを取得（販売中物件がある建物のみ）
-    active_building_ids = db.query(
-        Building.id
-    ).join(
-        Building.properties
-    ).join(
-        MasterProperty.listings
-    ).filter(
-        MasterProperty.listings.any(is_active=True)
-    ).distinct().limit(10000).all()  # 最大10,000件
-
-    for (building_id,) in active_building_ids:
-        url_elem = ET.SubElement(urlset, "url")
-        loc = ET.SubElement(url_elem, "loc")
-        loc.text = f"{BASE_URL}/buildings/{building_id}/properties"
-        priority = ET.SubElement(url_elem, "priority")
-        priority.text = "0.6"
-        changefreq = ET.SubElement(url_elem, "changefreq")
-        changefreq.text = "weekly"
-
-    # XMLを文字列に変換
-    xml_str = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    xml_str += ET.tostring(urlset, encoding="unicode", method="xml")
-
-    return Response(content=xml_str, media_type="application/xml")
+    分割したサイトマップを返す
+
+    生成済みのファイルがあればそのまま返し、なければその場で生成してストリーミングする
+    """
+    if shard_number < 1:
+        raise HTTPException(status_code=404, detail="サイトマップが見つかりません")
+
+    if _use_precomputed(db):
+        content = db.query(SitemapShard.content).filter(
+            SitemapShard.shard_number == shard_number
+        ).scalar()
+        if content is None:
+            raise HTTPException(status_code=404, detail="サイトマップが見つかりません")
+        return Response(content=content, media_type=XML_MEDIA_TYPE)
+
+    if shard_number > max(1, math.ceil(count_sitemap_urls(db) / MAX_URLS_PER_SHARD)):
+        raise HTTPException(status_code=404, detail="サイトマップが見つかりません")
+    return StreamingResponse(_stream_live_shard(shard_number), media_type=XML_MEDIA_TYPE)
 
 
 @router.get("/robots.txt")
 
-async def get_robots():
+def get_robots():
     """
     robots.txtを生成
     GoogleとBingのみを許可し、他の検索エンジンbotは拒否
@@ -97,7 +115,7 @@ User-agent: *
 Disallow: /
 
 # Sitemap
-Sitemap: {BASE_URL}/sitemap.xml
+Sitemap: {BASE_URL}/sitemap_index.xml
 """
 
     return Response(content=robots_content, media_type="text/plain")
@@ -7,81 +7,54 @@ from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 
 import os
-import re
+from typing import Callable, List, Optional, Tuple
 
 from ..database import get_db
 from ..models import Building, MasterProperty
+from ..utils.cache import get_cache
+from ..utils.ssr_shell import (
+    SSR_PROPERTIES_LIST_TAG, ShellTemplate, get_frontend_shell, ssr_building_tag, ssr_property_tag
+)
 
 router = APIRouter()
 
-# フロントエンドのビルド済みindex.htmlのパス
-# 本番環境：/app/frontend_dist/index.html（nginx経由でアクセス）
-# 開発環境：シンプルなテンプレートを使用（Vite devサーバーが別途動作）
-FRONTEND_DIST_PATH = os.getenv("FRONTEND_DIST_PATH", "/app/frontend_dist/index.html")
-
-# デフォルトのHTMLテンプレート（開発環境用）
-DEFAULT_HTML_TEMPLATE = """<!doctype html>
-<html lang="ja">
-  <head>
-    <meta charset="UTF-8" />
-    <link rel="icon" type="image/svg+xml" href="/vite.svg" />
-    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-
-    <!-- Google tag (gtag.js) -->
-    <script async src="https://www.googletagmanager.com/gtag/js?id=G-C985LS1W3F"></script>
-    <script>
-      window.dataLayer = window.dataLayer || [];
-      function gtag(){{dataLayer.push(arguments);}}
-      gtag('js', new Date());
-
-      gtag('config', 'G-C985LS1W3F');
-    </script>
-  </head>
-  <body>
-    <div id="root"></div>
-    <script type="module" src="/src/main.tsx"></script>
-  </body>
-</html>
-"""
+# 生成したページのキャッシュ期間（秒）。建物・物件の変更時はタグで個別に削除する
+SSR_PAGE_CACHE_TTL_SECONDS = int(os.getenv('SSR_PAGE_CACHE_TTL_SECONDS', '600'))
+# 物件一覧ページのキャッシュ期間（秒）
+SSR_LIST_CACHE_TTL_SECONDS = int(os.getenv('SSR_LIST_CACHE_TTL_SECONDS', '300'))
+
+# 物件一覧ページの検索条件（canonical URLとキャッシュのキーにはこれだけを使う。トラッキング等の他のパラメータは無視する）
+LIST_QUERY_PARAMS = [
+    'area', 'min_price', 'max_price', 'min_area', 'max_area', 'layouts', 'building_name',
+    'max_building_age', 'wards', 'include_inactive', 'page', 'per_page', 'sort_by', 'sort_order'
+]
+
 
-# ビルド済みindex.htmlを読み込む（本番環境用）
-def load_frontend_html() -> str:
+def render_cached_page(
+    cache_key: str,
+    ttl_seconds: int,
+    render: Callable[[ShellTemplate], Tuple[str, Optional[List[str]]]]
+) -> str:
     """
-    フロントエンドのビルド済みindex.htmlを読み込む
-    
-    本番環境：frontendコンテナからHTTPで取得
-    開発環境：ローカルファイルまたはデフォルトテンプレート
+    ページキャッシュから取得し、なければ生成して保存する
+
+    キーにはシェルの版を含めるため、フロントエンドのデプロイ後は新しいシェルで生成し直す。
+
+    Args:
+        cache_key: ページのキー
+        ttl_seconds: キャッシュ期間（秒）
+        render: シェルから (HTML, キャッシュのタグ) を生成する関数。
+            タグが None の場合は保存しない（初期データの取得に失敗したページをキャッシュしないため）
     """
-    import requests
-    
-    # 本番環境：frontendコンテナからHTMLを取得
-    frontend_urls = [
-        "http://frontend:3000/",  # 本番環境（docker-compose内部）
-        "http://localhost:3001/"   # 開発環境
-    ]
-    
-    for url in frontend_urls:
-        try:
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                print(f"Success: フロントエンドのHTMLを取得しました: {url}")
-                return response.text
-        except Exception as e:
-            print(f"Warning: {url}からHTMLを取得できませんでした: {e}")
-            continue
-    
-    # ローカルファイルシステムから試行
-    try:
-        if os.path.exists(FRONTEND_DIST_PATH):
-            with open(FRONTEND_DIST_PATH, 'r', encoding='utf-8') as f:
-                print(f"Success: ローカルファイルからHTMLを読み込みました: {FRONTEND_DIST_PATH}")
-                return f.read()
-    except Exception as e:
-        print(f"Warning: ローカルファイルから読み込めませんでした: {e}")
-    
-    # すべて失敗した場合はデフォルトテンプレート
-    print("Warning: フロントエンドのHTMLを取得できませんでした。デフォルトテンプレートを使用します。")
-    return DEFAULT_HTML_TEMPLATE
+    template = get_frontend_shell().get_template()
+    key = f"ssr:page:{template.version}:{cache_key}"
+    cache = get_cache()
+    html = cache.get(key)
+    if html is None:
+        html, tags = render(template)
+        if tags is not None:
+            cache.set(key, html, ttl_seconds, tags)
+    return html
 
 
 def is_crawler(request: Request) -> bool:
@@ -213,13 +186,11 @@ def generate_properties_list_meta_tags(request: Request) -> dict:
     Returns:
         メタタグの辞書
     """
-    # クエリパラメータを取得
-    query_params = dict(request.query_params)
-
-    # トラッキングパラメータを除外
-    tracking_params = ['utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'fbclid', 'gclid']
-    for param in tracking_params:
-        query_params.pop(param, None)
+    # 検索条件のクエリパラメータを取得（トラッキング等の他のパラメータは除外）
+    query_params = {
+        key: value for key, value in request.query_params.items()
+        if key in LIST_QUERY_PARAMS
+    }
 
     # canonical URLを生成
     if query_params:
@@ -269,48 +240,12 @@ def inject_meta_tags_into_html(html: str, meta_data: dict) -> str:
     Returns:
         メタタグが注入されたHTML
     """
-    # メタタグを生成（titleタグは別途置換するので除外）
-    # data-rh="true" を追加してreact-helmetが既存タグとして認識し、重複を防ぐ
-    meta_tags = f"""<meta name="description" content="{meta_data['description']}" data-rh="true" />
-    <link rel="canonical" href="{meta_data['canonical']}" data-rh="true" />
-    <meta property="og:title" content="{meta_data['title']}" data-rh="true" />
-    <meta property="og:description" content="{meta_data['description']}" data-rh="true" />
-    <meta property="og:url" content="{meta_data['canonical']}" data-rh="true" />
-    <meta property="og:type" content="website" data-rh="true" />
-    <meta name="twitter:card" content="summary_large_image" data-rh="true" />
-    <meta name="twitter:title" content="{meta_data['title']}" data-rh="true" />
-    <meta name="twitter:description" content="{meta_data['description']}" data-rh="true" />"""
-
-    # 既存のHTMLに対してメタタグを注入
-    # 1. 既存のmeta description、canonical、OGタグ、Twitterタグを削除
-    html = re.sub(r'<meta\s+name="description"[^>]*>', '', html)
-    html = re.sub(r'<link\s+rel="canonical"[^>]*>', '', html)
-    html = re.sub(r'<meta\s+property="og:[^"]*"[^>]*>', '', html)
-    html = re.sub(r'<meta\s+name="twitter:[^"]*"[^>]*>', '', html)
-
-    # 2. <title>タグを置換し、その後にメタタグを追加
-    # data-rh="true"を追加してreact-helmetが重複作成しないようにする
-    title_tag = f'<title data-rh="true">{meta_data["title"]}</title>'
-    if re.search(r'<title[^>]*>.*?</title>', html, flags=re.DOTALL):
-        html = re.sub(
-            r'<title[^>]*>.*?</title>',
-            title_tag + '\n    ' + meta_tags,
-            html,
-            flags=re.DOTALL
-        )
-    else:
-        # <title>がない場合は<head>の直後に追加
-        html = re.sub(
-            r'(<head[^>]*>)',
-            r'\1\n    ' + title_tag + '\n    ' + meta_tags,
-            html
-        )
-    
-    return html
+    # SSRのルートは解析済みのシェル（get_frontend_shell()）を使う。任意のHTMLはその場で解析する
+    return ShellTemplate(html).render(meta_data)
 
 
 @router.api_route("/buildings/{building_id}/properties", methods=["GET", "HEAD"], response_class=HTMLResponse)
-async def render_building_page(
+def render_building_page(
     building_id: int,
     request: Request,
     include_inactive: bool = Query(False, description="販売終了物件も含む"),
@@ -321,54 +256,58 @@ async def render_building_page(
     
     クローラーの場合のみ初期データを埋め込み、
     通常のユーザーには高速なフローを提供する（Dynamic Rendering）
+    生成したページは建物ごとにキャッシュする
     """
-    # フロントエンドのHTMLを読み込む
-    frontend_html = load_frontend_html()
-    
-    # メタタグを生成
-    meta_data = generate_building_meta_tags(building_id, db)
-    
-    # クローラーの場合のみ初期データを取得
-    initial_state_script = ""
-    if is_crawler(request):
-        # 初期データを取得（buildingsエンドポイントの実装を再利用）
-        from .buildings import get_building_properties
-        try:
-            # APIエンドポイントと同じデータを取得
-            initial_data = await get_building_properties(building_id, include_inactive, db)
-            
-            # JavaScriptで安全に扱えるようにJSON文字列化
-            import json
-            initial_state_json = json.dumps(initial_data, ensure_ascii=False, default=str)
-            
-            # 初期データをHTMLに埋め込む
-            initial_state_script = f'''
+    crawler = is_crawler(request)
+    if not crawler:
+        print(f"INFO: 通常ユーザー - 初期データスキップ（高速モード）")
+
+    def render(template: ShellTemplate) -> Tuple[str, Optional[List[str]]]:
+        # メタタグを生成
+        meta_data = generate_building_meta_tags(building_id, db)
+
+        # クローラーの場合のみ初期データを取得
+        initial_state_script = ""
+        tags = [ssr_building_tag(building_id)]
+        if crawler:
+            # 初期データを取得（buildingsエンドポイントの実装を再利用）
+            from .buildings import get_building_properties
+            try:
+                # APIエンドポイントと同じデータを取得
+                initial_data = get_building_properties(building_id, include_inactive, db)
+
+                # JavaScriptで安全に扱えるようにJSON文字列化
+                import json
+                initial_state_json = json.dumps(initial_data, ensure_ascii=False, default=str)
+
+                # 初期データをHTMLに埋め込む
+                initial_state_script = f'''
     <script>
       window.__INITIAL_STATE__ = {initial_state_json};
       window.__SSR_BUILDING_ID__ = {building_id};
       window.__SSR_INCLUDE_INACTIVE__ = {str(include_inactive).lower()};
     </script>'''
-        except Exception as e:
-            # データ取得失敗時はスクリプトを埋め込まない（通常のAPI呼び出しにフォールバック）
-            print(f"Warning: 初期データ取得失敗: {e}")
-            import traceback
-            traceback.print_exc()
-    else:
-        print(f"INFO: 通常ユーザー - 初期データスキップ（高速モード）")
-    
-    # メタタグを注入
-    html = inject_meta_tags_into_html(frontend_html, meta_data)
-    
-    # 初期データスクリプトを</head>の直前に挿入（クローラーの場合のみ）
-    if initial_state_script:
-        html = html.replace('</head>', f'{initial_state_script}\n  </head>')
-    
+            except Exception as e:
+                # データ取得失敗時はスクリプトを埋め込まない（通常のAPI呼び出しにフォールバック）
+                print(f"Warning: 初期データ取得失敗: {e}")
+                import traceback
+                traceback.print_exc()
+                tags = None  # 初期データのないページはキャッシュしない
+
+        # メタタグと初期データスクリプト（</head>の直前、クローラーの場合のみ）を差し込む
+        return template.render(meta_data, initial_state_script), tags
+
+    html = render_cached_page(
+        f"building:{building_id}:{int(include_inactive)}:{int(crawler)}",
+        SSR_PAGE_CACHE_TTL_SECONDS,
+        render
+    )
     return HTMLResponse(content=html)
 
 
 @router.api_route("/properties/{property_id}", methods=["GET", "HEAD"], response_class=HTMLResponse)
 
-async def render_property_page(
+def render_property_page(
     property_id: int,
     request: Request,
     db: Session = Depends(get_db)
@@ -378,55 +317,69 @@ async def render_property_page(
     
     クローラーの場合のみ初期データを埋め込み、
     通常のユーザーには高速なフローを提供する（Dynamic Rendering）
+    生成したページは物件ごとにキャッシュする（建物のタグも付ける）
     """
-    # フロントエンドのHTMLを読み込む
-    frontend_html = load_frontend_html()
-    
-    # メタタグを生成
-    meta_data = generate_property_meta_tags(property_id, db)
-    
-    # クローラーの場合のみ初期データを取得
-    initial_state_script = ""
-    if is_crawler(request):
-        # 初期データを取得（propertiesエンドポイントの実装を再利用）
-        from .properties import get_property_details
-        try:
-            # APIエンドポイントと同じデータを取得
-            initial_data = await get_property_details(property_id, db)
-            
-            # JavaScriptで安全に扱えるようにJSON文字列化
-            import json
-            # Pydantic modelの場合はdict()を使用
-            data_dict = initial_data.dict() if hasattr(initial_data, 'dict') else initial_data
-            initial_state_json = json.dumps(data_dict, ensure_ascii=False, default=str)
-            
-            # 初期データをHTMLに埋め込む
-            initial_state_script = f'''
+    crawler = is_crawler(request)
+    if not crawler:
+        print(f"INFO: 通常ユーザー - 初期データスキップ（高速モード）")
+
+    def render(template: ShellTemplate) -> Tuple[str, Optional[List[str]]]:
+        # メタタグを生成
+        meta_data = generate_property_meta_tags(property_id, db)
+
+        # クローラーの場合のみ初期データを取得
+        initial_state_script = ""
+        failed = False
+        if crawler:
+            # 初期データを取得（propertiesエンドポイントの実装を再利用）
+            from .properties import get_property_details
+            try:
+                # APIエンドポイントと同じデータを取得
+                initial_data = get_property_details(property_id, db)
+
+                # JavaScriptで安全に扱えるようにJSON文字列化
+                import json
+                # Pydantic modelの場合はdict()を使用
+                data_dict = initial_data.dict() if hasattr(initial_data, 'dict') else initial_data
+                initial_state_json = json.dumps(data_dict, ensure_ascii=False, default=str)
+
+                # 初期データをHTMLに埋め込む
+                initial_state_script = f'''
     <script>
       window.__INITIAL_STATE__ = {initial_state_json};
       window.__SSR_PROPERTY_ID__ = {property_id};
     </script>'''
-        except Exception as e:
-            # データ取得失敗時はスクリプトを埋め込まない（通常のAPI呼び出しにフォールバック）
-            print(f"Warning: 初期データ取得失敗: {e}")
-            import traceback
-            traceback.print_exc()
-    else:
-        print(f"INFO: 通常ユーザー - 初期データスキップ（高速モード）")
-    
-    # メタタグを注入
-    html = inject_meta_tags_into_html(frontend_html, meta_data)
-    
-    # 初期データスクリプトを</head>の直前に挿入（クローラーの場合のみ）
-    if initial_state_script:
-        html = html.replace('</head>', f'{initial_state_script}\n  </head>')
-    
+            except Exception as e:
+                # データ取得失敗時はスクリプトを埋め込まない（通常のAPI呼び出しにフォールバック）
+                print(f"Warning: 初期データ取得失敗: {e}")
+                import traceback
+                traceback.print_exc()
+                failed = True
+
+        # 初期データのないページはキャッシュしない
+        if failed:
+            return template.render(meta_data, initial_state_script), None
+
+        # 建物の変更（建物名の変更や統合）でも削除されるよう建物のタグも付ける
+        tags = [ssr_property_tag(property_id)]
+        building_id = db.query(MasterProperty.building_id).filter(MasterProperty.id == property_id).scalar()
+        if building_id is not None:
+            tags.append(ssr_building_tag(building_id))
+
+        # メタタグと初期データスクリプト（</head>の直前、クローラーの場合のみ）を差し込む
+        return template.render(meta_data, initial_state_script), tags
+
+    html = render_cached_page(
+        f"property:{property_id}:{int(crawler)}",
+        SSR_PAGE_CACHE_TTL_SECONDS,
+        render
+    )
     return HTMLResponse(content=html)
 
 
 @router.api_route("/properties", methods=["GET", "HEAD"], response_class=HTMLResponse)
 
-async def render_properties_list_page(
+def render_properties_list_page(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -435,65 +388,93 @@ async def render_properties_list_page(
     
     クローラーの場合のみ初期データを埋め込み、
     通常のユーザーには高速なフローを提供する（Dynamic Rendering）
+    生成したページは検索条件（LIST_QUERY_PARAMS）ごとにキャッシュする
     """
-    # フロントエンドのHTMLを読み込む
-    frontend_html = load_frontend_html()
-    
-    # メタタグを生成
-    meta_data = generate_properties_list_meta_tags(request)
-    
-    # クローラーの場合のみ初期データを取得
-    initial_state_script = ""
-    if is_crawler(request):
-        # 初期データを取得（propertiesエンドポイントの実装を再利用）
-        from .properties import get_properties
-        try:
-            # クエリパラメータを取得
-            min_price = request.query_params.get('min_price')
-            max_price = request.query_params.get('max_price')
-            min_area = request.query_params.get('min_area')
-            max_area = request.query_params.get('max_area')
-            layouts = request.query_params.getlist('layouts') if 'layouts' in request.query_params else None
-            building_name = request.query_params.get('building_name')
-            max_building_age = request.query_params.get('max_building_age')
-            wards = request.query_params.getlist('wards') if 'wards' in request.query_params else None
-            include_inactive = request.query_params.get('include_inactive', 'false').lower() == 'true'
-            page = int(request.query_params.get('page', 1))
-            per_page = int(request.query_params.get('per_page', 30))
-            sort_by = request.query_params.get('sort_by', 'updated_at')
-            sort_order = request.query_params.get('sort_order', 'desc')
-            
-            # int/floatに変換
-            min_price = int(min_price) if min_price else None
-            max_price = int(max_price) if max_price else None
-            min_area = float(min_area) if min_area else None
-            max_area = float(max_area) if max_area else None
-            max_building_age = int(max_building_age) if max_building_age else None
-            
-            # APIエンドポイントと同じデータを取得
-            initial_data = await get_properties(
-                min_price=min_price,
-                max_price=max_price,
-                min_area=min_area,
-                max_area=max_area,
-                layouts=layouts,
-                building_name=building_name,
-                max_building_age=max_building_age,
-                wards=wards,
-                include_inactive=include_inactive,
-                page=page,
-                per_page=per_page,
-                sort_by=sort_by,
-                sort_order=sort_order,
-                db=db
-            )
-            
-            # JavaScriptで安全に扱えるようにJSON文字列化
-            import json
-            initial_state_json = json.dumps(initial_data, ensure_ascii=False, default=str)
-            
-            # 初期データとクエリパラメータをHTMLに埋め込む
-            initial_state_script = f'''
+    crawler = is_crawler(request)
+    if not crawler:
+        print(f"INFO: 通常ユーザー - 初期データスキップ（高速モード）")
+
+    def render(template: ShellTemplate) -> Tuple[str, Optional[List[str]]]:
+        # メタタグを生成
+        meta_data = generate_properties_list_meta_tags(request)
+
+        # クローラーの場合のみ初期データを取得
+        initial_state_script = ""
+        tags = [SSR_PROPERTIES_LIST_TAG]
+        if crawler:
+            initial_state_script = _properties_list_initial_state_script(request, db)
+            if not initial_state_script:
+                tags = None  # 初期データのないページはキャッシュしない
+
+        # メタタグと初期データスクリプト（</head>の直前、クローラーの場合のみ）を差し込む
+        return template.render(meta_data, initial_state_script), tags
+
+    query_key = "&".join(
+        f"{key}={value}" for key, value in sorted(request.query_params.multi_items())
+        if key in LIST_QUERY_PARAMS
+    )
+    html = render_cached_page(
+        f"properties:{int(crawler)}:{query_key}",
+        SSR_LIST_CACHE_TTL_SECONDS,
+        render
+    )
+    return HTMLResponse(content=html)
+
+
+def _properties_list_initial_state_script(request: Request, db: Session) -> str:
+    """物件一覧ページの初期データスクリプトを生成（取得に失敗した場合は空文字）"""
+    # 初期データを取得（propertiesエンドポイントの実装を再利用）
+    from .properties import get_properties
+    try:
+        # クエリパラメータを取得
+        min_price = request.query_params.get('min_price')
+        max_price = request.query_params.get('max_price')
+        min_area = request.query_params.get('min_area')
+        max_area = request.query_params.get('max_area')
+        layouts = request.query_params.getlist('layouts') if 'layouts' in request.query_params else None
+        building_name = request.query_params.get('building_name')
+        max_building_age = request.query_params.get('max_building_age')
+        wards = request.query_params.getlist('wards') if 'wards' in request.query_params else None
+        include_inactive = request.query_params.get('include_inactive', 'false').lower() == 'true'
+        page = int(request.query_params.get('page', 1))
+        per_page = int(request.query_params.get('per_page', 30))
+        sort_by = request.query_params.get('sort_by', 'updated_at')
+        sort_order = request.query_params.get('sort_order', 'desc')
+        
+        # int/floatに変換
+        min_price = int(min_price) if min_price else None
+        max_price = int(max_price) if max_price else None
+        min_area = float(min_area) if min_area else None
+        max_area = float(max_area) if max_area else None
+        max_building_age = int(max_building_age) if max_building_age else None
+        
+        # APIエンドポイントと同じデータを取得
+        initial_data = get_properties(
+            min_price=min_price,
+            max_price=max_price,
+            min_area=min_area,
+            max_area=max_area,
+            layouts=layouts,
+            building_name=building_name,
+            max_building_age=max_building_age,
+            wards=wards,
+            land_rights_types=None,
+            include_inactive=include_inactive,
+            page=page,
+            per_page=per_page,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=None,
+            count_mode="exact",
+            db=db
+        )
+        
+        # JavaScriptで安全に扱えるようにJSON文字列化
+        import json
+        initial_state_json = json.dumps(initial_data, ensure_ascii=False, default=str)
+        
+        # 初期データとクエリパラメータをHTMLに埋め込む
+        return f'''
     <script>
       window.__INITIAL_STATE__ = {initial_state_json};
       window.__SSR_QUERY_PARAMS__ = {{
@@ -512,34 +493,21 @@ async def render_properties_list_page(
         sort_order: {json.dumps(sort_order)}
       }};
     </script>'''
-        except Exception as e:
-            # データ取得失敗時はスクリプトを埋め込まない（通常のAPI呼び出しにフォールバック）
-            print(f"Warning: 初期データ取得失敗: {e}")
-            import traceback
-            traceback.print_exc()
-    else:
-        print(f"INFO: 通常ユーザー - 初期データスキップ（高速モード）")
-    
-    # メタタグを注入
-    html = inject_meta_tags_into_html(frontend_html, meta_data)
-    
-    # 初期データスクリプトを</head>の直前に挿入（クローラーの場合のみ）
-    if initial_state_script:
-        html = html.replace('</head>', f'{initial_state_script}\n  </head>')
-    
-    return HTMLResponse(content=html)
+    except Exception as e:
+        # データ取得失敗時はスクリプトを埋め込まない（通常のAPI呼び出しにフォールバック）
+        print(f"Warning: 初期データ取得失敗: {e}")
+        import traceback
+        traceback.print_exc()
+        return ""
 
 
 @router.api_route("/", methods=["GET", "HEAD"], response_class=HTMLResponse)
-async def render_home_page(
+def render_home_page(
     request: Request
 ):
     """
     トップページのSSRを提供
     """
-    # フロントエンドのHTMLを読み込む
-    frontend_html = load_frontend_html()
-    
     # メタタグを生成
     meta_data = {
         "title": "都心マンション価格チェッカー - 複数サイト横断検索",
@@ -547,7 +515,7 @@ async def render_home_page(
         "canonical": "https://mscan.jp/"
     }
     
-    # メタタグを注入
-    html = inject_meta_tags_into_html(frontend_html, meta_data)
+    # 解析済みのシェルにメタタグを差し込む
+    html = get_frontend_shell().get_template().render(meta_data)
     
     return HTMLResponse(content=html)
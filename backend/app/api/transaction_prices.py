@@ -160,14 +160,14 @@ class PriceTrendData(BaseModel):
 
 
 @router.get("/areas")
-async def get_areas(db: Session = Depends(get_db)) -> List[str]:
+def get_areas(db: Session = Depends(get_db)) -> List[str]:
     """全エリアを取得"""
     areas = db.query(TransactionPrice.area_name).distinct().order_by(TransactionPrice.area_name).all()
     return [area[0] for area in areas if area[0]]
 
 
 @router.get("/areas-by-district")
-async def get_areas_by_district(db: Session = Depends(get_db)) -> Dict[str, List[str]]:
+def get_areas_by_district(db: Session = Depends(get_db)) -> Dict[str, List[str]]:
     """区ごとにグループ化されたエリア一覧を取得"""
 
     # データベースから全エリアを取得
@@ -187,7 +187,7 @@ async def get_areas_by_district(db: Session = Depends(get_db)) -> Dict[str, List
 
 
 @router.get("/transactions")
-async def get_transactions(
+def get_transactions(
     area: Optional[str] = Query(None, description="エリア名"),
     district: Optional[str] = Query(None, description="区名"),
     year: Optional[int] = Query(None, description="取引年"),
@@ -326,7 +326,7 @@ async def get_transactions(
 
 
 @router.get("/statistics/by-area")
-async def get_area_statistics(
+def get_area_statistics(
     start_year: Optional[int] = Query(None, description="開始年"),
     start_quarter: Optional[int] = Query(None, description="開始四半期"),
     end_year: Optional[int] = Query(None, description="終了年"),
@@ -378,7 +378,7 @@ async def get_area_statistics(
 
 
 @router.get("/trends")
-async def get_price_trends(
+def get_price_trends(
     area: Optional[str] = Query(None, description="エリア名"),
     district: Optional[str] = Query(None, description="区名"),
     start_year: Optional[int] = Query(None, description="開始年"),
@@ -441,7 +441,7 @@ async def get_price_trends(
 
 
 @router.get("/trends-by-size")
-async def get_trends_by_size(
+def get_trends_by_size(
     district: Optional[str] = Query(None, description="区名"),
     start_year: Optional[int] = Query(None, description="開始年"),
     start_quarter: Optional[int] = Query(None, description="開始四半期"),
@@ -519,7 +519,7 @@ async def get_trends_by_size(
 
 
 @router.get("/trends-by-age")
-async def get_trends_by_age(
+def get_trends_by_age(
     district: Optional[str] = Query(None, description="区名"),
     start_year: Optional[int] = Query(None, description="開始年"),
     start_quarter: Optional[int] = Query(None, description="開始四半期"),
@@ -624,7 +624,7 @@ async def get_trends_by_age(
 
 
 @router.get("/heatmap-data")
-async def get_heatmap_data(
+def get_heatmap_data(
     db: Session = Depends(get_db)
 ) -> Dict:
     """ヒートマップ用のデータを取得（エリア×年の平均価格）"""
@@ -10,6 +10,9 @@ from fastapi.middleware.cors import CORSMiddleware
 import time
 import os
 
+import anyio
+import anyio.to_thread
+
 from .database import init_db
 from .utils.logger import api_logger, error_logger
 from .scheduler import start_scheduler, stop_scheduler
@@ -147,6 +150,12 @@ async def startup_event():
         init_db()
         print("DEBUG: データベース初期化完了")
         api_logger.info("データベース初期化完了")
+
+        # 同期エンドポイント（def）を実行するスレッドプールの上限
+        # DBの接続プール（pool_size + max_overflow）を超えないようにする
+        threadpool_size = int(os.getenv("API_THREADPOOL_SIZE", "40"))
+        anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool_size
+        api_logger.info(f"スレッドプールの上限: {threadpool_size}")
         
         print("DEBUG: スケジューラー開始処理開始")
         # スケジューラーを安全に開始
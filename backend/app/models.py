@@ -2,7 +2,7 @@
 SQLAlchemyのモデル定義（v2スキーマ）
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, Date, JSON, UniqueConstraint, Index, func
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, Date, JSON, UniqueConstraint, Index, Computed, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -90,6 +90,7 @@ class MasterProperty(Base):
     current_price = Column(Integer)                           # 現在価格（多数決で決定、販売中物件用）
     sold_at = Column(DateTime)                                # 販売終了日（全掲載が終了した時点）
     final_price = Column(Integer)                             # 最終販売価格（販売終了前の最頻値）
+    final_price_updated_at = Column(DateTime)                 # 最終販売価格の更新日時
     earliest_listing_date = Column(DateTime)                  # 最初の掲載日（アクティブな掲載の中で最古）
     latest_price_change_at = Column(DateTime)                 # 最新の価格改定日時
     
@@ -106,6 +107,7 @@ class MasterProperty(Base):
         Index('idx_master_properties_building_id', 'building_id'),
         Index('idx_master_properties_floor_number', 'floor_number'),
         Index('idx_master_properties_layout', 'layout'),
+        Index('idx_master_properties_updated_at', 'updated_at'),
     )
 
 
@@ -192,6 +194,7 @@ class PropertyListing(Base):
         Index('idx_property_listings_is_active', 'is_active'),
         Index('idx_property_listings_url_source', 'url', 'source_site'),
         Index('idx_property_listings_site_property_source', 'site_property_id', 'source_site'),
+        Index('idx_property_listings_updated_at', 'updated_at'),
     )
 
 
@@ -750,6 +753,180 @@ class PropertyPriceChangeQueue(Base):
     )
 
 
+class PropertySearchSummary(Base):
+    """物件検索用の集計テーブル（物件一覧APIの掲載集計・価格改定集計・ソートキーを事前計算）"""
+    __tablename__ = "property_search_summary"
+
+    master_property_id = Column(Integer, ForeignKey("master_properties.id", ondelete="CASCADE"), primary_key=True)
+    building_id = Column(Integer, ForeignKey("buildings.id", ondelete="CASCADE"), nullable=False)
+
+    # 掲載の集計（active_* は掲載中のみ、all_* は掲載終了を含む全掲載）
+    listing_count = Column(Integer, nullable=False, default=0)   # 掲載中の掲載数
+    has_active_listing = Column(Boolean, nullable=False, default=False)
+    has_listing = Column(Boolean, nullable=False, default=False)  # 掲載が1件以上あるか
+    active_source_sites = Column(Text)                           # カンマ区切りの掲載サイト
+    all_source_sites = Column(Text)
+    active_last_confirmed_at = Column(DateTime)
+    all_last_confirmed_at = Column(DateTime)
+    active_delisted_at = Column(DateTime)
+    all_delisted_at = Column(DateTime)
+    active_station_info = Column(Text)
+    all_station_info = Column(Text)
+    earliest_published_at = Column(DateTime)                     # 売出確認日（全掲載の最小値）
+
+    # 価格改定の集計（property_price_changes から）
+    latest_price_update = Column(Date)
+    latest_price_update_time = Column(DateTime)
+    has_price_change = Column(Boolean, nullable=False, default=False)
+
+    # ソート・フィルタ用に非正規化した値
+    current_price = Column(Integer)
+    final_price = Column(Integer)
+    display_price = Column(Integer)                              # 一覧の表示価格（current_priceがない場合は掲載価格の多数決）
+    area = Column(Float)
+    built_year = Column(Integer)
+    tsubo_price = Column(Float)                                  # 坪単価（面積がない場合はNULL）
+    sort_updated_at = Column(DateTime)                           # coalesce(価格改定日, 売出確認日)
+    is_sold = Column(Boolean, nullable=False, default=False)
+
+    refreshed_at = Column(DateTime, server_default=func.now())
+
+    # 一覧の各ソート順に対応する複合インデックス（has_active_listing で販売中のみの一覧にも使える）
+    # NULLS LAST 指定のインデックスはPostgreSQLでのみ作成する
+    __table_args__ = (
+        Index('idx_pss_active_updated', 'has_active_listing', sort_updated_at.desc().nullslast(),
+              latest_price_update_time.desc().nullslast(),
+              master_property_id.desc()).ddl_if(dialect='postgresql'),
+        Index('idx_pss_active_price', 'has_active_listing', 'current_price', 'master_property_id'),
+        Index('idx_pss_active_area', 'has_active_listing', 'area', 'master_property_id'),
+        Index('idx_pss_active_built_year', 'has_active_listing', 'built_year', 'master_property_id'),
+        Index('idx_pss_active_published', 'has_active_listing', 'earliest_published_at', 'master_property_id'),
+        Index('idx_pss_active_tsubo_price', 'has_active_listing', tsubo_price.desc().nullslast(),
+              master_property_id.desc()).ddl_if(dialect='postgresql'),
+        Index('idx_pss_building', 'building_id'),
+    )
+
+
+class PropertyVoteTally(Base):
+    """物件の多数決用の票集計（掲載の属性値ごとの掲載数を掲載サイト別に保持）"""
+    __tablename__ = "property_vote_tallies"
+
+    master_property_id = Column(Integer, ForeignKey("master_properties.id", ondelete="CASCADE"), primary_key=True)
+    field = Column(String(30), primary_key=True)                 # 属性（floor_numbers, areas など）
+    source_site = Column(String(50), primary_key=True)
+    value = Column(Text, primary_key=True)                       # 属性値（文字列に変換した値）
+    listing_count = Column(Integer, nullable=False, default=0)   # 全掲載の票数
+    active_count = Column(Integer, nullable=False, default=0)    # 掲載中の掲載の票数
+
+
+class BuildingVoteTally(Base):
+    """建物の多数決用の票集計（建物の全物件の掲載の属性値ごとの掲載数を掲載サイト別に保持）"""
+    __tablename__ = "building_vote_tallies"
+
+    building_id = Column(Integer, ForeignKey("buildings.id", ondelete="CASCADE"), primary_key=True)
+    field = Column(String(30), primary_key=True)                 # 属性（addresses, total_floors など）
+    source_site = Column(String(50), primary_key=True)
+    value = Column(Text, primary_key=True)
+    listing_count = Column(Integer, nullable=False, default=0)
+    active_count = Column(Integer, nullable=False, default=0)
+
+
+class BuildingDuplicateCandidate(Base):
+    """建物の重複候補ペア（管理画面の建物重複候補用に類似度を事前計算）"""
+    __tablename__ = "building_duplicate_candidates"
+
+    # building1_id < building2_id で1ペア1行
+    building1_id = Column(Integer, ForeignKey("buildings.id", ondelete="CASCADE"), primary_key=True)
+    building2_id = Column(Integer, ForeignKey("buildings.id", ondelete="CASCADE"), primary_key=True)
+    similarity = Column(Float, nullable=False)                   # 総合類似度
+    address_score = Column(Float)                                # 住所の類似度
+    name_score = Column(Float)                                   # 建物名の統合スコア
+    attribute_score = Column(Float)                              # 属性（築年月・総階数・構造）の一致度
+    computed_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_bdc_similarity', similarity.desc()),
+        Index('idx_bdc_building2', 'building2_id'),
+    )
+
+
+# 間取りの基本部分（例: 2LDK+S → 2LDK, 3SLDK → 3LDK, 1DK → 1DK, 3LD → 3LDK。1S+S等はそのまま）
+# PostgreSQLの生成列で使うため、正規表現の一致判定も regexp_replace で書く
+BASE_LAYOUT_SQL = (
+    "CASE WHEN regexp_replace(layout, '^[0-9]+S\\+S$', '') = '' THEN layout "
+    "ELSE regexp_replace(regexp_replace(regexp_replace(regexp_replace("
+    "layout, '\\+[A-Z]+', '', 'g'), "
+    "'([0-9]+)S(LDK|DK|K)', '\\1\\2', 'g'), "
+    "'([0-9]+)LD$', '\\1LDK', 'g'), "
+    "'([0-9]+)K$', '\\1DK', 'g') END"
+)
+
+
+class PropertyDuplicateCandidate(Base):
+    """物件の重複候補（同じ建物・階・面積（1㎡単位）・基本間取りの販売中物件が2件以上あるグループの物件）"""
+    __tablename__ = "property_duplicate_candidates"
+
+    master_property_id = Column(Integer, ForeignKey("master_properties.id", ondelete="CASCADE"), primary_key=True)
+    building_id = Column(Integer, ForeignKey("buildings.id", ondelete="CASCADE"), nullable=False)
+    floor_number = Column(Integer)
+    area = Column(Float)
+    layout = Column(String(20))
+    # グループ化のキー（DBの生成列）
+    rounded_area = Column(Integer, Computed("CAST(FLOOR(area) AS INTEGER)", persisted=True))
+    base_layout = Column(String(20), Computed(BASE_LAYOUT_SQL, persisted=True))
+    group_id = Column(Integer)                                   # グループ内の最小の物件ID
+    group_size = Column(Integer, nullable=False, default=0)      # グループの物件数
+    refreshed_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_pdc_group_size', group_size.desc(), 'group_id'),
+        Index('idx_pdc_group_id', 'group_id'),
+        Index('idx_pdc_building_id', 'building_id'),
+    )
+
+
+class PropertyDuplicateCandidateRun(Base):
+    """物件重複候補の更新履歴（最後に完了した更新の開始時刻が次回の差分更新の起点）"""
+    __tablename__ = "property_duplicate_candidate_runs"
+
+    id = Column(Integer, primary_key=True)
+    started_at = Column(DateTime, nullable=False)
+    completed_at = Column(DateTime)
+    is_full = Column(Boolean, nullable=False, default=False)    # 全件更新か
+    building_count = Column(Integer, default=0)                  # 再評価した建物数
+    candidate_count = Column(Integer, default=0)                 # 保存した候補の物件数
+
+    __table_args__ = (
+        Index('idx_pdcr_completed_at', 'completed_at'),
+    )
+
+
+class SitemapShard(Base):
+    """サイトマップの分割ファイル（スクレイピング完了後に作り直し、/sitemap-{番号}.xml でそのまま返す）"""
+    __tablename__ = "sitemap_shards"
+
+    shard_number = Column(Integer, primary_key=True, autoincrement=False)  # 1から始まる番号
+    content = Column(Text, nullable=False)                       # <urlset>のXML
+    url_count = Column(Integer, nullable=False, default=0)
+    lastmod = Column(DateTime)                                   # 含まれるURLの最終更新日時の最大値
+    generated_at = Column(DateTime, nullable=False, server_default=func.now())
+
+
+class StatsSnapshot(Base):
+    """統計情報のスナップショット（/api/stats と管理画面の掲載状態の統計。定期的・スクレイピング完了後に保存）"""
+    __tablename__ = "stats_snapshots"
+
+    id = Column(Integer, primary_key=True)
+    computed_at = Column(DateTime, nullable=False)
+    stats = Column(JSON, nullable=False)                         # /api/stats の内容
+    listing_status_stats = Column(JSON, nullable=False)          # /admin/listing-status-stats の内容
+    duration_ms = Column(Integer)                                # 計算にかかった時間
+
+    __table_args__ = (
+        Index('idx_stats_snapshots_computed_at', 'computed_at'),
+    )
+
+
 class TransactionPrice(Base):
     """不動産取引価格テーブル（国土交通省データ）"""
     __tablename__ = "transaction_prices"
@@ -3,6 +3,7 @@
 """
 
 import logging
+import os
 from typing import Optional
 from datetime import datetime, timedelta
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -17,6 +18,9 @@ import pytz
 
 logger = logging.getLogger(__name__)
 
+# 統計情報のスナップショットを更新する間隔（分）。0以下で無効
+STATS_SNAPSHOT_INTERVAL_MINUTES = int(os.getenv('STATS_SNAPSHOT_INTERVAL_MINUTES', '15'))
+
 class SchedulerService:
     """スケジューラーサービス - より安定した状態管理"""
     
@@ -47,6 +51,7 @@ class SchedulerService:
                 self.is_running = True
                 if not self._initialization_complete:
                     self._load_existing_schedules()
+                    self._add_stats_snapshot_job()
                     self._initialization_complete = True
                 return
             
@@ -56,6 +61,7 @@ class SchedulerService:
             
             # 既存のスケジュールを読み込んで登録
             self._load_existing_schedules()
+            self._add_stats_snapshot_job()
             self._initialization_complete = True
             
             logger.info(f"スケジューラーが開始されました (状態: {self.scheduler.state})")
@@ -120,6 +126,35 @@ class SchedulerService:
         except Exception as e:
             logger.error(f"既存スケジュールの読み込みに失敗しました: {e}")
     
+    def _add_stats_snapshot_job(self):
+        """統計情報のスナップショットを定期的に更新するジョブを登録"""
+        if STATS_SNAPSHOT_INTERVAL_MINUTES <= 0:
+            return
+        try:
+            self.scheduler.add_job(
+                func=self._refresh_stats_snapshot,
+                trigger=IntervalTrigger(
+                    minutes=STATS_SNAPSHOT_INTERVAL_MINUTES,
+                    start_date=datetime.now() + timedelta(seconds=10),
+                    timezone=self.jst
+                ),
+                id="stats_snapshot",
+                name="統計情報のスナップショット",
+                replace_existing=True
+            )
+            logger.info(f"統計情報のスナップショットを{STATS_SNAPSHOT_INTERVAL_MINUTES}分ごとに更新します")
+        except Exception as e:
+            logger.error(f"統計情報のスナップショットのジョブの追加に失敗しました: {e}")
+    
+    def _refresh_stats_snapshot(self):
+        """統計情報のスナップショットを更新"""
+        from .utils.stats_snapshot import refresh_stats_snapshot
+        try:
+            with SessionLocal() as db:
+                refresh_stats_snapshot(db)
+        except Exception as e:
+            logger.error(f"統計情報のスナップショットの更新に失敗しました: {e}")
+    
     def add_schedule(self, schedule: ScrapingSchedule):
         """新しいスケジュールをスケジューラーに追加"""
         if not self.is_scheduler_running():
@@ -11,7 +11,7 @@ from urllib.parse import urljoin
 import requests
 from bs4 import BeautifulSoup
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, text, Table, MetaData
+from sqlalchemy import and_, or_, func, text, Table, MetaData
 import jaconv
 from difflib import SequenceMatcher
 
@@ -29,6 +29,9 @@ from ..utils.building_name_normalizer import (
     extract_room_number as extract_room_number_common
 )
 from ..utils.property_utils import update_earliest_listing_date
+from ..utils.building_candidate_index import get_building_index
+from ..utils.property_search_summary import refresh_property_search_summary
+from ..utils.majority_vote_tally import ListingVoteTracker
 
 # BuildingListingNameManagerは循環インポートを避けるため遅延インポート
 from ..utils.exceptions import TaskPausedException, TaskCancelledException, MaintenanceException
@@ -47,6 +50,9 @@ from .components import (
 )
 from .components.http_client import HttpClientComponent
 from .components.error_handler import ErrorHandlerComponent
+from .components.detail_pipeline import DetailPrefetchPipeline
+from .components.majority_vote_queue import MajorityVoteQueue
+from .components.page_store import PageStoreComponent
 
 
 class BuildingNameVerificationMode(Enum):
@@ -89,6 +95,17 @@ class BaseScraper(ABC):
     MAX_PAGES = 200  # 最大ページ数
     MAX_CONSECUTIVE_EMPTY_PAGES = 2  # 連続して空のページの最大数
     
+    # 詳細ページ先読みパイプライン設定
+    DEFAULT_PIPELINE_FETCH_WORKERS = 2  # 取得ワーカー数（0で無効）
+    DEFAULT_PIPELINE_PARSE_WORKERS = 1  # 解析ワーカー数
+    DEFAULT_PIPELINE_LOOKAHEAD = 8  # 先読みする物件数
+    
+    # 多数決更新キュー設定
+    # worker: ワーカースレッドで定期的に処理 / deferred: 処理フェーズの終了時に処理 / inline: 保存時に処理
+    DEFAULT_MAJORITY_VOTE_MODE = 'worker'
+    DEFAULT_MAJORITY_VOTE_BATCH_SIZE = 200  # 1バッチで処理する最大物件数
+    DEFAULT_MAJORITY_VOTE_INTERVAL = 30  # ワーカーの処理間隔（秒）
+    
     # タイムアウト設定
     PAUSE_CHECK_INTERVAL = 0.1  # 秒
     PAUSE_LOG_INTERVAL = 50  # 5秒ごとにログ（50 * 0.1秒）
@@ -125,7 +142,8 @@ class BaseScraper(ABC):
         """
         from ..database import get_db_for_scraping
         session = get_db_for_scraping()
-        
+        # 多数決更新をコミット後にキューへ追加できるセッションであることを示す
+        session.info['majority_vote_deferrable'] = True
         
         try:
             # トランザクション分離レベルをREAD COMMITTEDに設定
@@ -150,6 +168,8 @@ class BaseScraper(ABC):
             yield session  # 既存のコードとの互換性のため、sessionのみyield
             # 新しいコードではdb_repoを直接使用する場合は別メソッドを用意
             session.commit()
+            # コミット済みの掲載を反映するため、多数決更新はコミット後にキューへ追加
+            self._enqueue_majority_votes(session)
         except Exception as e:
             session.rollback()
             # エラーはログに記録するが、再スローして呼び出し元で処理
@@ -316,6 +336,33 @@ class BaseScraper(ABC):
         self.detail_refetch_days = self._get_detail_refetch_days()
         self.enable_smart_scraping = self._get_smart_scraping_enabled()
         
+        # 詳細ページ先読みパイプライン設定
+        self.pipeline_fetch_workers = int(os.getenv('SCRAPER_PIPELINE_FETCH_WORKERS', str(self.DEFAULT_PIPELINE_FETCH_WORKERS)))
+        self.pipeline_parse_workers = int(os.getenv('SCRAPER_PIPELINE_PARSE_WORKERS', str(self.DEFAULT_PIPELINE_PARSE_WORKERS)))
+        self.pipeline_lookahead = int(os.getenv('SCRAPER_PIPELINE_LOOKAHEAD', str(self.DEFAULT_PIPELINE_LOOKAHEAD)))
+        self._detail_pipeline = None
+        self._prefetch_cursor = 0
+        self._prefetch_released = 0
+        
+        # 多数決更新キュー設定（処理フェーズ中の多数決更新を重複除去してまとめて実行）
+        self.majority_vote_mode = os.getenv('SCRAPER_MAJORITY_VOTE_MODE', self.DEFAULT_MAJORITY_VOTE_MODE).lower()
+        self.majority_vote_batch_size = int(os.getenv('SCRAPER_MAJORITY_VOTE_BATCH_SIZE', str(self.DEFAULT_MAJORITY_VOTE_BATCH_SIZE)))
+        self.majority_vote_interval = float(os.getenv('SCRAPER_MAJORITY_VOTE_INTERVAL', str(self.DEFAULT_MAJORITY_VOTE_INTERVAL)))
+        self._majority_vote_queue = None
+        
+        # 永続ページストア（条件付きGETによる再クロールの省力化・オフライン再生用）
+        self.page_store = None
+        if os.getenv('SCRAPER_USE_PAGE_STORE', 'false').lower() == 'true':
+            store_dir = os.getenv('SCRAPER_PAGE_STORE_DIR', 'data/page_store')
+            self.page_store = PageStoreComponent(
+                os.path.join(store_dir, self.source_site.value), logger=self.logger
+            )
+        self._accept_not_modified = False
+        self._last_fetch_not_modified = False
+        
+        # 建物候補インデックス（段階的マッチングの候補検索をメモリ上で行う）
+        self.use_building_index = os.getenv('SCRAPER_BUILDING_INDEX', 'true').lower() == 'true'
+        
         # 進捗更新コールバック
         self._progress_callback = None
         
@@ -360,9 +407,6 @@ class BaseScraper(ABC):
         self._selector_stats = {}  # {selector: {'success': 0, 'fail': 0}}
         self._page_structure_errors = 0  # ページ構造エラーカウント  # ページ構造エラーカウント
 
-        
-        # 非同期多数決更新を有効化（デッドロック回避）
-        self.async_majority_vote = True
 
     def register_custom_validators(self):
         """
@@ -723,18 +767,53 @@ class BaseScraper(ABC):
             cached_content = self.cache_manager.get_cached_page(url)
             if cached_content:
                 self.logger.debug(f"キャッシュからページ取得: {url}")
-                soup = self.html_parser.parse_html(cached_content)
+                soup = self.parse_html(cached_content)
                 if soup:
                     return soup
         
+        # 先読みパイプラインで取得済みの場合はその結果を使用
+        prefetched = self._take_prefetched_page(url)
+        if prefetched is not None:
+            self.logger.debug(f"先読み済みページを使用: {url}")
+            return self._handle_fetch_result(
+                url,
+                prefetched.content,
+                prefetched.error_info,
+                prefetched.response_time,
+                soup=prefetched.soup,
+                parse_error=prefetched.parse_error,
+                not_modified=prefetched.not_modified
+            )
+        
+        content, error_info, response_time, not_modified = self._fetch_page_content(url)
+        return self._handle_fetch_result(url, content, error_info, response_time, not_modified=not_modified)
+    
+    def parse_html(self, content: str) -> Optional[BeautifulSoup]:
+        """
+        HTMLを解析する
+        
+        サイト別パーサー（self.parser）が宣言した解析エンジンを使用する。
+        パーサーを持たないスクレイパーは共通のHtmlParserComponentで解析する。
+        """
+        parser = getattr(self, 'parser', None)
+        html_parser = getattr(parser, 'html_parser', None) or self.html_parser
+        return html_parser.parse_html(content)
+    
+    def _fetch_page_content(self, url: str) -> Tuple[Optional[str], Optional[Dict[str, Any]], float, bool]:
+        """レート制限を適用してページのHTMLを取得する
+        
+        先読みパイプラインのワーカースレッドからも呼ばれるため、
+        DBアクセスや統計の更新は行わない（_handle_fetch_resultで行う）。
+        ページストアが有効な場合は条件付きGETを送信し、取得した本文を保存する。
+        
+        Returns:
+            (content, error_info, response_time, not_modified) のタプル
+            - not_modified: 304応答、または前回保存した本文と同一だった場合True
+        """
         # レート制限を適用
         self.rate_limiter.wait_if_needed(self.source_site.value)
         
-        # 前回のエラー情報をクリア
-        self._last_fetch_error = None
-        
         # SSL検証の判定
-        headers = None
         if 'gt-www.livable.co.jp' in url:
             # 特定ドメインの場合の処理（必要に応じて）
             self.logger.info(f"特殊ドメインの処理: {url}")
@@ -742,15 +821,61 @@ class BaseScraper(ABC):
         # リクエスト開始時刻を記録
         start_time = time.time()
         
+        # 条件付きGET用のヘッダー（前回のETag/Last-Modified）
+        conditional_headers = self.page_store.get_conditional_headers(url) if self.page_store else {}
+        
         # HTTPクライアントを使用してページを取得
-        content, error_info = self.http_client.fetch(
+        content, error_info, response_info = self.http_client.fetch_with_response_info(
             url,
+            headers=conditional_headers or None,
             check_content=lambda html: html and len(html) > 100  # 最小限のコンテンツチェック
         )
         
         # レスポンス時間を記録
         response_time = time.time() - start_time
         
+        not_modified = False
+        if self.page_store and not error_info:
+            try:
+                if response_info.get('not_modified'):
+                    # 304の場合は保存済みの本文を使用
+                    content = self.page_store.load_body(url)
+                    self.page_store.mark_checked(url)
+                    not_modified = content is not None
+                elif content:
+                    _, changed = self.page_store.save(
+                        url, content,
+                        etag=response_info.get('etag'),
+                        last_modified=response_info.get('last_modified')
+                    )
+                    not_modified = not changed
+            except Exception as e:
+                self.logger.warning(f"ページストアの更新に失敗: {url} - {e}")
+        
+        return content, error_info, response_time, not_modified
+    
+    def _handle_fetch_result(self, url: str, content: Optional[str], error_info: Optional[Dict[str, Any]],
+                             response_time: Optional[float], soup: Optional[BeautifulSoup] = None,
+                             parse_error: Optional[Exception] = None,
+                             not_modified: bool = False) -> Optional[BeautifulSoup]:
+        """取得結果を処理してBeautifulSoupオブジェクトを返す
+        
+        詳細ページの取得中（_accept_not_modifiedがTrue）に内容が前回から変わっていない場合は
+        解析せずにNoneを返し、_last_fetch_not_modified をTrueにする。
+        
+        Args:
+            url: 取得したURL
+            content: 取得したHTML
+            error_info: HTTPクライアントのエラー情報
+            response_time: レスポンス時間（秒）
+            soup: 解析済みのBeautifulSoup（先読みパイプラインで解析済みの場合）
+            parse_error: 先読みパイプラインでの解析エラー
+            not_modified: 前回取得時から内容が変わっていないか
+        """
+        # 前回のエラー情報をクリア
+        self._last_fetch_error = None
+        self._last_fetch_not_modified = False
+        
         # エラーハンドリング
         if error_info:
             self._last_fetch_error = error_info
@@ -782,9 +907,19 @@ class BaseScraper(ABC):
                 if os.getenv('SCRAPER_USE_CACHE', 'false').lower() == 'true':
                     self.cache_manager.cache_page(url, content, ttl=300)  # 5分間キャッシュ
                 
-                self.logger.debug(f"HTML解析開始: {url}")
-                soup = self.html_parser.parse_html(content)
-                self.logger.debug(f"HTML解析完了: {url}")
+                # 変更なしの詳細ページは解析しない
+                if not_modified and self._accept_not_modified:
+                    self.logger.debug(f"前回取得時から変更なし: {url}")
+                    self._last_fetch_not_modified = True
+                    return None
+                
+                if parse_error:
+                    raise parse_error
+                
+                if soup is None:
+                    self.logger.debug(f"HTML解析開始: {url}")
+                    soup = self.parse_html(content)
+                    self.logger.debug(f"HTML解析完了: {url}")
                 
                 # メンテナンスページの検出
                 if self._is_maintenance_page(soup):
@@ -804,6 +939,162 @@ class BaseScraper(ABC):
         
         return None
 
+    def _is_detail_pipeline_supported(self) -> bool:
+        """先読みパイプラインを使用できるスクレイパーか判定
+        
+        fetch_pageを独自実装しているスクレイパー（Playwrightを使うHOMESなど）は
+        スレッドから安全に呼び出せないため対象外とする。
+        """
+        return type(self).fetch_page is BaseScraper.fetch_page and hasattr(self, 'process_property_data')
+    
+    def _start_detail_pipeline(self) -> None:
+        """処理フェーズ用の詳細ページ先読みパイプラインを開始"""
+        self._close_detail_pipeline()
+        self._prefetch_cursor = self._processed_count
+        self._prefetch_released = self._processed_count
+        
+        if self.pipeline_fetch_workers <= 0 or not self._is_detail_pipeline_supported():
+            return
+        
+        self._detail_pipeline = DetailPrefetchPipeline(
+            fetch_func=self._fetch_page_content,
+            parse_func=self.parse_html,
+            logger=self.logger,
+            fetch_workers=self.pipeline_fetch_workers,
+            parse_workers=self.pipeline_parse_workers,
+            max_pending=self.pipeline_lookahead
+        )
+        self.logger.info(
+            f"詳細ページ先読みパイプライン開始: 取得ワーカー={self.pipeline_fetch_workers}, "
+            f"解析ワーカー={self.pipeline_parse_workers}, 先読み数={self.pipeline_lookahead}"
+        )
+    
+    def _close_detail_pipeline(self) -> None:
+        """詳細ページ先読みパイプラインを終了"""
+        pipeline = getattr(self, '_detail_pipeline', None)
+        if pipeline is not None:
+            self._detail_pipeline = None
+            pipeline.close()
+    
+    def _take_prefetched_page(self, url: str):
+        """先読み済みのページ結果を取り出す（先読みされていない場合はNone）"""
+        pipeline = getattr(self, '_detail_pipeline', None)
+        if pipeline is None:
+            return None
+        return pipeline.take(url)
+    
+    def _prefetch_upcoming_details(self, all_properties: List[Dict[str, Any]], index: int) -> None:
+        """処理中の物件より先の物件の詳細ページを先読み予約する
+        
+        Args:
+            all_properties: 収集済みの物件リスト
+            index: 現在処理中の物件のインデックス
+        """
+        pipeline = getattr(self, '_detail_pipeline', None)
+        if pipeline is None:
+            return
+        
+        # 処理済みの物件で使われなかった先読み結果を破棄
+        for released in range(self._prefetch_released, index):
+            pipeline.discard(all_properties[released].get('url'))
+        self._prefetch_released = max(self._prefetch_released, index)
+        
+        limit = len(all_properties)
+        if self.max_properties:
+            limit = min(limit, self.max_properties)
+        
+        start = max(self._prefetch_cursor, index)
+        end = min(limit, index + self.pipeline_lookahead)
+        if start >= end or not pipeline.has_capacity():
+            return
+        
+        candidates = all_properties[start:end]
+        existing_listings = self._load_listing_snapshots(candidates)
+        
+        cursor = start
+        for property_data in candidates:
+            url = property_data.get('url')
+            if url and self._predict_needs_detail(property_data, existing_listings):
+                if not pipeline.is_pending(url) and not pipeline.submit(url):
+                    # 先読み上限に達したため次回に持ち越す
+                    break
+            cursor += 1
+        self._prefetch_cursor = cursor
+    
+    def _load_listing_snapshots(self, properties: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """先読み判定用に既存掲載の情報をまとめて取得
+        
+        Returns:
+            site_property_id または URL をキーとした (current_price, detail_fetched_at) の辞書
+        """
+        site_ids = [p['site_property_id'] for p in properties if p.get('site_property_id')]
+        urls = [p['url'] for p in properties if not p.get('site_property_id') and p.get('url')]
+        if not site_ids and not urls:
+            return {}
+        
+        from ..database import get_db_for_scraping
+        session = get_db_for_scraping()
+        snapshots = {}
+        try:
+            conditions = []
+            if site_ids:
+                conditions.append(PropertyListing.site_property_id.in_(site_ids))
+            if urls:
+                conditions.append(PropertyListing.url.in_(urls))
+            
+            rows = session.query(
+                PropertyListing.site_property_id,
+                PropertyListing.url,
+                PropertyListing.current_price,
+                PropertyListing.detail_fetched_at
+            ).filter(
+                PropertyListing.source_site == self.source_site,
+                or_(*conditions)
+            ).all()
+            
+            for row in rows:
+                snapshot = (row.current_price, row.detail_fetched_at)
+                if row.site_property_id:
+                    snapshots[row.site_property_id] = snapshot
+                snapshots[row.url] = snapshot
+        except Exception as e:
+            self.logger.debug(f"先読み判定用の掲載情報取得に失敗（先読みせずに続行）: {e}")
+        finally:
+            session.close()
+        
+        return snapshots
+    
+    def _predict_needs_detail(self, property_data: Dict[str, Any], existing_listings: Dict[str, Any]) -> bool:
+        """詳細ページの取得が必要になるかを予測する
+        
+        process_property_with_detail_checkの判定と同じ基準を、
+        DBへの追加アクセスなしで評価する（外れた場合は先読み結果が破棄されるだけ）。
+        """
+        if self.has_critical_field_errors(property_data['url']):
+            return False
+        
+        if self.force_detail_fetch:
+            return True
+        
+        site_property_id = property_data.get('site_property_id')
+        snapshot = existing_listings.get(site_property_id or property_data['url'])
+        if snapshot is None:
+            return True
+        
+        if not self.enable_smart_scraping:
+            return True
+        
+        current_price, detail_fetched_at = snapshot
+        if property_data.get('price') is not None and current_price != property_data['price']:
+            return True
+        
+        if not detail_fetched_at:
+            return True
+        
+        from datetime import timezone
+        now = datetime.now(timezone.utc) if detail_fetched_at.tzinfo else datetime.now()
+        return (now - detail_fetched_at).days >= self.detail_refetch_days
+
     def _get_detailed_fetch_error_info(self, url: str) -> dict:
         """fetch_pageの失敗時に詳細なエラー情報を取得する
         
@@ -1093,6 +1384,13 @@ class BaseScraper(ABC):
         self.logger.info(f"[DEBUG] 処理フェーズのループ開始")
         debug_log(f"[{self.source_site}] 処理フェーズのループ開始")
         
+        # 詳細ページの取得・解析を先行させるパイプラインを開始
+        # （DBへの保存はこのループ内で1件ずつ行う）
+        self._start_detail_pipeline()
+        
+        # 多数決更新は保存時に行わず、キューにまとめて処理する
+        self._start_majority_vote_queue()
+        
         for i, property_data in enumerate(all_properties):
             # 既に処理済みの物件はスキップ（再開時）
             if i < self._processed_count:
@@ -1119,6 +1417,7 @@ class BaseScraper(ABC):
             # キャンセルチェック（各物件処理前）
             if self._is_cancelled():
                 self.logger.info("タスクがキャンセルされました（処理フェーズ）")
+                self._close_majority_vote_queue()
                 raise TaskCancelledException("Task cancelled during processing phase")
             
             # 進捗表示（都度表示）
@@ -1128,6 +1427,9 @@ class BaseScraper(ABC):
             # 各物件の処理前にもデバッグログ
             debug_log(f"[{self.source_site}] 物件 {i} の処理開始...")
             
+            # 後続物件の詳細ページを先読み予約
+            self._prefetch_upcoming_details(all_properties, i)
+            
             try:
                 self._scraping_stats['properties_attempted'] += 1
                 
@@ -1206,7 +1508,10 @@ class BaseScraper(ABC):
                                 
                                 # 非アクティブな掲載を再アクティブ化
                                 if not existing_listing.is_active:
+                                    vote_tracker = ListingVoteTracker(update_session)
+                                    vote_tracker.track(existing_listing)
                                     existing_listing.is_active = True
+                                    vote_tracker.apply()
                                     self.logger.debug(f"掲載を再開 (HTML構造エラースキップ) - ID: {listing_id}")
                                     
                                     # 物件が販売終了になっていた場合は販売再開
@@ -1372,6 +1677,8 @@ class BaseScraper(ABC):
                 # タスクの一時停止例外は再スロー
                 self.logger.info(f"物件 {i+1}: タスクが一時停止されました - {type(e).__name__}: {e}")
                 debug_log(f"[{self.source_site}] 物件 {i} で一時停止例外検出: {type(e).__name__}: {e}")
+                self._close_detail_pipeline()
+                self._close_majority_vote_queue()
                 raise
             except TaskCancelledException as e:
                 # タスクがキャンセルされた場合は、現在の物件までで処理を終了
@@ -1409,6 +1716,12 @@ class BaseScraper(ABC):
             # 定期的にコミット（新しいトランザクション管理では不要）
             # save_property_common内で各物件ごとにトランザクションが管理される
         
+        # 先読みパイプラインを終了（未使用の先読み結果は破棄）
+        self._close_detail_pipeline()
+        
+        # 残りの多数決更新を処理してキューを終了
+        self._close_majority_vote_queue()
+        
         # 最終コミット（新しいトランザクション管理では不要）
         # save_property_common内で各物件ごとにトランザクションが完結している
         final_commit_success = True
@@ -2140,6 +2453,17 @@ class BaseScraper(ABC):
             detail_error_info = None
             # 前回のエラー情報をクリア
             self._last_detail_error = None
+            self._last_fetch_not_modified = False
+            
+            # 既存掲載で一覧の価格が変わっていない場合のみ、
+            # 前回取得時と同一の詳細ページを「変更なし」として扱う
+            self._accept_not_modified = (
+                self.page_store is not None
+                and existing_listing is not None
+                and not self.force_detail_fetch
+                and (property_data.get('price') is None
+                     or property_data.get('price') == existing_listing.current_price)
+            )
             
             try:
                 # 詳細取得前のログ
@@ -2177,7 +2501,21 @@ class BaseScraper(ABC):
                     'error_message': str(e)
                 }
             
-            if detail_data:
+            finally:
+                self._accept_not_modified = False
+            
+            if not detail_data and not detail_error_info and self._last_fetch_not_modified:
+                # 詳細ページが前回取得時から変わっていない場合は解析・検証を省略し、
+                # 詳細を取得しなかった場合と同様に最終確認日時のみ更新する
+                print("  → 詳細ページに変更なし（前回取得時と同一）")
+                property_data['detail_fetched'] = False
+                property_data['detail_fetch_attempted'] = False
+                property_data['detail_not_modified'] = True
+                self._last_detail_fetched = False
+                self._increment_stat('detail_not_modified')
+                self._complete_from_existing_listing(property_data, existing_listing)
+            
+            elif detail_data:
                 # 価格不一致チェック（共通処理として実装）
                 list_price = property_data.get('price')
                 detail_price = detail_data.get('price')
@@ -2310,27 +2648,7 @@ class BaseScraper(ABC):
             self._last_detail_fetched = False  # フラグを記録
             
             # 詳細を取得しない場合、既存の情報を補完
-            # master_propertyを明示的に取得（lazy loadエラーを回避）
-            if existing_listing and existing_listing.master_property_id:
-                from ..database import get_db_for_scraping
-                temp_session = get_db_for_scraping()
-                try:
-                    master_prop = temp_session.query(MasterProperty).filter(
-                        MasterProperty.id == existing_listing.master_property_id
-                    ).first()
-                    if master_prop:
-                        # 必須情報を既存データから補完
-                        if 'building_name' not in property_data or not property_data['building_name']:
-                            if master_prop.building:
-                                property_data['building_name'] = master_prop.building.normalized_name
-                        if 'area' not in property_data or not property_data['area']:
-                            property_data['area'] = master_prop.area
-                        if 'layout' not in property_data or not property_data['layout']:
-                            property_data['layout'] = master_prop.layout
-                        if 'floor_number' not in property_data or property_data.get('floor_number') is None:
-                            property_data['floor_number'] = master_prop.floor_number
-                finally:
-                    temp_session.close()
+            self._complete_from_existing_listing(property_data, existing_listing)
         
         # 物件保存前に一時停止チェック
         try:
@@ -2345,6 +2663,31 @@ class BaseScraper(ABC):
         
         return saved
     
+    def _complete_from_existing_listing(self, property_data: Dict[str, Any],
+                                        existing_listing: Optional[PropertyListing]) -> None:
+        """詳細を取得しない場合に、必須情報を既存の物件データから補完する"""
+        # master_propertyを明示的に取得（lazy loadエラーを回避）
+        if existing_listing and existing_listing.master_property_id:
+            from ..database import get_db_for_scraping
+            temp_session = get_db_for_scraping()
+            try:
+                master_prop = temp_session.query(MasterProperty).filter(
+                    MasterProperty.id == existing_listing.master_property_id
+                ).first()
+                if master_prop:
+                    # 必須情報を既存データから補完
+                    if 'building_name' not in property_data or not property_data['building_name']:
+                        if master_prop.building:
+                            property_data['building_name'] = master_prop.building.normalized_name
+                    if 'area' not in property_data or not property_data['area']:
+                        property_data['area'] = master_prop.area
+                    if 'layout' not in property_data or not property_data['layout']:
+                        property_data['layout'] = master_prop.layout
+                    if 'floor_number' not in property_data or property_data.get('floor_number') is None:
+                        property_data['floor_number'] = master_prop.floor_number
+            finally:
+                temp_session.close()
+    
     def _save_property_with_error_handling(
         self, 
         property_data: Dict[str, Any], 
@@ -3113,8 +3456,8 @@ class BaseScraper(ABC):
             return 100, "完全一致"
         
         # AddressNormalizerを使って住所の構成要素に分解
-        from ..utils.address_normalizer import AddressNormalizer
-        normalizer = AddressNormalizer()
+        from ..utils.address_normalizer import get_address_normalizer
+        normalizer = get_address_normalizer()
         
         # 各住所を構成要素に分解
         components1 = normalizer.extract_components(addr1)
@@ -3279,10 +3622,10 @@ class BaseScraper(ABC):
             tuple: (is_ambiguous: bool, matching_buildings: list of Building)
         """
         from ..utils.building_name_normalizer import canonicalize_building_name
-        from ..utils.address_normalizer import AddressNormalizer
+        from ..utils.address_normalizer import get_address_normalizer
         
         canonical_search = canonicalize_building_name(search_key)
-        normalizer = AddressNormalizer()
+        normalizer = get_address_normalizer()
         
         # 同一住所の建物を取得
         buildings_at_address = session.query(Building).filter(
@@ -3386,22 +3729,8 @@ class BaseScraper(ABC):
 
         return total_score
 
-    def _find_buildings_with_staged_matching(self, session, search_key: str, normalized_address: str, 
-                                           total_floors: int = None, built_year: int = None, 
-                                           built_month: int = None, total_units: int = None,
-                                           is_ambiguous_search: bool = False) -> Optional[Building]:
-        """段階的マッチングで建物を検索
-        
-        1. 完全属性一致を優先
-        2. 許容誤差一致をフォールバック
-        3. 建物名一致度で優先順位付け
-        
-        案E: 曖昧な検索の場合はis_ambiguous_search=Trueを渡す
-        """
-        # 住所を正規化（表記ゆれを吸収）
-        from ..utils.address_normalizer import AddressNormalizer
-        normalizer = AddressNormalizer()
-        
+    def _query_staged_matching_candidates(self, session, search_key: str, normalized_address: str) -> List[Building]:
+        """段階的マッチングの候補をSQLで取得（建物候補インデックスを使用しない場合）"""
         # SQLで効率的に候補を絞り込み
         partial_match_query = session.query(Building).filter(
             Building.canonical_name.isnot(None),
@@ -3430,7 +3759,33 @@ class BaseScraper(ABC):
         )
         
         # 最大50件まで取得（より多くの候補を確認）
-        candidate_buildings = partial_match_query.limit(50).all()
+        return partial_match_query.limit(50).all()
+
+    def _find_buildings_with_staged_matching(self, session, search_key: str, normalized_address: str, 
+                                           total_floors: int = None, built_year: int = None, 
+                                           built_month: int = None, total_units: int = None,
+                                           is_ambiguous_search: bool = False) -> Optional[Building]:
+        """段階的マッチングで建物を検索
+        
+        1. 完全属性一致を優先
+        2. 許容誤差一致をフォールバック
+        3. 建物名一致度で優先順位付け
+        
+        案E: 曖昧な検索の場合はis_ambiguous_search=Trueを渡す
+        """
+        # 住所を正規化（表記ゆれを吸収）
+        from ..utils.address_normalizer import get_address_normalizer
+        normalizer = get_address_normalizer()
+        
+        if self.use_building_index:
+            # 建物名・住所の部分一致候補をプロセス内インデックスから取得（最大50件）
+            candidate_buildings = get_building_index().fetch_candidates(
+                session, search_key, normalized_address, limit=50
+            )
+        else:
+            candidate_buildings = self._query_staged_matching_candidates(
+                session, search_key, normalized_address
+            )
         
         if not candidate_buildings:
             return None
@@ -3438,9 +3793,12 @@ class BaseScraper(ABC):
         # 住所の精密チェックと分類
         valid_candidates = []
         
-        for building in candidate_buildings:
-            # 住所の正規化チェック（Python レベルで精密チェック）
-            building_normalized_addr = normalizer.normalize_for_comparison(building.address)
+        # 候補の住所をまとめて正規化（同じ住所の候補は1回だけ正規化される）
+        candidate_normalized_addrs = normalizer.normalize_many(
+            [building.address for building in candidate_buildings], for_comparison=True
+        )
+        
+        for building, building_normalized_addr in zip(candidate_buildings, candidate_normalized_addrs):
             
             # 詳細な住所一致度計算
             address_score, address_match_type = self._calculate_address_match_score(
@@ -3535,8 +3893,8 @@ class BaseScraper(ABC):
             return None
         
         # 住所を正規化（表記ゆれを吸収）
-        from ..utils.address_normalizer import AddressNormalizer
-        normalizer = AddressNormalizer()
+        from ..utils.address_normalizer import get_address_normalizer
+        normalizer = get_address_normalizer()
         normalized_address = normalizer.normalize_for_comparison(address)
         
         # === 案E: 曖昧な検索かどうかを最初に判定 ===
@@ -3831,8 +4189,8 @@ class BaseScraper(ABC):
                         updates['address'] = address
                         # 正規化住所も更新
                         if hasattr(building, 'normalized_address'):
-                            from ..utils.address_normalizer import AddressNormalizer
-                            addr_normalizer = AddressNormalizer()
+                            from ..utils.address_normalizer import get_address_normalizer
+                            addr_normalizer = get_address_normalizer()
                             updates['normalized_address'] = addr_normalizer.normalize_for_comparison(address)
                     # 築年月の更新（既存の値がない場合のみ）
                     # 注意: 実績ベースの許容で紐付けた場合、多数決で決まった既存の築年月を維持する
@@ -3925,8 +4283,8 @@ class BaseScraper(ABC):
         # 住所を正規化
         normalized_addr = None
         if address:
-            from ..utils.address_normalizer import AddressNormalizer
-            addr_normalizer = AddressNormalizer()
+            from ..utils.address_normalizer import get_address_normalizer
+            addr_normalizer = get_address_normalizer()
             normalized_addr = addr_normalizer.normalize_for_comparison(address)
         
         # 新規建物を作成
@@ -3947,6 +4305,10 @@ class BaseScraper(ABC):
         session.add(building)
         session.flush()  # IDを生成
         
+        # 建物候補インデックスに登録（同じ実行中の後続物件から検索できるように）
+        if self.use_building_index:
+            get_building_index().add_building(building)
+        
         # デバッグ: 新規作成された建物のIDを確認
         self.logger.info(f"[DEBUG] 新規建物作成後のID: {building.id}, 名前: {building.normalized_name}")
         
@@ -4018,8 +4380,8 @@ class BaseScraper(ABC):
             return None
         
         # 住所を正規化
-        from ..utils.address_normalizer import AddressNormalizer
-        normalizer = AddressNormalizer()
+        from ..utils.address_normalizer import get_address_normalizer
+        normalizer = get_address_normalizer()
         current_normalized_addr = normalizer.normalize_for_comparison(current_building.address)
         
         # 掲載情報を先に検索（階数・面積・価格が完全一致）してから建物条件で絞り込む
@@ -4514,6 +4876,10 @@ class BaseScraper(ABC):
                 PropertyListing.source_site == self.source_site
             ).first()
         
+        # 多数決用の票集計に差分を反映するため、変更前の票を記録
+        vote_tracker = ListingVoteTracker(session)
+        vote_tracker.track(listing)
+        
         # 既存の掲載が見つかった場合、URLが変わっているかチェック
         if listing and listing.url != url:
             # URLの実質的な違いを判定（site_property_idが同じ場合は軽微な変更として扱う）
@@ -4539,6 +4905,7 @@ class BaseScraper(ABC):
             ).first()
             
             if existing_with_same_url:
+                vote_tracker.track(existing_with_same_url)
                 # 同じURLで別の物件が存在する場合
                 if existing_with_same_url.master_property_id != master_property.id:
                     # 別の物件の場合、古い方を非アクティブにする
@@ -4920,6 +5287,7 @@ class BaseScraper(ABC):
                 )
                 session.add(listing)
                 self.safe_flush(session)
+                vote_tracker.track_new(listing)
                 
                 # 最初の掲載日を更新
                 update_earliest_listing_date(session, master_property.id)
@@ -4947,6 +5315,7 @@ class BaseScraper(ABC):
                     
                     if listing:
                         print(f"  → 既存レコード発見 (ID: {listing.id}, 物件ID: {listing.master_property_id})")
+                        vote_tracker.track(listing)
                         if listing.master_property_id != master_property.id:
                             # 別の物件の場合は、古い方を非アクティブにする
                             print(f"  → 別の物件のため、古い方を非アクティブ化")
@@ -4984,6 +5353,7 @@ class BaseScraper(ABC):
                             )
                             session.add(listing)
                             self.safe_flush(session)
+                            vote_tracker.track_new(listing)
                         else:
                             # 同じ物件の場合は、既存のレコードを更新
                             update_type = 'existing'
@@ -5063,8 +5433,11 @@ class BaseScraper(ABC):
                 self.logger.warning(f"BuildingListingNameの更新に失敗しました: {e}")
                 self._handle_transaction_error(e, "BuildingListingName更新エラー")
         
+        # 掲載の変更を多数決用の票集計に反映してから多数決で更新
+        vote_tracker.apply()
+        
         # 建物名と物件情報を多数決で更新
-        self._update_by_majority_vote(session, master_property)
+        self._request_majority_vote(session, master_property)
         
         # update_detailsが未設定の場合の処理
         if update_details is None:
@@ -5587,69 +5960,74 @@ class BaseScraper(ABC):
     
     
 
-    def _schedule_majority_vote_update(self, property_id: int, building_id: int = None):
+    def _refresh_search_summary(self, session, property_id: Optional[int]):
         """
-        多数決更新を後で実行するためにキューに追加（非同期処理）
-        
-        デッドロックを避けるため、メインのトランザクションとは別のタイミングで実行
+        物件一覧用の集計テーブルを更新（ベストエフォート）
+
+        集計の失敗で物件の保存まで失敗しないよう、セーブポイント内で実行する
         """
+        if not property_id:
+            return
         try:
-            from ..models import PropertyPriceChangeQueue
-            from ..database import get_db_for_scraping
-            
-            with get_db_for_scraping() as session:
-                # 既存のキューエントリがあるか確認
-                existing = session.query(PropertyPriceChangeQueue).filter(
-                    PropertyPriceChangeQueue.master_property_id == property_id,
-                    PropertyPriceChangeQueue.status == 'pending'
-                ).first()
-                
-                if not existing:
-                    # キューに追加
-                    queue_entry = PropertyPriceChangeQueue(
-                        master_property_id=property_id,
-                        reason='majority_vote_update',
-                        priority=10,  # 通常優先度
-                        status='pending'
-                    )
-                    session.add(queue_entry)
-                    session.commit()
-                    self.logger.debug(f"多数決更新をキューに追加: property_id={property_id}, building_id={building_id}")
-                else:
-                    self.logger.debug(f"多数決更新は既にキューに存在: property_id={property_id}")
-                    
+            with session.begin_nested():
+                refresh_property_search_summary(session, [property_id])
         except Exception as e:
-            self.logger.error(f"多数決更新のキュー追加に失敗: {e}")
-            # キューへの追加失敗はエラーとして記録するが、メイン処理は継続
+            self.logger.warning(f"物件検索用集計の更新に失敗: property_id={property_id}, error={e}")
 
-    def _record_data_quality_issue(self, property_id: int, error_message: str):
+    def _start_majority_vote_queue(self) -> None:
+        """処理フェーズ用の多数決更新キューを開始（inlineモードでは開始しない）"""
+        self._close_majority_vote_queue()
+        if self.majority_vote_mode not in ('worker', 'deferred'):
+            return
+        
+        from ..database import get_db_for_scraping
+        self._majority_vote_queue = MajorityVoteQueue(
+            session_factory=get_db_for_scraping,
+            logger=self.logger,
+            batch_size=self.majority_vote_batch_size,
+            use_worker=self.majority_vote_mode == 'worker',
+            flush_interval=self.majority_vote_interval
+        )
+        self.logger.info(
+            f"多数決更新キュー開始: モード={self.majority_vote_mode}, "
+            f"バッチサイズ={self.majority_vote_batch_size}, 処理間隔={self.majority_vote_interval}秒"
+        )
+    
+    def _close_majority_vote_queue(self) -> None:
+        """多数決更新キューの残りを処理して終了"""
+        queue = getattr(self, '_majority_vote_queue', None)
+        if queue is not None:
+            self._majority_vote_queue = None
+            queue.close()
+    
+    def _request_majority_vote(self, session: Session, master_property: MasterProperty):
         """
-        データ品質の問題を記録（将来的な分析のため）
+        物件と建物の多数決更新を依頼
         
-        Args:
-            property_id: 問題が発生した物件ID
-            error_message: エラーメッセージ
+        処理フェーズ中（キューが有効）でtransaction_scopeのセッションの場合は、
+        コミット後にキューへ追加して後でまとめて処理する。それ以外はその場で更新する。
         """
-        try:
-            # データ品質問題をログに記録
-            self.logger.warning(f"データ品質問題を記録: property_id={property_id}, error={error_message}")
-            
-            # 将来的には専用のテーブルに記録することも検討
-            # from ..database import get_db_for_scraping
-            # with get_db_for_scraping() as session:
-            #     quality_issue = DataQualityIssue(
-            #         property_id=property_id,
-            #         error_type='majority_vote_error',
-            #         error_message=error_message,
-            #         occurred_at=datetime.now()
-            #     )
-            #     session.add(quality_issue)
-            #     session.commit()
-            
-        except Exception as e:
-            # 記録自体のエラーは無視（メインフローを妨げない）
-            self.logger.debug(f"データ品質問題の記録中にエラー: {e}")
-        # TODO: 実際のキュー実装が必要な場合はここに追加
+        if not master_property:
+            return
+        if self._majority_vote_queue is None or not session.info.get('majority_vote_deferrable'):
+            self._update_by_majority_vote(session, master_property)
+            return
+        session.info.setdefault('majority_vote_keys', {})[master_property.id] = master_property.building_id
+    
+    def _enqueue_majority_votes(self, session: Session):
+        """コミット済みのセッションで依頼された多数決更新をキューに追加"""
+        keys = session.info.pop('majority_vote_keys', None)
+        if not keys:
+            return
+        queue = self._majority_vote_queue
+        for property_id, building_id in keys.items():
+            if queue is not None:
+                queue.add(property_id, building_id)
+            else:
+                # コミットまでにキューが終了していた場合は別セッションでその場で更新
+                with self.transaction_scope() as update_session:
+                    master_property = update_session.get(MasterProperty, property_id)
+                    self._update_by_majority_vote(update_session, master_property)
     
     def _log_validation_failure(self, property_data: Dict[str, Any]):
         """バリデーション失敗をログに記録"""
@@ -5754,7 +6132,10 @@ class BaseScraper(ABC):
                                             # 期間内なら再活性化
                                             days_since_sold = (datetime.now() - master_prop.sold_at).days
                                             print(f"  → 販売終了から{days_since_sold}日以内（閾値: {threshold_days}日）のため再活性化")
+                                            vote_tracker = ListingVoteTracker(session)
+                                            vote_tracker.track(existing_listing)
                                             existing_listing.is_active = True
+                                            vote_tracker.apply()
                                             master_prop.sold_at = None
                                             master_prop.final_price = None
                                             master_prop.final_price_updated_at = None
@@ -5765,7 +6146,12 @@ class BaseScraper(ABC):
                                     existing_listing.is_active = True
                                     print(f"  → 掲載を再開 (ID: {existing_listing.id})")
                             
+                            # 詳細ページが前回から変わっていないことを確認済みの場合は詳細取得日時も更新
+                            if property_data.get('detail_not_modified'):
+                                existing_listing.detail_fetched_at = get_utc_now()
+                            
                             print(f"  → 既存物件の最終確認日時を更新 (ID: {existing_listing.id})")
+                            self._refresh_search_summary(session, existing_listing.master_property_id)
                             property_data['update_type'] = 'skipped'
                             property_data['property_saved'] = True
                             return True
@@ -5919,46 +6305,11 @@ class BaseScraper(ABC):
                 if hasattr(self, '_post_listing_creation_hook'):
                     self._post_listing_creation_hook(session, listing, property_data)
                 
-                # 多数決で情報を更新
-                # デッドロック防止のため、オプションで別トランザクションで実行
-                if getattr(self, 'async_majority_vote', False):
-                    # 非同期モード：更新をスケジュールして後で実行
-                    self._schedule_majority_vote_update(master_property.id, master_property.building_id)
-                else:
-                    # 同期モード：現在のトランザクション内で実行（ベストエフォート）
-                    try:
-                        self._update_by_majority_vote(session, master_property)
-                    except Exception as e:
-                        # エラーの種類を判別して適切に処理
-                        error_str = str(e).lower()
-                        
-                        # ロック関連のエラー（リトライ可能）
-                        if 'lock' in error_str or 'deadlock' in error_str or 'timeout' in error_str:
-                            self.logger.warning(f"多数決更新でロックエラーが発生（後で再試行されます）: {e}")
-                            # 後で非同期更新をスケジュール
-                            self._schedule_majority_vote_update(master_property.id, master_property.building_id)
-                        
-                        # データ整合性エラー（致命的）
-                        elif 'integrity' in error_str or 'constraint' in error_str or 'foreign key' in error_str:
-                            self.logger.error(f"多数決更新でデータ整合性エラー: {e}")
-                            self.logger.error(f"[DEBUG] 多数決更新エラーで例外を再スロー（データ整合性）: URL={property_data.get('url', '不明')}")
-                            # トランザクション全体をロールバックすべき重大なエラー
-                            raise
-                        
-                        # NULL値エラーや型エラー（データ品質の問題）
-                        elif 'null' in error_str or 'type' in error_str or 'value' in error_str:
-                            self.logger.error(f"多数決更新でデータ品質エラー: {e}")
-                            # データの問題なので記録はするが、処理は続行
-                            self._record_data_quality_issue(master_property.id, str(e))
-                        
-                        # その他の予期しないエラー
-                        else:
-                            self.logger.error(f"多数決更新で予期しないエラー: {e}")
-                            import traceback
-                            self.logger.error(f"スタックトレース: {traceback.format_exc()}")
-                            self.logger.error(f"[DEBUG] 多数決更新エラーで例外を再スロー（予期しない）: URL={property_data.get('url', '不明')}")
-                            # 原因不明なので安全のため再スロー
-                            raise
+                # 多数決で情報を更新（処理フェーズ中はコミット後にキューでまとめて実行）
+                self._request_majority_vote(session, master_property)
+                
+                # 物件一覧用の集計テーブルを更新
+                self._refresh_search_summary(session, master_property.id)
                 
                 # コミットはwith文を抜ける時に自動実行
                 property_data['property_saved'] = True
@@ -6595,6 +6946,18 @@ class BaseScraper(ABC):
         """
         # トランザクションは transaction_scope() で自動管理される
         
+        # 先読みパイプラインのワーカーを停止
+        try:
+            self._close_detail_pipeline()
+        except Exception:
+            pass
+        
+        # 多数決更新キューの残りを処理してワーカーを停止
+        try:
+            self._close_majority_vote_queue()
+        except Exception:
+            pass
+        
         # HTTP接続のクリーンアップはHttpClientComponentが管理
         # （旧http_sessionは削除済み）
 
@@ -6626,8 +6989,8 @@ class BaseScraper(ABC):
         address = re.sub(r'<[^>]+>', '', address)
         
         # AddressNormalizerを使用してUI要素を削除
-        from ..utils.address_normalizer import AddressNormalizer
-        normalizer = AddressNormalizer()
+        from ..utils.address_normalizer import get_address_normalizer
+        normalizer = get_address_normalizer()
         return normalizer.remove_ui_elements(address)
     
     def contains_address_pattern(self, text: str) -> bool:
@@ -6641,8 +7004,8 @@ class BaseScraper(ABC):
         Returns:
             bool: 住所パターンが含まれている場合True
         """
-        from ..utils.address_normalizer import AddressNormalizer
-        normalizer = AddressNormalizer()
+        from ..utils.address_normalizer import get_address_normalizer
+        normalizer = get_address_normalizer()
         return normalizer.contains_address_pattern(text)
 
 
@@ -6,17 +6,26 @@
 """
 
 from .http_client import HttpClientComponent
+from .async_http_client import AsyncHttpClientComponent
 from .html_parser import HtmlParserComponent
 from .data_validator import DataValidatorComponent
 from .error_handler import ErrorHandlerComponent
 from .rate_limiter import RateLimiterComponent
 from .cache_manager import CacheManagerComponent
+from .detail_pipeline import DetailPrefetchPipeline, PrefetchedPage
+from .page_store import PageStoreComponent
+from .majority_vote_queue import MajorityVoteQueue
 
 __all__ = [
     'HttpClientComponent',
+    'AsyncHttpClientComponent',
     'HtmlParserComponent',
     'DataValidatorComponent',
     'ErrorHandlerComponent',
     'RateLimiterComponent',
     'CacheManagerComponent',
+    'DetailPrefetchPipeline',
+    'PrefetchedPage',
+    'PageStoreComponent',
+    'MajorityVoteQueue',
 ]
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+非同期HTTPクライアントコンポーネント
+
+asyncioベースのHTTP通信を担当
+- ホスト別の同時接続数制限
+- HTTP keep-alive（接続の再利用）
+- gzip/brotliの展開
+- 複数URLの同時取得（fetch_many）
+- 同一ホストへのリクエスト間隔（既定はスクレイパーのサイト別の遅延と同じ）
+
+戻り値は HttpClientComponent.fetch と同じ (content, error_info) のタプル
+"""
+import asyncio
+import importlib.util
+import logging
+import time
+from collections import defaultdict
+from typing import Optional, Tuple, Dict, Any, Callable, List, Iterable
+from urllib.parse import urlparse
+
+import httpx
+
+from .http_client import HttpClientComponent
+from .rate_limiter import RateLimiterComponent
+
+
+def _brotli_available() -> bool:
+    """httpxがbrotliを展開できるか（brotli または brotlicffi がインストールされているか）"""
+    return any(
+        importlib.util.find_spec(name) is not None
+        for name in ('brotli', 'brotlicffi')
+    )
+
+
+class AsyncHttpClientComponent:
+    """asyncioベースのHTTP通信を担当するコンポーネント"""
+
+    DEFAULT_HEADERS = dict(HttpClientComponent.DEFAULT_HEADERS)
+
+    # 同一ホストへのリクエスト開始間隔の既定値（秒）
+    DEFAULT_MIN_INTERVAL_PER_HOST = RateLimiterComponent.DEFAULT_DELAYS['default']
+
+    def __init__(self, logger: Optional[logging.Logger] = None,
+                 timeout: int = 30,
+                 retry_count: int = 3,
+                 retry_delay: float = 2.0,
+                 max_connections: int = 20,
+                 max_connections_per_host: int = 2,
+                 min_interval_per_host: float = DEFAULT_MIN_INTERVAL_PER_HOST,
+                 min_interval_by_host: Optional[Dict[str, float]] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 verify: bool = True,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        初期化
+
+        Args:
+            logger: ロガーインスタンス
+            timeout: タイムアウト秒数
+            retry_count: リトライ回数
+            retry_delay: リトライ間隔（秒）
+            max_connections: 全体の最大接続数
+            max_connections_per_host: ホスト別の最大同時リクエスト数
+            min_interval_per_host: 同一ホストへのリクエスト開始間隔の最小値（秒）
+            min_interval_by_host: ホスト別のリクエスト開始間隔（秒）。指定のないホストは min_interval_per_host
+            headers: 追加のデフォルトヘッダー
+            verify: SSL証明書を検証するか
+            transport: httpxのトランスポート（テスト用）
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.timeout = timeout
+        self.retry_count = retry_count
+        self.retry_delay = retry_delay
+        self.max_connections = max_connections
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self.min_interval_per_host = min_interval_per_host
+        self.min_interval_by_host = dict(min_interval_by_host or {})
+        self.verify = verify
+        self.transport = transport
+
+        self.headers = dict(self.DEFAULT_HEADERS)
+        self.headers['Accept-Encoding'] = 'gzip, deflate, br' if _brotli_available() else 'gzip, deflate'
+        if headers:
+            self.headers.update(headers)
+
+        # イベントループごとに作成する（asyncio.runを複数回呼んでも安全なように遅延初期化）
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._host_last_request: Dict[str, float] = defaultdict(float)
+
+        # 統計情報
+        self.request_counts = defaultdict(int)
+        self.error_counts = defaultdict(int)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """共有のAsyncClientを取得（keep-alive接続をホスト間で共有）"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                follow_redirects=True,
+                verify=self.verify,
+                transport=self.transport
+            )
+        return self._client
+
+    def _get_host_semaphore(self, host: str) -> asyncio.Semaphore:
+        """ホスト別の同時リクエスト数制限"""
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_semaphores[host]
+
+    async def _wait_for_host_slot(self, host: str) -> None:
+        """同一ホストへのリクエスト開始間隔を空ける"""
+        min_interval = self.min_interval_by_host.get(host, self.min_interval_per_host)
+        if min_interval <= 0:
+            return
+
+        if host not in self._host_locks:
+            self._host_locks[host] = asyncio.Lock()
+
+        async with self._host_locks[host]:
+            elapsed = time.monotonic() - self._host_last_request[host]
+            wait_time = min_interval - elapsed
+            if wait_time > 0:
+                self.logger.debug(f"{host}: {wait_time:.1f}秒待機")
+                await asyncio.sleep(wait_time)
+            self._host_last_request[host] = time.monotonic()
+
+    async def fetch(self, url: str,
+                    method: str = 'GET',
+                    headers: Optional[Dict[str, str]] = None,
+                    params: Optional[Dict[str, Any]] = None,
+                    data: Optional[Dict[str, Any]] = None,
+                    check_content: Optional[Callable[[str], bool]] = None
+                    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        URLからコンテンツを取得
+
+        Args:
+            url: 取得するURL
+            method: HTTPメソッド
+            headers: 追加ヘッダー
+            params: URLパラメータ
+            data: POSTデータ
+            check_content: コンテンツ検証関数
+
+        Returns:
+            (content, error_info) のタプル
+            - content: 取得したコンテンツ（成功時）
+            - error_info: エラー情報（失敗時）
+        """
+        host = urlparse(url).netloc
+        client = self._get_client()
+        last_error = None
+
+        for attempt in range(self.retry_count):
+            try:
+                async with self._get_host_semaphore(host):
+                    await self._wait_for_host_slot(host)
+                    self.logger.debug(f"HTTP {method} リクエスト送信: {url} (試行 {attempt + 1}/{self.retry_count})")
+                    self.request_counts[host] += 1
+
+                    response = await client.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        params=params,
+                        data=data
+                    )
+
+                # ステータスコードチェック
+                if response.status_code == 404:
+                    return None, {
+                        'type': 'http_404',
+                        'status_code': 404,
+                        'url': url,
+                        'message': 'Page not found'
+                    }
+
+                if response.status_code == 503:
+                    return None, {
+                        'type': 'http_503',
+                        'status_code': 503,
+                        'url': url,
+                        'message': 'Service unavailable'
+                    }
+
+                response.raise_for_status()
+
+                content = self._decode_content(response)
+
+                # コンテンツ検証
+                if check_content and not check_content(content):
+                    raise ValueError("Content validation failed")
+
+                self.logger.debug(f"コンテンツ取得成功: {url} (サイズ: {len(content)} bytes)")
+                return content, None
+
+            except httpx.TimeoutException:
+                last_error = {
+                    'type': 'timeout',
+                    'url': url,
+                    'message': f'Request timeout after {self.timeout} seconds'
+                }
+
+            except httpx.TransportError as e:
+                last_error = {
+                    'type': 'connection_error',
+                    'url': url,
+                    'message': str(e)
+                }
+
+            except httpx.HTTPStatusError as e:
+                last_error = {
+                    'type': 'http_error',
+                    'status_code': e.response.status_code,
+                    'url': url,
+                    'message': str(e)
+                }
+
+            except Exception as e:
+                last_error = {
+                    'type': 'unknown_error',
+                    'url': url,
+                    'message': str(e)
+                }
+
+            self.error_counts[host] += 1
+
+            # リトライ前の待機（イベントループはブロックしない）
+            if attempt < self.retry_count - 1:
+                self.logger.warning(f"リトライ待機中 ({self.retry_delay}秒): {url}")
+                await asyncio.sleep(self.retry_delay)
+
+        # 全試行失敗
+        self.logger.error(f"コンテンツ取得失敗 (全{self.retry_count}回失敗): {url}")
+        return None, last_error
+
+    async def fetch_many(self, urls: Iterable[str], **kwargs) -> List[Tuple[Optional[str], Optional[Dict[str, Any]]]]:
+        """
+        複数のURLを同時に取得
+
+        ホスト別の同時接続数・間隔の制限内で、異なるサイトへのリクエストは並行して送信される。
+
+        Args:
+            urls: 取得するURLのリスト
+            **kwargs: fetch に渡す追加引数
+
+        Returns:
+            urls と同じ順序の (content, error_info) タプルのリスト
+        """
+        return list(await asyncio.gather(*(self.fetch(url, **kwargs) for url in urls)))
+
+    def _decode_content(self, response: httpx.Response) -> str:
+        """レスポンスをテキストに変換（Content-Typeに文字コードがない場合は推定する）"""
+        if response.charset_encoding:
+            return response.text
+
+        raw = response.content
+        try:
+            from charset_normalizer import from_bytes
+            best = from_bytes(raw).best()
+            if best and best.encoding:
+                return raw.decode(best.encoding, errors='replace')
+        except ImportError:
+            pass
+        return raw.decode('utf-8', errors='replace')
+
+    async def aclose(self):
+        """接続を閉じる"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        # セマフォ・ロックはイベントループに紐づくため破棄する
+        self._host_semaphores.clear()
+        self._host_locks.clear()
+
+    async def __aenter__(self):
+        """非同期コンテキストマネージャーのエントリ"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """非同期コンテキストマネージャーの終了"""
+        await self.aclose()
+
+    def set_header(self, key: str, value: str):
+        """デフォルトヘッダーを設定"""
+        self.headers[key] = value
+        if self._client is not None:
+            self._client.headers[key] = value
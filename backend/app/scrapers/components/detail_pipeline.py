@@ -0,0 +1,218 @@
+"""
+詳細ページ先読みパイプラインコンポーネント
+
+処理フェーズの詳細ページ取得をパイプライン化する
+- 取得ステージ: 有限個のワーカーが詳細ページを先読み（サイト別の遅延はレート制限で共有）
+- 解析ステージ: 取得済みHTMLを別ワーカーでBeautifulSoupオブジェクトに変換
+- 書き込みステージ: 呼び出し元（メインスレッド）が結果を1件ずつ受け取りDBに保存
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Callable, Tuple
+
+
+@dataclass
+class PrefetchedPage:
+    """先読みしたページの結果"""
+    url: str
+    content: Optional[str]
+    error_info: Optional[Dict[str, Any]]
+    response_time: float
+    soup: Optional[Any] = None
+    parse_error: Optional[Exception] = None
+    not_modified: bool = False
+
+
+class DetailPrefetchPipeline:
+    """
+    詳細ページの先読みパイプライン
+
+    取得ステージと解析ステージを別々のスレッドプールで実行し、
+    結果はURL単位の Future として保持する。DBへの書き込みは行わず、
+    呼び出し元が take() で結果を受け取って従来通り順番に保存する。
+    """
+
+    def __init__(self,
+                 fetch_func: Callable[[str], Tuple[Optional[str], Optional[Dict[str, Any]], float, bool]],
+                 parse_func: Callable[[str], Any],
+                 logger: Optional[logging.Logger] = None,
+                 fetch_workers: int = 2,
+                 parse_workers: int = 1,
+                 max_pending: int = 8):
+        """
+        初期化
+
+        Args:
+            fetch_func: URLを受け取り (content, error_info, response_time, not_modified) を返す関数
+                        （レート制限の待機を含むこと）
+            parse_func: HTML文字列を解析してBeautifulSoupオブジェクトを返す関数
+            logger: ロガーインスタンス
+            fetch_workers: 取得ステージのワーカー数
+            parse_workers: 解析ステージのワーカー数
+            max_pending: 同時に先読みしておく最大ページ数
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.fetch_func = fetch_func
+        self.parse_func = parse_func
+        self.max_pending = max(1, max_pending)
+
+        self._fetch_executor = ThreadPoolExecutor(
+            max_workers=max(1, fetch_workers), thread_name_prefix='detail-fetch'
+        )
+        self._parse_executor = ThreadPoolExecutor(
+            max_workers=max(1, parse_workers), thread_name_prefix='detail-parse'
+        )
+
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # 統計情報
+        self.stats = {
+            'submitted': 0,
+            'consumed': 0,
+            'discarded': 0,
+            'wait_time': 0.0,
+        }
+
+    def submit(self, url: str) -> bool:
+        """
+        URLの先読みを予約
+
+        Args:
+            url: 先読みするURL
+
+        Returns:
+            予約できた場合True（既に予約済み、上限到達、終了済みの場合はFalse）
+        """
+        if not url:
+            return False
+
+        with self._lock:
+            if self._closed or url in self._futures:
+                return False
+            if len(self._futures) >= self.max_pending:
+                return False
+
+            result = Future()
+            self._futures[url] = result
+            self.stats['submitted'] += 1
+
+        self._fetch_executor.submit(self._run_fetch_stage, url, result)
+        return True
+
+    def has_capacity(self) -> bool:
+        """新たに先読みを予約できるか"""
+        with self._lock:
+            return not self._closed and len(self._futures) < self.max_pending
+
+    def is_pending(self, url: str) -> bool:
+        """URLが先読み予約済みか"""
+        with self._lock:
+            return url in self._futures
+
+    def take(self, url: str, timeout: Optional[float] = None) -> Optional[PrefetchedPage]:
+        """
+        先読み結果を受け取る（完了するまで待機）
+
+        Args:
+            url: 対象URL
+            timeout: 最大待機秒数（Noneの場合は無制限）
+
+        Returns:
+            先読み結果（予約されていない場合や失敗した場合はNone）
+        """
+        with self._lock:
+            result = self._futures.pop(url, None)
+
+        if result is None:
+            return None
+
+        start_time = time.time()
+        try:
+            page = result.result(timeout=timeout)
+        except Exception as e:
+            self.logger.debug(f"先読み結果の取得に失敗: {url} - {type(e).__name__}: {e}")
+            return None
+        finally:
+            self.stats['wait_time'] += time.time() - start_time
+
+        self.stats['consumed'] += 1
+        return page
+
+    def discard(self, url: str) -> None:
+        """使用されなかった先読み結果を破棄"""
+        with self._lock:
+            result = self._futures.pop(url, None)
+
+        if result is not None:
+            result.cancel()
+            self.stats['discarded'] += 1
+
+    def close(self) -> None:
+        """パイプラインを終了（未処理の予約は破棄）"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            pending = list(self._futures.values())
+            self._futures.clear()
+
+        for result in pending:
+            result.cancel()
+        self.stats['discarded'] += len(pending)
+
+        self._fetch_executor.shutdown(wait=False, cancel_futures=True)
+        self._parse_executor.shutdown(wait=False, cancel_futures=True)
+
+        self.logger.info(
+            f"詳細ページ先読みパイプライン終了: 予約={self.stats['submitted']}件, "
+            f"使用={self.stats['consumed']}件, 破棄={self.stats['discarded']}件, "
+            f"待機合計={self.stats['wait_time']:.1f}秒"
+        )
+
+    def _run_fetch_stage(self, url: str, result: Future) -> None:
+        """取得ステージ（ワーカースレッドで実行）"""
+        if self._closed or not result.set_running_or_notify_cancel():
+            return
+
+        try:
+            content, error_info, response_time, not_modified = self.fetch_func(url)
+        except Exception as e:
+            content, response_time, not_modified = None, 0.0, False
+            error_info = {
+                'type': 'unknown_error',
+                'url': url,
+                'message': str(e)
+            }
+
+        page = PrefetchedPage(
+            url=url,
+            content=content,
+            error_info=error_info,
+            response_time=response_time,
+            not_modified=not_modified
+        )
+
+        # 前回から変更のないページは解析しない
+        if content and not error_info and not not_modified and not self._closed:
+            try:
+                self._parse_executor.submit(self._run_parse_stage, page, result)
+                return
+            except RuntimeError:
+                # 終了処理と競合した場合は未解析のまま返す
+                pass
+
+        result.set_result(page)
+
+    def _run_parse_stage(self, page: PrefetchedPage, result: Future) -> None:
+        """解析ステージ（ワーカースレッドで実行）"""
+        try:
+            page.soup = self.parse_func(page.content)
+        except Exception as e:
+            page.parse_error = e
+
+        result.set_result(page)
@@ -6,14 +6,72 @@ HTML解析に関する共通処理を担当
 - テーブルデータ抽出
 - CSS選択
 - URL正規化
+
+解析エンジンは切り替え可能
+- html.parser: 標準ライブラリのパーサー（最も遅いが追加の依存なし。デフォルト）
+- lxml: lxmlを使ったBeautifulSoup
+- selectolax: selectolax(lexbor)で不要なタグを除去してからlxmlで解析（selectolaxは任意の依存）
+
+lxml・selectolaxは環境変数 SCRAPER_PARSER_ENGINE で明示した場合のみ使用する
+（tbodyの補完など木の構造がhtml.parserと異なり、サイト別パーサーのセレクタが
+一致しなくなる場合があるため）。
 """
 import re
+import os
+import importlib.util
 import logging
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Sequence
 from bs4 import BeautifulSoup, Tag
 from datetime import datetime
 
 
+ENGINE_HTML_PARSER = 'html.parser'
+ENGINE_LXML = 'lxml'
+ENGINE_SELECTOLAX = 'selectolax'
+
+PARSER_ENGINES = (ENGINE_SELECTOLAX, ENGINE_LXML, ENGINE_HTML_PARSER)
+
+# エンジンが指定されていない場合に使用するエンジン
+DEFAULT_ENGINE = ENGINE_HTML_PARSER
+
+# selectolaxエンジンで除去するタグのデフォルト
+DEFAULT_PRUNE_TAGS = ('style', 'noscript', 'svg', 'iframe', 'template')
+
+
+def is_engine_available(engine: str) -> bool:
+    """解析エンジンが利用可能か（必要なパッケージがインストールされているか）"""
+    if engine == ENGINE_HTML_PARSER:
+        return True
+    if engine == ENGINE_LXML:
+        return importlib.util.find_spec('lxml') is not None
+    if engine == ENGINE_SELECTOLAX:
+        return (importlib.util.find_spec('selectolax') is not None
+                and importlib.util.find_spec('lxml') is not None)
+    return False
+
+
+def select_engine(supported: Sequence[str], requested: Optional[str] = None) -> str:
+    """
+    利用する解析エンジンを決定
+
+    Args:
+        supported: パーサーが対応するエンジン（優先順）
+        requested: 明示的に指定されたエンジン（環境変数 SCRAPER_PARSER_ENGINE など）
+
+    Returns:
+        requested が対応・利用可能ならそれ、指定がなければ DEFAULT_ENGINE、
+        そうでなければ supported のうち最初に利用可能なもの
+    """
+    if requested and requested in supported and is_engine_available(requested):
+        return requested
+    if not requested and DEFAULT_ENGINE in supported:
+        return DEFAULT_ENGINE
+    for engine in supported:
+        if is_engine_available(engine):
+            return engine
+    return ENGINE_HTML_PARSER
+
+
 class HtmlParserComponent:
     """
     HTML解析コンポーネント
@@ -27,35 +85,64 @@ class HtmlParserComponent:
     データの意味解釈や正規化はDataNormalizerに委譲
     """
     
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None,
+                 engine: Optional[str] = None,
+                 supported_engines: Sequence[str] = (ENGINE_LXML, ENGINE_HTML_PARSER),
+                 prune_tags: Sequence[str] = DEFAULT_PRUNE_TAGS):
         """
         初期化
         
         Args:
             logger: ロガーインスタンス
+            engine: 解析エンジン（Noneの場合は環境変数 SCRAPER_PARSER_ENGINE、
+                    未設定なら DEFAULT_ENGINE）
+            supported_engines: 対応する解析エンジン（指定したエンジンが使えない場合の優先順）
+            prune_tags: selectolaxエンジンで解析前に除去するタグ
         """
         self.logger = logger or logging.getLogger(__name__)
+        self.supported_engines = tuple(supported_engines)
+        self.prune_tags = list(prune_tags)
+        
+        requested = engine or os.getenv('SCRAPER_PARSER_ENGINE')
+        self.engine = select_engine(self.supported_engines, requested)
+        if requested and requested != self.engine:
+            self.logger.warning(
+                f"解析エンジン '{requested}' は使用できないため '{self.engine}' を使用します"
+                f"（対応エンジン: {', '.join(self.supported_engines)}）"
+            )
     
-    def parse_html(self, html_content: str, parser: str = 'html.parser') -> Optional[BeautifulSoup]:
+    def parse_html(self, html_content: str, parser: Optional[str] = None) -> Optional[BeautifulSoup]:
         """
         HTML文字列をBeautifulSoupオブジェクトに変換
         
         Args:
             html_content: HTML文字列
-            parser: パーサーの種類
+            parser: 解析エンジン（Noneの場合は初期化時に決定したエンジン）
             
         Returns:
             BeautifulSoupオブジェクト
         """
         if not html_content:
             return None
-            
+        
+        engine = parser or self.engine
         try:
-            return BeautifulSoup(html_content, parser)
+            if engine == ENGINE_SELECTOLAX:
+                return BeautifulSoup(self._prune_html(html_content), ENGINE_LXML)
+            return BeautifulSoup(html_content, engine)
         except Exception as e:
             self.logger.error(f"HTML解析エラー: {e}")
             return None
     
+    def _prune_html(self, html_content: str) -> str:
+        """selectolaxで不要なタグを除去したHTMLを返す（BeautifulSoupが構築する要素数を減らす）"""
+        from selectolax.lexbor import LexborHTMLParser
+        
+        tree = LexborHTMLParser(html_content)
+        if self.prune_tags:
+            tree.strip_tags(self.prune_tags)
+        return tree.html or ''
+    
     def extract_text(self, element: Union[Tag, BeautifulSoup, str, None]) -> Optional[str]:
         """
         HTML要素からテキストを抽出
@@ -67,12 +67,46 @@ class HttpClientComponent:
             - content: 取得したコンテンツ（成功時）
             - error_info: エラー情報（失敗時）
         """
+        content, error_info, _ = self.fetch_with_response_info(
+            url, method=method, headers=headers, params=params, data=data,
+            check_content=check_content
+        )
+        return content, error_info
+    
+    def fetch_with_response_info(self, url: str,
+                                 method: str = 'GET',
+                                 headers: Optional[Dict[str, str]] = None,
+                                 params: Optional[Dict[str, Any]] = None,
+                                 data: Optional[Dict[str, Any]] = None,
+                                 check_content: Optional[Callable[[str], bool]] = None
+                                 ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        URLからコンテンツを取得し、レスポンスの付加情報も返す
+        
+        条件付きGET（If-None-Match / If-Modified-Since）に対する
+        304 Not Modified はエラーではなく content=None, not_modified=True として返す。
+        
+        Args:
+            url: 取得するURL
+            method: HTTPメソッド
+            headers: 追加ヘッダー
+            params: URLパラメータ
+            data: POSTデータ
+            check_content: コンテンツ検証関数
+            
+        Returns:
+            (content, error_info, response_info) のタプル
+            - content: 取得したコンテンツ（成功時）
+            - error_info: エラー情報（失敗時）
+            - response_info: status_code, etag, last_modified, not_modified
+        """
         # ヘッダーのマージ
         req_headers = self.session.headers.copy()
         if headers:
             req_headers.update(headers)
         
         last_error = None
+        response_info = {'status_code': None, 'etag': None, 'last_modified': None, 'not_modified': False}
         
         for attempt in range(self.retry_count):
             try:
@@ -88,6 +122,16 @@ class HttpClientComponent:
                     timeout=self.timeout
                 )
                 
+                response_info['status_code'] = response.status_code
+                response_info['etag'] = response.headers.get('ETag')
+                response_info['last_modified'] = response.headers.get('Last-Modified')
+                
+                # 条件付きGETで変更なし
+                if response.status_code == 304:
+                    response_info['not_modified'] = True
+                    self.logger.debug(f"変更なし (304): {url}")
+                    return None, None, response_info
+                
                 # ステータスコードチェック
                 if response.status_code == 404:
                     return None, {
@@ -95,7 +139,7 @@ class HttpClientComponent:
                         'status_code': 404,
                         'url': url,
                         'message': 'Page not found'
-                    }
+                    }, response_info
                 
                 if response.status_code == 503:
                     return None, {
@@ -103,7 +147,7 @@ class HttpClientComponent:
                         'status_code': 503,
                         'url': url,
                         'message': 'Service unavailable'
-                    }
+                    }, response_info
                 
                 response.raise_for_status()
                 
@@ -118,7 +162,7 @@ class HttpClientComponent:
                     raise ValueError("Content validation failed")
                 
                 self.logger.debug(f"コンテンツ取得成功: {url} (サイズ: {len(content)} bytes)")
-                return content, None
+                return content, None, response_info
                 
             except requests.exceptions.Timeout:
                 last_error = {
@@ -156,7 +200,7 @@ class HttpClientComponent:
         
         # 全試行失敗
         self.logger.error(f"コンテンツ取得失敗 (全{self.retry_count}回失敗): {url}")
-        return None, last_error
+        return None, last_error, response_info
     
     def close(self):
         """セッションを閉じる"""
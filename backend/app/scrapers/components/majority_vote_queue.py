@@ -0,0 +1,210 @@
+"""
+多数決更新キューコンポーネント
+
+スクレイピング中の物件・建物の多数決更新を保存トランザクションの外で行う
+- 保存処理は物件ID・建物IDをキューに追加するだけ（同じIDは1件にまとめる）
+- キューは建物単位にまとめてバッチで処理し、建物の多数決は1バッチにつき1回だけ実行する
+- ワーカースレッドを使う場合は一定間隔で処理し、使わない場合は flush() で処理する
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ...models import Building, MasterProperty
+from ...utils.property_search_summary import refresh_property_search_summary
+
+
+class MajorityVoteQueue:
+    """
+    物件・建物の多数決更新を重複除去して後でまとめて実行するキュー
+
+    キーは物件IDで、建物IDは最後に追加された値を使う。処理中に同じ物件が
+    再度追加された場合は次のバッチで再計算する（保存済みの掲載を確実に反映するため）。
+    """
+
+    def __init__(self,
+                 session_factory: Callable[[], Session],
+                 logger: Optional[logging.Logger] = None,
+                 batch_size: int = 200,
+                 use_worker: bool = False,
+                 flush_interval: float = 30.0):
+        """
+        初期化
+
+        Args:
+            session_factory: 多数決更新に使うセッションを作成する関数（バッチごとに作成・クローズ）
+            logger: ロガーインスタンス
+            batch_size: 1バッチで処理する最大物件数
+            use_worker: ワーカースレッドで定期的に処理するか
+            flush_interval: ワーカースレッドの処理間隔（秒）
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        # 物件ID → 建物ID（dictの挿入順で処理する）
+        self._pending: Dict[int, Optional[int]] = {}
+        self._lock = threading.Lock()  # キューと統計情報を保護
+        self._process_lock = threading.Lock()  # バッチ処理の同時実行を防ぐ
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        # 統計情報
+        self.stats = {
+            'requested': 0,
+            'coalesced': 0,
+            'properties_updated': 0,
+            'buildings_updated': 0,
+            'batches': 0,
+            'errors': 0,
+            'vote_time': 0.0,
+        }
+
+        self._worker = None
+        if use_worker:
+            self._worker = threading.Thread(
+                target=self._run_worker, name='majority-vote-worker', daemon=True
+            )
+            self._worker.start()
+
+    def add(self, property_id: Optional[int], building_id: Optional[int] = None) -> None:
+        """
+        物件（と建物）の多数決更新を予約
+
+        保存トランザクションのコミット後に呼ぶこと（未コミットの掲載は別セッションから見えないため）。
+        クローズ後に呼ばれた場合はその場で処理する。
+        """
+        if not property_id:
+            return
+
+        with self._lock:
+            self.stats['requested'] += 1
+            if property_id in self._pending:
+                self.stats['coalesced'] += 1
+            self._pending[property_id] = building_id
+            closed = self._closed
+
+        if closed:
+            self.flush()
+
+    def _count(self, key: str, value=1) -> None:
+        """統計情報を加算（ワーカースレッドと呼び出し元のスレッドの両方から呼ばれる）"""
+        with self._lock:
+            self.stats[key] += value
+
+    def pending_count(self) -> int:
+        """未処理の物件数"""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """未処理の更新を全て処理（呼び出し元のスレッドで実行）"""
+        while self._process_next_batch():
+            pass
+
+    def close(self) -> None:
+        """ワーカースレッドを停止し、残りの更新を全て処理"""
+        with self._lock:
+            self._closed = True
+        if self._worker is not None:
+            self._wakeup.set()
+            self._worker.join()
+            self._worker = None
+        self.flush()
+
+        with self._lock:
+            stats = dict(self.stats)
+        self.logger.info(
+            f"多数決更新キュー: 予約 {stats['requested']}件（重複 {stats['coalesced']}件）, "
+            f"物件 {stats['properties_updated']}件, 建物 {stats['buildings_updated']}件, "
+            f"バッチ {stats['batches']}回, エラー {stats['errors']}件, "
+            f"処理時間 {stats['vote_time']:.1f}秒"
+        )
+
+    def _run_worker(self) -> None:
+        """一定間隔でキューを処理するワーカースレッド"""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            with self._lock:
+                closed = self._closed
+            if closed:
+                # 残りは close() の呼び出し元で処理する
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"多数決更新ワーカーでエラー: {e}")
+
+    def _take_batch(self) -> List[Tuple[int, Optional[int]]]:
+        with self._lock:
+            batch = []
+            for property_id in list(self._pending)[:self.batch_size]:
+                batch.append((property_id, self._pending.pop(property_id)))
+            return batch
+
+    def _process_next_batch(self) -> bool:
+        """1バッチ分を処理（処理するものがなければFalse）"""
+        with self._process_lock:
+            batch = self._take_batch()
+            if not batch:
+                return False
+
+            start = time.time()
+            session = self.session_factory()
+            try:
+                for building_id, property_ids in self._group_by_building(batch):
+                    self._update_group(session, building_id, property_ids)
+            finally:
+                session.close()
+                self._count('batches')
+                self._count('vote_time', time.time() - start)
+            return True
+
+    @staticmethod
+    def _group_by_building(batch: List[Tuple[int, Optional[int]]]) -> List[Tuple[Optional[int], List[int]]]:
+        """同じ建物の物件をまとめる（建物の多数決を1回にするため）"""
+        groups: Dict[Optional[int], List[int]] = {}
+        for property_id, building_id in batch:
+            groups.setdefault(building_id, []).append(property_id)
+        return list(groups.items())
+
+    def _update_group(self, session: Session, building_id: Optional[int], property_ids: List[int]) -> None:
+        """
+        1つの建物とその物件の多数決を更新してコミット
+
+        順序は従来の保存時と同じく、物件建物名 → 建物（建物名を含む） → 物件の順。
+        多数決で変わった値は同じトランザクションで物件検索用の集計にも反映する。
+        エラーが発生した場合はこの建物の分だけロールバックして次に進む。
+        """
+        from ...utils.majority_vote_updater import MajorityVoteUpdater
+
+        try:
+            updater = MajorityVoteUpdater(session)
+
+            if building_id:
+                for property_id in property_ids:
+                    updater.update_property_building_name_by_majority(property_id)
+                building = session.get(Building, building_id)
+                if building:
+                    updater.update_building_by_majority(building)
+                    self._count('buildings_updated')
+
+            for property_id in property_ids:
+                master_property = session.get(MasterProperty, property_id)
+                if master_property:
+                    updater.update_master_property_by_majority(master_property)
+                    self._count('properties_updated')
+
+            refresh_property_search_summary(session, property_ids)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            self._count('errors')
+            self.logger.warning(
+                f"多数決更新エラー: building_id={building_id}, property_ids={property_ids} - {e}"
+            )
@@ -0,0 +1,210 @@
+"""
+ページストアコンポーネント
+
+取得したHTMLをディスクに永続化し、再クロール時の条件付きGETに利用する
+- 本文はSHA-256ハッシュをキーにgzip圧縮して保存（同一内容は1ファイルのみ）
+- URLごとにETag/Last-Modified/本文ハッシュを記録
+- 取得履歴を残し、過去のクロール結果をオフラインで再生できる
+"""
+import gzip
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple, List
+
+
+class PageStoreComponent:
+    """取得済みページを内容アドレスで保存するコンポーネント"""
+
+    INDEX_FILENAME = 'index.sqlite3'
+    OBJECTS_DIRNAME = 'objects'
+
+    def __init__(self, base_dir: str, logger: Optional[logging.Logger] = None):
+        """
+        初期化
+
+        Args:
+            base_dir: 保存先ディレクトリ
+            logger: ロガーインスタンス
+        """
+        self.logger = logger or logging.getLogger(__name__)
+        self.base_dir = Path(base_dir)
+        self.objects_dir = self.base_dir / self.OBJECTS_DIRNAME
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.base_dir / self.INDEX_FILENAME
+
+        # SQLite接続はスレッドごとに保持（先読みワーカーからも利用される）
+        self._local = threading.local()
+        self._init_schema()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """スレッドごとのSQLite接続を取得"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.index_path), timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        """インデックスのテーブルを作成"""
+        conn = self._get_connection()
+        with conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    body_hash TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at TEXT NOT NULL,
+                    checked_at TEXT NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS page_versions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    body_hash TEXT NOT NULL,
+                    fetched_at TEXT NOT NULL
+                )
+            ''')
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_page_versions_url ON page_versions (url, fetched_at)'
+            )
+
+    @staticmethod
+    def compute_hash(content: str) -> str:
+        """本文のハッシュを計算"""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _object_path(self, body_hash: str) -> Path:
+        return self.objects_dir / body_hash[:2] / f"{body_hash}.html.gz"
+
+    def get_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """URLの最新の記録を取得"""
+        row = self._get_connection().execute(
+            'SELECT body_hash, etag, last_modified, fetched_at, checked_at FROM pages WHERE url = ?',
+            (url,)
+        ).fetchone()
+        if not row:
+            return None
+        return {
+            'url': url,
+            'body_hash': row[0],
+            'etag': row[1],
+            'last_modified': row[2],
+            'fetched_at': row[3],
+            'checked_at': row[4],
+        }
+
+    def get_conditional_headers(self, url: str) -> Dict[str, str]:
+        """条件付きGET用のヘッダーを生成（本文が残っている場合のみ）"""
+        entry = self.get_entry(url)
+        if not entry or not self._object_path(entry['body_hash']).exists():
+            return {}
+
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load_body(self, url: str) -> Optional[str]:
+        """URLの最新の本文を読み込む"""
+        entry = self.get_entry(url)
+        if not entry:
+            return None
+        return self.load_object(entry['body_hash'])
+
+    def load_object(self, body_hash: str) -> Optional[str]:
+        """ハッシュから本文を読み込む"""
+        path = self._object_path(body_hash)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"ページストアの読み込みに失敗: {body_hash} - {e}")
+            return None
+
+    def save(self, url: str, content: str,
+             etag: Optional[str] = None,
+             last_modified: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        取得した本文を保存
+
+        Args:
+            url: 取得したURL
+            content: 本文
+            etag: ETagヘッダー
+            last_modified: Last-Modifiedヘッダー
+
+        Returns:
+            (body_hash, changed) のタプル
+            - changed: 前回保存した本文と異なる場合True（初回もTrue）
+        """
+        body_hash = self.compute_hash(content)
+        previous = self.get_entry(url)
+        changed = previous is None or previous['body_hash'] != body_hash
+
+        path = self._object_path(body_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 書き込み途中のファイルを読まれないよう一時ファイル経由で置き換える
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        now = datetime.now().isoformat()
+        conn = self._get_connection()
+        with conn:
+            conn.execute('''
+                INSERT INTO pages (url, body_hash, etag, last_modified, fetched_at, checked_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    body_hash = excluded.body_hash,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    fetched_at = CASE WHEN pages.body_hash = excluded.body_hash
+                                      THEN pages.fetched_at ELSE excluded.fetched_at END,
+                    checked_at = excluded.checked_at
+            ''', (url, body_hash, etag, last_modified, now, now))
+            if changed:
+                conn.execute(
+                    'INSERT INTO page_versions (url, body_hash, fetched_at) VALUES (?, ?, ?)',
+                    (url, body_hash, now)
+                )
+
+        return body_hash, changed
+
+    def mark_checked(self, url: str) -> None:
+        """304応答などで内容が変わっていないことを確認した日時を記録"""
+        conn = self._get_connection()
+        with conn:
+            conn.execute(
+                'UPDATE pages SET checked_at = ? WHERE url = ?',
+                (datetime.now().isoformat(), url)
+            )
+
+    def get_versions(self, url: str) -> List[Dict[str, Any]]:
+        """URLの取得履歴（本文が変わった時点の一覧）を古い順に返す"""
+        rows = self._get_connection().execute(
+            'SELECT body_hash, fetched_at FROM page_versions WHERE url = ? ORDER BY fetched_at, id',
+            (url,)
+        ).fetchall()
+        return [{'body_hash': row[0], 'fetched_at': row[1]} for row in rows]
+
+    def close(self) -> None:
+        """現在のスレッドの接続を閉じる"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -9,6 +9,7 @@
 """
 import time
 import logging
+import threading
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
@@ -61,6 +62,9 @@ class RateLimiterComponent:
         
         # 適応的調整の履歴
         self.success_history = defaultdict(lambda: deque(maxlen=self.ADAPTIVE_CONFIG['window_size']))
+        
+        # 複数スレッドからの同時呼び出しでも遅延を守るためのロック
+        self._lock = threading.Lock()
     
     def wait_if_needed(self, site: str) -> float:
         """
@@ -72,26 +76,29 @@ class RateLimiterComponent:
         Returns:
             実際に待機した秒数
         """
-        delay = self._get_delay(site)
-        last_time = self.last_request_times.get(site)
-        
-        if last_time:
-            elapsed = time.time() - last_time
-            wait_time = max(0, delay - elapsed)
+        # 送信枠の予約はロック内で行い、待機自体はロック外で行う
+        # （先読みワーカーが複数あってもサイト別の遅延を共有する）
+        with self._lock:
+            delay = self._get_delay(site)
+            last_time = self.last_request_times.get(site)
+            now = time.time()
             
-            if wait_time > 0:
-                self.logger.debug(f"{site}: {wait_time:.1f}秒待機")
-                time.sleep(wait_time)
-                actual_wait = wait_time
+            if last_time:
+                wait_time = max(0, delay - (now - last_time))
             else:
-                actual_wait = 0.0
+                wait_time = 0.0
+            
+            # 最終リクエスト時刻を更新（待機後の送信予定時刻）
+            self.last_request_times[site] = now + wait_time
+            self.request_counts[site] += 1
+        
+        if wait_time > 0:
+            self.logger.debug(f"{site}: {wait_time:.1f}秒待機")
+            time.sleep(wait_time)
+            actual_wait = wait_time
         else:
             actual_wait = 0.0
         
-        # 最終リクエスト時刻を更新
-        self.last_request_times[site] = time.time()
-        self.request_counts[site] += 1
-        
         return actual_wait
     
     def _get_delay(self, site: str) -> float:
@@ -16,6 +16,39 @@ from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
 
 
+# ========== 駅情報のフォーマットで使うパターン ==========
+# format_station_info は掲載ごとに呼ばれるため、路線名ごとの正規表現はモジュール読み込み時に作る
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# 「東京メトロ南北線・都営地下鉄三田線」のような複合路線
+_COMBINED_LINE_RE = re.compile(r'([^「」\s]+線・[^「」\s]+線)')
+
+# 複合路線を保護するプレースホルダー（__PROTECTED_LINE_0__ など）の前
+_PROTECTED_LINE_BREAK_RE = re.compile(r'(?<!^)(?<![\n])(?=__PROTECTED_LINE_\d+__)')
+
+# 路線名の前（改行を入れる位置）。路線名の順に1つずつ適用する
+_STATION_RAILWAY_NAMES = [
+    '東京メトロ', '都営地下鉄', '都営', 'ＪＲ', 'JR', '京王', '小田急', 
+    '東急', '京急', '京成', '新交通', '東武', '西武', '相鉄', 
+    'りんかい線', 'つくばエクスプレス', '横浜市営', '東葉高速', 
+    '北総', '埼玉高速', '多摩都市モノレール'
+]
+_RAILWAY_BREAK_RES = [
+    re.compile(f'(?<!^)(?<![\\n])(?={re.escape(name)})') for name in _STATION_RAILWAY_NAMES
+]
+
+# 駅情報の終端（バス+徒歩の複合パターン、単独の終端パターン）
+_BUS_WALK_RE = re.compile(r'(.*?バス\d+分.*?(?:徒歩|歩|停歩)\d+分)')
+_STATION_END_RES = [re.compile(pattern) for pattern in [
+    r'(.*?(?:徒歩|歩)\d+分)',
+    r'(.*?バス\d+分)',
+    r'(.*?車\d+分)',
+    r'(.*?停歩\d+分)',
+]]
+_RAILWAY_NAME_RE = re.compile(r'(東京メトロ|都営|ＪＲ|JR|京王|小田急|東急|京急|京成|新交通|東武|西武|相鉄|りんかい線|つくばエクスプレス)')
+
+
 class DataNormalizer:
     """データ正規化のメインクラス"""
     
@@ -665,7 +698,7 @@ class DataNormalizer:
             return ""
         
         # HTMLタグだけは削除（表示を妨げるため）
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _HTML_TAG_RE.sub('', text)
         
         # 改行とスペースを正規化
         # 「・」で終わる行と次の行を結合
@@ -699,32 +732,21 @@ class DataNormalizer:
         
         # 「東京メトロ南北線・都営地下鉄三田線」のようなパターンを保護
         # 「線・」を含む部分全体を保護
-        combined_line_pattern = r'([^「」\s]+線・[^「」\s]+線)'
-        for match in re.finditer(combined_line_pattern, text):
+        for match in _COMBINED_LINE_RE.finditer(text):
             placeholder = f'__PROTECTED_LINE_{protected_counter}__'
             protected_patterns.append((placeholder, match.group(0)))
             text = text.replace(match.group(0), placeholder)
             protected_counter += 1
         
-        # 通常の路線名の前で改行を入れる
-        # 路線名パターンのリスト
-        railway_patterns = [
-            '東京メトロ', '都営地下鉄', '都営', 'ＪＲ', 'JR', '京王', '小田急', 
-            '東急', '京急', '京成', '新交通', '東武', '西武', '相鉄', 
-            'りんかい線', 'つくばエクスプレス', '横浜市営', '東葉高速', 
-            '北総', '埼玉高速', '多摩都市モノレール'
-        ]
+        # プレースホルダーの前でも改行を入れる（文字列の先頭でない場合）
+        if protected_counter:
+            text = _PROTECTED_LINE_BREAK_RE.sub('\n', text)
         
-        # プレースホルダーの前でも改行を入れる
-        for i in range(protected_counter):
-            placeholder = f'__PROTECTED_LINE_{i}__'
-            # プレースホルダーの前に改行を入れる（文字列の先頭でない場合）
-            text = re.sub(f'(?<!^)(?<![\\n])(?={re.escape(placeholder)})', '\n', text)
-        
-        for pattern in railway_patterns:
+        # 通常の路線名の前で改行を入れる
+        for pattern in _RAILWAY_BREAK_RES:
             # パターンの前に改行がない場合のみ改行を挿入
             # ただし文字列の先頭の場合は改行を挿入しない
-            text = re.sub(f'(?<!^)(?<![\\n])(?={re.escape(pattern)})', '\n', text)
+            text = pattern.sub('\n', text)
         
         # 保護したパターンを復元
         for placeholder, original in protected_patterns:
@@ -743,24 +765,16 @@ class DataNormalizer:
             # 駅情報の終端パターンを探して、それ以降を削除
             # バス利用の場合は「バス●分バス停名歩●分」のパターンも処理
             # まず、バス+徒歩の複合パターンを処理
-            bus_walk_pattern = r'(.*?バス\d+分.*?(?:徒歩|歩|停歩)\d+分)'
-            bus_walk_match = re.search(bus_walk_pattern, line)
+            bus_walk_match = _BUS_WALK_RE.search(line)
             if bus_walk_match:
                 # バス+徒歩パターンの場合は、その部分を抽出
                 line = bus_walk_match.group(1)
             else:
                 # 単独の終端パターンを探す
                 # パターン: 徒歩●分、歩●分、バス●分、車●分、停歩●分
-                patterns = [
-                    r'(.*?(?:徒歩|歩)\d+分)',
-                    r'(.*?バス\d+分)',
-                    r'(.*?車\d+分)',
-                    r'(.*?停歩\d+分)',
-                ]
-                
                 # 各パターンを検索し、最初にマッチしたものを使用
-                for pattern in patterns:
-                    match = re.search(pattern, line)
+                for pattern in _STATION_END_RES:
+                    match = pattern.search(line)
                     if match:
                         line = match.group(1)
                         break
@@ -771,7 +785,7 @@ class DataNormalizer:
             if any(keyword in line for keyword in ['駅', '線', '徒歩', '歩', '分', 'バス', '車', '停']):
                 cleaned_lines.append(line)
             # 路線名パターンにマッチする行も有効
-            elif re.search(r'(東京メトロ|都営|ＪＲ|JR|京王|小田急|東急|京急|京成|新交通|東武|西武|相鉄|りんかい線|つくばエクスプレス)', line):
+            elif _RAILWAY_NAME_RE.search(line):
                 cleaned_lines.append(line)
         
         return '\n'.join(cleaned_lines)
@@ -1084,12 +1098,11 @@ def clean_address(text: str, soup_element=None) -> str:
         return ""
     
     # HTMLタグを削除（念のため）
-    import re
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _HTML_TAG_RE.sub('', text)
     
     # AddressNormalizerを直接使用
-    from ..utils.address_normalizer import AddressNormalizer
-    address_normalizer = AddressNormalizer()
+    from ..utils.address_normalizer import get_address_normalizer
+    address_normalizer = get_address_normalizer()
     return address_normalizer.remove_ui_elements(text)
 
 
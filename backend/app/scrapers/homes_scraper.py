@@ -206,7 +206,7 @@ class HomesScraper(BaseScraper):
                 self.logger.error(f"[HOMES] JavaScript実行に失敗しました: {url}")
                 return None
 
-            return BeautifulSoup(html, 'html.parser')
+            return self.parse_html(html)
 
         except Exception as e:
             self.logger.error(f"[HOMES] ページ取得エラー: {url}, {type(e).__name__}: {e}")
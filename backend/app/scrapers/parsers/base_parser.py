@@ -12,6 +12,9 @@ from bs4 import BeautifulSoup, Tag
 from datetime import datetime
 
 from ..components import HtmlParserComponent, DataValidatorComponent
+from ..components.html_parser import (
+    ENGINE_HTML_PARSER, ENGINE_LXML, DEFAULT_PRUNE_TAGS
+)
 
 
 class BaseHtmlParser:
@@ -23,6 +26,12 @@ class BaseHtmlParser:
     - データ正規化はDataNormalizerの関数を使用
     """
     
+    # SCRAPER_PARSER_ENGINE で指定できるHTML解析エンジン（指定したエンジンが使えない場合の優先順）。
+    # サブクラスでサイトのHTMLに合わせて上書きする（未指定時は常にhtml.parser）
+    SUPPORTED_PARSER_ENGINES: Tuple[str, ...] = (ENGINE_LXML, ENGINE_HTML_PARSER)
+    # selectolaxエンジンで解析前に除去するタグ（パースで参照しないもの）
+    PRUNE_TAGS: Tuple[str, ...] = DEFAULT_PRUNE_TAGS
+    
     def __init__(self, logger: Optional[logging.Logger] = None):
         """
         初期化
@@ -31,8 +40,11 @@ class BaseHtmlParser:
             logger: ロガーインスタンス
         """
         self.logger = logger or logging.getLogger(__name__)
-        from ..components.html_parser import HtmlParserComponent
-        self.html_parser = HtmlParserComponent(logger=self.logger)
+        self.html_parser = HtmlParserComponent(
+            logger=self.logger,
+            supported_engines=self.SUPPORTED_PARSER_ENGINES,
+            prune_tags=self.PRUNE_TAGS
+        )
 
     
     # ========== フィールド抽出追跡フレームワーク ==========
@@ -10,6 +10,7 @@ from bs4 import BeautifulSoup, Tag
 from urllib.parse import urljoin
 
 from .base_parser import BaseHtmlParser
+from ..components.html_parser import ENGINE_SELECTOLAX, ENGINE_LXML, ENGINE_HTML_PARSER
 from ..data_normalizer import extract_monthly_fee
 
 
@@ -19,6 +20,9 @@ class LivableParser(BaseHtmlParser):
     # 東急リバブルのデフォルト設定
     DEFAULT_AGENCY_NAME = "東急リバブル"
     BASE_URL = "https://www.livable.co.jp"
+
+    # 住所をscriptタグ内のJSONから読むため、selectolaxでもscriptは残す
+    SUPPORTED_PARSER_ENGINES = (ENGINE_SELECTOLAX, ENGINE_LXML, ENGINE_HTML_PARSER)
     
     # デバッグ用の物件ID
     DEBUG_PROPERTY_IDS = []
@@ -10,6 +10,7 @@ from bs4 import BeautifulSoup, Tag
 from datetime import datetime
 
 from .base_parser import BaseHtmlParser
+from ..components.html_parser import ENGINE_SELECTOLAX, ENGINE_LXML, ENGINE_HTML_PARSER, DEFAULT_PRUNE_TAGS
 from ..data_normalizer import extract_monthly_fee
 
 
@@ -19,6 +20,9 @@ class NomuParser(BaseHtmlParser):
     # ノムコムのデフォルト設定
     DEFAULT_AGENCY_NAME = "野村不動産アーバンネット"
     BASE_URL = "https://www.nomu.com"
+
+    SUPPORTED_PARSER_ENGINES = (ENGINE_SELECTOLAX, ENGINE_LXML, ENGINE_HTML_PARSER)
+    PRUNE_TAGS = DEFAULT_PRUNE_TAGS + ('script',)
     
     def __init__(self, logger: Optional[logging.Logger] = None):
         """
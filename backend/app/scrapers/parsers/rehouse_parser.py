@@ -10,6 +10,7 @@ from typing import Optional, List, Dict, Any
 from bs4 import BeautifulSoup, Tag
 
 from .base_parser import BaseHtmlParser
+from ..components.html_parser import ENGINE_LXML, ENGINE_HTML_PARSER
 from ..data_normalizer import extract_monthly_fee
 
 
@@ -19,6 +20,9 @@ class RehouseParser(BaseHtmlParser):
     # 三井のリハウスのデフォルト設定
     DEFAULT_AGENCY_NAME = "三井のリハウス"
     BASE_URL = "https://www.rehouse.co.jp"
+
+    # tbodyの有無で表の形式を判定しているため、tbodyを補完するselectolax(HTML5準拠)は使わない
+    SUPPORTED_PARSER_ENGINES = (ENGINE_LXML, ENGINE_HTML_PARSER)
     
     def __init__(self, logger: Optional[logging.Logger] = None):
         """
@@ -9,6 +9,7 @@ from typing import Optional, List, Dict, Any
 from bs4 import BeautifulSoup, Tag
 
 from .base_parser import BaseHtmlParser
+from ..components.html_parser import ENGINE_SELECTOLAX, ENGINE_LXML, ENGINE_HTML_PARSER
 from ..data_normalizer import extract_monthly_fee
 
 
@@ -18,6 +19,9 @@ class SuumoParser(BaseHtmlParser):
     # SUUMOのデフォルト設定
     DEFAULT_AGENCY_NAME = None  # SUUMOは不動産会社ではないため、デフォルト値は設定しない
     BASE_URL = "https://suumo.jp"
+
+    # 向き情報をscriptタグから読むため、selectolaxでもscriptは残す
+    SUPPORTED_PARSER_ENGINES = (ENGINE_SELECTOLAX, ENGINE_LXML, ENGINE_HTML_PARSER)
     
     def __init__(self, logger: Optional[logging.Logger] = None):
         """
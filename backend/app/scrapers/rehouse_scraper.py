@@ -196,7 +196,7 @@ class RehouseScraper(BaseScraper):
         # 多数決による物件情報更新（建物情報も含む）
         # listingからmaster_propertyへの参照を取得
         if listing.master_property:
-            self._update_by_majority_vote(session, listing.master_property)
+            self._request_majority_vote(session, listing.master_property)
     
     
     def _set_additional_fields(self, listing: PropertyListing, property_data: Dict[str, Any]):
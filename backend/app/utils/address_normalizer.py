@@ -2,132 +2,366 @@
 住所正規化ユーティリティ
 
 住所の表記ゆれを吸収し、同一住所を正確に判定するためのツール
+
+正規表現はモジュール読み込み時にコンパイルし、normalize / normalize_for_comparison の結果は
+入力文字列ごとにメモ化する（normalization_cache）。
 """
 
 import re
-from typing import Dict, Optional, Tuple, List
+from typing import Dict, Iterable, Optional, Tuple, List
 import unicodedata
 
+from .normalization_cache import memoize_normalizer, normalize_many
+
+
+# 数字の正規化辞書
+NUMBER_MAP = {
+    '０': '0', '１': '1', '２': '2', '３': '3', '４': '4',
+    '５': '5', '６': '6', '７': '7', '８': '8', '９': '9',
+    '一': '1', '二': '2', '三': '3', '四': '4', '五': '5',
+    '六': '6', '七': '7', '八': '8', '九': '9', '十': '10',
+    '〇': '0', '○': '0'
+}
+# 千・百・十・万以外の数字の変換表（千・百・十・万は位取りとして別に処理する）
+_SIMPLE_NUMBER_TABLE = str.maketrans({
+    old: new for old, new in NUMBER_MAP.items() if old not in ['十', '百', '千', '万']
+})
+_FULLWIDTH_DIGIT_TABLE = str.maketrans('０１２３４５６７８９', '0123456789')
+
+# 丁目・番地・号の表記パターン
+BLOCK_PATTERNS = [
+    # 丁目-番地-号パターン（最も詳細なパターンから処理）
+    (r'(\d+)\s*丁目\s*(\d+)\s*番地?\s*(\d+)\s*号?', r'\1-\2-\3'),
+    (r'(\d+)\s*丁目\s*(\d+)\s*番地?', r'\1-\2'),
+    (r'(\d+)\s*丁目\s*(\d+)\s*[-－−]\s*(\d+)', r'\1-\2-\3'),  # 7丁目1-19のパターン
+    (r'(\d+)\s*丁目\s*(\d+)\s*号', r'\1-\2'),  # 7丁目119号のパターン
+    (r'(\d+)\s*丁目\s*(\d+)(?![番号])', r'\1-\2'),  # 7丁目119のパターン（番・号が続かない）
+    (r'(\d+)\s*丁目(?!\d)', r'\1'),  # 丁目のみ（後ろに数字が続かない場合）
+    
+    # 番地・号パターン（丁目なし）
+    (r'(\d+)\s*番地?\s*(\d+)\s*号?', r'\1-\2'),
+    (r'(\d+)\s*番地?(?!\d)', r'\1'),  # 番地のみ（後ろに数字が続かない場合）
+    
+    # ハイフン区切りパターン（そのまま）
+    (r'(\d+)\s*[-－−]\s*(\d+)\s*[-－−]\s*(\d+)', r'\1-\2-\3'),
+    (r'(\d+)\s*[-－−]\s*(\d+)', r'\1-\2'),
+]
+_BLOCK_RES = [(re.compile(pattern), replacement) for pattern, replacement in BLOCK_PATTERNS]
+
+# 住所の構成要素パターン
+ADDRESS_COMPONENTS = {
+    'prefecture': r'(東京都|北海道|(?:京都|大阪)府|(?:神奈川|埼玉|千葉|愛知|兵庫|福岡)県|(?:\S+?)県)',
+    'city': r'(\S+?[市])',
+    'ward': r'(\S+?[区])',
+    'town': r'(\S+?[町村])',
+    'area': r'([^0-9０-９一二三四五六七八九十〇○]+)',  # 地域名（数字以外）
+}
+_COMPONENT_RES = {key: re.compile(pattern) for key, pattern in ADDRESS_COMPONENTS.items()}
+
+# 番地情報の抽出パターン（丁目を含むパターンを優先）
+_COMPONENT_BLOCK_RES = [re.compile(pattern) for pattern in [
+    r'\d+丁目\d+番地?\d*号?',       # N丁目N番地N号、N丁目N番N号、N丁目N番地、N丁目N番
+    r'\d+丁目\d+-\d+',             # N丁目N-N
+    r'\d+丁目\d+',                 # N丁目N
+    r'\d+-\d+-\d+',                # N-N-N
+    r'\d+-\d+',                    # N-N
+    r'\d+丁目',                    # N丁目のみ
+    r'\d+番地?\d*号?',             # N番地N号、N番N号、N番地、N番
+    r'\d+',                        # 数字のみ
+]]
+
+# 千・百・十を含む漢数字のパターン（例：「二千三百四十五」「百十九」「千二百」）
+_KANJI_NUMBER_RE = re.compile(r'[一二三四五六七八九千百十〇○]+')
+
+_SPACES_RE = re.compile(r'\s+')
+_FULLWIDTH_HYPHEN_RE = re.compile(r'[－−]')
+
+# ========== 住所の終端位置の検出パターン ==========
+
+# 数字パターンの定義（全角・半角・漢数字）
+_NUM = r'[０-９0-9一二三四五六七八九十百千万〇○]+'
+
+# 最も詳細な住所パターンから順に試行
+_ADDRESS_END_RES = [
+    # パターン1: ○丁目○番地○号（最も正式な表記）
+    re.compile(_NUM + r'丁目' + r'[\s]*' + _NUM + r'番地' + r'[\s]*' + _NUM + r'号'),
+    # パターン2: ○丁目○番○号
+    re.compile(_NUM + r'丁目' + r'[\s]*' + _NUM + r'番' + r'[\s]*' + _NUM + r'号'),
+    # パターン3: ○丁目○-○（ハイフン区切り、3つ目の数字はオプション）
+    re.compile(
+        _NUM + r'丁目' + r'[\s]*' + _NUM + r'[-－−]' + _NUM +
+        r'(?:[-－−]' + _NUM + r')?'
+    ),
+    # パターン4: ○丁目○番地
+    re.compile(_NUM + r'丁目' + r'[\s]*' + _NUM + r'番地'),
+    # パターン5: ○丁目○番
+    re.compile(_NUM + r'丁目' + r'[\s]*' + _NUM + r'番'),
+    # パターン6: ○丁目○（丁目の後に数字のみ、番・号が続かない場合）
+    re.compile(_NUM + r'丁目' + r'[\s]*' + _NUM + r'(?![番号])'),
+    # パターン7: ○丁目（丁目のみ、後に数字が続かない）
+    re.compile(_NUM + r'丁目' + r'(?![\s]*' + _NUM + r')'),
+    # パターン8: ハイフン区切りの番地（丁目なし）
+    # 例：「千駄ヶ谷4-20-3」「日本橋3-5-1」「三番町26-1」
+    # 町名の後に直接数字-数字パターンが来る場合
+    re.compile(
+        r'(?<=[ぁ-んァ-ヶー一-龯])'  # 前に日本語文字（町名）
+        r'[０-９0-9]+' +  # 数字1
+        r'[-－−]' +  # ハイフン
+        r'[０-９0-9]+' +  # 数字2
+        r'(?:[-－−][０-９0-9]+)?'  # 数字3（オプション）
+    ),
+    # パターン9: 番地表記（○番地○号、○番○号など）
+    re.compile(
+        r'(?<=[ぁ-んァ-ヶー一-龯])' +  # 前に日本語文字
+        _NUM + r'番地?' +
+        r'[\s]*' +
+        _NUM + r'号?'
+    ),
+    # パターン10: 町名の後の単純な数字（最も簡略な表記）
+    re.compile(
+        r'(?<=[ぁ-んァ-ヶー一-龯])' +  # 前に日本語文字
+        r'[０-９0-9]+' +  # 数字のみ
+        r'(?![０-９0-9\-－−番号丁])'  # 後に番地関連の文字が続かない
+    ),
+]
+
+# パターン11: 町名のみで終わる場合（番地なし）の東京の町名パターン（番地を含まない町名のみ）
+# 注意：「丁目」パターンは既にパターン1-7で処理済みなので、ここでは不要
+_TOKYO_TOWN_RES = [re.compile(pattern) for pattern in [
+    # 「日本橋」で始まる町名（実際の町名を列挙）
+    r'^(日本橋中洲|日本橋久松町|日本橋人形町|日本橋兜町|日本橋堀留町|日本橋大伝馬町|日本橋室町|日本橋富沢町|日本橋小伝馬町|日本橋小網町|日本橋本町|日本橋横山町|日本橋浜町|日本橋箱崎町|日本橋茅場町|日本橋蛎殻町|日本橋馬喰町)',
+    
+    # 番地なしでも有効な特別な地名（「日本橋」単独も含む）
+    r'^(銀座|丸の内|大手町|有楽町|霞が関|永田町|日比谷|赤坂|青山|六本木|新宿|渋谷|原宿|表参道|日本橋)',
+    
+    # ○○町で終わる（東京で最も一般的、ただし「丁目」を含まない）
+    r'^[ぁ-んァ-ヶー一-龯々]{2,}町',
+    
+    # 方角＋地名（例：南青山、北青山、西新宿、東新橋）
+    # カタカナを除外してひらがな・漢字のみにする
+    r'^[東西南北][ぁ-ん一-龯々]+',
+    
+    # ○○坂、○○谷、○○橋、○○台など地形由来
+    r'^[ぁ-んァ-ヶー一-龯々]{2,}(坂|谷|橋|台|原|川|田|山|ヶ丘|が丘|ケ丘)',
+    
+    # 番町（一番町〜六番町）- これは特別なケース
+    r'^[一二三四五六]番町',
+    
+    # 上○○、下○○、中○○、元○○（例：上原、中落合、下落合、元代々木）
+    # カタカナを除外してひらがな・漢字のみにする
+    r'^(上|下|中|元)[ぁ-ん一-龯々]+',
+]]
+
+# 都道府県パターン
+_PREFECTURE_PATTERN = r'(?:東京都|北海道|(?:京都|大阪)府|(?:青森|岩手|宮城|秋田|山形|福島|茨城|栃木|群馬|埼玉|千葉|神奈川|新潟|富山|石川|福井|山梨|長野|岐阜|静岡|愛知|三重|滋賀|兵庫|奈良|和歌山|鳥取|島根|岡山|広島|山口|徳島|香川|愛媛|高知|福岡|佐賀|長崎|熊本|大分|宮崎|鹿児島|沖縄)県)'
+
+# 市区町村の検出（都道府県＋市/区、都道府県＋郡＋町/村、都道府県なしで市/区から始まる場合）
+_CITY_RES = [
+    re.compile(_PREFECTURE_PATTERN + r'([^市区]+(?:市|区))'),
+    re.compile(_PREFECTURE_PATTERN + r'([^郡]+郡[^町村]+(?:町|村))'),
+    re.compile(r'^([^市区]+(?:市|区))'),
+]
+_STARTS_WITH_DIGIT_RE = re.compile(r'^[０-９0-9]')
+_STARTS_WITH_GOOGLE_RE = re.compile(r'^[Gg]oogle')
+
+# ========== UI要素の除去 ==========
+
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# UI要素のキーワード（最も早く出現するものより前を住所とする）
+_UI_KEYWORDS = [
+    # 地図関連
+    'GoogleMaps', 'Google Maps', 'GOOGLEMAPS', 'googlemaps',
+    'グーグルマップ', 'Googleマップ', 'Google地図',
+    '地図', 'マップ', 'MAP', 'Map', 'map',
+    # リンク・表示関連
+    'を見る', 'はこちら', '詳細', '周辺', 'へのリンク',
+    'もっと見る', 'アクセス',
+    # 記号
+    '※', '＊', '[', '【', '(', '→'
+]
+
+# 都道府県＋市区町村までの基本的な住所パターン
+_BASIC_ADDRESS_RE = re.compile(r'^(.*?(?:都|道|府|県).*?(?:区|市|町|村))')
+
+# 住所パターンの判定（都道府県、市区町村、番地）
+_CONTAINS_ADDRESS_RES = [
+    re.compile(_PREFECTURE_PATTERN),
+    re.compile(r'[市区町村]'),
+    re.compile(r'\d+丁目|\d+番|\d+号|\d+-\d+'),
+]
+
+# ========== normalize で使うパターン ==========
+
+_PUNCTUATION_RE = re.compile(r'[、。，．]')
+_PARENTHESES_RE = re.compile(r'[（(][^）)]*[）)]')
+
+# パターン1: ○丁目○番地○号 / ○丁目○番○号 / ○丁目○-○-○
+_CHOME_BANCHI_GO_RE = re.compile(
+    r'([０-９0-9一二三四五六七八九十百千万〇○]+)'  # 数字1
+    r'(丁目)'  # 丁目
+    r'[\s]*'  # 空白（あってもなくても）
+    r'([０-９0-9一二三四五六七八九十百千万〇○]+)'  # 数字2
+    r'(番地?|[-－−])'  # 番地/番/ハイフン
+    r'[\s]*'  # 空白
+    r'([０-９0-9一二三四五六七八九十百千万〇○]+)?'  # 数字3（オプション）
+    r'(号|[-－−])?'  # 号/ハイフン（オプション）
+)
+
+# パターン2: ○丁目○ （丁目の後に数字のみ）
+_CHOME_NUMBER_RE = re.compile(
+    r'([０-９0-9一二三四五六七八九十百千万〇○]+)'  # 数字1
+    r'(丁目)'  # 丁目
+    r'[\s]*'  # 空白
+    r'([０-９0-9一二三四五六七八九十百千万〇○]+)'  # 数字2
+    r'(?![番号丁])'  # 番・号・丁が続かない
+)
+
+# パターン3: 単独の○丁目
+_CHOME_ONLY_RE = re.compile(
+    r'([０-９0-9一二三四五六七八九十百千万〇○]+)'  # 数字
+    r'(丁目)'  # 丁目
+    r'(?![\s]*[０-９0-9一二三四五六七八九十百千万〇○])'  # 後に数字が続かない
+)
+
+# パターン4: ハイフン区切りの番地（丁目なし）
+# 例：「千駄ヶ谷4-20-3」「日本橋3-5-1」
+# ただし、前に地名（漢字・ひらがな・カタカナ）があることが条件
+_HYPHEN_BLOCK_RE = re.compile(
+    r'(?<=[ぁ-んァ-ヶー一-龯])'  # 前に日本語文字
+    r'([０-９0-9]+)'  # 数字1
+    r'[-－−]'  # ハイフン
+    r'([０-９0-9]+)'  # 数字2
+    r'(?:[-－−]([０-９0-9]+))?'  # 数字3（オプション）
+)
+
+# 町名の後の単独の全角数字（番地の可能性）
+_TOWN_FULLWIDTH_NUMBER_RE = re.compile(r'(?<=[町村通り条])([０-９]+)(?=[-－−]|$)')
+
+_BLOCK_NUMBERS_RE = re.compile(r'(\d+(?:-\d+)*)')
+_CHOME_BLOCK_RE = re.compile(r'^\d+丁目$')
+_CHOME_FOLLOWED_BY_NUMBER_RE = re.compile(r'丁目\d+')
+_CHOME_IN_AREA_RE = re.compile(r'\d+丁目')
+_CHOME_PREFIX_RE = re.compile(r'^(\d+丁目)')
+
+
+def _convert_complex_japanese_number(text: str) -> str:
+    """千・百・十を含む漢数字を変換"""
+    # 基本的な数値マップ
+    basic_nums = {
+        '一': 1, '二': 2, '三': 3, '四': 4, '五': 5,
+        '六': 6, '七': 7, '八': 8, '九': 9, '〇': 0, '○': 0
+    }
+    
+    # 位の値
+    positions = {'千': 1000, '百': 100, '十': 10}
+    
+    # 数値に変換
+    result = 0
+    current_num = 0
+    
+    for char in text:
+        if char in basic_nums:
+            current_num = basic_nums[char]
+        elif char in positions:
+            if current_num == 0:
+                # 「百」「千」の前に数字がない場合は1とする
+                current_num = 1
+            result += current_num * positions[char]
+            current_num = 0
+        else:
+            # 変換できない文字が含まれる場合は元の文字列を返す
+            return text
+    
+    # 最後の数字を追加
+    result += current_num
+    
+    return str(result)
+
+
+def _replace_complex_japanese_number(match: re.Match) -> str:
+    matched_text = match.group(0)
+    # 千・百・十のいずれかを含む場合のみ変換
+    if any(pos in matched_text for pos in ['千', '百', '十']):
+        return _convert_complex_japanese_number(matched_text)
+    # 単純な数字の場合はそのまま返す
+    return matched_text
+
+
+def _normalize_numbers(text: str) -> str:
+    """全角数字・漢数字を半角数字に変換"""
+    normalized = _KANJI_NUMBER_RE.sub(_replace_complex_japanese_number, text)
+    # その後、残った単純な数字を置換
+    return normalized.translate(_SIMPLE_NUMBER_TABLE)
+
+
+def _normalize_block_digits(num_str: str) -> str:
+    """番地の数字文字列を半角数字に変換"""
+    # 漢数字の「十」「百」「千」を含む場合
+    if any(char in num_str for char in ['十', '百', '千', '万']):
+        return _normalize_numbers(num_str)
+    # 全角数字・簡単な漢数字を変換
+    return num_str.translate(_SIMPLE_NUMBER_TABLE)
+
+
+def _replace_chome_banchi_go(match: re.Match) -> str:
+    """○丁目○番○号パターンを正規化"""
+    groups = match.groups()
+    result = _normalize_block_digits(groups[0])  # 丁目の数字
+    result += '-'
+    result += _normalize_block_digits(groups[2])  # 番/番地の数字
+    if groups[4]:  # 号の数字があれば
+        result += '-' + _normalize_block_digits(groups[4])
+    return result
+
+
+def _replace_chome_number(match: re.Match) -> str:
+    """○丁目○パターンを正規化"""
+    groups = match.groups()
+    return _normalize_block_digits(groups[0]) + '-' + _normalize_block_digits(groups[2])
+
+
+def _replace_chome_only(match: re.Match) -> str:
+    """単独の○丁目を正規化"""
+    return _normalize_block_digits(match.group(1))
+
+
+def _replace_hyphen_block(match: re.Match) -> str:
+    """ハイフン区切り番地を正規化"""
+    groups = match.groups()
+    result = groups[0].translate(_FULLWIDTH_DIGIT_TABLE)
+    result += '-'
+    result += groups[1].translate(_FULLWIDTH_DIGIT_TABLE)
+    if groups[2]:
+        result += '-' + groups[2].translate(_FULLWIDTH_DIGIT_TABLE)
+    return result
+
 
 class AddressNormalizer:
     """住所正規化クラス"""
     
-    def __init__(self):
-        # 数字の正規化辞書
-        self.number_map = {
-            '０': '0', '１': '1', '２': '2', '３': '3', '４': '4',
-            '５': '5', '６': '6', '７': '7', '８': '8', '９': '9',
-            '一': '1', '二': '2', '三': '3', '四': '4', '五': '5',
-            '六': '6', '七': '7', '八': '8', '九': '9', '十': '10',
-            '〇': '0', '○': '0'
-        }
-        
-        # 丁目・番地・号の表記パターン
-        self.block_patterns = [
-            # 丁目-番地-号パターン（最も詳細なパターンから処理）
-            (r'(\d+)\s*丁目\s*(\d+)\s*番地?\s*(\d+)\s*号?', r'\1-\2-\3'),
-            (r'(\d+)\s*丁目\s*(\d+)\s*番地?', r'\1-\2'),
-            (r'(\d+)\s*丁目\s*(\d+)\s*[-－−]\s*(\d+)', r'\1-\2-\3'),  # 7丁目1-19のパターン
-            (r'(\d+)\s*丁目\s*(\d+)\s*号', r'\1-\2'),  # 7丁目119号のパターン
-            (r'(\d+)\s*丁目\s*(\d+)(?![番号])', r'\1-\2'),  # 7丁目119のパターン（番・号が続かない）
-            (r'(\d+)\s*丁目(?!\d)', r'\1'),  # 丁目のみ（後ろに数字が続かない場合）
-            
-            # 番地・号パターン（丁目なし）
-            (r'(\d+)\s*番地?\s*(\d+)\s*号?', r'\1-\2'),
-            (r'(\d+)\s*番地?(?!\d)', r'\1'),  # 番地のみ（後ろに数字が続かない場合）
-            
-            # ハイフン区切りパターン（そのまま）
-            (r'(\d+)\s*[-－−]\s*(\d+)\s*[-－−]\s*(\d+)', r'\1-\2-\3'),
-            (r'(\d+)\s*[-－−]\s*(\d+)', r'\1-\2'),
-        ]
-        
-        # 住所の構成要素パターン
-        self.address_components = {
-            'prefecture': r'(東京都|北海道|(?:京都|大阪)府|(?:神奈川|埼玉|千葉|愛知|兵庫|福岡)県|(?:\S+?)県)',
-            'city': r'(\S+?[市])',
-            'ward': r'(\S+?[区])',
-            'town': r'(\S+?[町村])',
-            'area': r'([^0-9０-９一二三四五六七八九十〇○]+)',  # 地域名（数字以外）
-        }
+    # 数字の正規化辞書・丁目番地号の表記パターン・住所の構成要素パターン
+    number_map = NUMBER_MAP
+    block_patterns = BLOCK_PATTERNS
+    address_components = ADDRESS_COMPONENTS
     
     def normalize_numbers(self, text: str) -> str:
         """全角数字・漢数字を半角数字に変換"""
-        normalized = text
-        
-        # 複雑な漢数字を処理する関数
-        def convert_complex_japanese_number(text):
-            """千・百・十を含む漢数字を変換"""
-            # 基本的な数値マップ
-            basic_nums = {
-                '一': 1, '二': 2, '三': 3, '四': 4, '五': 5,
-                '六': 6, '七': 7, '八': 8, '九': 9, '〇': 0, '○': 0
-            }
-            
-            # 位の値
-            positions = {'千': 1000, '百': 100, '十': 10}
-            
-            # 数値に変換
-            result = 0
-            current_num = 0
-            
-            i = 0
-            while i < len(text):
-                char = text[i]
-                
-                if char in basic_nums:
-                    current_num = basic_nums[char]
-                elif char in positions:
-                    if current_num == 0:
-                        # 「百」「千」の前に数字がない場合は1とする
-                        current_num = 1
-                    result += current_num * positions[char]
-                    current_num = 0
-                else:
-                    # 変換できない文字が含まれる場合は元の文字列を返す
-                    return text
-                
-                i += 1
-            
-            # 最後の数字を追加
-            result += current_num
-            
-            return str(result)
-        
-        # 千・百・十を含む漢数字のパターン
-        # 例：「二千三百四十五」「百十九」「千二百」
-        pattern = r'[一二三四五六七八九千百十〇○]+'
-        
-        def replace_func(match):
-            matched_text = match.group(0)
-            # 千・百・十のいずれかを含む場合のみ変換
-            if any(pos in matched_text for pos in ['千', '百', '十']):
-                return convert_complex_japanese_number(matched_text)
-            else:
-                # 単純な数字の場合はそのまま返す
-                return matched_text
-        
-        normalized = re.sub(pattern, replace_func, normalized)
-        
-        # その後、残った単純な数字を置換
-        for old, new in self.number_map.items():
-            if old not in ['千', '百', '十']:  # 千・百・十は上で処理済み
-                normalized = normalized.replace(old, new)
-        
-        return normalized
+        return _normalize_numbers(text)
     
     def normalize_block_number(self, text: str) -> str:
         """丁目・番地・号の表記を統一"""
         normalized = text
         
         # 各パターンを適用
-        for pattern, replacement in self.block_patterns:
-            normalized = re.sub(pattern, replacement, normalized)
+        for pattern, replacement in _BLOCK_RES:
+            normalized = pattern.sub(replacement, normalized)
         
         # 余分なスペースを削除
-        normalized = re.sub(r'\s+', '', normalized)
+        normalized = _SPACES_RE.sub('', normalized)
         
         # ハイフンの統一
-        normalized = re.sub(r'[－−]', '-', normalized)
+        normalized = _FULLWIDTH_HYPHEN_RE.sub('-', normalized)
         
         return normalized
     
@@ -145,46 +379,16 @@ class AddressNormalizer:
         
         remaining = address
         
-        # 都道府県
-        pref_match = re.search(self.address_components['prefecture'], remaining)
-        if pref_match:
-            components['prefecture'] = pref_match.group(1)
-            remaining = remaining[pref_match.end():]
+        # 都道府県・市・区・町村の順に取り出す
+        for key in ['prefecture', 'city', 'ward', 'town']:
+            match = _COMPONENT_RES[key].search(remaining)
+            if match:
+                components[key] = match.group(1)
+                remaining = remaining[match.end():]
         
-        # 市
-        city_match = re.search(self.address_components['city'], remaining)
-        if city_match:
-            components['city'] = city_match.group(1)
-            remaining = remaining[city_match.end():]
-        
-        # 区
-        ward_match = re.search(self.address_components['ward'], remaining)
-        if ward_match:
-            components['ward'] = ward_match.group(1)
-            remaining = remaining[ward_match.end():]
-        
-        # 町村
-        town_match = re.search(self.address_components['town'], remaining)
-        if town_match:
-            components['town'] = town_match.group(1)
-            remaining = remaining[town_match.end():]
-        
-        # 番地情報を抽出（より正確なパターン）
-        # 丁目を含むパターンを優先
-        block_patterns = [
-            r'\d+丁目\d+番地?\d*号?',       # N丁目N番地N号、N丁目N番N号、N丁目N番地、N丁目N番
-            r'\d+丁目\d+-\d+',             # N丁目N-N
-            r'\d+丁目\d+',                 # N丁目N
-            r'\d+-\d+-\d+',                # N-N-N
-            r'\d+-\d+',                    # N-N
-            r'\d+丁目',                    # N丁目のみ
-            r'\d+番地?\d*号?',             # N番地N号、N番N号、N番地、N番
-            r'\d+',                        # 数字のみ
-        ]
-        
-        matched = False
-        for pattern in block_patterns:
-            match = re.search(pattern, remaining)
+        # 番地情報を抽出（丁目を含むパターンを優先）
+        for pattern in _COMPONENT_BLOCK_RES:
+            match = pattern.search(remaining)
             if match:
                 # マッチした部分全体を番地として保存
                 components['block'] = match.group(0)
@@ -192,10 +396,8 @@ class AddressNormalizer:
                 components['area'] = remaining[:match.start()].strip()
                 # 番地より後の部分を建物名として保存
                 components['building'] = remaining[match.end():].strip()
-                matched = True
                 break
-        
-        if not matched:
+        else:
             # 番地がない場合は全体を地域名として保存
             components['area'] = remaining.strip()
         
@@ -222,183 +424,42 @@ class AddressNormalizer:
         if not address:
             return None
 
-        # 数字パターンの定義（全角・半角・漢数字）
-        num_pattern = r'[０-９0-9一二三四五六七八九十百千万〇○]+'
-
-        # 最も詳細な住所パターンから順に試行
-
-        # パターン1: ○丁目○番地○号（最も正式な表記）
-        pattern1 = re.compile(
-            num_pattern + r'丁目' +
-            r'[\s]*' +
-            num_pattern + r'番地' +
-            r'[\s]*' +
-            num_pattern + r'号'
-        )
-        match = pattern1.search(address)
-        if match:
-            return match.end()
-
-        # パターン2: ○丁目○番○号
-        pattern2 = re.compile(
-            num_pattern + r'丁目' +
-            r'[\s]*' +
-            num_pattern + r'番' +
-            r'[\s]*' +
-            num_pattern + r'号'
-        )
-        match = pattern2.search(address)
-        if match:
-            return match.end()
-
-        # パターン3: ○丁目○-○（ハイフン区切り）
-        pattern3 = re.compile(
-            num_pattern + r'丁目' +
-            r'[\s]*' +
-            num_pattern + r'[-－−]' + num_pattern +
-            r'(?:[-－−]' + num_pattern + r')?'  # 3つ目の数字はオプション
-        )
-        match = pattern3.search(address)
-        if match:
-            return match.end()
-
-        # パターン4: ○丁目○番地
-        pattern4 = re.compile(
-            num_pattern + r'丁目' +
-            r'[\s]*' +
-            num_pattern + r'番地'
-        )
-        match = pattern4.search(address)
-        if match:
-            return match.end()
-
-        # パターン5: ○丁目○番
-        pattern5 = re.compile(
-            num_pattern + r'丁目' +
-            r'[\s]*' +
-            num_pattern + r'番'
-        )
-        match = pattern5.search(address)
-        if match:
-            return match.end()
-
-        # パターン6: ○丁目○（丁目の後に数字のみ）
-        pattern6 = re.compile(
-            num_pattern + r'丁目' +
-            r'[\s]*' +
-            num_pattern +
-            r'(?![番号])'  # 番・号が続かない場合
-        )
-        match = pattern6.search(address)
-        if match:
-            return match.end()
-
-        # パターン7: ○丁目（丁目のみ）
-        pattern7 = re.compile(
-            num_pattern + r'丁目' +
-            r'(?![\s]*' + num_pattern + r')'  # 後に数字が続かない
-        )
-        match = pattern7.search(address)
-        if match:
-            return match.end()
-
-        # パターン8: ハイフン区切りの番地（丁目なし）
-        # 例：「千駄ヶ谷4-20-3」「日本橋3-5-1」「三番町26-1」
-        # 町名の後に直接数字-数字パターンが来る場合
-        pattern8 = re.compile(
-            r'(?<=[ぁ-んァ-ヶー一-龯])'  # 前に日本語文字（町名）
-            r'[０-９0-9]+' +  # 数字1
-            r'[-－−]' +  # ハイフン
-            r'[０-９0-9]+' +  # 数字2
-            r'(?:[-－−][０-９0-9]+)?'  # 数字3（オプション）
-        )
-        match = pattern8.search(address)
-        if match:
-            return match.end()
-
-        # パターン9: 番地表記（○番地○号、○番○号など）
-        pattern9 = re.compile(
-            r'(?<=[ぁ-んァ-ヶー一-龯])' +  # 前に日本語文字
-            num_pattern + r'番地?' +
-            r'[\s]*' +
-            num_pattern + r'号?'
-        )
-        match = pattern9.search(address)
-        if match:
-            return match.end()
-
-        # パターン10: 町名の後の単純な数字（最も簡略な表記）
-        pattern10 = re.compile(
-            r'(?<=[ぁ-んァ-ヶー一-龯])' +  # 前に日本語文字
-            r'[０-９0-9]+' +  # 数字のみ
-            r'(?![０-９0-9\-－−番号丁])'  # 後に番地関連の文字が続かない
-        )
-        match = pattern10.search(address)
-        if match:
-            return match.end()
+        # パターン1〜10: 丁目・番地・号の表記（最も詳細な住所パターンから順に試行）
+        for pattern in _ADDRESS_END_RES:
+            match = pattern.search(address)
+            if match:
+                return match.end()
 
         # パターン11: 町名のみで終わる場合（番地なし）
         # 「東京都中央区銀座」「東京都千代田区丸の内」など
         # 市区町村の後に町名があり、その後に番地等がない場合
         
-        # 東京の町名パターンを定義（番地を含まない町名のみ）
-        # 注意：「丁目」パターンは既にパターン1-7で処理済みなので、ここでは不要
-        tokyo_town_patterns = [
-            # 「日本橋」で始まる町名（実際の町名を列挙）
-            r'^(日本橋中洲|日本橋久松町|日本橋人形町|日本橋兜町|日本橋堀留町|日本橋大伝馬町|日本橋室町|日本橋富沢町|日本橋小伝馬町|日本橋小網町|日本橋本町|日本橋横山町|日本橋浜町|日本橋箱崎町|日本橋茅場町|日本橋蛎殻町|日本橋馬喰町)',
-            
-            # 番地なしでも有効な特別な地名（「日本橋」単独も含む）
-            r'^(銀座|丸の内|大手町|有楽町|霞が関|永田町|日比谷|赤坂|青山|六本木|新宿|渋谷|原宿|表参道|日本橋)',
-            
-            # ○○町で終わる（東京で最も一般的、ただし「丁目」を含まない）
-            r'^[ぁ-んァ-ヶー一-龯々]{2,}町',
-            
-            # 方角＋地名（例：南青山、北青山、西新宿、東新橋）
-            # カタカナを除外してひらがな・漢字のみにする
-            r'^[東西南北][ぁ-ん一-龯々]+',
-            
-            # ○○坂、○○谷、○○橋、○○台など地形由来
-            r'^[ぁ-んァ-ヶー一-龯々]{2,}(坂|谷|橋|台|原|川|田|山|ヶ丘|が丘|ケ丘)',
-            
-            # 番町（一番町〜六番町）- これは特別なケース
-            r'^[一二三四五六]番町',
-            
-            # 上○○、下○○、中○○、元○○（例：上原、中落合、下落合、元代々木）
-            # カタカナを除外してひらがな・漢字のみにする
-            r'^(上|下|中|元)[ぁ-ん一-龯々]+',
-        ]
-        
         # まず、市区町村を探す（都道府県の後の市区町村のみ）
         # 都道府県の後に来る最初の市・区、または郡＋町村を探す
-        prefecture_pattern = r'(?:東京都|北海道|(?:京都|大阪)府|(?:青森|岩手|宮城|秋田|山形|福島|茨城|栃木|群馬|埼玉|千葉|神奈川|新潟|富山|石川|福井|山梨|長野|岐阜|静岡|愛知|三重|滋賀|兵庫|奈良|和歌山|鳥取|島根|岡山|広島|山口|徳島|香川|愛媛|高知|福岡|佐賀|長崎|熊本|大分|宮崎|鹿児島|沖縄)県)'
-        
-        # パターン1: 都道府県＋市/区
-        city_match = re.search(prefecture_pattern + r'([^市区]+(?:市|区))', address)
-        if not city_match:
-            # パターン2: 都道府県＋郡＋町/村
-            city_match = re.search(prefecture_pattern + r'([^郡]+郡[^町村]+(?:町|村))', address)
-        if not city_match:
-            # パターン3: 都道府県なしで市/区から始まる場合
-            city_match = re.search(r'^([^市区]+(?:市|区))', address)
+        city_match = None
+        for pattern in _CITY_RES:
+            city_match = pattern.search(address)
+            if city_match:
+                break
         
         if city_match:
             # 市区町村の後の部分を取得
             after_city = address[city_match.end():]
             
             # まず数字が来る場合は町名なしとして扱う
-            if re.match(r'^[０-９0-9]', after_city.strip()):
+            if _STARTS_WITH_DIGIT_RE.match(after_city.strip()):
                 return None
             
             # GoogleMaps等のUI要素で始まる場合も町名なしとして扱う
-            if re.match(r'^[Gg]oogle', after_city.strip()):
+            if _STARTS_WITH_GOOGLE_RE.match(after_city.strip()):
                 return None
             
             # 町名パターンをチェック
             after_city_stripped = after_city.strip()
             
             # 東京の町名パターンを順にチェック
-            for pattern in tokyo_town_patterns:
-                match = re.match(pattern, after_city_stripped)
+            for pattern in _TOKYO_TOWN_RES:
+                match = pattern.match(after_city_stripped)
                 if match:
                     # 町名の終端位置を取得
                     town_len = match.end()
@@ -419,7 +480,7 @@ class AddressNormalizer:
             return ""
         
         # HTMLタグを削除（念のため）
-        address = re.sub(r'<[^>]+>', '', address)
+        address = _HTML_TAG_RE.sub('', address)
         
         # 住所の終端位置を検出
         end_pos = self.find_address_end_position(address)
@@ -428,21 +489,9 @@ class AddressNormalizer:
         
         # パターンにマッチしない場合のフォールバック処理
         # フォールバック1: UI要素のキーワードで分割
-        ui_keywords = [
-            # 地図関連
-            'GoogleMaps', 'Google Maps', 'GOOGLEMAPS', 'googlemaps',
-            'グーグルマップ', 'Googleマップ', 'Google地図',
-            '地図', 'マップ', 'MAP', 'Map', 'map',
-            # リンク・表示関連
-            'を見る', 'はこちら', '詳細', '周辺', 'へのリンク',
-            'もっと見る', 'アクセス',
-            # 記号
-            '※', '＊', '[', '【', '(', '→'
-        ]
-        
         # 最も早く出現するキーワードの位置を探す
         earliest_pos = len(address)
-        for keyword in ui_keywords:
+        for keyword in _UI_KEYWORDS:
             pos = address.find(keyword)
             if pos != -1 and pos < earliest_pos:
                 earliest_pos = pos
@@ -458,8 +507,7 @@ class AddressNormalizer:
         
         # フォールバック2: 基本的な住所パターンで抽出
         # 都道府県＋市区町村までは最低限抽出を試みる
-        basic_pattern = r'^(.*?(?:都|道|府|県).*?(?:区|市|町|村))'
-        match = re.search(basic_pattern, address)
+        match = _BASIC_ADDRESS_RE.search(address)
         if match:
             return match.group(1).strip()
         
@@ -479,21 +527,15 @@ class AddressNormalizer:
         if not text:
             return False
             
-        # 都道府県パターン
-        prefecture_pattern = r'(?:東京都|北海道|(?:京都|大阪)府|(?:青森|岩手|宮城|秋田|山形|福島|茨城|栃木|群馬|埼玉|千葉|神奈川|新潟|富山|石川|福井|山梨|長野|岐阜|静岡|愛知|三重|滋賀|兵庫|奈良|和歌山|鳥取|島根|岡山|広島|山口|徳島|香川|愛媛|高知|福岡|佐賀|長崎|熊本|大分|宮崎|鹿児島|沖縄)県)'
-        
-        # 市区町村パターン
-        city_pattern = r'[市区町村]'
-        
-        # 番地パターン
-        address_number_pattern = r'\d+丁目|\d+番|\d+号|\d+-\d+'
-        
-        # いずれかのパターンが含まれているかチェック
-        patterns = [prefecture_pattern, city_pattern, address_number_pattern]
-        return any(re.search(pattern, text) for pattern in patterns)
+        # 都道府県・市区町村・番地のいずれかのパターンが含まれているかチェック
+        return any(pattern.search(text) for pattern in _CONTAINS_ADDRESS_RES)
 
     def normalize(self, address: str) -> str:
-        """住所を正規化"""
+        """住所を正規化（結果は入力文字列ごとにメモ化される）"""
+        return normalize_address(address)
+    
+    def _normalize(self, address: str) -> str:
+        """住所を正規化（メモ化なし）"""
         if not address:
             return ""
         
@@ -504,121 +546,38 @@ class AddressNormalizer:
         normalized = unicodedata.normalize('NFKC', address)
         
         # 余分なスペースを削除
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        normalized = _SPACES_RE.sub(' ', normalized).strip()
         
         # 句読点を削除
-        normalized = re.sub(r'[、。，．]', '', normalized)
+        normalized = _PUNCTUATION_RE.sub('', normalized)
         
         # カッコ内の情報を削除（建物名など）
-        normalized = re.sub(r'[（(][^）)]*[）)]', '', normalized).strip()
-        
-        # 番地の数字を正規化する関数
-        def normalize_number(num_str):
-            """数字文字列を半角数字に変換"""
-            # 漢数字の「十」「百」「千」を含む場合
-            if any(char in num_str for char in ['十', '百', '千', '万']):
-                return self.normalize_numbers(num_str)
-            else:
-                # 全角数字・簡単な漢数字を変換
-                result = num_str
-                for old, new in self.number_map.items():
-                    if old not in ['十', '百', '千', '万']:
-                        result = result.replace(old, new)
-                return result
-        
-        # 住所番地の厳密なパターン
-        # パターン1: ○丁目○番地○号 / ○丁目○番○号 / ○丁目○-○-○
-        pattern1 = re.compile(
-            r'([０-９0-9一二三四五六七八九十百千万〇○]+)'  # 数字1
-            r'(丁目)'  # 丁目
-            r'[\s]*'  # 空白（あってもなくても）
-            r'([０-９0-9一二三四五六七八九十百千万〇○]+)'  # 数字2
-            r'(番地?|[-－−])'  # 番地/番/ハイフン
-            r'[\s]*'  # 空白
-            r'([０-９0-9一二三四五六七八九十百千万〇○]+)?'  # 数字3（オプション）
-            r'(号|[-－−])?'  # 号/ハイフン（オプション）
-        )
-        
-        def replace_pattern1(match):
-            """○丁目○番○号パターンを正規化"""
-            groups = match.groups()
-            result = normalize_number(groups[0])  # 丁目の数字
-            result += '-'
-            result += normalize_number(groups[2])  # 番/番地の数字
-            if groups[4]:  # 号の数字があれば
-                result += '-' + normalize_number(groups[4])
-            return result
-        
-        # パターン2: ○丁目○ （丁目の後に数字のみ）
-        pattern2 = re.compile(
-            r'([０-９0-9一二三四五六七八九十百千万〇○]+)'  # 数字1
-            r'(丁目)'  # 丁目
-            r'[\s]*'  # 空白
-            r'([０-９0-9一二三四五六七八九十百千万〇○]+)'  # 数字2
-            r'(?![番号丁])'  # 番・号・丁が続かない
-        )
+        normalized = _PARENTHESES_RE.sub('', normalized).strip()
         
-        def replace_pattern2(match):
-            """○丁目○パターンを正規化"""
-            groups = match.groups()
-            result = normalize_number(groups[0])  # 丁目の数字
-            result += '-'
-            result += normalize_number(groups[2])  # 番地の数字
-            return result
-        
-        # パターン3: 単独の○丁目
-        pattern3 = re.compile(
-            r'([０-９0-9一二三四五六七八九十百千万〇○]+)'  # 数字
-            r'(丁目)'  # 丁目
-            r'(?![\s]*[０-９0-9一二三四五六七八九十百千万〇○])'  # 後に数字が続かない
-        )
-        
-        def replace_pattern3(match):
-            """単独の○丁目を正規化"""
-            return normalize_number(match.group(1))
-        
-        # パターン4: ハイフン区切りの番地（丁目なし）
-        # 例：「千駄ヶ谷4-20-3」「日本橋3-5-1」
-        # ただし、前に地名（漢字・ひらがな・カタカナ）があることが条件
-        pattern4 = re.compile(
-            r'(?<=[ぁ-んァ-ヶー一-龯])'  # 前に日本語文字
-            r'([０-９0-9]+)'  # 数字1
-            r'[-－−]'  # ハイフン
-            r'([０-９0-9]+)'  # 数字2
-            r'(?:[-－−]([０-９0-9]+))?'  # 数字3（オプション）
-        )
-        
-        def replace_pattern4(match):
-            """ハイフン区切り番地を正規化"""
-            groups = match.groups()
-            result = groups[0].translate(str.maketrans('０１２３４５６７８９', '0123456789'))
-            result += '-'
-            result += groups[1].translate(str.maketrans('０１２３４５６７８９', '0123456789'))
-            if groups[2]:
-                result += '-' + groups[2].translate(str.maketrans('０１２３４５６７８９', '0123456789'))
-            return result
-        
-        # パターンを順番に適用（より具体的なパターンから）
-        normalized = pattern1.sub(replace_pattern1, normalized)
-        normalized = pattern2.sub(replace_pattern2, normalized)
-        normalized = pattern3.sub(replace_pattern3, normalized)
-        normalized = pattern4.sub(replace_pattern4, normalized)
+        # 住所番地の厳密なパターンを順番に適用（より具体的なパターンから）
+        normalized = _CHOME_BANCHI_GO_RE.sub(_replace_chome_banchi_go, normalized)
+        normalized = _CHOME_NUMBER_RE.sub(_replace_chome_number, normalized)
+        normalized = _CHOME_ONLY_RE.sub(_replace_chome_only, normalized)
+        normalized = _HYPHEN_BLOCK_RE.sub(_replace_hyphen_block, normalized)
         
         # 全角数字の単純な変換（番地以外の部分）
         # 町名の後の単独の数字（番地の可能性）
-        normalized = re.sub(
-            r'(?<=[町村通り条])([０-９]+)(?=[-－−]|$)',
-            lambda m: m.group(1).translate(str.maketrans('０１２３４５６７８９', '0123456789')),
+        normalized = _TOWN_FULLWIDTH_NUMBER_RE.sub(
+            lambda m: m.group(1).translate(_FULLWIDTH_DIGIT_TABLE),
             normalized
         )
         
         # ハイフンの統一
-        normalized = re.sub(r'[－−]', '-', normalized)
+        normalized = _FULLWIDTH_HYPHEN_RE.sub('-', normalized)
         
         return normalized
     
     def normalize_for_comparison(self, address: str) -> str:
-        """比較用に住所を正規化（建物名を除去）"""
+        """比較用に住所を正規化（建物名を除去、結果は入力文字列ごとにメモ化される）"""
+        return normalize_address_for_comparison(address)
+    
+    def _normalize_for_comparison(self, address: str) -> str:
+        """比較用に住所を正規化（メモ化なし）"""
         normalized = self.normalize(address)
         
         # 構成要素に分解
@@ -632,6 +591,19 @@ class AddressNormalizer:
         
         return ''.join(parts)
     
+    def normalize_many(self, addresses: Iterable[str], for_comparison: bool = False) -> List[str]:
+        """
+        複数の住所をまとめて正規化（重複する住所は1回だけ正規化）
+        
+        Args:
+            addresses: 正規化する住所
+            for_comparison: Trueの場合は normalize_for_comparison、Falseの場合は normalize で正規化
+        """
+        return normalize_many(
+            addresses,
+            normalize_address_for_comparison if for_comparison else normalize_address
+        )
+    
     def is_same_block(self, addr1: str, addr2: str) -> bool:
         """同じ番地かどうかを判定"""
         norm1 = self.normalize_for_comparison(addr1)
@@ -644,7 +616,7 @@ class AddressNormalizer:
         normalized = self.normalize(address)
         
         # 番地部分を抽出
-        block_match = re.search(r'(\d+(?:-\d+)*)', normalized)
+        block_match = _BLOCK_NUMBERS_RE.search(normalized)
         if block_match:
             block_str = block_match.group(1)
             # ハイフンで分割して数値のリストに変換
@@ -745,10 +717,10 @@ class AddressNormalizer:
         if components.get('block'):
             block = components['block']
             # 「N丁目」のみの場合は丁目レベル
-            if re.match(r'^\d+丁目$', block):
+            if _CHOME_BLOCK_RE.match(block):
                 return 3
             # 「N丁目N-N」「N丁目N番地N号」などは番地・号レベル
-            elif '丁目' in block and (re.search(r'丁目\d+', block) or '番地' in block or '号' in block):
+            elif '丁目' in block and (_CHOME_FOLLOWED_BY_NUMBER_RE.search(block) or '番地' in block or '号' in block):
                 return 4
             # ハイフンが2つ以上ある（号まである）
             elif block.count('-') >= 2:
@@ -777,7 +749,7 @@ class AddressNormalizer:
         # 町名まで
         if components.get('area'):
             # 「○丁目」パターンのチェック
-            if re.search(r'\d+丁目', components['area']):
+            if _CHOME_IN_AREA_RE.search(components['area']):
                 return 3
             return 2
         
@@ -831,9 +803,9 @@ class AddressNormalizer:
                     # ハイフン区切りの最初の部分が丁目
                     first_part = block.split('-')[0]
                     parts.append(first_part)
-                elif re.match(r'^\d+丁目', block):
+                elif _CHOME_PREFIX_RE.match(block):
                     # 「N丁目」部分だけ抽出
-                    match = re.match(r'^(\d+丁目)', block)
+                    match = _CHOME_PREFIX_RE.match(block)
                     if match:
                         parts.append(match.group(1))
                 elif block.isdigit() and len(block) <= 2:
@@ -849,6 +821,27 @@ class AddressNormalizer:
         return ''.join(parts)
 
 
+
+_shared_normalizer = AddressNormalizer()
+
+
+def get_address_normalizer() -> AddressNormalizer:
+    """プロセス内で共有する AddressNormalizer を取得"""
+    return _shared_normalizer
+
+
+@memoize_normalizer
+def normalize_address(address: str) -> str:
+    """住所を正規化（AddressNormalizer.normalize と同じ、結果はメモ化される）"""
+    return _shared_normalizer._normalize(address)
+
+
+@memoize_normalizer
+def normalize_address_for_comparison(address: str) -> str:
+    """比較用に住所を正規化（AddressNormalizer.normalize_for_comparison と同じ、結果はメモ化される）"""
+    return _shared_normalizer._normalize_for_comparison(address)
+
+
 # 使用例
 if __name__ == "__main__":
     normalizer = AddressNormalizer()
@@ -0,0 +1,287 @@
+"""
+建物候補インデックス
+
+スクレイピング中の建物検索（段階的マッチング）で使用するプロセス内インデックス。
+buildingsテーブルを LIKE '%...%' で走査する代わりに、
+建物名のbi-gramと名前・住所の辞書から候補IDを引く。
+
+- 検索キーを含む建物名: 検索キーのbi-gramごとの転置リストの積集合
+- 検索キーに含まれる建物名: 検索キーの部分文字列で辞書を引く
+- 住所の包含関係は候補ごとにメモリ上で確認する
+
+インデックスは初回利用時に全件読み込み、以降は updated_at を使って差分更新する。
+スクレイパーが建物を作成した場合や管理画面で建物を統合した場合は即時に反映する。
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Optional, List, Dict, Set, Iterable, Tuple
+
+from ..models import Building
+
+
+GRAM_SIZE = 2
+
+
+def _grams(text: str) -> Set[str]:
+    """文字列のbi-gramを返す"""
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """どちらか一方がもう一方に含まれるか（LIKE '%a%' / 逆方向LIKE と同じ判定）"""
+    return a in b or b in a
+
+
+class BuildingCandidateIndex:
+    """建物名・住所による候補検索のためのプロセス内インデックス（スレッドセーフ）"""
+
+    def __init__(self, refresh_seconds: int = 60, full_reload_seconds: int = 1800):
+        """
+        初期化
+
+        Args:
+            refresh_seconds: updated_at による差分更新の間隔（秒）
+            full_reload_seconds: 全件読み込み直しの間隔（秒）。削除された建物の掃除を兼ねる
+        """
+        self.refresh_seconds = refresh_seconds
+        self.full_reload_seconds = full_reload_seconds
+
+        self._lock = threading.RLock()
+        self._names: Dict[int, str] = {}
+        self._addresses: Dict[int, str] = {}
+        self._by_name: Dict[str, Set[int]] = defaultdict(set)
+        self._name_grams: Dict[str, Set[int]] = defaultdict(set)
+
+        self._loaded = False
+        self._last_full_load = 0.0
+        self._last_sync = 0.0
+        self._synced_until = None
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    # ========== 更新 ==========
+
+    def add(self, building_id: int, canonical_name: Optional[str], normalized_address: Optional[str]) -> None:
+        """建物を登録（既に登録されている場合は更新）。名前・住所がない建物は検索対象外なので除外する"""
+        with self._lock:
+            self._remove_locked(building_id)
+            if canonical_name is None or normalized_address is None:
+                return
+
+            self._names[building_id] = canonical_name
+            self._addresses[building_id] = normalized_address
+            self._by_name[canonical_name].add(building_id)
+            for gram in _grams(canonical_name):
+                self._name_grams[gram].add(building_id)
+
+    def add_building(self, building: Building) -> None:
+        """Buildingオブジェクトを登録"""
+        if building.address is None:
+            self.remove(building.id)
+            return
+        self.add(building.id, building.canonical_name, building.normalized_address)
+
+    def remove(self, building_id: int) -> None:
+        """建物を削除"""
+        with self._lock:
+            self._remove_locked(building_id)
+
+    def remove_many(self, building_ids: Iterable[int]) -> None:
+        """複数の建物を削除（建物統合時など）"""
+        with self._lock:
+            for building_id in building_ids:
+                self._remove_locked(building_id)
+
+    def _remove_locked(self, building_id: int) -> None:
+        name = self._names.pop(building_id, None)
+        self._addresses.pop(building_id, None)
+        if name is None:
+            return
+
+        ids = self._by_name.get(name)
+        if ids is not None:
+            ids.discard(building_id)
+            if not ids:
+                del self._by_name[name]
+        for gram in _grams(name):
+            ids = self._name_grams.get(gram)
+            if ids is not None:
+                ids.discard(building_id)
+                if not ids:
+                    del self._name_grams[gram]
+
+    def clear(self) -> None:
+        """インデックスを空にする（次回利用時に全件読み込み）"""
+        with self._lock:
+            self._names.clear()
+            self._addresses.clear()
+            self._by_name.clear()
+            self._name_grams.clear()
+            self._loaded = False
+            self._synced_until = None
+
+    # ========== DBとの同期 ==========
+
+    def ensure_fresh(self, session) -> None:
+        """必要に応じて全件読み込み・差分更新を行う"""
+        now = time.monotonic()
+        with self._lock:
+            if not self._loaded or now - self._last_full_load >= self.full_reload_seconds:
+                self._load_all(session, now)
+            elif now - self._last_sync >= self.refresh_seconds:
+                self._sync_updated(session, now)
+
+    def _load_all(self, session, now: float) -> None:
+        rows = session.query(
+            Building.id, Building.canonical_name, Building.normalized_address,
+            Building.address, Building.updated_at
+        ).filter(
+            Building.canonical_name.isnot(None),
+            Building.address.isnot(None),
+            Building.normalized_address.isnot(None)
+        ).all()
+
+        self._names.clear()
+        self._addresses.clear()
+        self._by_name.clear()
+        self._name_grams.clear()
+        self._synced_until = None
+        self._apply_rows(rows)
+
+        self._loaded = True
+        self._last_full_load = now
+        self._last_sync = now
+
+    def _sync_updated(self, session, now: float) -> None:
+        query = session.query(
+            Building.id, Building.canonical_name, Building.normalized_address,
+            Building.address, Building.updated_at
+        )
+        if self._synced_until is not None:
+            # 同時刻の更新を取りこぼさないよう境界を含める（再登録は冪等）
+            query = query.filter(Building.updated_at >= self._synced_until)
+        self._apply_rows(query.all())
+        self._last_sync = now
+
+    def _apply_rows(self, rows: Iterable[Tuple]) -> None:
+        for building_id, canonical_name, normalized_address, address, updated_at in rows:
+            if address is None:
+                self._remove_locked(building_id)
+            else:
+                self.add(building_id, canonical_name, normalized_address)
+            if updated_at is not None and (self._synced_until is None or updated_at > self._synced_until):
+                self._synced_until = updated_at
+
+    # ========== 検索 ==========
+
+    def find_candidate_ids(self, search_key: str, normalized_address: str, limit: Optional[int] = 50) -> List[int]:
+        """
+        建物名・住所のどちらも部分一致（どちらか一方が他方を含む）する建物IDを返す
+
+        Args:
+            search_key: 検索キー（canonical_name形式）
+            normalized_address: 比較用に正規化した住所
+            limit: 最大件数（名前の完全一致を優先し、次にID順）
+
+        Returns:
+            建物IDのリスト
+        """
+        with self._lock:
+            ids = [
+                building_id for building_id in self._ids_with_name_overlap(search_key)
+                if _overlaps(self._addresses[building_id], normalized_address)
+            ]
+            ids.sort(key=lambda building_id: (self._names[building_id] != search_key, building_id))
+
+        return ids[:limit] if limit else ids
+
+    def _ids_with_name_overlap(self, search_key: str) -> Set[int]:
+        # 検索キーを含む建物名（bi-gramの転置リストの積集合から絞り込む）
+        if len(search_key) >= GRAM_SIZE:
+            postings = []
+            for gram in _grams(search_key):
+                ids = self._name_grams.get(gram)
+                if not ids:
+                    postings = []
+                    break
+                postings.append(ids)
+
+            result: Set[int] = set()
+            if postings:
+                postings.sort(key=len)
+                candidates = set(postings[0])
+                for ids in postings[1:]:
+                    candidates &= ids
+                    if not candidates:
+                        break
+                result = {bid for bid in candidates if search_key in self._names[bid]}
+        else:
+            result = {bid for bid, name in self._names.items() if search_key in name}
+
+        # 検索キーに含まれる建物名（部分文字列で辞書を引く）
+        length = len(search_key)
+        for start in range(length):
+            for end in range(start + 1, length + 1):
+                ids = self._by_name.get(search_key[start:end])
+                if ids:
+                    result |= ids
+        empty_name_ids = self._by_name.get('')
+        if empty_name_ids:
+            result |= empty_name_ids
+
+        return result
+
+    def fetch_candidates(self, session, search_key: str, normalized_address: str, limit: int = 50) -> List[Building]:
+        """
+        候補の建物を取得
+
+        インデックスで候補IDを引き、主キーで読み込んだ行に対して条件を再確認する
+        （他のプロセスによる更新でインデックスが古くなっていても誤った候補は返さない）
+        """
+        self.ensure_fresh(session)
+        candidate_ids = self.find_candidate_ids(search_key, normalized_address, limit=None)
+        if not candidate_ids:
+            return []
+
+        buildings = []
+        for chunk_start in range(0, len(candidate_ids), 500):
+            chunk = candidate_ids[chunk_start:chunk_start + 500]
+            rows = session.query(Building).filter(Building.id.in_(chunk)).all()
+            rows_by_id = {building.id: building for building in rows}
+
+            for building_id in chunk:
+                building = rows_by_id.get(building_id)
+                if building is None:
+                    continue
+                if (building.canonical_name is not None and building.address is not None
+                        and building.normalized_address is not None
+                        and _overlaps(building.canonical_name, search_key)
+                        and _overlaps(building.normalized_address, normalized_address)):
+                    buildings.append(building)
+                    if len(buildings) >= limit:
+                        return buildings
+                else:
+                    # インデックスが古かった建物は最新の内容で登録し直す
+                    self.add_building(building)
+
+        return buildings
+
+
+# プロセス内で共有するインスタンス（スクレイパーのスレッド間で共有）
+_building_index: Optional[BuildingCandidateIndex] = None
+_building_index_lock = threading.Lock()
+
+
+def get_building_index() -> BuildingCandidateIndex:
+    """プロセス内で共有する建物候補インデックスを取得"""
+    global _building_index
+    if _building_index is None:
+        with _building_index_lock:
+            if _building_index is None:
+                _building_index = BuildingCandidateIndex(
+                    refresh_seconds=int(os.getenv('SCRAPER_BUILDING_INDEX_REFRESH_SECONDS', '60'))
+                )
+    return _building_index
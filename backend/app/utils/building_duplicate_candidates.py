@@ -0,0 +1,542 @@
+"""
+建物重複候補（building_duplicate_candidates）の事前計算
+
+管理画面の建物重複候補（GET /admin/duplicate-buildings）は、このテーブルに保存した
+建物ペアの類似度を読んでグループ化する。スクレイピング完了後に全件を計算し直し、
+建物統合・建物情報の変更時は対象建物を含むペアだけ計算し直す。
+
+計算の流れ:
+1. 物件のある建物を1回のクエリで読み込み、1回の走査でブロックに振り分ける
+   - 住所の丁目（normalized_address の最初の「-」より前） × 総階数・総戸数・築年
+   - 地域（市区町村＋町名） × 建物の基本名（棟番号を除いた名前）
+2. ブロック内のペアのうち、属性または建物名が一致するものだけを比較対象にする
+3. 属性の一致度・最終スコアは配列でまとめて計算する（NumPyは poetry install -E fast-duplicates で入る。ない場合は1ペアずつ計算）
+4. 建物名を満点と仮定しても閾値に届かないペアは建物名の計算を省略する
+5. 建物名の類似度は建物ごとの名前リストを1回だけ作り、文字列ペアごとの一致度をメモ化して計算する
+
+類似度は EnhancedBuildingMatcher.calculate_comprehensive_similarity と同じ値になる。
+
+- rebuild_building_duplicate_candidates(): 全ペアを計算し直す
+- refresh_building_duplicate_candidates(): 指定建物を含むペアだけ計算し直す
+"""
+import logging
+import re
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from ..models import Building, MasterProperty, BuildingListingName, BuildingDuplicateCandidate
+from .enhanced_building_matcher import EnhancedBuildingMatcher
+
+try:
+    import numpy as np
+except ImportError:  # NumPyがない環境では同じ計算をペアごとに行う
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# 保存する類似度の下限（管理画面ではこれ以上の閾値を指定した場合に事前計算結果を使う）
+STORE_MIN_SIMILARITY = 0.5
+
+# 築年がこれより離れたペアは別建物（calculate_comprehensive_similarity の早期リターンと同じ）
+MAX_BUILT_YEAR_DIFF = 2
+
+# 1回のINSERTで保存する行数
+INSERT_CHUNK_SIZE = 1000
+
+# 地域（市区町村＋町名）の抽出パターン
+AREA_PATTERN = re.compile(r'(.*?[区市町村][^0-9０-９]*)')
+# 建物の基本名（末尾の棟表記・番号を除く）
+BUILDING_UNIT_SUFFIX_PATTERN = re.compile(r'[　\s]+[^　\s]*棟$')
+TRAILING_NUMBER_PATTERN = re.compile(r'[　\s]+[０-９0-9]+$')
+
+
+# ========== 読み込み ==========
+
+def load_candidate_buildings(db: Session) -> List[Any]:
+    """物件のある建物を比較に必要な項目だけ読み込む（property_count 付き）"""
+    property_counts = db.query(
+        MasterProperty.building_id.label('building_id'),
+        func.count(MasterProperty.id).label('property_count')
+    ).group_by(MasterProperty.building_id).subquery()
+
+    return db.query(
+        Building.id,
+        Building.normalized_name,
+        Building.canonical_name,
+        Building.address,
+        Building.normalized_address,
+        Building.total_floors,
+        Building.total_units,
+        Building.built_year,
+        Building.built_month,
+        Building.construction_type,
+        property_counts.c.property_count,
+    ).join(
+        property_counts, property_counts.c.building_id == Building.id
+    ).order_by(Building.id).all()
+
+
+def build_listing_name_aliases(listing_names: Iterable[Any]) -> Tuple[Dict[int, Dict[str, Any]], Dict[str, int]]:
+    """
+    掲載名から EnhancedBuildingMatcher 用のエイリアスキャッシュとグローバル名前カウントを作成
+
+    Args:
+        listing_names: building_id / normalized_name / canonical_name / occurrence_count を持つ行
+
+    Returns:
+        ({建物ID: {'names': [{'name', 'canonical', 'count'}, ...], 'total': int}}, {canonical名: 出現回数})
+    """
+    aliases_cache: Dict[int, Dict[str, Any]] = {}
+    global_name_counts: Dict[str, int] = {}
+    name_index: Dict[Tuple[int, str], Dict[str, Any]] = {}
+
+    for listing in listing_names:
+        building_id = listing.building_id
+        aliases = aliases_cache.setdefault(building_id, {'names': [], 'total': 0})
+
+        # 出現回数を合計に加算
+        count = listing.occurrence_count or 1
+        aliases['total'] += count
+
+        # グローバル名前カウントを更新
+        canonical = listing.canonical_name
+        if canonical:
+            global_name_counts[canonical] = global_name_counts.get(canonical, 0) + count
+
+        # 重複を避けながら追加（名前、canonical、出現回数）
+        if listing.normalized_name:
+            existing = name_index.get((building_id, listing.normalized_name))
+            if existing:
+                existing['count'] += count
+            else:
+                entry = {'name': listing.normalized_name, 'canonical': canonical, 'count': count}
+                name_index[(building_id, listing.normalized_name)] = entry
+                aliases['names'].append(entry)
+
+    return aliases_cache, global_name_counts
+
+
+def load_listing_name_aliases(db: Session) -> Tuple[Dict[int, Dict[str, Any]], Dict[str, int]]:
+    """全建物の掲載名からエイリアスキャッシュとグローバル名前カウントを作成"""
+    listing_names = db.query(
+        BuildingListingName.building_id,
+        BuildingListingName.normalized_name,
+        BuildingListingName.canonical_name,
+        BuildingListingName.occurrence_count,
+    ).order_by(BuildingListingName.id).all()
+    return build_listing_name_aliases(listing_names)
+
+
+# ========== ブロック化 ==========
+
+def _address_prefix(normalized_address: Optional[str]) -> Optional[str]:
+    """住所の丁目まで（regexp_replace(normalized_address, '-.*', '') と同じ）"""
+    if not normalized_address:
+        return None
+    return normalized_address.split('-', 1)[0]
+
+
+def _area(building: Any) -> str:
+    """地域（市区町村＋町名）。取得できない場合は「その他」"""
+    for address in (building.normalized_address, building.address):
+        if address:
+            match = AREA_PATTERN.match(address)
+            if match:
+                return match.group(1)
+    return 'その他'
+
+
+def _name_key(normalized_name: Optional[str]) -> str:
+    """建物名ブロックのキー（基本名が短すぎる場合は建物名そのもの）"""
+    name = normalized_name or ''
+    base_name = BUILDING_UNIT_SUFFIX_PATTERN.sub('', name)
+    base_name = TRAILING_NUMBER_PATTERN.sub('', base_name).strip()
+    return base_name if len(base_name) >= 5 else name
+
+
+def _is_name_match(name1: Optional[str], name2: Optional[str]) -> bool:
+    """建物名の部分一致（完全一致・包含・5文字以上の共通接頭辞）"""
+    if not name1 or not name2:
+        return False
+    if name1 == name2 or name1 in name2 or name2 in name1:
+        return True
+    return min(len(name1), len(name2)) >= 5 and name1[:5] == name2[:5]
+
+
+def _years_close(year1: Optional[int], year2: Optional[int], tolerance: int) -> bool:
+    return bool(year1 and year2 and abs(year1 - year2) <= tolerance)
+
+
+def _accept_attribute_pair(block_field: str, building1: Any, building2: Any) -> bool:
+    """
+    住所×属性ブロック内のペアを比較対象にするか
+
+    - 総階数ブロック: 築年が一致、または総戸数が一致して築年が±1年、または建物名が部分一致
+    - 総戸数・築年ブロック: 建物名が部分一致
+    """
+    if block_field == 'total_floors':
+        if building1.built_year and building1.built_year == building2.built_year:
+            return True
+        if (building1.total_units and building1.total_units == building2.total_units
+                and _years_close(building1.built_year, building2.built_year, 1)):
+            return True
+    return _is_name_match(building1.canonical_name, building2.canonical_name)
+
+
+def generate_candidate_pairs(buildings: List[Any],
+                             target_ids: Optional[Set[int]] = None) -> List[Tuple[int, int]]:
+    """
+    ブロック化して比較対象のペアを作成
+
+    Args:
+        buildings: load_candidate_buildings() の結果
+        target_ids: 指定した場合はこの建物を含むペアだけを返す
+
+    Returns:
+        buildings のインデックスのペア（i < j）のリスト
+    """
+    attribute_blocks: Dict[Tuple[str, str, int], List[int]] = defaultdict(list)
+    name_blocks: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+
+    # 1回の走査で全ブロックに振り分ける
+    for index, building in enumerate(buildings):
+        prefix = _address_prefix(building.normalized_address)
+        if prefix:
+            for field in ('total_floors', 'total_units', 'built_year'):
+                value = getattr(building, field)
+                if value:
+                    attribute_blocks[(prefix, field, value)].append(index)
+        if building.normalized_name:
+            name_blocks[(_area(building), _name_key(building.normalized_name))].append(index)
+
+    def block_pairs(members: List[int]):
+        if target_ids is None:
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    yield i, j
+        else:
+            targets = [i for i in members if buildings[i].id in target_ids]
+            for i in targets:
+                for j in members:
+                    if j != i:
+                        yield (i, j) if i < j else (j, i)
+
+    pairs: Set[Tuple[int, int]] = set()
+    for members in name_blocks.values():
+        if len(members) > 1:
+            pairs.update(block_pairs(members))
+    for (_, field, _), members in attribute_blocks.items():
+        if len(members) < 2:
+            continue
+        for i, j in block_pairs(members):
+            if (i, j) not in pairs and _accept_attribute_pair(field, buildings[i], buildings[j]):
+                pairs.add((i, j))
+
+    # 築年が大きく異なるペアは比較しない
+    return sorted(
+        (i, j) for i, j in pairs
+        if not (buildings[i].built_year and buildings[j].built_year
+                and abs(buildings[i].built_year - buildings[j].built_year) > MAX_BUILT_YEAR_DIFF)
+    )
+
+
+# ========== スコア計算 ==========
+
+def _int_array(values: Iterable[Optional[int]]):
+    """NULLを0とした整数配列（0は「値なし」として扱う）"""
+    return np.array([value or 0 for value in values], dtype=np.int64)
+
+
+def _attribute_scores_array(pair_buildings: List[Tuple[Any, Any]]):
+    """属性の一致度（_calculate_attribute_similarity と同じ計算）を配列で計算"""
+    year1 = _int_array(b1.built_year for b1, _ in pair_buildings)
+    year2 = _int_array(b2.built_year for _, b2 in pair_buildings)
+    month1 = _int_array(b1.built_month for b1, _ in pair_buildings)
+    month2 = _int_array(b2.built_month for _, b2 in pair_buildings)
+    floors1 = _int_array(b1.total_floors for b1, _ in pair_buildings)
+    floors2 = _int_array(b2.total_floors for _, b2 in pair_buildings)
+    has_construction = np.array([bool(b1.construction_type and b2.construction_type)
+                                 for b1, b2 in pair_buildings])
+    same_construction = np.array([b1.construction_type == b2.construction_type for b1, b2 in pair_buildings])
+
+    total = np.zeros(len(pair_buildings))
+    weights = np.zeros(len(pair_buildings))
+
+    # 築年月（重み2.0）
+    has_year = (year1 > 0) & (year2 > 0)
+    year_diff = np.abs(year1 - year2)
+    has_month = (month1 > 0) & (month2 > 0)
+    year_score = np.select(
+        [(year_diff == 0) & has_month & (month1 == month2),
+         (year_diff == 0) & has_month,
+         year_diff == 0,
+         year_diff == 1,
+         year_diff == 2],
+        [1.0, 0.3, 0.7, 0.2, 0.1],
+        0.0
+    )
+    total = total + np.where(has_year, year_score * 2.0, 0.0)
+    weights = weights + np.where(has_year, 2.0, 0.0)
+
+    # 総階数（重み0.8）
+    has_floors = (floors1 > 0) & (floors2 > 0)
+    floor_diff = np.abs(floors1 - floors2)
+    floor_score = np.select(
+        [floor_diff == 0, floor_diff == 1, floor_diff <= 5, floor_diff <= 10, floor_diff <= 20],
+        [1.0, 0.8, 0.5, 0.3, 0.2],
+        0.1
+    )
+    total = total + np.where(has_floors, floor_score * 0.8, 0.0)
+    weights = weights + np.where(has_floors, 0.8, 0.0)
+
+    # 構造（重み0.5）
+    construction_score = np.where(same_construction, 1.0, 0.5)
+    total = total + np.where(has_construction, construction_score * 0.5, 0.0)
+    weights = weights + np.where(has_construction, 0.5, 0.0)
+
+    return np.where(weights > 0, total / np.where(weights > 0, weights, 1.0), 0.5)
+
+
+def _weighted_scores_array(addr, name, attr):
+    """通常の重み付け（住所あり 40/30/30、住所なし 60/40）"""
+    return np.where(addr > 0, addr * 0.40 + name * 0.30 + attr * 0.30, name * 0.60 + attr * 0.40)
+
+
+def _final_scores_array(addr, name, attr):
+    """最終スコア（_calculate_final_score と同じ判定）を配列で計算"""
+    address_and_attributes = (addr >= 0.95) & (attr >= 0.9)
+    return np.select(
+        [address_and_attributes & (name < 0.3),
+         address_and_attributes,
+         (name >= 0.85) & (addr >= 0.8),
+         (name < 0.5) & (addr >= 0.9) & (attr >= 0.8),
+         (addr == 0.0) & (name >= 0.9) & (attr >= 0.8)],
+        [0.92, 0.95, np.maximum(name, addr), 0.85, 0.85],
+        _weighted_scores_array(addr, name, attr)
+    )
+
+
+def _score_upper_bounds_array(addr, attr):
+    """建物名のスコアによらない最終スコアの上限（建物名の計算を省略できるペアの判定用）"""
+    upper = np.maximum(
+        np.where((addr == 0.0) & (attr >= 0.8), 0.85, 0.0),
+        _weighted_scores_array(addr, np.ones_like(addr), attr)
+    )
+    upper = np.where(addr >= 0.8, 1.0, upper)
+    return np.where((addr >= 0.95) & (attr >= 0.9), 0.95, upper)
+
+
+class DuplicateCandidateScorer:
+    """建物ペアの類似度をまとめて計算するクラス"""
+
+    def __init__(self, aliases_cache: Dict[int, Dict[str, Any]], global_name_counts: Dict[str, int]):
+        self.matcher = EnhancedBuildingMatcher(aliases_cache=aliases_cache, global_name_counts=global_name_counts)
+        self._normalized_names: Dict[int, str] = {}
+        self._name_variants: Dict[int, List[Dict[str, Any]]] = {}
+        self._string_similarities: Dict[Tuple[str, str], float] = {}
+        self._address_scores: Dict[Tuple[Optional[str], Optional[str]], float] = {}
+        self.stats = {'pairs': 0, 'name_scored': 0, 'string_pairs': 0}
+
+    def _normalized_name(self, building: Any) -> str:
+        name = self._normalized_names.get(building.id)
+        if name is None:
+            name = self.matcher.building_normalizer.normalize(building.normalized_name)
+            self._normalized_names[building.id] = name
+        return name
+
+    def _variants(self, building: Any) -> List[Dict[str, Any]]:
+        variants = self._name_variants.get(building.id)
+        if variants is None:
+            aliases = self.matcher._get_building_aliases(building, None)
+            variants = self.matcher._build_name_variants(self._normalized_name(building), aliases)
+            self._name_variants[building.id] = variants
+        return variants
+
+    def _string_similarity(self, name1: str, name2: str) -> float:
+        key = (name1, name2)
+        score = self._string_similarities.get(key)
+        if score is None:
+            score = self.matcher.building_normalizer.calculate_similarity(name1, name2)
+            self._string_similarities[key] = score
+            self.stats['string_pairs'] += 1
+        return score
+
+    def address_score(self, building1: Any, building2: Any) -> float:
+        """住所の類似度（同じ住所の組み合わせは1回だけ計算）"""
+        key = (building1.address, building2.address)
+        score = self._address_scores.get(key)
+        if score is None:
+            score = self.matcher._calculate_address_similarity(building1.address, building2.address)
+            self._address_scores[key] = score
+        return score
+
+    def name_score(self, building1: Any, building2: Any) -> float:
+        """建物名の統合スコア（_calculate_name_similarity と同じ計算）"""
+        self.stats['name_scored'] += 1
+        if not building1.normalized_name or not building2.normalized_name:
+            return 0.0
+        if self._normalized_name(building1) == self._normalized_name(building2):
+            return 1.0
+
+        score, _, _ = self.matcher._find_best_name_match(
+            self._variants(building1), self._variants(building2),
+            self.matcher._get_building_aliases(building1, None),
+            self.matcher._get_building_aliases(building2, None),
+            string_similarity=self._string_similarity
+        )
+        return score
+
+    def score_pairs(self, pair_buildings: List[Tuple[Any, Any]],
+                    min_similarity: float = STORE_MIN_SIMILARITY) -> List[Tuple[float, float, float, float]]:
+        """
+        ペアの類似度を計算
+
+        Returns:
+            ペアごとの (総合類似度, 住所, 建物名, 属性)。min_similarity に届かないことが
+            確定したペアは総合類似度を 0.0 とする
+        """
+        self.stats['pairs'] += len(pair_buildings)
+        if not pair_buildings:
+            return []
+
+        addr_scores = [self.address_score(b1, b2) for b1, b2 in pair_buildings]
+
+        if np is None:
+            results = []
+            for (b1, b2), addr in zip(pair_buildings, addr_scores):
+                attr = self.matcher._calculate_attribute_similarity(b1, b2)
+                name = self.name_score(b1, b2)
+                results.append((self.matcher._calculate_final_score(addr, name, attr), addr, name, attr))
+            return results
+
+        addr = np.array(addr_scores, dtype=float)
+        attr = _attribute_scores_array(pair_buildings)
+        name = np.zeros(len(pair_buildings))
+
+        # 建物名が満点でも閾値に届かないペアは建物名を計算しない
+        reachable = _score_upper_bounds_array(addr, attr) >= min_similarity
+        for index in np.flatnonzero(reachable):
+            b1, b2 = pair_buildings[index]
+            name[index] = self.name_score(b1, b2)
+
+        final = np.where(reachable, _final_scores_array(addr, name, attr), 0.0)
+        return list(zip(final.tolist(), addr.tolist(), name.tolist(), attr.tolist()))
+
+
+def compute_building_duplicate_candidates(db: Session,
+                                          target_ids: Optional[Set[int]] = None,
+                                          min_similarity: float = STORE_MIN_SIMILARITY,
+                                          buildings: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+    """
+    重複候補のペアを計算
+
+    Args:
+        db: データベースセッション
+        target_ids: 指定した場合はこの建物を含むペアだけを計算する
+        min_similarity: 返す類似度の下限
+        buildings: 比較する建物（省略時は物件のある全建物）
+
+    Returns:
+        building_duplicate_candidates の行（building1_id < building2_id）のリスト
+    """
+    start = time.time()
+    if buildings is None:
+        buildings = load_candidate_buildings(db)
+    aliases_cache, global_name_counts = load_listing_name_aliases(db)
+
+    pairs = generate_candidate_pairs(buildings, target_ids)
+    pair_buildings = [(buildings[i], buildings[j]) for i, j in pairs]
+
+    scorer = DuplicateCandidateScorer(aliases_cache, global_name_counts)
+    scores = scorer.score_pairs(pair_buildings, min_similarity)
+
+    now = datetime.now()
+    rows = []
+    for (b1, b2), (similarity, addr, name, attr) in zip(pair_buildings, scores):
+        if similarity < min_similarity:
+            continue
+        building1_id, building2_id = sorted((b1.id, b2.id))
+        rows.append({
+            'building1_id': building1_id,
+            'building2_id': building2_id,
+            'similarity': similarity,
+            'address_score': addr,
+            'name_score': name,
+            'attribute_score': attr,
+            'computed_at': now,
+        })
+
+    logger.info(
+        f"建物重複候補の計算: 建物{len(buildings)}件, 比較{len(pairs)}ペア "
+        f"(建物名の計算{scorer.stats['name_scored']}ペア, 文字列{scorer.stats['string_pairs']}組), "
+        f"候補{len(rows)}ペア, {time.time() - start:.2f}秒"
+    )
+    return rows
+
+
+def _insert_candidates(db: Session, rows: List[Dict[str, Any]]) -> None:
+    table = BuildingDuplicateCandidate.__table__
+    for chunk_start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.execute(table.insert(), rows[chunk_start:chunk_start + INSERT_CHUNK_SIZE])
+
+
+def rebuild_building_duplicate_candidates(db: Session) -> int:
+    """
+    全建物の重複候補を計算し直す
+
+    呼び出し側のトランザクション内で実行する（コミットは呼び出し側で行う）。
+
+    Returns:
+        保存したペア数
+    """
+    db.flush()
+    rows = compute_building_duplicate_candidates(db)
+    db.query(BuildingDuplicateCandidate).delete(synchronize_session=False)
+    _insert_candidates(db, rows)
+    return len(rows)
+
+
+def refresh_building_duplicate_candidates(db: Session, building_ids: Iterable[Optional[int]]) -> int:
+    """
+    指定建物を含む重複候補を計算し直す（建物統合・建物情報の変更の後など）
+
+    削除された建物や物件がなくなった建物のペアは削除だけ行う。
+
+    Returns:
+        保存したペア数
+    """
+    ids = {building_id for building_id in building_ids if building_id is not None}
+    if not ids:
+        return 0
+
+    db.flush()
+    db.query(BuildingDuplicateCandidate).filter(
+        or_(
+            BuildingDuplicateCandidate.building1_id.in_(ids),
+            BuildingDuplicateCandidate.building2_id.in_(ids)
+        )
+    ).delete(synchronize_session=False)
+
+    rows = compute_building_duplicate_candidates(db, target_ids=ids)
+    _insert_candidates(db, rows)
+    return len(rows)
+
+
+def load_building_duplicate_candidates(db: Session, min_similarity: float) -> Dict[int, Dict[int, float]]:
+    """保存済みの重複候補から類似度グラフ {建物ID: {建物ID: 類似度}} を作成"""
+    graph: Dict[int, Dict[int, float]] = defaultdict(dict)
+    candidates = db.query(
+        BuildingDuplicateCandidate.building1_id,
+        BuildingDuplicateCandidate.building2_id,
+        BuildingDuplicateCandidate.similarity,
+    ).filter(BuildingDuplicateCandidate.similarity >= min_similarity)
+
+    for building1_id, building2_id, similarity in candidates:
+        graph[building1_id][building2_id] = similarity
+        graph[building2_id][building1_id] = similarity
+    return dict(graph)
@@ -26,32 +26,21 @@ def apply_building_name_filter(
     if not building_name:
         return query
     
-    from ..models import BuildingListingName
     from .building_name_normalizer import canonicalize_building_name
+    from .search_normalizer import normalize_search_text
+    from .building_trigram_search import building_ids_matching_term
     
     terms = building_name.split()
     for term in terms:
         # 検索語をcanonical形式に変換（ひらがな→カタカナ、記号除去、小文字化）
         canonical_term = canonicalize_building_name(term)
-        
-        # BuildingListingNameテーブルから該当する建物IDを取得
-        # canonical_nameを使用して検索（ひらがな入力でも検索可能）
-        listing_building_ids = db.query(
-            BuildingListingName.building_id
-        ).filter(
-            BuildingListingName.canonical_name.ilike(f"%{canonical_term}%")
-        ).distinct().subquery()
-        
-        # Building.normalized_name または 掲載建物名でマッチ
-        # normalized_nameに対してもcanonical化した検索語で検索
-        from ..utils.search_normalizer import normalize_search_text
+        # normalized_nameに対しては正規化した検索語で検索
         normalized_term = normalize_search_text(term)
         
+        # Building.normalized_name または 掲載建物名（BuildingListingName.canonical_name）でマッチ
+        # 両テーブルの部分一致をUNIONした建物IDで絞り込む（それぞれトライグラムインデックスを使用）
         query = query.filter(
-            or_(
-                building_table.normalized_name.ilike(f"%{normalized_term}%"),
-                building_table.id.in_(listing_building_ids)
-            )
+            building_table.id.in_(building_ids_matching_term(normalized_term, canonical_term))
         )
     
     return query
@@ -0,0 +1,293 @@
+"""
+建物の空間インデックス
+
+周辺建物（/api/buildings/{id}/nearby）の検索で使用するプロセス内インデックス。
+建物の座標を緯度・経度のグリッド（セル）に振り分け、検索地点のセルから外側へ
+リング状にセルを調べて、距離の近い順に建物を返す。
+
+- 半径検索: 半径内の建物を距離順に返す
+- k近傍検索: 近い順にk件を返す（半径の上限も指定できる）
+- いずれも iter_nearest() で距離順に必要な分だけ取り出せる（販売中の建物だけを
+  上限件数まで取得する場合など、呼び出し側で条件を確認しながら読み進められる）
+
+距離はハバーサイン公式で計算する。インデックスは初回利用時に全件読み込み、
+以降は updated_at を使って差分更新する（ジオコーディングや住所変更による座標の
+更新・クリアは updated_at が更新されるため、次の差分更新で反映される）。
+"""
+import heapq
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..models import Building
+
+
+EARTH_RADIUS_METERS = 6371000
+METERS_PER_DEGREE = EARTH_RADIUS_METERS * math.pi / 180
+
+# セルの大きさ（度）。東京付近で南北約560m・東西約450m
+DEFAULT_CELL_DEGREES = 0.005
+
+# 経度方向の距離の下限を見積もるときの余裕（大円距離は緯線に沿った距離よりわずかに短いため）
+_BOUND_SAFETY = 0.99
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    2点間の距離をメートルで計算（ハバーサイン公式）
+    """
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = math.sin(delta_lat / 2) ** 2 + \
+        math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    return EARTH_RADIUS_METERS * c
+
+
+class BuildingSpatialIndex:
+    """建物座標のグリッドインデックス（スレッドセーフ）"""
+
+    def __init__(self, cell_degrees: float = DEFAULT_CELL_DEGREES,
+                 refresh_seconds: int = 60, full_reload_seconds: int = 1800):
+        """
+        初期化
+
+        Args:
+            cell_degrees: グリッドのセルの大きさ（度）
+            refresh_seconds: updated_at による差分更新の間隔（秒）
+            full_reload_seconds: 全件読み込み直しの間隔（秒）。削除された建物の掃除を兼ねる
+        """
+        self.cell_degrees = cell_degrees
+        self.refresh_seconds = refresh_seconds
+        self.full_reload_seconds = full_reload_seconds
+
+        self._lock = threading.RLock()
+        self._coords: Dict[int, Tuple[float, float]] = {}
+        self._cells: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        # 登録されたことのあるセルの範囲（リングの探索の終了判定に使う）
+        self._cell_bounds: Optional[Tuple[int, int, int, int]] = None
+
+        self._loaded = False
+        self._last_full_load = 0.0
+        self._last_sync = 0.0
+        self._synced_until = None
+
+    def __len__(self) -> int:
+        return len(self._coords)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees))
+
+    # ========== 更新 ==========
+
+    def add(self, building_id: int, latitude: Optional[float], longitude: Optional[float]) -> None:
+        """建物を登録（既に登録されている場合は更新）。座標がない建物は除外する"""
+        with self._lock:
+            self._remove_locked(building_id)
+            if not latitude or not longitude:
+                return
+
+            self._coords[building_id] = (latitude, longitude)
+            cell = self._cell(latitude, longitude)
+            self._cells[cell].add(building_id)
+            if self._cell_bounds is None:
+                self._cell_bounds = (cell[0], cell[0], cell[1], cell[1])
+            else:
+                min_i, max_i, min_j, max_j = self._cell_bounds
+                self._cell_bounds = (min(min_i, cell[0]), max(max_i, cell[0]),
+                                     min(min_j, cell[1]), max(max_j, cell[1]))
+
+    def add_building(self, building: Building) -> None:
+        """Buildingオブジェクトを登録"""
+        self.add(building.id, building.latitude, building.longitude)
+
+    def remove(self, building_id: int) -> None:
+        """建物を削除"""
+        with self._lock:
+            self._remove_locked(building_id)
+
+    def remove_many(self, building_ids: Iterable[int]) -> None:
+        """複数の建物を削除（建物統合時など）"""
+        with self._lock:
+            for building_id in building_ids:
+                self._remove_locked(building_id)
+
+    def _remove_locked(self, building_id: int) -> None:
+        coords = self._coords.pop(building_id, None)
+        if coords is None:
+            return
+        cell = self._cell(*coords)
+        ids = self._cells.get(cell)
+        if ids is not None:
+            ids.discard(building_id)
+            if not ids:
+                del self._cells[cell]
+
+    def clear(self) -> None:
+        """インデックスを空にする（次回利用時に全件読み込み）"""
+        with self._lock:
+            self._coords.clear()
+            self._cells.clear()
+            self._cell_bounds = None
+            self._loaded = False
+            self._synced_until = None
+
+    # ========== DBとの同期 ==========
+
+    def ensure_fresh(self, session) -> None:
+        """必要に応じて全件読み込み・差分更新を行う"""
+        now = time.monotonic()
+        with self._lock:
+            if not self._loaded or now - self._last_full_load >= self.full_reload_seconds:
+                self._load_all(session, now)
+            elif now - self._last_sync >= self.refresh_seconds:
+                self._sync_updated(session, now)
+
+    def _load_all(self, session, now: float) -> None:
+        rows = session.query(
+            Building.id, Building.latitude, Building.longitude, Building.updated_at
+        ).filter(
+            Building.latitude.isnot(None),
+            Building.longitude.isnot(None)
+        ).all()
+
+        self._coords.clear()
+        self._cells.clear()
+        self._cell_bounds = None
+        self._synced_until = None
+        self._apply_rows(rows)
+
+        self._loaded = True
+        self._last_full_load = now
+        self._last_sync = now
+
+    def _sync_updated(self, session, now: float) -> None:
+        query = session.query(Building.id, Building.latitude, Building.longitude, Building.updated_at)
+        if self._synced_until is not None:
+            # 同時刻の更新を取りこぼさないよう境界を含める（再登録は冪等）
+            query = query.filter(Building.updated_at >= self._synced_until)
+        self._apply_rows(query.all())
+        self._last_sync = now
+
+    def _apply_rows(self, rows: Iterable[Tuple]) -> None:
+        for building_id, latitude, longitude, updated_at in rows:
+            self.add(building_id, latitude, longitude)
+            if updated_at is not None and (self._synced_until is None or updated_at > self._synced_until):
+                self._synced_until = updated_at
+
+    # ========== 検索 ==========
+
+    def _ring_ids(self, center: Tuple[int, int], ring: int) -> List[int]:
+        """中心セルからチェビシェフ距離 ring のセルに含まれる建物ID"""
+        ci, cj = center
+        ids: List[int] = []
+        with self._lock:
+            if ring == 0:
+                ids.extend(self._cells.get(center, ()))
+                return ids
+            for i in range(ci - ring, ci + ring + 1):
+                if i in (ci - ring, ci + ring):
+                    columns = range(cj - ring, cj + ring + 1)
+                else:
+                    columns = (cj - ring, cj + ring)
+                for j in columns:
+                    cell_ids = self._cells.get((i, j))
+                    if cell_ids:
+                        ids.extend(cell_ids)
+        return ids
+
+    def _min_distance_outside(self, latitude: float, ring: int) -> float:
+        """リング ring より外側のセルにある地点までの距離の下限（メートル）"""
+        lat_meters = self.cell_degrees * METERS_PER_DEGREE
+        max_lat = min(89.9, abs(latitude) + (ring + 1) * self.cell_degrees)
+        lon_meters = lat_meters * math.cos(math.radians(max_lat))
+        return ring * min(lat_meters, lon_meters) * _BOUND_SAFETY
+
+    def iter_nearest(self, latitude: float, longitude: float,
+                     max_distance: Optional[float] = None,
+                     exclude_ids: Iterable[int] = ()) -> Iterator[Tuple[int, float]]:
+        """
+        近い順に (建物ID, 距離（メートル）) を返すジェネレータ
+
+        Args:
+            latitude, longitude: 検索地点
+            max_distance: 距離の上限（メートル）。Noneの場合は全件
+            exclude_ids: 除外する建物ID（検索元の建物など）
+        """
+        excluded = set(exclude_ids)
+        with self._lock:
+            bounds = self._cell_bounds
+        if bounds is None:
+            return
+
+        center = self._cell(latitude, longitude)
+        min_i, max_i, min_j, max_j = bounds
+        last_ring = max(center[0] - min_i, max_i - center[0], center[1] - min_j, max_j - center[1], 0)
+
+        heap: List[Tuple[float, int]] = []
+        for ring in range(last_ring + 1):
+            with self._lock:
+                coords = self._coords
+                for building_id in self._ring_ids(center, ring):
+                    if building_id in excluded:
+                        continue
+                    point = coords.get(building_id)
+                    if point is None:
+                        continue
+                    distance = haversine_distance(latitude, longitude, point[0], point[1])
+                    if max_distance is None or distance <= max_distance:
+                        heapq.heappush(heap, (distance, building_id))
+
+            # 外側のセルにはこれより近い建物はないので、ここまでの建物を確定して返す
+            bound = self._min_distance_outside(latitude, ring)
+            while heap and heap[0][0] <= bound:
+                distance, building_id = heapq.heappop(heap)
+                yield building_id, distance
+            if max_distance is not None and bound > max_distance:
+                break
+
+        while heap:
+            distance, building_id = heapq.heappop(heap)
+            yield building_id, distance
+
+    def nearest(self, latitude: float, longitude: float, k: int,
+                max_distance: Optional[float] = None,
+                exclude_ids: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """近い順にk件の (建物ID, 距離（メートル）) を返す"""
+        result = []
+        if k <= 0:
+            return result
+        for item in self.iter_nearest(latitude, longitude, max_distance, exclude_ids):
+            result.append(item)
+            if len(result) >= k:
+                break
+        return result
+
+    def within_radius(self, latitude: float, longitude: float, radius_meters: float,
+                      exclude_ids: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """半径内の (建物ID, 距離（メートル）) を近い順に返す"""
+        return list(self.iter_nearest(latitude, longitude, radius_meters, exclude_ids))
+
+
+# プロセス内で共有するインスタンス（APIのスレッド間で共有）
+_spatial_index: Optional[BuildingSpatialIndex] = None
+_spatial_index_lock = threading.Lock()
+
+
+def get_building_spatial_index() -> BuildingSpatialIndex:
+    """プロセス内で共有する建物の空間インデックスを取得"""
+    global _spatial_index
+    if _spatial_index is None:
+        with _spatial_index_lock:
+            if _spatial_index is None:
+                _spatial_index = BuildingSpatialIndex(
+                    refresh_seconds=int(os.getenv('BUILDING_SPATIAL_INDEX_REFRESH_SECONDS', '60'))
+                )
+    return _spatial_index
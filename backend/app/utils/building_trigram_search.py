@@ -0,0 +1,146 @@
+"""
+建物名のトライグラム検索
+
+pg_trgm のGINインデックス（alembic: add_trgm_search_idx）を前提に、
+建物名・読み仮名・掲載名（BuildingListingName）をまとめて検索する。
+
+- ILIKE '%語%' の部分一致はトライグラムインデックスで高速化される
+- similarity() で類似度を計算し、表記ゆれ（% 演算子）も候補に含める
+- 建物単位に重複を除いたランキングを1クエリで返す
+
+pg_trgm が使えない環境（SQLiteや拡張未導入のDB）では is_trigram_search_available() が
+Falseを返すので、呼び出し側は従来のILIKE検索を使う。
+"""
+import logging
+from typing import List, Dict, Any
+
+from sqlalchemy import text, select, union
+from sqlalchemy.orm import Session
+
+from ..models import Building, BuildingListingName
+
+logger = logging.getLogger(__name__)
+
+# エンジン（DB URL）ごとの pg_trgm 利用可否
+_trigram_available: Dict[str, bool] = {}
+
+
+def is_trigram_search_available(db: Session) -> bool:
+    """pg_trgm 拡張が使えるか（結果はプロセス内でキャッシュ）"""
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key in _trigram_available:
+        return _trigram_available[key]
+
+    available = False
+    if bind.dialect.name == 'postgresql':
+        try:
+            available = db.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ).first() is not None
+        except Exception as e:
+            logger.warning(f"pg_trgm の確認に失敗しました: {e}")
+            db.rollback()
+
+    _trigram_available[key] = available
+    return available
+
+
+def building_ids_matching_term(normalized_term: str, canonical_term: str):
+    """
+    建物名または掲載名に検索語を含む建物IDのサブクエリ
+
+    建物名と掲載名をUNIONで結合するため、それぞれのトライグラムインデックスが使われる
+    （OR条件で結合すると建物テーブル側の全件走査になる）
+    """
+    return union(
+        select(Building.id).where(Building.normalized_name.ilike(f"%{normalized_term}%")),
+        select(BuildingListingName.building_id).where(
+            BuildingListingName.canonical_name.ilike(f"%{canonical_term}%")
+        )
+    )
+
+
+def search_building_suggestions(db: Session, q: str, search_terms: List[str],
+                                canonical_terms: List[str], limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    建物名サジェストの候補を1クエリで取得
+
+    Args:
+        db: データベースセッション
+        q: 入力された検索文字列
+        search_terms: 正規化済みの検索語（AND条件）
+        canonical_terms: search_terms をcanonical形式にしたもの
+        limit: 最大件数
+
+    Returns:
+        [{'id', 'name', 'matched_by', 'score'}, ...]（物件のある建物のみ、ランキング順）
+    """
+    terms = [(term, canonical) for term, canonical in zip(search_terms, canonical_terms) if term]
+    if not terms:
+        return []
+
+    params: Dict[str, Any] = {
+        'q': ' '.join(search_terms),
+        'cq': ''.join(canonical_terms),
+        'prefix': f"{q}%",
+        'limit': limit,
+    }
+    if len(terms) == 1:
+        # 単一語の場合は入力そのままの掲載名も対象にする（従来の検索と同じ）
+        params['raw'] = f"%{q}%"
+
+    name_conditions = []
+    reading_conditions = []
+    listing_conditions = []
+    for i, (term, canonical) in enumerate(terms):
+        params[f't{i}'] = f"%{term}%"
+        params[f'c{i}'] = f"%{canonical}%"
+        name_conditions.append(f"b.normalized_name ILIKE :t{i}")
+        reading_conditions.append(f"b.reading ILIKE :t{i}")
+
+        listing_condition = [f"bln.normalized_name ILIKE :t{i}", f"bln.canonical_name ILIKE :c{i}"]
+        if 'raw' in params:
+            listing_condition.append("bln.normalized_name ILIKE :raw")
+        listing_conditions.append(f"({' OR '.join(listing_condition)})")
+
+    sql = f"""
+        WITH matches AS (
+            SELECT b.id AS building_id, 1 AS source_rank,
+                   similarity(b.normalized_name, :q) AS score
+            FROM buildings b
+            WHERE ({' AND '.join(name_conditions)}) OR b.normalized_name % :q
+            UNION ALL
+            SELECT b.id, 2, similarity(b.reading, :q)
+            FROM buildings b
+            WHERE b.reading IS NOT NULL AND {' AND '.join(reading_conditions)}
+            UNION ALL
+            SELECT bln.building_id, 3,
+                   GREATEST(similarity(bln.normalized_name, :q), similarity(bln.canonical_name, :cq))
+            FROM building_listing_names bln
+            WHERE ({' AND '.join(listing_conditions)}) OR bln.canonical_name % :cq
+        ),
+        best AS (
+            SELECT building_id, MIN(source_rank) AS source_rank, MAX(score) AS score
+            FROM matches
+            GROUP BY building_id
+        )
+        SELECT b.id, b.normalized_name, best.source_rank, best.score
+        FROM best
+        JOIN buildings b ON b.id = best.building_id
+        WHERE EXISTS (SELECT 1 FROM master_properties mp WHERE mp.building_id = b.id)
+        ORDER BY (b.normalized_name ILIKE :prefix) DESC, best.score DESC,
+                 length(b.normalized_name), b.id
+        LIMIT :limit
+    """
+
+    matched_by = {1: 'name', 2: 'reading', 3: 'listing'}
+    return [
+        {
+            'id': row.id,
+            'name': row.normalized_name,
+            'matched_by': matched_by[row.source_rank],
+            'score': float(row.score or 0),
+        }
+        for row in db.execute(text(sql), params)
+    ]
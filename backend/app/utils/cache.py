@@ -1,67 +1,340 @@
 """
 サーバーサイドキャッシュユーティリティ
+
+2段構成のキャッシュ:
+- ローカル層: プロセス内のLRUキャッシュ（件数上限あり）
+- 共有層: Redis互換サーバー（CACHE_REDIS_URL を設定した場合のみ）
+
+共有層を使うと、uvicornの各ワーカーやスクレイパーのプロセスでキャッシュと
+無効化（clear / clear_pattern / タグ指定の無効化）が共有される。
+ローカル層は共有層の前段として短時間（CACHE_LOCAL_TTL_SECONDS）だけ値を保持するため、
+他のプロセスでの無効化はその時間内に反映される。
+
+同じキーへのリクエストが同時に来た場合は get_or_set() で1回だけ値を計算する
+（プロセス内はキーごとのロック、プロセス間は共有層のロックキー）。
 """
-from datetime import datetime, timedelta
-from typing import Optional, Any, Dict
+import logging
+import os
+import pickle
 import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Any, Dict, Callable, Iterable, Set, Tuple
 
+logger = logging.getLogger(__name__)
 
-class SimpleCache:
-    """シンプルなメモリキャッシュ（スレッドセーフ）"""
+# 直近更新情報（/api/properties/recent-updates 系）のキャッシュに付けるタグ
+RECENT_UPDATES_TAG = 'recent_updates'
+
+# この大きさ（バイト）を超える値は圧縮して共有層に保存する
+_COMPRESS_THRESHOLD = 1024
+_FORMAT_RAW = b'\x00'
+_FORMAT_ZLIB = b'\x01'
+
+
+def serialize_value(value: Any) -> bytes:
+    """値を共有層に保存する形式に変換（pickle、大きい値はzlib圧縮）"""
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) > _COMPRESS_THRESHOLD:
+        return _FORMAT_ZLIB + zlib.compress(data)
+    return _FORMAT_RAW + data
+
+
+def deserialize_value(data: bytes) -> Any:
+    """serialize_value() の逆変換"""
+    if data[:1] == _FORMAT_ZLIB:
+        return pickle.loads(zlib.decompress(data[1:]))
+    return pickle.loads(data[1:])
 
-    def __init__(self):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+
+class LocalLRUCache:
+    """プロセス内のLRUキャッシュ（スレッドセーフ）"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        # key -> (value, 有効期限（time.monotonic）またはNone, タグ)
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float], Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
         self._lock = threading.Lock()
 
+    def __len__(self) -> int:
+        return len(self._entries)
+
     def get(self, key: str) -> Optional[Any]:
-        """キャッシュから値を取得"""
         with self._lock:
-            if key not in self._cache:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _ = entry
+            if expires_at is not None and time.monotonic() > expires_at:
+                self._delete_locked(key)
                 return None
+            self._entries.move_to_end(key)
+            return value
 
-            cache_entry = self._cache[key]
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None, tags: Iterable[str] = ()):
+        with self._lock:
+            self._delete_locked(key)
+            expires_at = time.monotonic() + ttl_seconds if ttl_seconds else None
+            tags = tuple(tags)
+            self._entries[key] = (value, expires_at, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
 
-            # 有効期限チェック
-            if cache_entry['expires_at'] and datetime.now() > cache_entry['expires_at']:
-                del self._cache[key]
-                return None
+            # 上限を超えた分は最も使われていないものから削除
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._delete_locked(oldest_key)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._delete_locked(key)
 
-            return cache_entry['value']
+    def _delete_locked(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
 
-    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
-        """キャッシュに値を設定"""
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def clear_pattern(self, pattern: str):
         with self._lock:
-            expires_at = None
+            for key in [k for k in self._entries if pattern in k]:
+                self._delete_locked(key)
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._delete_locked(key)
+
+
+class RedisCacheBackend:
+    """
+    Redis互換サーバーを使う共有キャッシュ
+
+    client は redis-py 互換のクライアント（redis.Redis、fakeredis など）。
+    キーには prefix を付け、タグはタグごとのSETにキーを登録して管理する。
+    """
+
+    def __init__(self, client, prefix: str = 'realestate:cache:'):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}__tag__:{tag}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.prefix}__lock__:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self.client.get(self._key(key))
+        if data is None:
+            return None
+        return deserialize_value(data)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None, tags: Iterable[str] = ()):
+        full_key = self._key(key)
+        self.client.set(full_key, serialize_value(value), ex=int(ttl_seconds) if ttl_seconds else None)
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            self.client.sadd(tag_key, full_key)
             if ttl_seconds:
-                expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
+                # タグのSETは値より長く残るようにする（値の期限切れ後に残ったキーは無害）
+                self.client.expire(tag_key, int(ttl_seconds) * 2)
+
+    def delete(self, key: str):
+        self.client.delete(self._key(key))
+
+    def _delete_matching(self, match: str):
+        keys = list(self.client.scan_iter(match=match))
+        for start in range(0, len(keys), 500):
+            self.client.delete(*keys[start:start + 500])
+
+    def clear(self):
+        self._delete_matching(f"{self.prefix}*")
+
+    def clear_pattern(self, pattern: str):
+        self._delete_matching(f"{self.prefix}*{pattern}*")
+
+    def invalidate_tags(self, tags: Iterable[str]):
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            keys = list(self.client.smembers(tag_key))
+            self.client.delete(tag_key, *keys)
+
+    def acquire_lock(self, key: str, timeout_seconds: float) -> bool:
+        """値の計算権を取得（他のプロセスが計算中ならFalse）"""
+        return bool(self.client.set(self._lock_key(key), b'1', nx=True, px=int(timeout_seconds * 1000)))
+
+    def release_lock(self, key: str):
+        self.client.delete(self._lock_key(key))
+
+
+class SimpleCache:
+    """
+    サーバーサイドキャッシュ（スレッドセーフ）
+
+    ローカルLRU層と、任意の共有層（RedisCacheBackend）を組み合わせる。
+    """
+
+    def __init__(self, max_entries: int = 1024, shared: Optional[RedisCacheBackend] = None,
+                 local_ttl_seconds: float = 5, lock_timeout_seconds: float = 30):
+        """
+        初期化
+
+        Args:
+            max_entries: ローカル層の最大件数
+            shared: 共有層（Noneの場合はローカル層のみ）
+            local_ttl_seconds: 共有層がある場合にローカル層で値を保持する最大秒数
+            lock_timeout_seconds: get_or_set() で他の計算を待つ最大秒数
+        """
+        self.local = LocalLRUCache(max_entries)
+        self.shared = shared
+        self.local_ttl_seconds = local_ttl_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+
+        # キーごとの計算ロック（キーのハッシュで分割し、ロックの数を固定する）
+        self._key_locks = [threading.RLock() for _ in range(64)]
+
+    def _local_ttl(self, ttl_seconds: Optional[float]) -> Optional[float]:
+        if self.shared is None:
+            return ttl_seconds
+        if ttl_seconds:
+            return min(ttl_seconds, self.local_ttl_seconds)
+        return self.local_ttl_seconds
+
+    def _call_shared(self, operation: str, *args, **kwargs):
+        """共有層の操作（接続エラー時はローカル層だけで動作を続ける）"""
+        try:
+            return getattr(self.shared, operation)(*args, **kwargs)
+        except Exception as e:
+            logger.warning(f"共有キャッシュの{operation}に失敗しました: {e}")
+            return None
 
-            self._cache[key] = {
-                'value': value,
-                'expires_at': expires_at,
-                'created_at': datetime.now()
-            }
+    def get(self, key: str) -> Optional[Any]:
+        """キャッシュから値を取得"""
+        value = self.local.get(key)
+        if value is not None or self.shared is None:
+            return value
+
+        value = self._call_shared('get', key)
+        if value is not None:
+            self.local.set(key, value, self.local_ttl_seconds)
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None, tags: Iterable[str] = ()):
+        """キャッシュに値を設定（tags を付けると invalidate_tags() でまとめて削除できる）"""
+        tags = tuple(tags)
+        self.local.set(key, value, self._local_ttl(ttl_seconds), tags)
+        if self.shared is not None:
+            self._call_shared('set', key, value, ttl_seconds, tags)
 
     def delete(self, key: str):
         """キャッシュから値を削除"""
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+        self.local.delete(key)
+        if self.shared is not None:
+            self._call_shared('delete', key)
 
     def clear(self):
         """すべてのキャッシュをクリア"""
-        with self._lock:
-            self._cache.clear()
+        self.local.clear()
+        if self.shared is not None:
+            self._call_shared('clear')
 
     def clear_pattern(self, pattern: str):
         """パターンに一致するキーをすべて削除"""
-        with self._lock:
-            keys_to_delete = [k for k in self._cache.keys() if pattern in k]
-            for key in keys_to_delete:
-                del self._cache[key]
+        self.local.clear_pattern(pattern)
+        if self.shared is not None:
+            self._call_shared('clear_pattern', pattern)
+
+    def invalidate_tags(self, *tags: str):
+        """指定したタグが付いた値をすべて削除"""
+        self.local.invalidate_tags(tags)
+        if self.shared is not None:
+            self._call_shared('invalidate_tags', tags)
+
+    def _key_lock(self, key: str) -> threading.RLock:
+        return self._key_locks[hash(key) % len(self._key_locks)]
+
+    def get_or_set(self, key: str, loader: Callable[[], Any], ttl_seconds: Optional[int] = None,
+                   tags: Iterable[str] = ()) -> Tuple[Any, bool]:
+        """
+        キャッシュから値を取得し、なければ loader() で計算して保存する
+
+        同じキーの計算はプロセス内・プロセス間で1つだけ実行し、他のリクエストはその結果を待つ。
+
+        Returns:
+            (値, キャッシュヒットしたか)
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, True
+
+        with self._key_lock(key):
+            # 待っている間に他のスレッドが計算した場合
+            value = self.get(key)
+            if value is not None:
+                return value, True
+
+            locked = False
+            if self.shared is not None:
+                locked = self._call_shared('acquire_lock', key, self.lock_timeout_seconds)
+                # Noneは共有層のエラー（待たずに自分で計算する）
+                if locked is False:
+                    # 他のプロセスが計算中なので結果を待つ（タイムアウトしたら自分で計算）
+                    deadline = time.monotonic() + self.lock_timeout_seconds
+                    while time.monotonic() < deadline:
+                        time.sleep(0.05)
+                        value = self.get(key)
+                        if value is not None:
+                            return value, True
+
+            try:
+                value = loader()
+                if value is not None:
+                    self.set(key, value, ttl_seconds, tags)
+                return value, False
+            finally:
+                if locked:
+                    self._call_shared('release_lock', key)
+
+
+def _create_shared_backend() -> Optional[RedisCacheBackend]:
+    """CACHE_REDIS_URL が設定されていれば共有層を作成"""
+    redis_url = os.getenv('CACHE_REDIS_URL', '').strip()
+    if not redis_url:
+        return None
+    try:
+        import redis
+    except ImportError:
+        logger.warning("CACHE_REDIS_URL が設定されていますが redis パッケージがありません。ローカルキャッシュのみ使用します")
+        return None
+
+    client = redis.Redis.from_url(redis_url, socket_timeout=1, socket_connect_timeout=1)
+    return RedisCacheBackend(client, prefix=os.getenv('CACHE_KEY_PREFIX', 'realestate:cache:'))
 
 
 # グローバルキャッシュインスタンス
-_global_cache = SimpleCache()
+_global_cache = SimpleCache(
+    max_entries=int(os.getenv('CACHE_MAX_ENTRIES', '1024')),
+    shared=_create_shared_backend(),
+    local_ttl_seconds=float(os.getenv('CACHE_LOCAL_TTL_SECONDS', '5')),
+)
 
 
 def get_cache() -> SimpleCache:
@@ -70,7 +343,9 @@ def get_cache() -> SimpleCache:
 
 
 def clear_recent_updates_cache():
-    """直近更新情報のキャッシュをクリア"""
+    """直近更新情報のキャッシュをクリア（共有層がある場合は全プロセスに反映）"""
     cache = get_cache()
+    cache.invalidate_tags(RECENT_UPDATES_TAG)
+    # タグ導入前に保存された値も削除
     cache.clear_pattern('recent_updates')
     print(f"[{datetime.now()}] キャッシュクリア: recent_updates")
@@ -602,31 +602,8 @@ class EnhancedBuildingMatcher:
         aliases2 = self._get_building_aliases(building2, session) if building2 else {'names': [], 'total': 0}
         
         # 比較対象の名前リスト（正規化名、canonical、出現割合）
-        names1_with_info = [{'name': norm1, 'canonical': norm1, 'proportion': 1.0}]
-        names2_with_info = [{'name': norm2, 'canonical': norm2, 'proportion': 1.0}]
-        
-        # エイリアスを追加（出現割合計算）
-        if aliases1['total'] > 0:
-            for alias_info in aliases1['names']:
-                normalized_alias = self.building_normalizer.normalize(alias_info['name'])
-                if normalized_alias not in [n['name'] for n in names1_with_info]:
-                    proportion = alias_info['count'] / aliases1['total']
-                    names1_with_info.append({
-                        'name': normalized_alias,
-                        'canonical': alias_info.get('canonical', normalized_alias),
-                        'proportion': proportion
-                    })
-                    
-        if aliases2['total'] > 0:
-            for alias_info in aliases2['names']:
-                normalized_alias = self.building_normalizer.normalize(alias_info['name'])
-                if normalized_alias not in [n['name'] for n in names2_with_info]:
-                    proportion = alias_info['count'] / aliases2['total']
-                    names2_with_info.append({
-                        'name': normalized_alias,
-                        'canonical': alias_info.get('canonical', normalized_alias),
-                        'proportion': proportion
-                    })
+        names1_with_info = self._build_name_variants(norm1, aliases1)
+        names2_with_info = self._build_name_variants(norm2, aliases2)
         
         # デバッグ情報
         self.last_debug_info['name_variations'] = {
@@ -637,6 +614,57 @@ class EnhancedBuildingMatcher:
         }
         
         # 3. 全ての組み合わせで統合スコアを計算し、最高スコアを採用
+        max_unified_score, best_pair, best_details = self._find_best_name_match(
+            names1_with_info, names2_with_info, aliases1, aliases2
+        )
+        
+        # デバッグ情報
+        if best_pair:
+            self.last_debug_info['best_name_match'] = {
+                'pair': best_pair,
+                'unified_score': max_unified_score,
+                **best_details
+            }
+        
+        return max_unified_score
+    
+    def _build_name_variants(self, normalized_name: str, aliases: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """正規化済みの建物名と掲載名（エイリアス）から比較対象の名前リストを作成
+        
+        Returns:
+            [{'name': 正規化名, 'canonical': canonical名, 'proportion': 建物内の出現割合}, ...]
+        """
+        names_with_info = [{'name': normalized_name, 'canonical': normalized_name, 'proportion': 1.0}]
+        
+        # エイリアスを追加（出現割合計算）
+        if aliases['total'] > 0:
+            for alias_info in aliases['names']:
+                normalized_alias = self.building_normalizer.normalize(alias_info['name'])
+                if normalized_alias not in [n['name'] for n in names_with_info]:
+                    proportion = alias_info['count'] / aliases['total']
+                    names_with_info.append({
+                        'name': normalized_alias,
+                        'canonical': alias_info.get('canonical', normalized_alias),
+                        'proportion': proportion
+                    })
+        
+        return names_with_info
+    
+    def _find_best_name_match(self, names1_with_info: List[Dict[str, Any]],
+                              names2_with_info: List[Dict[str, Any]],
+                              aliases1: Dict[str, Any], aliases2: Dict[str, Any],
+                              string_similarity=None) -> Tuple[float, Optional[Tuple[str, str]], Optional[Dict[str, Any]]]:
+        """名前リストの全ての組み合わせで統合スコア（文字列一致度 × 複合割合）を計算し、最高スコアを返す
+        
+        Args:
+            string_similarity: 文字列一致度の計算関数（省略時は BuildingNameNormalizer.calculate_similarity）
+            
+        Returns:
+            (最高スコア, 最もマッチした名前の組, 詳細)
+        """
+        if string_similarity is None:
+            string_similarity = self.building_normalizer.calculate_similarity
+        
         max_unified_score = 0.0
         best_pair = None
         best_details = None
@@ -650,7 +678,7 @@ class EnhancedBuildingMatcher:
                 if n1 == n2:
                     string_match_score = 1.0
                 else:
-                    string_match_score = self.building_normalizer.calculate_similarity(n1, n2)
+                    string_match_score = string_similarity(n1, n2)
                 
                 if string_match_score < 0.5:
                     continue
@@ -722,15 +750,7 @@ class EnhancedBuildingMatcher:
             if max_unified_score >= 0.95:
                 break
         
-        # デバッグ情報
-        if best_pair:
-            self.last_debug_info['best_name_match'] = {
-                'pair': best_pair,
-                'unified_score': max_unified_score,
-                **best_details
-            }
-        
-        return max_unified_score
+        return max_unified_score, best_pair, best_details
     
     
     def _calculate_attribute_similarity(self, building1: Any, building2: Any) -> float:
@@ -0,0 +1,181 @@
+"""
+キーセット（カーソル）ページネーション
+
+一覧APIの OFFSET ページングは深いページほど読み飛ばす行が増えて遅くなるため、
+前ページ最後の行のソートキーを不透明なカーソルとして返し、次ページは
+「そのキーより後ろ」の条件で絞り込む。
+
+- SortKey: ソートキー（カラム・昇順/降順・NULLの位置）。最後のキーは一意（IDなど）にする
+- order_by_clauses(): ORDER BY 句
+- keyset_condition(): カーソル位置より後ろの行を表す条件
+- encode_cursor() / decode_cursor(): カーソル文字列の生成と復元
+- count_rows(): 総件数（exact: COUNT / estimate: 実行計画の推定行数 / none: 数えない）
+"""
+import base64
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, date
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
+
+from sqlalchemy import and_, or_, false, func
+from sqlalchemy.orm import Query
+
+logger = logging.getLogger(__name__)
+
+COUNT_MODES = ("exact", "estimate", "none")
+
+
+class InvalidCursorError(ValueError):
+    """カーソルが壊れている、または別の並び順のカーソル"""
+    pass
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """ソートキー"""
+    column: Any
+    descending: bool = False
+    nulls_last: Optional[bool] = None  # Noneの場合はPostgreSQLの既定（昇順はNULLが最後、降順は最初）
+
+    @property
+    def nulls_are_last(self) -> bool:
+        if self.nulls_last is None:
+            return not self.descending
+        return self.nulls_last
+
+
+def order_by_clauses(keys: Sequence[SortKey]) -> List[Any]:
+    """ソートキーから ORDER BY 句を生成（NULLの位置は明示する）"""
+    clauses = []
+    for key in keys:
+        clause = key.column.desc() if key.descending else key.column.asc()
+        clauses.append(clause.nullslast() if key.nulls_are_last else clause.nullsfirst())
+    return clauses
+
+
+def keyset_condition(keys: Sequence[SortKey], values: Sequence[Any]):
+    """
+    カーソル位置（values）より後ろにある行の条件
+
+    (k1, k2, ..., kn) > (v1, v2, ..., vn) を、キーごとの昇順/降順とNULLの位置を考慮して
+    OR条件に展開する。
+    """
+    if len(keys) != len(values):
+        raise InvalidCursorError("カーソルのキー数が一致しません")
+
+    conditions = []
+    equal_prefix = []
+    for key, value in zip(keys, values):
+        column = key.column
+        if value is None:
+            # NULLが先頭なら非NULLの行はすべて後ろ、NULLが最後なら後ろの行はない
+            after = column.isnot(None) if not key.nulls_are_last else false()
+            equal = column.is_(None)
+        else:
+            after = column < value if key.descending else column > value
+            if key.nulls_are_last:
+                after = or_(after, column.is_(None))
+            equal = column == value
+
+        conditions.append(and_(*equal_prefix, after))
+        equal_prefix.append(equal)
+
+    return or_(*conditions)
+
+
+# ========== カーソル文字列 ==========
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise InvalidCursorError("不正なカーソル値です")
+    return value
+
+
+def encode_cursor(signature: str, values: Sequence[Any]) -> str:
+    """
+    カーソル文字列を生成
+
+    Args:
+        signature: 並び順を表す文字列（別の並び順のカーソルを拒否するため）
+        values: 最後の行のソートキーの値
+    """
+    payload = json.dumps({"s": signature, "v": [_encode_value(v) for v in values]},
+                         ensure_ascii=False, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, signature: str) -> List[Any]:
+    """カーソル文字列からソートキーの値を復元"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        if payload.get("s") != signature:
+            raise InvalidCursorError("並び順が異なるカーソルです")
+        return [_decode_value(v) for v in payload["v"]]
+    except InvalidCursorError:
+        raise
+    except Exception as e:
+        raise InvalidCursorError(f"カーソルを解析できません: {e}")
+
+
+# ========== 総件数 ==========
+
+def estimate_count(query: Query) -> Optional[int]:
+    """
+    実行計画の推定行数を返す（PostgreSQLのみ。それ以外はNone）
+
+    COUNT(*) と違って該当行を読まないため、件数が多い検索でも一定時間で返る。
+    """
+    session = query.session
+    bind = session.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return None
+
+    compiled = query.order_by(None).statement.compile(
+        dialect=bind.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    try:
+        # 失敗してもトランザクションを壊さないようセーブポイント内で実行
+        with session.begin_nested():
+            plan = session.connection().exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+            ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.warning(f"件数の推定に失敗しました: {e}")
+        return None
+
+
+def count_rows(query: Query, count_mode: str = "exact") -> Optional[int]:
+    """
+    総件数を取得
+
+    Args:
+        query: 件数を数えるクエリ
+        count_mode: exact（正確な件数）/ estimate（推定値。使えない場合は正確な件数）/ none（数えない）
+    """
+    if count_mode == "none":
+        return None
+    if count_mode == "estimate":
+        estimated = estimate_count(query)
+        if estimated is not None:
+            return estimated
+    return query.session.query(func.count()).select_from(query.order_by(None).subquery()).scalar()
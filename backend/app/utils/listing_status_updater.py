@@ -0,0 +1,215 @@
+"""
+掲載状態の一括更新
+
+24時間以上確認されていない掲載の終了、再確認された掲載の再開、全掲載が終了した物件の
+販売終了（sold_at / final_price）の設定を、物件ごとのループではなく数本の UPDATE 文で行う。
+物件数が多くてもトランザクションが短く済み、スクレイパーとのロック競合が起きにくい。
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from ..models import MasterProperty, PropertyListing
+from .price_queries import calculate_final_prices_for_sold_properties
+from .property_utils import update_earliest_listing_dates, update_latest_price_changes
+
+logger = logging.getLogger(__name__)
+
+# 掲載がこの時間以上確認されていなければ掲載終了とする
+DEFAULT_INACTIVE_THRESHOLD = timedelta(hours=24)
+
+# IN句に渡す物件IDの最大数
+CHUNK_SIZE = 1000
+
+
+def _chunks(ids: Iterable[int]) -> Iterable[List[int]]:
+    ordered = sorted(set(ids))
+    for chunk_start in range(0, len(ordered), CHUNK_SIZE):
+        yield ordered[chunk_start:chunk_start + CHUNK_SIZE]
+
+
+class ListingStatusUpdater:
+    """掲載状態と販売終了状態の一括更新"""
+
+    def __init__(self, session: Session, inactive_threshold: timedelta = DEFAULT_INACTIVE_THRESHOLD):
+        self.session = session
+        self.inactive_threshold = inactive_threshold
+
+    def _has_active_listing(self):
+        return select(PropertyListing.id).where(
+            PropertyListing.master_property_id == MasterProperty.id,
+            PropertyListing.is_active == True
+        ).exists()
+
+    def _sold_listing_summary(self):
+        """全掲載が非アクティブで掲載終了日時がある物件と、その最新の掲載終了日時"""
+        return select(
+            PropertyListing.master_property_id,
+            func.max(PropertyListing.delisted_at).label('max_delisted_at')
+        ).group_by(
+            PropertyListing.master_property_id
+        ).having(
+            func.max(case((PropertyListing.is_active == True, 1), else_=0)) == 0,
+            func.max(PropertyListing.delisted_at).isnot(None)
+        ).subquery()
+
+    def reactivate_listings(self, now: datetime, threshold: datetime) -> List[int]:
+        """閾値以降に確認された非アクティブな掲載を再開し、対象の物件IDを返す（掲載ごと）"""
+        return self.session.execute(
+            update(PropertyListing)
+            .where(
+                PropertyListing.is_active == False,
+                PropertyListing.last_confirmed_at >= threshold
+            )
+            .values(is_active=True, delisted_at=None, updated_at=now)
+            .returning(PropertyListing.master_property_id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+
+    def deactivate_listings(self, now: datetime, threshold: datetime) -> List[int]:
+        """閾値より前から確認されていないアクティブな掲載を終了し、対象の物件IDを返す（掲載ごと）"""
+        return self.session.execute(
+            update(PropertyListing)
+            .where(
+                PropertyListing.is_active == True,
+                PropertyListing.last_confirmed_at < threshold
+            )
+            .values(is_active=False, delisted_at=now, updated_at=now)
+            .returning(PropertyListing.master_property_id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+
+    def reopen_properties(self, property_ids: Iterable[int]) -> Set[int]:
+        """アクティブな掲載がある販売終了物件を販売再開に戻す"""
+        reopened = set()
+        for chunk in _chunks(property_ids):
+            reopened.update(self.session.execute(
+                update(MasterProperty)
+                .where(
+                    MasterProperty.id.in_(chunk),
+                    MasterProperty.sold_at.isnot(None),
+                    self._has_active_listing()
+                )
+                .values(sold_at=None, final_price=None, final_price_updated_at=None)
+                .returning(MasterProperty.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all())
+        return reopened
+
+    def reopen_properties_missing_final_price(self) -> Set[int]:
+        """final_price未設定の販売終了物件のうち、アクティブな掲載があるものを販売再開に戻す"""
+        return set(self.session.execute(
+            update(MasterProperty)
+            .where(
+                MasterProperty.sold_at.isnot(None),
+                MasterProperty.final_price.is_(None),
+                self._has_active_listing()
+            )
+            .values(sold_at=None, final_price=None, final_price_updated_at=None)
+            .returning(MasterProperty.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all())
+
+    def mark_sold_properties(self) -> Set[int]:
+        """全掲載が終了しているのに sold_at が未設定の物件に、最新の掲載終了日時を設定"""
+        summary = self._sold_listing_summary()
+        return set(self.session.execute(
+            update(MasterProperty)
+            .where(
+                MasterProperty.id == summary.c.master_property_id,
+                MasterProperty.sold_at.is_(None)
+            )
+            .values(sold_at=summary.c.max_delisted_at)
+            .returning(MasterProperty.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all())
+
+    def update_final_prices(self, property_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        販売終了物件の最終価格を再計算
+
+        Args:
+            property_ids: 再計算する物件ID（販売中の物件は無視される）
+
+        Returns:
+            {物件ID: 設定した最終価格}
+        """
+        summary = self._sold_listing_summary()
+        base_query = select(MasterProperty.id, summary.c.max_delisted_at).join(
+            summary, summary.c.master_property_id == MasterProperty.id
+        ).where(MasterProperty.sold_at.isnot(None))
+
+        # 最終価格は全掲載の最新の掲載終了日時を基準に計算する
+        sold_at_by_property = {}
+        for chunk in _chunks(property_ids):
+            sold_at_by_property.update(
+                self.session.execute(base_query.where(MasterProperty.id.in_(chunk))).all()
+            )
+
+        final_prices = calculate_final_prices_for_sold_properties(self.session, sold_at_by_property)
+        if final_prices:
+            self.session.execute(
+                update(MasterProperty),
+                [{"id": pid, "final_price": price} for pid, price in final_prices.items()]
+            )
+        return final_prices
+
+    def run(self, now: Optional[datetime] = None) -> dict:
+        """
+        掲載状態を一括更新
+
+        Returns:
+            dict: 更新結果の統計情報と、集計テーブルの更新が必要な物件ID（affected_property_ids）
+        """
+        now = now or datetime.now()
+        threshold = now - self.inactive_threshold
+
+        # 1. 再確認された掲載を再開し、販売終了になっていた物件を販売再開とする
+        reactivated = self.reactivate_listings(now, threshold)
+        reopened = self.reopen_properties(reactivated)
+
+        # 2. 確認されていない掲載を終了
+        deactivated = self.deactivate_listings(now, threshold)
+        touched = set(reactivated) | set(deactivated)
+
+        # 掲載が変わった物件のうち、アクティブな掲載がある販売終了物件も販売再開に戻す
+        self.reopen_properties(touched)
+
+        # 3. 全掲載が終了した物件を販売終了とする（過去の設定漏れも含む）
+        newly_sold = self.mark_sold_properties()
+        sold = newly_sold & touched
+        fixed_sold = newly_sold - touched
+
+        # 4. 最終価格を設定（今回販売終了になった物件、掲載が変わった物件、final_price未設定の物件）
+        missing_final_price = set(self.session.execute(
+            select(MasterProperty.id).where(
+                MasterProperty.sold_at.isnot(None),
+                MasterProperty.final_price.is_(None)
+            )
+        ).scalars().all()) - newly_sold - touched
+        reopened_missing_final_price = self.reopen_properties_missing_final_price()
+        final_prices = self.update_final_prices(newly_sold | touched | missing_final_price)
+        fixed_final_price = missing_final_price & set(final_prices)
+
+        # 影響を受けた全物件の最初の掲載日と価格改定日を更新
+        update_earliest_listing_dates(self.session, touched)
+        update_latest_price_changes(self.session, touched)
+
+        logger.info(
+            f"掲載状態を一括更新: 再開 {len(reactivated)}件, 終了 {len(deactivated)}件, "
+            f"販売終了 {len(sold)}件, sold_at修正 {len(fixed_sold)}件, final_price修正 {len(fixed_final_price)}件"
+        )
+
+        return {
+            "reactivated_listings": len(reactivated),
+            "reopened_properties": len(reopened),
+            "inactive_listings": len(deactivated),
+            "sold_properties": len(sold),
+            "fixed_sold_properties": len(fixed_sold),
+            "fixed_final_price": len(fixed_final_price),
+            "affected_property_ids": touched | fixed_sold | fixed_final_price | reopened_missing_final_price,
+        }
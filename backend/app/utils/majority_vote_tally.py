@@ -0,0 +1,411 @@
+"""
+多数決用の票集計テーブル（property_vote_tallies / building_vote_tallies）の管理
+
+掲載情報の属性値ごとの票数（掲載数）を、物件単位・建物単位・掲載サイト別に保持する。
+MajorityVoteUpdater はこの集計から (値, 掲載サイト) の票を組み立てるため、
+物件・建物の全掲載を読み直さずに多数決を取れる。
+
+- ListingVoteTracker: 掲載の変更前後の値を比べ、差分だけ集計に反映する（スクレイパーの保存時）
+- refresh_vote_tallies(): 指定した物件・建物の集計を掲載情報から作り直す（掲載状態の一括更新・統合など）
+- refresh_building_vote_tallies(): 指定建物とその全物件の集計を作り直す（建物統合・物件移動など）
+- rebuild_vote_tallies(): 全件を作り直す（初期投入・不整合の修復用）
+
+票数は掲載1件につき1票（listing_count）。掲載中の掲載の票数（active_count）も別に持ち、
+アクティブな掲載のみで多数決を取る属性に使う。
+
+集計には掲載の順序が残らないため、票は (掲載サイト, 値) の順に並べて返す。
+票数・サイト優先順位が同じ値どうしの同点は、掲載の取得順ではなく
+集計テーブル上の値（文字列）の昇順で先にくる値が選ばれる。
+"""
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from ..models import MasterProperty, PropertyListing
+
+logger = logging.getLogger(__name__)
+
+# 1回のSQLで処理するID数の上限
+TALLY_CHUNK_SIZE = 500
+
+# 物件の票（キーは collect_property_info_from_listings の戻り値と同じ）: (掲載のカラム, 値の型)
+PROPERTY_VOTE_FIELDS = {
+    'floor_numbers': ('listing_floor_number', int),
+    'areas': ('listing_area', float),
+    'layouts': ('listing_layout', str),
+    'directions': ('listing_direction', str),
+    'balcony_areas': ('listing_balcony_area', float),
+    'management_fees': ('management_fee', int),
+    'repair_funds': ('repair_fund', int),
+    'parking_infos': ('listing_parking_info', str),
+    'addresses': ('listing_address', str),
+    'prices': ('current_price', int),
+    'building_names': ('listing_building_name', str),
+}
+
+# 建物の票（キーは collect_building_info_from_listings の戻り値と同じ）
+# 敷地権利形態は掲載日から借地期限を計算するため集計しない
+BUILDING_VOTE_FIELDS = {
+    'addresses': ('listing_address', str),
+    'total_floors': ('listing_total_floors', int),
+    'built_years': ('listing_built_year', int),
+    'built_months': ('listing_built_month', int),
+    'structures': ('listing_building_structure', str),
+    'basement_floors': ('listing_basement_floors', int),
+    'station_infos': ('listing_station_info', str),
+    'total_units': ('listing_total_units', int),
+}
+
+# 集計対象（物件・建物）ごとのテーブルとIDカラム
+_TALLY_TABLES = {
+    'property': ('property_vote_tallies', 'master_property_id', PROPERTY_VOTE_FIELDS),
+    'building': ('building_vote_tallies', 'building_id', BUILDING_VOTE_FIELDS),
+}
+
+
+def _encode_value(value: Any, value_type: type) -> Optional[str]:
+    """
+    票の値を集計テーブルの文字列に変換（空の値は票にならないためNone）
+
+    同じ値が常に同じ文字列になるよう、型を揃えてから変換する（例: 面積の 70 と 70.0）
+    """
+    if not value:
+        return None
+    return str(value_type(value))
+
+
+def _source_site(listing: PropertyListing) -> str:
+    return str(getattr(listing.source_site, 'value', listing.source_site))
+
+
+class ListingVotes(NamedTuple):
+    """1件の掲載が投じている票"""
+    master_property_id: int
+    building_id: Optional[int]
+    source_site: str
+    is_active: bool
+    property_values: Tuple[Tuple[str, str], ...]   # ((フィールド, 値), ...)
+    building_values: Tuple[Tuple[str, str], ...]
+
+
+def listing_votes(session: Session, listing: PropertyListing) -> Optional[ListingVotes]:
+    """掲載の現在の値から票を作る（物件に紐付いていない掲載はNone）"""
+    if listing is None or not listing.master_property_id:
+        return None
+
+    master_property = session.get(MasterProperty, listing.master_property_id)
+    building_id = master_property.building_id if master_property else None
+
+    def values(fields):
+        result = []
+        for field, (column, value_type) in fields.items():
+            encoded = _encode_value(getattr(listing, column, None), value_type)
+            if encoded is not None:
+                result.append((field, encoded))
+        return tuple(result)
+
+    return ListingVotes(
+        master_property_id=listing.master_property_id,
+        building_id=building_id,
+        source_site=_source_site(listing),
+        is_active=bool(listing.is_active),
+        property_values=values(PROPERTY_VOTE_FIELDS),
+        building_values=values(BUILDING_VOTE_FIELDS),
+    )
+
+
+def _add_votes(deltas: Dict[tuple, List[int]], votes: Optional[ListingVotes], sign: int):
+    """票の増減を (対象, ID, フィールド, サイト, 値) ごとに積み上げる"""
+    if votes is None:
+        return
+    active = sign if votes.is_active else 0
+    targets = [('property', votes.master_property_id, votes.property_values)]
+    if votes.building_id:
+        targets.append(('building', votes.building_id, votes.building_values))
+    for kind, owner_id, values in targets:
+        for field, value in values:
+            delta = deltas[(kind, owner_id, field, votes.source_site, value)]
+            delta[0] += sign
+            delta[1] += active
+
+
+def apply_vote_changes(session: Session, changes: Iterable[Tuple[Optional[ListingVotes], Optional[ListingVotes]]]) -> int:
+    """
+    掲載の変更前後の票の差分を集計テーブルに反映する
+
+    呼び出し側のトランザクション内で実行する（コミットは呼び出し側で行う）。
+
+    Args:
+        session: データベースセッション
+        changes: (変更前の票, 変更後の票) のリスト（新規掲載は変更前がNone）
+
+    Returns:
+        更新した集計行の数
+    """
+    deltas: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+    for before, after in changes:
+        _add_votes(deltas, before, -1)
+        _add_votes(deltas, after, 1)
+
+    rows_by_kind: Dict[str, List[dict]] = defaultdict(list)
+    for (kind, owner_id, field, source_site, value), (listing_delta, active_delta) in deltas.items():
+        if listing_delta or active_delta:
+            rows_by_kind[kind].append({
+                'owner_id': owner_id, 'field': field, 'source_site': source_site, 'value': value,
+                'listing_count': listing_delta, 'active_count': active_delta,
+            })
+
+    updated = 0
+    for kind, rows in rows_by_kind.items():
+        table, id_column, _ = _TALLY_TABLES[kind]
+        session.execute(text(f"""
+            INSERT INTO {table} ({id_column}, field, source_site, value, listing_count, active_count)
+            VALUES (:owner_id, :field, :source_site, :value, :listing_count, :active_count)
+            ON CONFLICT ({id_column}, field, source_site, value) DO UPDATE SET
+                listing_count = {table}.listing_count + EXCLUDED.listing_count,
+                active_count = {table}.active_count + EXCLUDED.active_count
+        """), rows)
+        # 票がなくなった値は削除
+        session.execute(
+            text(f"DELETE FROM {table} WHERE {id_column} IN :owner_ids AND listing_count <= 0")
+            .bindparams(bindparam('owner_ids', expanding=True)),
+            {'owner_ids': sorted({row['owner_id'] for row in rows})}
+        )
+        updated += len(rows)
+    return updated
+
+
+class ListingVoteTracker:
+    """
+    掲載の変更前の票を記録し、変更後との差分を集計テーブルに反映する
+
+    使用例:
+        tracker = ListingVoteTracker(session)
+        tracker.track(listing)        # 変更前に呼ぶ
+        listing.listing_area = 70.5
+        tracker.track_new(new_listing)
+        tracker.apply()               # 変更後に呼ぶ
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._before: Dict[int, Tuple[PropertyListing, Optional[ListingVotes]]] = {}
+
+    def track(self, listing: Optional[PropertyListing]):
+        """既存の掲載を変更する前に呼ぶ（同じ掲載は最初の呼び出し時の票を使う）"""
+        if listing is not None and id(listing) not in self._before:
+            self._before[id(listing)] = (listing, listing_votes(self.session, listing))
+
+    def track_new(self, listing: Optional[PropertyListing]):
+        """新規に追加した掲載を記録する"""
+        if listing is not None and id(listing) not in self._before:
+            self._before[id(listing)] = (listing, None)
+
+    def apply(self) -> int:
+        """記録した掲載の差分を反映する"""
+        changes = []
+        for listing, before in self._before.values():
+            changes.append((before, listing_votes(self.session, listing)))
+        self._before.clear()
+        return apply_vote_changes(self.session, changes)
+
+
+def _chunks(ids: List[int]) -> Iterable[List[int]]:
+    for start in range(0, len(ids), TALLY_CHUNK_SIZE):
+        yield ids[start:start + TALLY_CHUNK_SIZE]
+
+
+def _insert_tallies(session: Session, kind: str, tallies: Dict[tuple, List[int]]):
+    """集計結果を一括で挿入"""
+    table, id_column, _ = _TALLY_TABLES[kind]
+    rows = [
+        {'owner_id': owner_id, 'field': field, 'source_site': source_site, 'value': value,
+         'listing_count': counts[0], 'active_count': counts[1]}
+        for (owner_id, field, source_site, value), counts in tallies.items()
+    ]
+    if rows:
+        session.execute(text(f"""
+            INSERT INTO {table} ({id_column}, field, source_site, value, listing_count, active_count)
+            VALUES (:owner_id, :field, :source_site, :value, :listing_count, :active_count)
+        """), rows)
+
+
+def _listing_columns():
+    columns = {column for column, _ in PROPERTY_VOTE_FIELDS.values()}
+    columns |= {column for column, _ in BUILDING_VOTE_FIELDS.values()}
+    return [getattr(PropertyListing, column) for column in sorted(columns)]
+
+
+def _tally_rows(rows, columns, fields, owner_index) -> Dict[tuple, List[int]]:
+    """掲載の行（カラム値・掲載サイト・掲載中か・集計対象ID）から票を数える"""
+    column_index = {column.key: index for index, column in enumerate(columns)}
+    tallies: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+    for row in rows:
+        owner_id = row[owner_index]
+        if owner_id is None:
+            continue
+        source_site = str(getattr(row.source_site, 'value', row.source_site))
+        for field, (column, value_type) in fields.items():
+            value = _encode_value(row[column_index[column]], value_type)
+            if value is None:
+                continue
+            counts = tallies[(owner_id, field, source_site, value)]
+            counts[0] += 1
+            if row.is_active:
+                counts[1] += 1
+    return tallies
+
+
+def _refresh(session: Session, kind: str, owner_ids: List[int]) -> int:
+    table, id_column, fields = _TALLY_TABLES[kind]
+    columns = _listing_columns()
+    owner_column = (PropertyListing.master_property_id if kind == 'property'
+                    else MasterProperty.building_id)
+
+    refreshed = 0
+    for chunk in _chunks(owner_ids):
+        session.execute(
+            text(f"DELETE FROM {table} WHERE {id_column} IN :owner_ids")
+            .bindparams(bindparam('owner_ids', expanding=True)),
+            {'owner_ids': chunk}
+        )
+        query = session.query(
+            *columns, PropertyListing.source_site, PropertyListing.is_active, owner_column
+        )
+        if kind == 'building':
+            query = query.join(MasterProperty, MasterProperty.id == PropertyListing.master_property_id)
+        rows = query.filter(owner_column.in_(chunk)).all()
+        tallies = _tally_rows(rows, columns, fields, owner_index=len(columns) + 2)
+        _insert_tallies(session, kind, tallies)
+        refreshed += len(tallies)
+    return refreshed
+
+
+def refresh_vote_tallies(session: Session, property_ids: Iterable[Optional[int]] = (),
+                         building_ids: Iterable[Optional[int]] = ()) -> int:
+    """
+    指定した物件・建物の票集計を掲載情報から作り直す
+
+    掲載状態の一括更新（UPDATE文）や物件・建物の統合など、掲載ごとの差分を
+    追えない変更の後に呼ぶ。物件の集計を作り直す場合、その物件の建物の集計も作り直す。
+    呼び出し側のトランザクション内で実行する（コミットは呼び出し側で行う）。
+
+    Returns:
+        作り直した集計行の数
+    """
+    property_id_list = sorted({pid for pid in property_ids if pid is not None})
+    building_id_set = {bid for bid in building_ids if bid is not None}
+
+    session.flush()
+    if property_id_list:
+        for chunk in _chunks(property_id_list):
+            building_id_set.update(
+                building_id for (building_id,) in session.query(MasterProperty.building_id)
+                .filter(MasterProperty.id.in_(chunk)).distinct()
+                if building_id is not None
+            )
+
+    refreshed = 0
+    if property_id_list:
+        refreshed += _refresh(session, 'property', property_id_list)
+    if building_id_set:
+        refreshed += _refresh(session, 'building', sorted(building_id_set))
+    return refreshed
+
+
+def refresh_building_vote_tallies(session: Session, building_ids: Iterable[Optional[int]]) -> int:
+    """
+    指定建物とその全物件の票集計を作り直す（建物統合・物件移動の後など）
+
+    Returns:
+        作り直した集計行の数
+    """
+    ids = sorted({building_id for building_id in building_ids if building_id is not None})
+    if not ids:
+        return 0
+
+    session.flush()
+    property_ids = [
+        property_id for (property_id,) in session.query(MasterProperty.id)
+        .filter(MasterProperty.building_id.in_(ids))
+    ]
+    return refresh_vote_tallies(session, property_ids=property_ids, building_ids=ids)
+
+
+def rebuild_vote_tallies(session: Session, batch_size: int = 5000) -> int:
+    """
+    全物件・全建物の票集計を作り直す（初期投入・不整合の修復用）
+
+    物件ID・建物IDの範囲ごとに作り直すため、途中でコミットしない限り
+    1つのトランザクションで実行される。
+
+    Returns:
+        作り直した集計行の数
+    """
+    session.flush()
+    session.execute(text("DELETE FROM property_vote_tallies"))
+    session.execute(text("DELETE FROM building_vote_tallies"))
+
+    rebuilt = 0
+    property_ids = [pid for (pid,) in session.query(MasterProperty.id).order_by(MasterProperty.id)]
+    for start in range(0, len(property_ids), batch_size):
+        rebuilt += _refresh(session, 'property', property_ids[start:start + batch_size])
+
+    building_ids = [
+        bid for (bid,) in session.query(MasterProperty.building_id)
+        .filter(MasterProperty.building_id.isnot(None)).distinct().order_by(MasterProperty.building_id)
+    ]
+    for start in range(0, len(building_ids), batch_size):
+        rebuilt += _refresh(session, 'building', building_ids[start:start + batch_size])
+
+    logger.info(f"票集計を再作成: {rebuilt}行（物件{len(property_ids)}件・建物{len(building_ids)}件）")
+    return rebuilt
+
+
+def _load_votes(session: Session, kind: str, owner_id: int, active_only: bool,
+                fields: Optional[Iterable[str]] = None) -> Dict[str, List[tuple]]:
+    """
+    集計から (値, 掲載サイト) の票を組み立てる
+
+    票数の分だけ同じ (値, 掲載サイト) を並べるため、既存の多数決関数にそのまま渡せる。
+    並び順は (掲載サイト, 値) で固定し、同点の値の選ばれ方を掲載の順序に依存させない。
+    """
+    table, id_column, field_types = _TALLY_TABLES[kind]
+    count_column = 'active_count' if active_only else 'listing_count'
+    field_names = list(fields) if fields is not None else list(field_types)
+    votes: Dict[str, List[tuple]] = {field: [] for field in field_names}
+
+    rows = session.execute(
+        text(f"""
+            SELECT field, value, source_site, {count_column}
+            FROM {table}
+            WHERE {id_column} = :owner_id AND field IN :fields AND {count_column} > 0
+            ORDER BY field, source_site, value
+        """).bindparams(bindparam('fields', expanding=True)),
+        {'owner_id': owner_id, 'fields': field_names}
+    )
+    for field, value, source_site, count in rows:
+        _, value_type = field_types[field]
+        votes[field].extend([(value_type(value), source_site)] * count)
+    return votes
+
+
+def load_property_votes(session: Session, property_id: int, active_only: bool,
+                        fields: Optional[Iterable[str]] = None) -> Dict[str, List[tuple]]:
+    """
+    物件の票を集計から取得
+
+    Args:
+        active_only: Trueの場合は掲載中の掲載の票のみ
+        fields: 取得するフィールド（PROPERTY_VOTE_FIELDS のキー、省略時は全て）
+    """
+    return _load_votes(session, 'property', property_id, active_only, fields)
+
+
+def load_building_votes(session: Session, building_id: int, active_only: bool,
+                        fields: Optional[Iterable[str]] = None) -> Dict[str, List[tuple]]:
+    """建物の票を集計から取得（fields は BUILDING_VOTE_FIELDS のキー）"""
+    return _load_votes(session, 'building', building_id, active_only, fields)
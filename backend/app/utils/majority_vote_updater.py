@@ -11,7 +11,9 @@ from sqlalchemy import func, and_, String
 from sqlalchemy.orm import Session
 from ..models import Building, MasterProperty, PropertyListing, ListingPriceHistory
 from .building_name_normalizer import remove_ad_text_from_building_name, remove_room_number_from_building_name
+from .majority_vote_tally import load_property_votes, load_building_votes, BUILDING_VOTE_FIELDS
 import logging
+import os
 import re
 from dateutil.relativedelta import relativedelta
 
@@ -24,8 +26,12 @@ class MajorityVoteUpdater:
     # サイトの優先順位（左が高優先度）
     SITE_PRIORITY = ['suumo', 'homes', 'rehouse', 'nomu', '東急リバブル']
     
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, use_vote_tallies: Optional[bool] = None):
         self.session = session
+        # 票集計テーブル（majority_vote_tally）から票を読むか（Falseの場合は全掲載を読み直す）
+        if use_vote_tallies is None:
+            use_vote_tallies = os.getenv('MAJORITY_VOTE_USE_TALLIES', 'true').lower() == 'true'
+        self.use_vote_tallies = use_vote_tallies
 
     def add_to_price_change_queue(self, master_property_id: int, reason: str = "majority_vote_update"):
         """
@@ -719,6 +725,37 @@ class MajorityVoteUpdater:
         
         return info
     
+    def _has_active_listing(self, master_property_id: int) -> bool:
+        """物件に掲載中の掲載があるか"""
+        return self.session.query(
+            self.session.query(PropertyListing.id).filter(
+                PropertyListing.master_property_id == master_property_id,
+                PropertyListing.is_active == True
+            ).exists()
+        ).scalar()
+    
+    def _has_active_building_listing(self, building_id: int) -> bool:
+        """建物に掲載中の掲載があるか"""
+        return self.session.query(
+            self.session.query(PropertyListing.id).join(MasterProperty).filter(
+                MasterProperty.building_id == building_id,
+                PropertyListing.is_active == True
+            ).exists()
+        ).scalar()
+    
+    def collect_property_votes(self, master_property: MasterProperty, include_inactive: bool,
+                               has_active_listing: bool) -> Dict[str, List[Any]]:
+        """
+        物件の票を取得する（collect_property_info_from_listings と同じ形式）
+        
+        票集計テーブルを使う場合は掲載を読み直さない。全掲載が非アクティブな販売終了物件は
+        販売終了前1週間の掲載で多数決を取るため、掲載情報から収集する。
+        """
+        if self.use_vote_tallies and (has_active_listing or not include_inactive):
+            # アクティブな掲載がある場合はそれらのみ、ない場合は全ての掲載の票
+            return load_property_votes(self.session, master_property.id, active_only=has_active_listing)
+        return self.collect_property_info_from_listings(master_property, include_inactive)
+    
     def update_master_property_by_majority(self, master_property: MasterProperty) -> bool:
         """
         物件情報を掲載情報の多数決で更新する
@@ -728,7 +765,8 @@ class MajorityVoteUpdater:
         """
         # 販売終了物件の場合は非アクティブも含める
         include_inactive = master_property.sold_at is not None
-        info = self.collect_property_info_from_listings(master_property, include_inactive)
+        has_active_listing = self._has_active_listing(master_property.id)
+        info = self.collect_property_votes(master_property, include_inactive, has_active_listing)
         updated = False
         
         # 更新予定の値を保持（ユニーク制約チェック用）
@@ -769,7 +807,6 @@ class MajorityVoteUpdater:
         
         # 価格の多数決（アクティブな掲載がある場合のみ）
         # sold_atが設定されていても、アクティブな掲載があれば価格を更新
-        has_active_listing = any(listing.is_active for listing in master_property.listings)
         if has_active_listing and info['prices']:
             # 価格のみを抽出（ソース情報は不要）
             prices = [price for price, _ in info['prices']]
@@ -857,7 +894,7 @@ class MajorityVoteUpdater:
         name_updated = self.update_building_name_by_majority(building)
         
         # 建物に関連する全ての掲載情報から建物属性を収集
-        building_info = self.collect_building_info_from_listings(building.id)
+        building_info = self.collect_building_votes(building.id)
         updated = name_updated  # 建物名が更新された場合はTrueから開始
         
         # 住所の多数決（正規化あり）
@@ -959,6 +996,38 @@ class MajorityVoteUpdater:
         
         return updated
     
+    def collect_building_votes(self, building_id: int) -> Dict[str, List[Any]]:
+        """
+        建物の票を取得する（collect_building_info_from_listings と同じ形式）
+        
+        票集計テーブルを使う場合、掲載日が必要な敷地権利形態のみ掲載情報から収集する。
+        """
+        if not self.use_vote_tallies:
+            return self.collect_building_info_from_listings(building_id)
+        
+        # 普遍的属性は全ての掲載履歴の票
+        info = load_building_votes(
+            self.session, building_id, active_only=False,
+            fields=[field for field in BUILDING_VOTE_FIELDS if field != 'station_infos']
+        )
+        # 可変的属性（交通情報）はアクティブな掲載のみ（全て非アクティブの場合は全て）の票
+        has_active_listing = self._has_active_building_listing(building_id)
+        info.update(load_building_votes(
+            self.session, building_id, active_only=has_active_listing, fields=['station_infos']
+        ))
+        # 敷地権利形態（終了日計算のために created_at も含める）
+        info['land_rights'] = [
+            (land_rights, source_site, created_at)
+            for land_rights, source_site, created_at in self.session.query(
+                PropertyListing.listing_land_rights, PropertyListing.source_site, PropertyListing.created_at
+            ).join(MasterProperty).filter(
+                MasterProperty.building_id == building_id,
+                PropertyListing.listing_land_rights.isnot(None),
+                PropertyListing.listing_land_rights != ''
+            )
+        ]
+        return info
+    
     def collect_building_info_from_listings(self, building_id: int) -> Dict[str, List[Any]]:
         """
         建物に関連する全ての掲載情報から建物属性を収集
@@ -1206,17 +1275,26 @@ class MajorityVoteUpdater:
         all_building_names = []
         name_weights = {}  # {建物名: 重み}
 
-        # 全ての掲載情報を取得（アクティブ・非アクティブ両方）
+        # 全ての掲載情報の建物名を取得（アクティブ・非アクティブ両方）
         # 改善: アクティブ掲載のみではなく、全掲載で多数決を取る
-        all_listings = self.session.query(PropertyListing).filter(
-            PropertyListing.master_property_id == property_id,
-            PropertyListing.listing_building_name.isnot(None)
-        ).all()
+        if self.use_vote_tallies:
+            listing_building_names = [
+                name for name, _ in load_property_votes(
+                    self.session, property_id, active_only=False, fields=['building_names']
+                )['building_names']
+            ]
+        else:
+            listing_building_names = [
+                name for (name,) in self.session.query(PropertyListing.listing_building_name).filter(
+                    PropertyListing.master_property_id == property_id,
+                    PropertyListing.listing_building_name.isnot(None)
+                )
+            ]
 
-        for listing in all_listings:
-            if listing.listing_building_name:
+        for listing_building_name in listing_building_names:
+            if listing_building_name:
                 # 広告文除去処理を適用
-                cleaned_building_name = remove_ad_text_from_building_name(listing.listing_building_name)
+                cleaned_building_name = remove_ad_text_from_building_name(listing_building_name)
 
                 # 部屋番号除去処理を適用
                 cleaned_building_name = remove_room_number_from_building_name(
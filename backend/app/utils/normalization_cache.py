@@ -0,0 +1,68 @@
+"""
+建物名・住所の正規化結果のメモ化
+
+正規化関数は1件の掲載につき何度も、建物の候補ごとにも呼ばれるが、入力される
+建物名・住所の種類は限られている。入力文字列をキーにした件数上限付きのLRUキャッシュで
+同じ入力の再計算を省き、normalize_many() で複数件をまとめて正規化する。
+
+キャッシュの件数上限は NORMALIZER_CACHE_SIZE（関数ごと）で変更できる。
+"""
+
+import os
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional
+
+# 正規化関数ごとのキャッシュ件数上限
+NORMALIZER_CACHE_SIZE = int(os.getenv('NORMALIZER_CACHE_SIZE', '20000'))
+
+_memoized_functions: List[Callable] = []
+
+
+def memoize_normalizer(func: Callable[[str], str]) -> Callable[[str], str]:
+    """
+    入力文字列1つを受け取る正規化関数をメモ化する
+
+    正規化関数は入力だけで結果が決まる（DBや設定を参照しない）ものに限る。
+    """
+    cached = lru_cache(maxsize=NORMALIZER_CACHE_SIZE)(func)
+    _memoized_functions.append(cached)
+    return cached
+
+
+def normalize_many(values: Iterable[Optional[str]], normalizer: Callable[[str], str]) -> List[str]:
+    """
+    複数の文字列をまとめて正規化する
+
+    重複する入力は1回だけ正規化し、入力と同じ順序で結果を返す。
+
+    Args:
+        values: 正規化する文字列
+        normalizer: 正規化関数（canonicalize_building_name など）
+    """
+    results: Dict[Optional[str], str] = {}
+    output = []
+    for value in values:
+        if value not in results:
+            results[value] = normalizer(value)
+        output.append(results[value])
+    return output
+
+
+def clear_normalization_caches():
+    """全ての正規化キャッシュを破棄（正規化ルールを変更した場合やベンチマーク用）"""
+    for func in _memoized_functions:
+        func.cache_clear()
+
+
+def normalization_cache_info() -> Dict[str, dict]:
+    """正規化関数ごとのキャッシュのヒット数・ミス数・件数"""
+    info = {}
+    for func in _memoized_functions:
+        stats = func.cache_info()
+        info[f"{func.__module__}.{func.__qualname__}"] = {
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "size": stats.currsize,
+            "max_size": stats.maxsize,
+        }
+    return info
@@ -3,8 +3,9 @@
 """
 
 import logging
+import os
 from datetime import datetime, timedelta, date
-from typing import List, Dict, Optional, Set
+from typing import Iterable, List, Dict, Optional, Set, Tuple
 from sqlalchemy import text, func
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
@@ -16,9 +17,199 @@ from ..models import (
     PropertyListing,
     ListingPriceHistory
 )
+from .property_search_summary import refresh_property_search_summary
 
 logger = logging.getLogger(__name__)
 
+# キューから一度に取り出して計算する物件数
+QUEUE_BATCH_SIZE = int(os.getenv('PRICE_CHANGE_QUEUE_BATCH_SIZE', '100'))
+
+# この時間（分）以上 processing のままのキューは、異常終了したワーカーのものとみなして再投入する
+STALE_PROCESSING_MINUTES = 30
+
+
+# 複数物件の価格改定をまとめて検出するCTE
+# 掲載ごとに日付を展開し、直前の価格履歴で埋めた日ごとの価格から物件・日ごとの多数決価格を求め、
+# 前日の多数決価格と異なる日を価格改定とする
+_PRICE_CHANGES_CTE = """
+    WITH target_listings AS (
+        SELECT
+            pl.id AS listing_id,
+            pl.master_property_id,
+            pl.current_price,
+            pl.first_seen_at,
+            pl.created_at,
+            DATE(COALESCE(pl.first_published_at, pl.first_seen_at, pl.created_at)) AS listed_from,
+            CASE
+                WHEN pl.is_active = true THEN CURRENT_DATE  -- アクティブな掲載は現在まで有効
+                ELSE DATE(COALESCE(pl.delisted_at, pl.last_confirmed_at))  -- 非アクティブな掲載は終了日まで
+            END AS listed_until,
+            (SELECT MIN(recorded_at) FROM listing_price_history
+             WHERE property_listing_id = pl.id) AS first_recorded_at
+        FROM property_listings pl
+        WHERE pl.master_property_id = ANY(:property_ids)
+    ),
+    property_periods AS (
+        -- 物件ごとの計算開始日
+        SELECT
+            master_property_id,
+            COALESCE(
+                CAST(:start_date AS date),
+                MIN(DATE(COALESCE(first_recorded_at, first_seen_at, created_at)))
+            ) AS start_date
+        FROM target_listings
+        GROUP BY master_property_id
+        HAVING MIN(DATE(COALESCE(first_recorded_at, first_seen_at, created_at))) IS NOT NULL
+    ),
+    listing_windows AS (
+        -- 掲載の有効期間（履歴の展開は最初の価格記録から始める）
+        SELECT
+            tl.listing_id,
+            tl.master_property_id,
+            tl.current_price,
+            GREATEST(pp.start_date, tl.listed_from) AS window_start,
+            LEAST(tl.listed_until, CURRENT_DATE) AS window_end,
+            LEAST(GREATEST(pp.start_date, tl.listed_from), DATE(tl.first_recorded_at)) AS series_start
+        FROM target_listings tl
+        JOIN property_periods pp ON pp.master_property_id = tl.master_property_id
+        WHERE tl.listed_from IS NOT NULL
+          AND tl.listed_until IS NOT NULL
+    ),
+    daily_recorded_prices AS (
+        -- 掲載・日ごとの最後に記録された価格
+        SELECT DISTINCT ON (lph.property_listing_id, DATE(lph.recorded_at))
+            lph.property_listing_id AS listing_id,
+            DATE(lph.recorded_at) AS price_date,
+            lph.price
+        FROM listing_price_history lph
+        JOIN listing_windows lw ON lw.listing_id = lph.property_listing_id
+        ORDER BY lph.property_listing_id, DATE(lph.recorded_at), lph.recorded_at DESC
+    ),
+    listing_days AS (
+        SELECT
+            lw.listing_id,
+            lw.master_property_id,
+            lw.current_price,
+            lw.window_start,
+            d.price_date,
+            drp.price AS recorded_price,
+            -- 価格が記録された日で区切ったグループ（同じグループ内は直前の記録価格）
+            COUNT(drp.price) OVER (PARTITION BY lw.listing_id ORDER BY d.price_date) AS price_group
+        FROM listing_windows lw
+        CROSS JOIN LATERAL (
+            SELECT CAST(gs AS date) AS price_date
+            FROM generate_series(lw.series_start, lw.window_end, '1 day'::interval) gs
+        ) d
+        LEFT JOIN daily_recorded_prices drp
+            ON drp.listing_id = lw.listing_id AND drp.price_date = d.price_date
+    ),
+    listing_prices AS (
+        SELECT
+            master_property_id,
+            price_date,
+            window_start,
+            -- 記録がなければ現在価格（最新の状態）
+            COALESCE(
+                MAX(recorded_price) OVER (PARTITION BY listing_id, price_group),
+                current_price
+            ) AS price
+        FROM listing_days
+    ),
+    daily_majority_prices AS (
+        -- 各日付の価格ごとの票数
+        SELECT master_property_id, price_date, price, COUNT(*) AS vote_count
+        FROM listing_prices
+        WHERE price IS NOT NULL
+          AND price_date >= window_start
+        GROUP BY master_property_id, price_date, price
+    ),
+    daily_majority AS (
+        -- 各日付の多数決価格（同票の場合は最低価格）
+        SELECT DISTINCT ON (master_property_id, price_date)
+            master_property_id,
+            price_date,
+            price AS majority_price,
+            vote_count
+        FROM daily_majority_prices
+        ORDER BY master_property_id, price_date, vote_count DESC, price ASC
+    ),
+    compared AS (
+        SELECT
+            master_property_id,
+            price_date AS change_date,
+            majority_price AS new_price,
+            vote_count AS new_price_votes,
+            LAG(majority_price) OVER w AS old_price,
+            LAG(vote_count) OVER w AS old_price_votes
+        FROM daily_majority
+        WINDOW w AS (PARTITION BY master_property_id ORDER BY price_date)
+    ),
+    detected_changes AS (
+        SELECT
+            master_property_id,
+            change_date,
+            new_price,
+            old_price,
+            new_price - old_price AS price_diff,
+            CASE
+                WHEN old_price > 0 THEN
+                    ROUND(((new_price - old_price)::numeric / old_price * 100), 2)
+                ELSE 0
+            END AS price_diff_rate,
+            new_price_votes,
+            old_price_votes
+        FROM compared
+        WHERE old_price IS NOT NULL
+          AND new_price != old_price
+    )
+"""
+
+_SELECT_PRICE_CHANGES_SQL = _PRICE_CHANGES_CTE + """
+    SELECT * FROM detected_changes
+    ORDER BY master_property_id, change_date
+"""
+
+_UPSERT_PRICE_CHANGES_SQL = _PRICE_CHANGES_CTE + """
+    INSERT INTO property_price_changes (
+        master_property_id, change_date, new_price, old_price, price_diff,
+        price_diff_rate, new_price_votes, old_price_votes
+    )
+    SELECT
+        master_property_id, change_date, new_price, old_price, price_diff,
+        price_diff_rate, new_price_votes, old_price_votes
+    FROM detected_changes
+    ON CONFLICT (master_property_id, change_date) DO UPDATE SET
+        new_price = EXCLUDED.new_price,
+        old_price = EXCLUDED.old_price,
+        price_diff = EXCLUDED.price_diff,
+        price_diff_rate = EXCLUDED.price_diff_rate,
+        new_price_votes = EXCLUDED.new_price_votes,
+        old_price_votes = EXCLUDED.old_price_votes,
+        updated_at = NOW()
+"""
+
+# 再計算対象の既存履歴を削除（start_date指定時はその日より後のみ）
+_DELETE_PRICE_CHANGES_SQL = """
+    DELETE FROM property_price_changes
+    WHERE master_property_id = ANY(:property_ids)
+      AND (CAST(:start_date AS date) IS NULL OR change_date > CAST(:start_date AS date))
+"""
+
+# 優先度順に pending のキューを取り出す（他のワーカーがロック中の行は飛ばす）
+_CLAIM_QUEUE_SQL = """
+    UPDATE property_price_change_queue q
+    SET status = 'processing', updated_at = NOW()
+    FROM (
+        SELECT id FROM property_price_change_queue
+        WHERE status = 'pending'
+        ORDER BY priority, created_at
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ) claimed
+    WHERE q.id = claimed.id
+    RETURNING q.id, q.master_property_id
+"""
+
 
 class PriceChangeCalculator:
     """価格改定履歴を計算・管理するクラス"""
@@ -88,168 +279,83 @@ class PriceChangeCalculator:
                 count += 1
         return count
     
+    def calculate_price_changes_batch(self, master_property_ids: Iterable[int],
+                                      start_date: Optional[date] = None) -> Dict[int, List[Dict]]:
+        """
+        複数物件の価格改定履歴を1回のクエリで計算
+
+        Args:
+            master_property_ids: 物件IDのリスト
+            start_date: 計算開始日（Noneの場合は物件ごとの最初の掲載日から）
+
+        Returns:
+            {物件ID: 価格改定履歴のリスト}
+        """
+        ids = sorted({pid for pid in master_property_ids if pid is not None})
+        changes = {pid: [] for pid in ids}
+        if not ids:
+            return changes
+
+        result = self.db.execute(text(_SELECT_PRICE_CHANGES_SQL), {
+            'property_ids': ids,
+            'start_date': start_date
+        }).fetchall()
+
+        for row in result:
+            changes[row.master_property_id].append({
+                'change_date': row.change_date,
+                'new_price': row.new_price,
+                'old_price': row.old_price,
+                'price_diff': row.price_diff,
+                'price_diff_rate': row.price_diff_rate,
+                'new_price_votes': row.new_price_votes,
+                'old_price_votes': row.old_price_votes
+            })
+
+        return changes
+
     def calculate_price_changes(self, master_property_id: int, start_date: Optional[date] = None) -> List[Dict]:
         """
-        物件の価格改定履歴を計算（改善版）
-        
-        主な改善点：
-        1. 連続した日付範囲を生成して、記録がない日も含める
-        2. すべての掲載を対象とする（非掲載も含む）
-        3. 最新の状態（今日）も含めて価格変更を検出
-        
+        物件の価格改定履歴を計算
+
+        - 掲載期間中の記録がない日も直前の価格で埋める
+        - すべての掲載を対象とする（非掲載も含む）
+        - 最新の状態（今日）も含めて価格変更を検出
+
         Args:
             master_property_id: 物件ID
             start_date: 計算開始日（Noneの場合は最初の掲載日から）
-            
+
         Returns:
             価格改定履歴のリスト
         """
-        # まず対象物件の掲載期間を取得
-        period_query = text("""
-            SELECT 
-                MIN(DATE(COALESCE(
-                    (SELECT MIN(recorded_at) FROM listing_price_history
-                     WHERE property_listing_id = pl.id),
-                    pl.first_seen_at,
-                    pl.created_at
-                ))) as start_date,
-                CURRENT_DATE as end_date
-            FROM property_listings pl
-            WHERE pl.master_property_id = :master_property_id
-        """)
-        
-        period = self.db.execute(period_query, {'master_property_id': master_property_id}).fetchone()
-        
-        if not period or not period[0]:
-            logger.warning(f"物件ID {master_property_id} の有効な掲載が見つかりません")
-            return []
-        
-        calc_start_date = start_date or period[0]
-        calc_end_date = period[1]
-        
-        # 改善されたSQL クエリ
-        query = text("""
-            WITH date_range AS (
-                -- 連続した日付範囲を生成（記録がない日も含める）
-                SELECT generate_series(
-                    CAST(:start_date AS date),
-                    CAST(:end_date AS date),
-                    '1 day'::interval
-                )::date as price_date
-            ),
-            all_listings AS (
-                -- すべての掲載を対象とする（非掲載も含む）
-                SELECT * FROM property_listings
-                WHERE master_property_id = :master_property_id
-            ),
-            listing_prices_expanded AS (
-                -- 各掲載の価格を日付ごとに展開（掲載の有効期間のみ）
-                SELECT DISTINCT
-                    al.master_property_id,
-                    al.id as listing_id,
-                    dr.price_date,
-                    COALESCE(
-                        -- その日の価格履歴
-                        (SELECT price FROM listing_price_history
-                         WHERE property_listing_id = al.id
-                           AND DATE(recorded_at) = dr.price_date
-                         ORDER BY recorded_at DESC
-                         LIMIT 1),
-                        -- なければ直前の価格
-                        (SELECT price FROM listing_price_history
-                         WHERE property_listing_id = al.id
-                           AND DATE(recorded_at) < dr.price_date
-                         ORDER BY recorded_at DESC
-                         LIMIT 1),
-                        -- それもなければ現在価格（最新の状態）
-                        al.current_price
-                    ) as price
-                FROM all_listings al
-                CROSS JOIN date_range dr
-                WHERE 
-                    -- 掲載の有効期間内のみ
-                    dr.price_date >= DATE(COALESCE(al.first_published_at, al.first_seen_at, al.created_at))
-                    AND (
-                        al.is_active = true  -- アクティブな掲載は現在まで有効
-                        OR dr.price_date <= DATE(COALESCE(al.delisted_at, al.last_confirmed_at))  -- 非アクティブな掲載は終了日まで
-                    )
-            ),
-            daily_majority_prices AS (
-                -- 各日付の多数決価格を計算
-                SELECT 
-                    price_date,
-                    price,
-                    COUNT(*) as vote_count
-                FROM listing_prices_expanded
-                WHERE price IS NOT NULL
-                GROUP BY price_date, price
-            ),
-            daily_majority AS (
-                -- 各日付の最終的な多数決価格を決定
-                SELECT DISTINCT ON (price_date)
-                    price_date,
-                    price as majority_price,
-                    vote_count
-                FROM daily_majority_prices
-                ORDER BY price_date, vote_count DESC, price ASC  -- 同票の場合は最低価格
-            ),
-            price_changes AS (
-                -- 価格変動を検出
-                SELECT 
-                    dm1.price_date as change_date,
-                    dm1.majority_price as new_price,
-                    dm1.vote_count as new_price_votes,
-                    dm2.majority_price as old_price,
-                    dm2.vote_count as old_price_votes
-                FROM daily_majority dm1
-                LEFT JOIN LATERAL (
-                    SELECT majority_price, vote_count
-                    FROM daily_majority dm2
-                    WHERE dm2.price_date < dm1.price_date
-                    ORDER BY dm2.price_date DESC
-                    LIMIT 1
-                ) dm2 ON true
-                WHERE dm2.majority_price IS NOT NULL
-                  AND dm1.majority_price != dm2.majority_price
-            )
-            SELECT 
-                change_date,
-                new_price,
-                old_price,
-                new_price - old_price as price_diff,
-                CASE 
-                    WHEN old_price > 0 THEN 
-                        ROUND(((new_price - old_price)::numeric / old_price * 100), 2)
-                    ELSE 0
-                END as price_diff_rate,
-                new_price_votes,
-                old_price_votes
-            FROM price_changes
-            ORDER BY change_date
-        """)
-        
-        result = self.db.execute(query, {
-            'master_property_id': master_property_id,
-            'start_date': calc_start_date,
-            'end_date': calc_end_date
-        }).fetchall()
-        
-        changes = []
-        for row in result:
-            changes.append({
-                'change_date': row[0],
-                'new_price': row[1],
-                'old_price': row[2],
-                'price_diff': row[3],
-                'price_diff_rate': row[4],
-                'new_price_votes': row[5],
-                'old_price_votes': row[6]
-            })
-        
+        changes = self.calculate_price_changes_batch([master_property_id], start_date)[master_property_id]
         logger.info(f"物件ID {master_property_id}: {len(changes)}件の価格変更を検出")
-        
         return changes
-    
+
+    def recalculate_price_changes(self, master_property_ids: Iterable[int],
+                                  start_date: Optional[date] = None) -> int:
+        """
+        複数物件の価格改定履歴をDB内で計算し、まとめて保存（コミットは呼び出し側で行う）
+
+        計算結果をアプリに取り出さず、INSERT ... SELECT ... ON CONFLICT で一括保存する。
+        start_date を指定した場合は、その日より後の履歴だけを置き換える。
+
+        Returns:
+            保存された件数
+        """
+        ids = sorted({pid for pid in master_property_ids if pid is not None})
+        if not ids:
+            return 0
+
+        params = {'property_ids': ids, 'start_date': start_date}
+        self.db.execute(text(_DELETE_PRICE_CHANGES_SQL), params)
+        saved = self.db.execute(text(_UPSERT_PRICE_CHANGES_SQL), params).rowcount
+
+        # 一覧の並び順（価格改定日）に反映
+        refresh_property_search_summary(self.db, ids)
+        return saved
+
     def save_price_changes(self, master_property_id: int, changes: List[Dict]) -> int:
         """
         価格改定履歴をデータベースに保存
@@ -272,6 +378,7 @@ class PriceChangeCalculator:
             ).delete(synchronize_session=False)
             
             if not changes:
+                refresh_property_search_summary(self.db, [master_property_id])
                 self.db.commit()
                 return 0
             
@@ -289,6 +396,8 @@ class PriceChangeCalculator:
                 )
                 self.db.add(price_change)
             
+            # 一覧の並び順（価格改定日）に反映
+            refresh_property_search_summary(self.db, [master_property_id])
             self.db.commit()
             logger.info(f"物件ID {master_property_id}: {len(changes)}件の価格改定履歴を保存（既存履歴は削除）")
             return len(changes)
@@ -298,13 +407,87 @@ class PriceChangeCalculator:
             self.db.rollback()
             return 0
     
-    def process_queue(self, limit: int = 100) -> Dict[str, int]:
+    def requeue_stale_items(self, minutes: int = STALE_PROCESSING_MINUTES) -> int:
+        """異常終了したワーカーが processing のまま残したキューを pending に戻す"""
+        count = self.db.execute(text("""
+            UPDATE property_price_change_queue
+            SET status = 'pending', updated_at = NOW()
+            WHERE status = 'processing'
+              AND updated_at < NOW() - make_interval(mins => :minutes)
+        """), {'minutes': minutes}).rowcount
+        self.db.commit()
+        if count:
+            logger.warning(f"処理中のまま残っていたキュー {count}件を再投入しました")
+        return count
+
+    def claim_queue_items(self, batch_size: int) -> List[Tuple[int, int]]:
+        """
+        pending のキューを優先度順に取り出して processing にする
+
+        FOR UPDATE SKIP LOCKED で他のワーカーが取り出し中の行を飛ばすため、
+        複数のワーカーが同時に呼び出しても同じ行を取り出さない。
+
+        Returns:
+            [(キューID, 物件ID)]
+        """
+        rows = self.db.execute(text(_CLAIM_QUEUE_SQL), {'batch_size': batch_size}).fetchall()
+        self.db.commit()
+        return [(row.id, row.master_property_id) for row in rows]
+
+    def _mark_queue_items(self, queue_ids: List[int], status: str, error_message: Optional[str] = None):
+        self.db.execute(text("""
+            UPDATE property_price_change_queue
+            SET status = :status,
+                processed_at = COALESCE(:processed_at, processed_at),
+                error_message = :error_message,
+                updated_at = NOW()
+            WHERE id = ANY(:queue_ids)
+        """), {
+            'queue_ids': queue_ids,
+            'status': status,
+            'processed_at': datetime.now() if status == 'completed' else None,
+            'error_message': error_message
+        })
+
+    def _process_claimed_items(self, claimed: List[Tuple[int, int]], stats: Dict[str, int]):
+        """取り出したキューをまとめて計算し、失敗した場合は1件ずつ処理して原因の物件を特定する"""
+        try:
+            saved_count = self.recalculate_price_changes(pid for _, pid in claimed)
+            self._mark_queue_items([queue_id for queue_id, _ in claimed], 'completed')
+            self.db.commit()
+            stats['processed'] += len(claimed)
+            stats['changes_found'] += saved_count
+            return
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"価格改定履歴の一括計算に失敗したため1件ずつ処理します: {e}")
+
+        for queue_id, property_id in claimed:
+            try:
+                saved_count = self.recalculate_price_changes([property_id])
+                self._mark_queue_items([queue_id], 'completed')
+                self.db.commit()
+                stats['processed'] += 1
+                stats['changes_found'] += saved_count
+            except Exception as e:
+                self.db.rollback()
+                logger.error(f"物件 {property_id} の処理に失敗: {e}")
+                self._mark_queue_items([queue_id], 'failed', str(e))
+                self.db.commit()
+                stats['failed'] += 1
+
+    def process_queue(self, limit: int = 100, batch_size: int = QUEUE_BATCH_SIZE) -> Dict[str, int]:
         """
         キューに入っている物件の価格改定履歴を処理
-        
+
+        batch_size 件ずつ取り出し、1回のクエリで計算して一括保存する。
+        取り出しは SKIP LOCKED で行うため、複数のワーカーから同時に実行できる
+        （process_queue_in_parallel を参照）。
+
         Args:
             limit: 一度に処理する最大件数
-            
+            batch_size: 1回の計算で処理する件数
+
         Returns:
             処理結果の統計
         """
@@ -313,102 +496,81 @@ class PriceChangeCalculator:
             'failed': 0,
             'changes_found': 0
         }
-        
-        # 優先度順にキューを取得
-        queue_items = self.db.query(PropertyPriceChangeQueue).filter(
-            PropertyPriceChangeQueue.status == 'pending'
-        ).order_by(
-            PropertyPriceChangeQueue.priority,
-            PropertyPriceChangeQueue.created_at
-        ).limit(limit).all()
-        
-        for item in queue_items:
-            try:
-                # ステータスを処理中に更新
-                item.status = 'processing'
-                self.db.commit()
-                
-                # 価格改定履歴を計算
-                changes = self.calculate_price_changes(item.master_property_id)
-                
-                # 保存
-                saved_count = self.save_price_changes(item.master_property_id, changes)
-                
-                # キューを完了に更新
-                item.status = 'completed'
-                item.processed_at = datetime.now()
-                self.db.commit()
-                
-                stats['processed'] += 1
-                stats['changes_found'] += saved_count
-                
-            except Exception as e:
-                logger.error(f"物件 {item.master_property_id} の処理に失敗: {e}")
-                item.status = 'failed'
-                item.error_message = str(e)
-                self.db.commit()
-                stats['failed'] += 1
-        
+
+        self.requeue_stale_items()
+
+        while stats['processed'] + stats['failed'] < limit:
+            remaining = limit - stats['processed'] - stats['failed']
+            claimed = self.claim_queue_items(min(batch_size, remaining))
+            if not claimed:
+                break
+            self._process_claimed_items(claimed, stats)
+
         return stats
-    
-    def refresh_all_recent_changes(self, days: int = 90) -> Dict[str, int]:
+
+    def refresh_all_recent_changes(self, days: int = 90, batch_size: int = QUEUE_BATCH_SIZE) -> Dict[str, int]:
         """
         全物件の最近の価格改定履歴を更新
-        
+
         Args:
             days: 更新対象期間（日数）
-            
+            batch_size: 1回の計算で処理する物件数
+
         Returns:
             処理結果の統計
         """
         start_date = date.today() - timedelta(days=days)
-        
+
         # アクティブな物件を取得
-        active_properties = self.db.query(MasterProperty.id).join(
+        active_properties = [property_id for (property_id,) in self.db.query(MasterProperty.id).join(
             PropertyListing,
             PropertyListing.master_property_id == MasterProperty.id
         ).filter(
             PropertyListing.is_active == True,
             MasterProperty.sold_at.is_(None)
-        ).distinct().all()
-        
+        ).distinct().order_by(MasterProperty.id).all()]
+
         stats = {
             'total': len(active_properties),
             'processed': 0,
             'changes_found': 0
         }
-        
-        for (property_id,) in active_properties:
+
+        for chunk_start in range(0, len(active_properties), batch_size):
+            chunk = active_properties[chunk_start:chunk_start + batch_size]
             try:
-                # キューに入っている物件は全期間を再計算
-                queued = self.db.query(PropertyPriceChangeQueue).filter(
-                    PropertyPriceChangeQueue.master_property_id == property_id,
+                # キューに入っている物件は全期間、それ以外は指定期間のみ再計算
+                queued = {property_id for (property_id,) in self.db.query(
+                    PropertyPriceChangeQueue.master_property_id
+                ).filter(
+                    PropertyPriceChangeQueue.master_property_id.in_(chunk),
                     PropertyPriceChangeQueue.status == 'pending'
-                ).first()
-                
-                if queued:
-                    # キューに入っている場合は全期間
-                    changes = self.calculate_price_changes(property_id)
-                else:
-                    # キューに入っていない場合は指定期間のみ
-                    changes = self.calculate_price_changes(property_id, start_date)
-                
-                saved_count = self.save_price_changes(property_id, changes)
-                
-                stats['processed'] += 1
-                stats['changes_found'] += saved_count
-                
+                )}
+
+                saved_count = self.recalculate_price_changes(queued)
+                saved_count += self.recalculate_price_changes(set(chunk) - queued, start_date)
+
                 # キューから削除
                 if queued:
-                    queued.status = 'completed'
-                    queued.processed_at = datetime.now()
-                    self.db.commit()
-                
+                    self.db.query(PropertyPriceChangeQueue).filter(
+                        PropertyPriceChangeQueue.master_property_id.in_(queued),
+                        PropertyPriceChangeQueue.status == 'pending'
+                    ).update({
+                        'status': 'completed',
+                        'processed_at': datetime.now()
+                    }, synchronize_session=False)
+
+                self.db.commit()
+                stats['processed'] += len(chunk)
+                stats['changes_found'] += saved_count
+
             except Exception as e:
-                logger.error(f"物件 {property_id} の処理に失敗: {e}")
-        
+                self.db.rollback()
+                logger.error(f"物件 {chunk[0]}〜{chunk[-1]} の処理に失敗: {e}")
+
         return stats
     
+
     def get_recent_changes(self, hours: int = 24, ward: Optional[str] = None) -> List[Dict]:
         """
         最近の価格改定を取得（キャッシュテーブルから）
@@ -468,4 +630,46 @@ class PriceChangeCalculator:
                 # その他の必要な属性
             })
         
-        return changes
\ No newline at end of file
+        return changes
+
+
+def process_queue_in_parallel(workers: int = 4, limit: int = 1000, batch_size: int = QUEUE_BATCH_SIZE,
+                              session_factory=None) -> Dict[str, int]:
+    """
+    価格改定キューを複数のワーカーで並列に処理
+
+    各ワーカーは独立したセッションで process_queue を実行する。
+    キューの取り出しに SKIP LOCKED を使うため、同じ物件を重複して処理しない。
+
+    Args:
+        workers: ワーカー数
+        limit: 全ワーカー合計の最大処理件数
+        batch_size: 1回の計算で処理する件数
+        session_factory: セッションを生成する関数（Noneの場合はSessionLocal）
+
+    Returns:
+        全ワーカーの処理結果の合計
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if session_factory is None:
+        from ..database import SessionLocal
+        session_factory = SessionLocal
+
+    workers = max(1, workers)
+    per_worker_limit = -(-limit // workers)
+
+    def run_worker(_):
+        session = session_factory()
+        try:
+            return PriceChangeCalculator(session).process_queue(per_worker_limit, batch_size)
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='price-change-worker') as executor:
+        results = list(executor.map(run_worker, range(workers)))
+
+    return {
+        key: sum(result[key] for result in results)
+        for key in ('processed', 'failed', 'changes_found')
+    }
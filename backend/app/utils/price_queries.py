@@ -2,7 +2,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_, and_, distinct, String
 from typing import Optional
-from datetime import timedelta
+from datetime import datetime, timedelta
 from ..models import PropertyListing, MasterProperty
 
 def create_majority_price_subquery(db: Session, include_inactive: bool = False):
@@ -226,6 +226,76 @@ def calculate_final_price_for_sold_property(db: Session, master_property_id: int
     
     return None
 
+def calculate_final_prices_for_sold_properties(db: Session, sold_at_by_property: dict,
+                                                chunk_size: int = 1000) -> dict:
+    """
+    複数の販売終了物件の最終価格をまとめて計算（calculate_final_price_for_sold_property の一括版）
+
+    物件ごとに販売終了前1週間の価格履歴の多数決（同数は高い方）、履歴がなければ
+    最後に更新された掲載の価格を最終価格とする。アクティブな掲載の有無は確認しないため、
+    呼び出し側で販売終了物件に絞り込んでおくこと。
+
+    Args:
+        db: データベースセッション
+        sold_at_by_property: {物件ID: 販売終了日時}
+        chunk_size: 1クエリで処理する物件数
+
+    Returns:
+        {物件ID: 最終価格（万円）}（価格が決まらなかった物件は含まない）
+    """
+    from collections import Counter, defaultdict
+    from ..models import ListingPriceHistory
+
+    final_prices = {}
+    ids = sorted(pid for pid, sold_at in sold_at_by_property.items() if sold_at is not None)
+    for chunk_start in range(0, len(ids), chunk_size):
+        chunk = ids[chunk_start:chunk_start + chunk_size]
+        windows = {pid: (sold_at_by_property[pid] - timedelta(days=7), sold_at_by_property[pid])
+                   for pid in chunk}
+
+        # 期間内の価格履歴を物件ごとに集計
+        history_rows = db.query(
+            PropertyListing.master_property_id,
+            ListingPriceHistory.price,
+            ListingPriceHistory.recorded_at
+        ).join(
+            PropertyListing,
+            ListingPriceHistory.property_listing_id == PropertyListing.id
+        ).filter(
+            PropertyListing.master_property_id.in_(chunk),
+            ListingPriceHistory.recorded_at >= min(start for start, _ in windows.values()),
+            ListingPriceHistory.recorded_at <= max(end for _, end in windows.values()),
+            ListingPriceHistory.price.isnot(None)
+        ).all()
+
+        votes = defaultdict(Counter)
+        for pid, price, recorded_at in history_rows:
+            start, end = windows[pid]
+            if start <= recorded_at <= end:
+                votes[pid][price] += 1
+        for pid, counter in votes.items():
+            # 件数の多い順、同数の場合は高い方を優先
+            final_prices[pid] = max(counter.items(), key=lambda item: (item[1], item[0]))[0]
+
+        # 1週間以内のデータがない物件は、最後に更新された掲載の価格
+        remaining = [pid for pid in chunk if pid not in final_prices]
+        if remaining:
+            latest = {}
+            for pid, price, updated_at in db.query(
+                PropertyListing.master_property_id,
+                PropertyListing.current_price,
+                PropertyListing.updated_at
+            ).filter(
+                PropertyListing.master_property_id.in_(remaining),
+                PropertyListing.current_price.isnot(None)
+            ):
+                if pid not in latest or (updated_at or datetime.min) > latest[pid][0]:
+                    latest[pid] = (updated_at or datetime.min, price)
+            for pid, (_, price) in latest.items():
+                final_prices[pid] = price
+
+    return final_prices
+
 def get_sold_property_final_price(db: Session, master_property: MasterProperty) -> Optional[int]:
     """
     販売終了物件の最終価格を取得（キャッシュ済みならそれを使用、なければ計算）
@@ -0,0 +1,247 @@
+"""
+物件重複候補（property_duplicate_candidates）の事前計算
+
+管理画面の物件重複候補（GET /admin/duplicate-properties）は、このテーブルを
+グループの物件数順のインデックスでページングして読む。
+
+重複候補は、同じ建物・階・面積（1㎡単位で切り捨て）・基本間取りの販売中物件が
+2件以上あるグループ。面積の切り捨てと基本間取りはテーブルの生成列としてDBが計算する。
+
+- update_property_duplicate_candidates(): 前回の更新以降に物件・掲載が変わった建物だけ再評価する
+  （スクレイピング完了後に実行。初回・full=True の場合は全件）
+- refresh_property_duplicate_candidates(): 指定建物だけ再評価する（物件統合・建物統合の後など）
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import bindparam, exists, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from ..models import MasterProperty, PropertyListing, PropertyDuplicateCandidate, PropertyDuplicateCandidateRun
+
+logger = logging.getLogger(__name__)
+
+# 前回の更新の開始時刻からさかのぼって変更を確認する時間
+# （前回の更新の実行中にコミットされた変更を取りこぼさないため）
+CHANGE_DETECTION_MARGIN = timedelta(minutes=10)
+
+# 1回のSQLで再評価する建物数
+REFRESH_CHUNK_SIZE = 500
+
+
+def _has_active_listing():
+    return exists().where(
+        PropertyListing.master_property_id == MasterProperty.id,
+        PropertyListing.is_active == True
+    )
+
+
+def _chunks(values: List[int], size: int) -> Iterable[List[int]]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _insert_candidate_properties(db: Session, building_filter=None) -> None:
+    """販売中の物件を候補テーブルに追加（グループは後で設定する）"""
+    query = select(
+        MasterProperty.id, MasterProperty.building_id, MasterProperty.floor_number,
+        MasterProperty.area, MasterProperty.layout
+    ).where(
+        MasterProperty.building_id.isnot(None),
+        _has_active_listing()
+    )
+    if building_filter is not None:
+        query = query.where(building_filter)
+
+    db.execute(
+        insert(PropertyDuplicateCandidate).from_select(
+            ['master_property_id', 'building_id', 'floor_number', 'area', 'layout'],
+            query
+        )
+    )
+
+
+def _assign_groups(db: Session, building_filter=None) -> int:
+    """
+    生成列（rounded_area, base_layout）でグループ化してグループID・物件数を設定し、
+    1件だけのグループを削除する
+
+    Returns:
+        残った候補の物件数
+    """
+    query = db.query(
+        PropertyDuplicateCandidate.master_property_id,
+        PropertyDuplicateCandidate.building_id,
+        PropertyDuplicateCandidate.floor_number,
+        PropertyDuplicateCandidate.rounded_area,
+        PropertyDuplicateCandidate.base_layout,
+    )
+    if building_filter is not None:
+        query = query.filter(building_filter)
+
+    # NULLも1つの値として扱う（GROUP BY と同じ）
+    groups: Dict[Tuple[Any, ...], List[int]] = {}
+    for property_id, building_id, floor_number, rounded_area, base_layout in query:
+        groups.setdefault((building_id, floor_number, rounded_area, base_layout), []).append(property_id)
+
+    params = [
+        {'property_id': property_id, 'group_id': min(property_ids), 'group_size': len(property_ids)}
+        for property_ids in groups.values() if len(property_ids) > 1
+        for property_id in property_ids
+    ]
+    table = PropertyDuplicateCandidate.__table__
+    if params:
+        db.execute(
+            table.update().where(table.c.master_property_id == bindparam('property_id')).values(
+                group_id=bindparam('group_id'), group_size=bindparam('group_size')
+            ),
+            params
+        )
+
+    delete_query = db.query(PropertyDuplicateCandidate).filter(PropertyDuplicateCandidate.group_size < 2)
+    if building_filter is not None:
+        delete_query = delete_query.filter(building_filter)
+    delete_query.delete(synchronize_session=False)
+    return len(params)
+
+
+def rebuild_property_duplicate_candidates(db: Session) -> int:
+    """
+    全物件の重複候補を作り直す
+
+    呼び出し側のトランザクション内で実行する（コミットは呼び出し側で行う）。
+
+    Returns:
+        保存した候補の物件数
+    """
+    db.flush()
+    db.query(PropertyDuplicateCandidate).delete(synchronize_session=False)
+    _insert_candidate_properties(db)
+    return _assign_groups(db)
+
+
+def refresh_property_duplicate_candidates(db: Session, building_ids: Iterable[Optional[int]]) -> int:
+    """
+    指定建物の重複候補を作り直す（物件統合・物件の建物移動・建物統合の後など）
+
+    Returns:
+        保存した候補の物件数
+    """
+    ids = sorted({building_id for building_id in building_ids if building_id is not None})
+    if not ids:
+        return 0
+
+    db.flush()
+    saved = 0
+    for chunk in _chunks(ids, REFRESH_CHUNK_SIZE):
+        # 他の建物から移動してきた物件の古い行も削除する
+        moved_property_ids = select(MasterProperty.id).where(MasterProperty.building_id.in_(chunk))
+        db.query(PropertyDuplicateCandidate).filter(
+            or_(
+                PropertyDuplicateCandidate.building_id.in_(chunk),
+                PropertyDuplicateCandidate.master_property_id.in_(moved_property_ids)
+            )
+        ).delete(synchronize_session=False)
+
+        _insert_candidate_properties(db, MasterProperty.building_id.in_(chunk))
+        saved += _assign_groups(db, PropertyDuplicateCandidate.building_id.in_(chunk))
+    return saved
+
+
+def find_changed_building_ids(db: Session, since: datetime) -> Set[int]:
+    """
+    指定時刻以降に重複候補が変わりうる建物IDを取得
+
+    - 物件または掲載が更新された建物（掲載の販売終了・再開を含む）
+    - 保存済みの候補のうち、物件が別の建物に移動・削除された、
+      販売中の掲載がなくなった、またはグループの物件数が合わなくなった建物
+    """
+    building_ids: Set[int] = set()
+
+    building_ids.update(
+        building_id for (building_id,) in db.query(MasterProperty.building_id).filter(
+            MasterProperty.updated_at >= since
+        ).distinct()
+    )
+    building_ids.update(
+        building_id for (building_id,) in db.query(MasterProperty.building_id).join(
+            PropertyListing, PropertyListing.master_property_id == MasterProperty.id
+        ).filter(
+            PropertyListing.updated_at >= since
+        ).distinct()
+    )
+
+    # 保存済みの候補の整合性（テーブルは候補の物件だけなので小さい）
+    stale = db.query(
+        PropertyDuplicateCandidate.building_id, MasterProperty.building_id
+    ).outerjoin(
+        MasterProperty, MasterProperty.id == PropertyDuplicateCandidate.master_property_id
+    ).filter(
+        or_(
+            MasterProperty.id.is_(None),
+            MasterProperty.building_id != PropertyDuplicateCandidate.building_id,
+            ~_has_active_listing()
+        )
+    )
+    for stored_building_id, current_building_id in stale:
+        building_ids.add(stored_building_id)
+        building_ids.add(current_building_id)
+
+    building_ids.update(
+        building_id for (building_id,) in db.query(PropertyDuplicateCandidate.building_id).group_by(
+            PropertyDuplicateCandidate.building_id,
+            PropertyDuplicateCandidate.group_id,
+            PropertyDuplicateCandidate.group_size
+        ).having(func.count() != PropertyDuplicateCandidate.group_size)
+    )
+
+    building_ids.discard(None)
+    return building_ids
+
+
+def get_last_completed_run(db: Session) -> Optional[PropertyDuplicateCandidateRun]:
+    """最後に完了した重複候補の更新"""
+    return db.query(PropertyDuplicateCandidateRun).filter(
+        PropertyDuplicateCandidateRun.completed_at.isnot(None)
+    ).order_by(PropertyDuplicateCandidateRun.started_at.desc()).first()
+
+
+def update_property_duplicate_candidates(db: Session, full: bool = False) -> Dict[str, Any]:
+    """
+    物件重複候補を差分更新する（まだ一度も更新していない場合・full=True の場合は全件）
+
+    最後に完了した更新の開始時刻以降に物件・掲載が変わった建物だけ再評価し、
+    更新履歴を記録してコミットする。
+
+    Returns:
+        更新結果（is_full, building_count, candidate_count）
+    """
+    last_run = None if full else get_last_completed_run(db)
+
+    # 開始・完了時刻は物件・掲載の updated_at と同じ時計（DBの現在時刻）を使う
+    run = PropertyDuplicateCandidateRun(started_at=func.now(), is_full=last_run is None)
+    if last_run is None:
+        run.candidate_count = rebuild_property_duplicate_candidates(db)
+        run.building_count = db.query(
+            func.count(func.distinct(MasterProperty.building_id))
+        ).filter(_has_active_listing()).scalar() or 0
+    else:
+        building_ids = find_changed_building_ids(db, last_run.started_at - CHANGE_DETECTION_MARGIN)
+        refresh_property_duplicate_candidates(db, building_ids)
+        run.building_count = len(building_ids)
+        run.candidate_count = db.query(func.count(PropertyDuplicateCandidate.master_property_id)).scalar()
+
+    run.completed_at = func.now()
+    db.add(run)
+    db.commit()
+
+    logger.info(
+        f"物件重複候補を更新: {'全件' if run.is_full else '差分'}, "
+        f"建物 {run.building_count}件, 候補 {run.candidate_count}件"
+    )
+    return {
+        'is_full': run.is_full,
+        'building_count': run.building_count,
+        'candidate_count': run.candidate_count,
+    }
@@ -0,0 +1,233 @@
+"""
+物件検索用集計テーブル（property_search_summary）の更新
+
+物件一覧API（GET /api/properties）は、掲載情報と価格改定履歴の集計・表示価格・
+ソートキーをこのテーブルから読む。集計は物件の保存時（スクレイパー）、
+価格改定履歴の保存時、掲載状態の一括更新時などに対象物件だけ再計算する。
+
+- refresh_property_search_summary(): 指定物件の行を集計し直す（INSERT ... ON CONFLICT）
+- rebuild_property_search_summary(): 全物件を集計し直す（初期投入・不整合の修復用）
+
+集計SQLは PostgreSQL 専用（string_agg / bool_or / FILTER 句）。
+"""
+import logging
+from typing import Iterable, Optional, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# 1回のSQLで集計する物件数の上限
+REFRESH_CHUNK_SIZE = 1000
+
+# property_search_summary に書き込むカラム（主キー以外）
+SUMMARY_COLUMNS = [
+    'building_id', 'listing_count', 'has_active_listing', 'has_listing',
+    'active_source_sites', 'all_source_sites',
+    'active_last_confirmed_at', 'all_last_confirmed_at',
+    'active_delisted_at', 'all_delisted_at',
+    'active_station_info', 'all_station_info',
+    'earliest_published_at',
+    'latest_price_update', 'latest_price_update_time', 'has_price_change',
+    'current_price', 'final_price', 'display_price', 'area', 'built_year',
+    'tsubo_price', 'sort_updated_at', 'is_sold', 'refreshed_at',
+]
+
+
+def _summary_upsert_sql(property_filter: str) -> str:
+    """
+    集計のINSERT ... SELECT文を生成
+
+    Args:
+        property_filter: 物件の絞り込み条件（{column} を物件IDのカラムに置き換える）
+    """
+    columns = ', '.join(['master_property_id'] + SUMMARY_COLUMNS)
+    updates = ',\n            '.join(f"{column} = EXCLUDED.{column}" for column in SUMMARY_COLUMNS)
+
+    return f"""
+        INSERT INTO property_search_summary ({columns})
+        SELECT
+            mp.id,
+            mp.building_id,
+            COALESCE(l.listing_count, 0),
+            COALESCE(l.has_active_listing, FALSE),
+            l.master_property_id IS NOT NULL,
+            l.active_source_sites,
+            l.all_source_sites,
+            l.active_last_confirmed_at,
+            l.all_last_confirmed_at,
+            l.active_delisted_at,
+            l.all_delisted_at,
+            l.active_station_info,
+            l.all_station_info,
+            l.earliest_published_at,
+            pc.latest_price_update,
+            pc.latest_price_update_time,
+            pc.master_property_id IS NOT NULL,
+            mp.current_price,
+            mp.final_price,
+            CASE
+                -- 掲載がすべて終了した販売終了物件は最終価格
+                WHEN NOT COALESCE(l.has_active_listing, FALSE)
+                     AND mp.sold_at IS NOT NULL AND COALESCE(mp.final_price, 0) <> 0
+                    THEN mp.final_price
+                WHEN COALESCE(mp.current_price, 0) <> 0 THEN mp.current_price
+                -- current_priceがない場合は掲載中の掲載価格の多数決（同数の場合は最小値）
+                ELSE (
+                    SELECT pl.current_price
+                    FROM property_listings pl
+                    WHERE pl.master_property_id = mp.id
+                      AND pl.is_active = TRUE
+                      AND COALESCE(pl.current_price, 0) <> 0
+                    GROUP BY pl.current_price
+                    ORDER BY COUNT(*) DESC, pl.current_price ASC
+                    LIMIT 1
+                )
+            END,
+            mp.area,
+            b.built_year,
+            CASE WHEN mp.area > 0
+                THEN COALESCE(mp.current_price, mp.final_price) / (mp.area / 3.30578)
+            END,
+            COALESCE(pc.latest_price_update, l.earliest_published_at),
+            mp.sold_at IS NOT NULL,
+            NOW()
+        FROM master_properties mp
+        JOIN buildings b ON b.id = mp.building_id
+        LEFT JOIN (
+            SELECT
+                master_property_id,
+                COUNT(DISTINCT id) FILTER (WHERE is_active) AS listing_count,
+                BOOL_OR(is_active) AS has_active_listing,
+                STRING_AGG(DISTINCT CAST(source_site AS VARCHAR), ',') FILTER (WHERE is_active) AS active_source_sites,
+                STRING_AGG(DISTINCT CAST(source_site AS VARCHAR), ',') AS all_source_sites,
+                MAX(last_confirmed_at) FILTER (WHERE is_active) AS active_last_confirmed_at,
+                MAX(last_confirmed_at) AS all_last_confirmed_at,
+                MAX(delisted_at) FILTER (WHERE is_active) AS active_delisted_at,
+                MAX(delisted_at) AS all_delisted_at,
+                MAX(listing_station_info) FILTER (WHERE is_active) AS active_station_info,
+                MAX(listing_station_info) AS all_station_info,
+                MIN(COALESCE(first_published_at, published_at, first_seen_at)) AS earliest_published_at
+            FROM property_listings
+            WHERE {property_filter.format(column='master_property_id')}
+            GROUP BY master_property_id
+        ) l ON l.master_property_id = mp.id
+        LEFT JOIN (
+            SELECT
+                master_property_id,
+                MAX(change_date) AS latest_price_update,
+                MAX(created_at) AS latest_price_update_time
+            FROM property_price_changes
+            WHERE {property_filter.format(column='master_property_id')}
+            GROUP BY master_property_id
+        ) pc ON pc.master_property_id = mp.id
+        WHERE {property_filter.format(column='mp.id')}
+        ON CONFLICT (master_property_id) DO UPDATE SET
+            {updates}
+    """
+
+
+_REFRESH_SQL = _summary_upsert_sql("{column} = ANY(:property_ids)")
+_REBUILD_SQL = _summary_upsert_sql("TRUE")
+
+# 物件が削除された場合は外部キーのCASCADEで行が消えるが、
+# 統合などで物件の建物が変わった場合や築年が変わった場合に備えて建物側の値も同期する
+_SYNC_BUILDING_SQL = """
+    UPDATE property_search_summary pss
+    SET built_year = b.built_year
+    FROM buildings b
+    WHERE pss.building_id = b.id
+      AND b.id = ANY(:building_ids)
+      AND pss.built_year IS DISTINCT FROM b.built_year
+"""
+
+
+def is_search_summary_supported(db: Session) -> bool:
+    """集計テーブルを更新できるDBか（PostgreSQLのみ）"""
+    return db.get_bind().dialect.name == 'postgresql'
+
+
+def refresh_property_search_summary(db: Session, property_ids: Iterable[Optional[int]]) -> int:
+    """
+    指定物件の検索用集計を再計算する
+
+    呼び出し側のトランザクション内で実行する（コミットは呼び出し側で行う）。
+    ORMで変更したオブジェクトは実行前にflushされる。
+
+    Args:
+        db: データベースセッション
+        property_ids: 物件IDのリスト（Noneは無視）
+
+    Returns:
+        更新した行数
+    """
+    ids = sorted({property_id for property_id in property_ids if property_id is not None})
+    if not ids or not is_search_summary_supported(db):
+        return 0
+
+    db.flush()
+    updated = 0
+    for chunk_start in range(0, len(ids), REFRESH_CHUNK_SIZE):
+        chunk = ids[chunk_start:chunk_start + REFRESH_CHUNK_SIZE]
+        result = db.execute(text(_REFRESH_SQL), {'property_ids': chunk})
+        updated += result.rowcount or 0
+
+        # 同じ建物の他の物件の築年も揃える
+        building_ids = [
+            row[0] for row in db.execute(
+                text("SELECT DISTINCT building_id FROM master_properties WHERE id = ANY(:property_ids)"),
+                {'property_ids': chunk}
+            )
+        ]
+        if building_ids:
+            db.execute(text(_SYNC_BUILDING_SQL), {'building_ids': building_ids})
+
+    return updated
+
+
+def refresh_building_search_summary(db: Session, building_ids: Iterable[Optional[int]]) -> int:
+    """
+    指定建物に属する全物件の検索用集計を再計算する（建物統合・物件移動の後など）
+
+    Args:
+        db: データベースセッション
+        building_ids: 建物IDのリスト
+
+    Returns:
+        更新した行数
+    """
+    ids = sorted({building_id for building_id in building_ids if building_id is not None})
+    if not ids or not is_search_summary_supported(db):
+        return 0
+
+    db.flush()
+    property_ids: List[int] = [
+        row[0] for row in db.execute(
+            text("SELECT id FROM master_properties WHERE building_id = ANY(:building_ids)"),
+            {'building_ids': ids}
+        )
+    ]
+    return refresh_property_search_summary(db, property_ids)
+
+
+def rebuild_property_search_summary(db: Session) -> int:
+    """
+    全物件の検索用集計を再計算する
+
+    既存行の更新と不足行の追加を1文で行い、物件が存在しない行は削除する。
+
+    Returns:
+        更新した行数
+    """
+    if not is_search_summary_supported(db):
+        logger.warning("検索用集計テーブルはPostgreSQLでのみ利用できます")
+        return 0
+
+    db.flush()
+    result = db.execute(text(_REBUILD_SQL))
+    db.execute(text("""
+        DELETE FROM property_search_summary pss
+        WHERE NOT EXISTS (SELECT 1 FROM master_properties mp WHERE mp.id = pss.master_property_id)
+    """))
+    return result.rowcount or 0
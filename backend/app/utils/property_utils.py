@@ -82,4 +82,86 @@ def update_latest_price_change(db: Session, master_property_id: int):
         
     except Exception as e:
         logger.error(f"Error updating latest_price_change for property {master_property_id}: {e}")
-        # エラーが発生しても処理を継続（最適化機能なので致命的ではない）
\ No newline at end of file
+        # エラーが発生しても処理を継続（最適化機能なので致命的ではない）
+
+def update_earliest_listing_dates(db: Session, master_property_ids, chunk_size: int = 1000) -> int:
+    """
+    複数物件の最初の掲載日をまとめて更新（update_earliest_listing_date の一括版）
+
+    Args:
+        db: データベースセッション
+        master_property_ids: 更新する物件IDの集合
+        chunk_size: 1文で更新する物件数
+
+    Returns:
+        更新した物件数
+    """
+    from sqlalchemy import case, select, update
+
+    effective_date = case(
+        (PropertyListing.first_published_at.isnot(None), PropertyListing.first_published_at),
+        (PropertyListing.published_at.isnot(None), PropertyListing.published_at),
+        (PropertyListing.first_seen_at.isnot(None), PropertyListing.first_seen_at),
+        else_=PropertyListing.created_at
+    )
+    earliest_date = select(func.min(effective_date)).where(
+        PropertyListing.master_property_id == MasterProperty.id
+    ).scalar_subquery()
+
+    ids = sorted({property_id for property_id in master_property_ids if property_id is not None})
+    updated = 0
+    for chunk_start in range(0, len(ids), chunk_size):
+        chunk = ids[chunk_start:chunk_start + chunk_size]
+        result = db.execute(
+            update(MasterProperty)
+            .where(MasterProperty.id.in_(chunk))
+            .values(earliest_listing_date=earliest_date)
+            .execution_options(synchronize_session=False)
+        )
+        updated += result.rowcount
+    return updated
+
+
+def update_latest_price_changes(db: Session, master_property_ids, chunk_size: int = 1000) -> int:
+    """
+    複数物件の最新価格改定日をまとめて更新（update_latest_price_change の一括版）
+
+    Args:
+        db: データベースセッション
+        master_property_ids: 更新する物件IDの集合
+        chunk_size: 1文で更新する物件数
+
+    Returns:
+        更新した物件数
+    """
+    from sqlalchemy import exists, select, update
+    from sqlalchemy.orm import aliased
+    from ..models import ListingPriceHistory
+
+    history = aliased(ListingPriceHistory)
+    prev = aliased(ListingPriceHistory)
+    # アクティブな掲載で、直前と異なる価格が記録された最新日時
+    latest_change = select(func.max(history.recorded_at)).join(
+        PropertyListing, PropertyListing.id == history.property_listing_id
+    ).where(
+        PropertyListing.master_property_id == MasterProperty.id,
+        PropertyListing.is_active == True,
+        exists().where(
+            prev.property_listing_id == history.property_listing_id,
+            prev.recorded_at < history.recorded_at,
+            prev.price != history.price
+        )
+    ).scalar_subquery()
+
+    ids = sorted({property_id for property_id in master_property_ids if property_id is not None})
+    updated = 0
+    for chunk_start in range(0, len(ids), chunk_size):
+        chunk = ids[chunk_start:chunk_start + chunk_size]
+        result = db.execute(
+            update(MasterProperty)
+            .where(MasterProperty.id.in_(chunk))
+            .values(latest_price_change_at=latest_change)
+            .execution_options(synchronize_session=False)
+        )
+        updated += result.rowcount
+    return updated
@@ -1,14 +1,24 @@
 """
 スクレイパー専用のエラーログ機能
 エラー発生時の詳細なコンテキスト情報を記録
+
+エラーは logs/scraper_errors.jsonl に1行1件のJSON（JSON Lines）で追記する。
+- 書き込みは O_APPEND で1行を1回の write() で行うため、複数プロセスが同時に書き込んでも
+  行が混ざらず、ファイルロックも不要
+- ファイルが SCRAPER_ERROR_LOG_MAX_BYTES を超えると scraper_errors.<日時>.jsonl に
+  リネームして新しいファイルに切り替え、古いものから SCRAPER_ERROR_LOG_BACKUP_COUNT 個を超えた分を削除
+- 集計（get_error_summary / check_selector_changes）は、対象期間より前に更新が止まった
+  ファイルを読み飛ばし、読み込み済みの位置以降だけを追加で読む
 """
 
 import json
 import logging
+import os
+import threading
 import traceback
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, NamedTuple, Optional, List, Tuple
 
 
 class DateTimeEncoder(json.JSONEncoder):
@@ -17,7 +27,225 @@ class DateTimeEncoder(json.JSONEncoder):
         if isinstance(obj, datetime):
             return obj.isoformat()
         return super().default(obj)
-import os
+
+
+# ローテーションするサイズ（バイト）と保持する世代数
+DEFAULT_MAX_BYTES = int(os.getenv('SCRAPER_ERROR_LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+DEFAULT_BACKUP_COUNT = int(os.getenv('SCRAPER_ERROR_LOG_BACKUP_COUNT', '5'))
+
+
+class ErrorIndexEntry(NamedTuple):
+    """集計に使う項目だけを取り出したエラー"""
+    timestamp: float
+    scraper: Optional[str]
+    error_type: str
+    url: Optional[str]
+    missing_selectors: Tuple[str, ...]
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> Optional['ErrorIndexEntry']:
+        try:
+            timestamp = datetime.fromisoformat(record['timestamp']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return None
+        return cls(
+            timestamp=timestamp,
+            scraper=record.get('scraper'),
+            error_type=record.get('error_type', 'unknown'),
+            url=record.get('url'),
+            missing_selectors=tuple(record.get('missing_selectors') or ())
+        )
+
+
+class ErrorLogStore:
+    """JSON Lines形式の追記専用エラーストア（サイズでローテーション）"""
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._fd: Optional[int] = None
+        self._lock = threading.Lock()
+        # ファイルごとの読み込み状態 {パス: (inode, 読み込み済みの位置, 集計用の項目)}
+        self._index: Dict[str, Tuple[int, int, List[ErrorIndexEntry]]] = {}
+        self._index_lock = threading.Lock()
+
+        self._migrate_legacy_file()
+
+    # ========== 書き込み ==========
+
+    def append(self, record: Dict[str, Any]):
+        """エラーを1行追記"""
+        line = json.dumps(record, ensure_ascii=False, cls=DateTimeEncoder, separators=(',', ':')) + '\n'
+        data = line.encode('utf-8')
+        with self._lock:
+            fd = self._open()
+            os.write(fd, data)
+            if self.max_bytes and os.fstat(fd).st_size >= self.max_bytes:
+                self._rotate()
+
+    def _open(self) -> int:
+        """追記用のファイルを開く（他プロセスがローテーションしていたら開き直す）"""
+        if self._fd is not None:
+            try:
+                if os.stat(self.path).st_ino == os.fstat(self._fd).st_ino:
+                    return self._fd
+            except FileNotFoundError:
+                pass
+            os.close(self._fd)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _rotate(self):
+        """現在のファイルを日時付きの名前にして、古い世代を削除"""
+        rotated = self.path.with_name(
+            f"{self.path.stem}.{datetime.now().strftime('%Y%m%d%H%M%S%f')}.{os.getpid()}{self.path.suffix}"
+        )
+        try:
+            os.rename(self.path, rotated)
+        except FileNotFoundError:
+            # 他のプロセスが先にローテーションした
+            pass
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+        for old_segment in self.rotated_segments()[:-self.backup_count or None]:
+            try:
+                old_segment.unlink()
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _migrate_legacy_file(self):
+        """旧形式（scraper_errors.json のJSON配列）のエラーを取り込む"""
+        legacy = self.path.with_suffix('.json')
+        if not legacy.exists():
+            return
+        claimed = legacy.with_name(f"{legacy.name}.migrating.{os.getpid()}")
+        try:
+            # リネームできたプロセスだけが取り込む
+            os.rename(legacy, claimed)
+        except FileNotFoundError:
+            return
+        try:
+            with open(claimed, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+            for record in records:
+                self.append(record)
+        except Exception:
+            pass
+        os.rename(claimed, legacy.with_name(f"{legacy.name}.bak"))
+
+    # ========== 読み込み ==========
+
+    def rotated_segments(self) -> List[Path]:
+        """ローテーション済みのファイル（古い順）"""
+        return sorted(self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}"))
+
+    def segments(self) -> List[Path]:
+        """全ファイル（古い順、最後が書き込み中のファイル）"""
+        segments = self.rotated_segments()
+        if self.path.exists():
+            segments.append(self.path)
+        return segments
+
+    def iter_records(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """エラーを古い順に返す（since指定時はそれより後のもの）"""
+        since_ts = since.timestamp() if since else None
+        for segment in self.segments():
+            try:
+                if since_ts is not None and segment.stat().st_mtime < since_ts:
+                    continue
+                with open(segment, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        record = self._parse_line(line)
+                        if record is None:
+                            continue
+                        if since_ts is not None:
+                            entry = ErrorIndexEntry.from_record(record)
+                            if entry is None or entry.timestamp <= since_ts:
+                                continue
+                        yield record
+            except FileNotFoundError:
+                continue
+
+    def index_entries(self, since: Optional[datetime] = None) -> List[ErrorIndexEntry]:
+        """
+        集計用の項目を返す（since指定時はそれより後のもの）
+
+        ファイルごとに読み込み済みの位置を覚えておき、追記された分だけを読む。
+        対象期間より前に更新が止まったファイルは開かない。
+        """
+        since_ts = since.timestamp() if since else None
+        entries: List[ErrorIndexEntry] = []
+        with self._index_lock:
+            segments = self.segments()
+            for stale in set(self._index) - {str(segment) for segment in segments}:
+                del self._index[stale]
+
+            for segment in segments:
+                try:
+                    stat = segment.stat()
+                except FileNotFoundError:
+                    continue
+                if since_ts is not None and stat.st_mtime < since_ts:
+                    continue
+                segment_entries = self._read_index(segment, stat)
+                if since_ts is None:
+                    entries.extend(segment_entries)
+                else:
+                    entries.extend(e for e in segment_entries if e.timestamp > since_ts)
+        return entries
+
+    def _read_index(self, segment: Path, stat: os.stat_result) -> List[ErrorIndexEntry]:
+        inode, offset, segment_entries = self._index.get(str(segment), (stat.st_ino, 0, []))
+        if inode != stat.st_ino or stat.st_size < offset:
+            # 別のファイルに置き換わった
+            offset, segment_entries = 0, []
+        if stat.st_size > offset:
+            with open(segment, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+            # 書き込み途中の最終行は次回読む
+            complete = data.rfind(b'\n') + 1
+            for line in data[:complete].splitlines():
+                record = self._parse_line(line)
+                entry = ErrorIndexEntry.from_record(record) if record else None
+                if entry is not None:
+                    segment_entries.append(entry)
+            offset += complete
+        self._index[str(segment)] = (stat.st_ino, offset, segment_entries)
+        return segment_entries
+
+    @staticmethod
+    def _parse_line(line) -> Optional[Dict[str, Any]]:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        return record if isinstance(record, dict) else None
+
+
+_stores: Dict[str, ErrorLogStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_error_store(path: Path) -> ErrorLogStore:
+    """プロセス内で共有するエラーストアを取得"""
+    key = str(Path(path).resolve())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ErrorLogStore(path)
+        return _stores[key]
 
 
 class ScraperErrorLogger:
@@ -30,8 +258,9 @@ class ScraperErrorLogger:
         self.log_dir = Path("logs")
         self.log_dir.mkdir(exist_ok=True)
         
-        # エラーログファイルのパス
-        self.error_json_path = self.log_dir / "scraper_errors.json"
+        # エラーログファイルのパス（JSON Lines、プロセス内で共有）
+        self.error_log_path = self.log_dir / "scraper_errors.jsonl"
+        self.store = get_error_store(self.error_log_path)
         self.debug_log_path = self.log_dir / "scraper_debug.log"
         
         # 通常のロガー設定（詳細デバッグ用）
@@ -47,24 +276,16 @@ class ScraperErrorLogger:
             self.logger.addHandler(handler)
             self.logger.setLevel(logging.DEBUG)
     
-    def _load_error_history(self) -> List[Dict[str, Any]]:
-        """既存のエラー履歴を読み込む"""
-        if self.error_json_path.exists():
-            try:
-                with open(self.error_json_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception:
-                return []
-        return []
+    def _load_error_history(self, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """エラー履歴を読み込む（since指定時はそれより後のもの）"""
+        return list(self.store.iter_records(since))
     
-    def _save_error_history(self, errors: List[Dict[str, Any]]):
-        """エラー履歴を保存（最新1000件のみ保持）"""
-        # 最新1000件のみ保持
-        if len(errors) > 1000:
-            errors = errors[-1000:]
-        
-        with open(self.error_json_path, 'w', encoding='utf-8') as f:
-            json.dump(errors, f, ensure_ascii=False, indent=2, cls=DateTimeEncoder)
+    def _append_error(self, error_record: Dict[str, Any]):
+        """エラーを1行追記（既存の履歴は読み込まない）"""
+        try:
+            self.store.append(error_record)
+        except OSError as e:
+            self.logger.warning(f"エラーログへの書き込みに失敗: {e}")
     
     def log_property_error(self, 
                           error_type: str,
@@ -95,10 +316,8 @@ class ScraperErrorLogger:
             "property_data": property_data
         }
         
-        # JSONファイルに追記
-        errors = self._load_error_history()
-        errors.append(error_record)
-        self._save_error_history(errors)
+        # JSON Linesファイルに追記
+        self._append_error(error_record)
         
         # デバッグログにも記録
         self.logger.error(
@@ -131,10 +350,8 @@ class ScraperErrorLogger:
             "html_snippet": html_snippet[:500] if html_snippet else None  # 最初の500文字のみ
         }
         
-        # JSONファイルに追記
-        errors = self._load_error_history()
-        errors.append(error_record)
-        self._save_error_history(errors)
+        # JSON Linesファイルに追記
+        self._append_error(error_record)
         
         # デバッグログ
         self.logger.error(
@@ -165,10 +382,8 @@ class ScraperErrorLogger:
             "property_data": property_data
         }
         
-        # JSONファイルに追記
-        errors = self._load_error_history()
-        errors.append(error_record)
-        self._save_error_history(errors)
+        # JSON Linesファイルに追記
+        self._append_error(error_record)
         
         # デバッグログ
         self.logger.error(
@@ -193,10 +408,8 @@ class ScraperErrorLogger:
             "consecutive_errors": consecutive_errors
         }
         
-        # JSONファイルに追記
-        errors = self._load_error_history()
-        errors.append(error_record)
-        self._save_error_history(errors)
+        # JSON Linesファイルに追記
+        self._append_error(error_record)
         
         # デバッグログ
         self.logger.critical(
@@ -207,24 +420,17 @@ class ScraperErrorLogger:
     
     def get_error_summary(self, hours: int = 24) -> Dict[str, Any]:
         """指定時間内のエラーサマリーを取得"""
-        errors = self._load_error_history()
-        cutoff_time = datetime.now().timestamp() - (hours * 3600)
-        
-        recent_errors = [
-            e for e in errors
-            if datetime.fromisoformat(e['timestamp']).timestamp() > cutoff_time
-        ]
+        recent_errors = self.store.index_entries(since=datetime.now() - timedelta(hours=hours))
         
         # エラータイプ別の集計
         error_types = {}
         for error in recent_errors:
-            error_type = error.get('error_type', 'unknown')
-            error_types[error_type] = error_types.get(error_type, 0) + 1
+            error_types[error.error_type] = error_types.get(error.error_type, 0) + 1
         
         # URL別の集計
         url_errors = {}
         for error in recent_errors:
-            url = error.get('url')
+            url = error.url
             if url:
                 url_errors[url] = url_errors.get(url, 0) + 1
         
@@ -245,20 +451,16 @@ class ScraperErrorLogger:
     
     def check_selector_changes(self) -> List[Dict[str, Any]]:
         """セレクタ変更の可能性を検出"""
-        errors = self._load_error_history()
-        parsing_errors = [e for e in errors if e.get('error_type') == 'parsing']
-        
         # 最近24時間のパースエラーを分析
-        cutoff_time = datetime.now().timestamp() - (24 * 3600)
         recent_parsing_errors = [
-            e for e in parsing_errors
-            if datetime.fromisoformat(e['timestamp']).timestamp() > cutoff_time
+            e for e in self.store.index_entries(since=datetime.now() - timedelta(hours=24))
+            if e.error_type == 'parsing'
         ]
         
         # セレクタ別のエラー回数を集計
         selector_errors = {}
         for error in recent_parsing_errors:
-            for selector in error.get('missing_selectors', []):
+            for selector in error.missing_selectors:
                 selector_errors[selector] = selector_errors.get(selector, 0) + 1
         
         # 頻繁に失敗しているセレクタを検出
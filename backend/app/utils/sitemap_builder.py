@@ -0,0 +1,198 @@
+"""
+サイトマップの生成
+
+URLを1件ずつ読み込みながらXMLの断片を順に生成し、1ファイルあたり
+MAX_URLS_PER_SHARD 件（サイトマップの仕様の上限は50,000件）で分割する。
+分割したファイルは sitemap_index.xml から参照する。
+
+- rebuild_sitemap_shards(): 全ファイルを生成して sitemap_shards テーブルに保存する
+  （スクレイピング完了後に実行。APIは保存済みのXMLをそのまま返す）
+- iter_shard_xml() / count_sitemap_urls(): 保存済みのファイルがない場合に
+  APIがその場でストリーミング生成するために使用する
+
+含めるURL:
+- 静的ページ
+- 販売中の掲載がある建物のページ（/buildings/{id}/properties）
+- 販売中の掲載がある物件のページ（/properties/{id}）
+建物・物件の lastmod は掲載の更新日時（販売終了を含む）の最大値。
+"""
+import logging
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from xml.sax.saxutils import escape
+
+from sqlalchemy import case, func, text
+from sqlalchemy.orm import Session
+
+from ..models import MasterProperty, PropertyListing, SitemapShard
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://mscan.jp"
+
+# 1ファイルあたりのURL数の上限
+MAX_URLS_PER_SHARD = 50000
+
+# DBから一度に読み込む行数
+FETCH_SIZE = 5000
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+class SitemapUrl(NamedTuple):
+    loc: str
+    lastmod: Optional[datetime] = None
+    changefreq: Optional[str] = None
+    priority: Optional[str] = None
+
+
+STATIC_PAGES = [
+    SitemapUrl(f"{BASE_URL}/", changefreq="daily", priority="1.0"),
+    SitemapUrl(f"{BASE_URL}/transaction-prices", changefreq="weekly", priority="0.8"),
+]
+
+
+def _has_active_listing():
+    return func.max(case((PropertyListing.is_active == True, 1), else_=0)) == 1
+
+
+def iter_sitemap_urls(db: Session) -> Iterator[SitemapUrl]:
+    """サイトマップに含めるURLを順に返す（順序は毎回同じ）"""
+    yield from STATIC_PAGES
+
+    buildings = db.query(
+        MasterProperty.building_id, func.max(PropertyListing.updated_at)
+    ).join(
+        PropertyListing, PropertyListing.master_property_id == MasterProperty.id
+    ).filter(
+        MasterProperty.building_id.isnot(None)
+    ).group_by(
+        MasterProperty.building_id
+    ).having(
+        _has_active_listing()
+    ).order_by(
+        MasterProperty.building_id
+    ).yield_per(FETCH_SIZE)
+    for building_id, lastmod in buildings:
+        yield SitemapUrl(f"{BASE_URL}/buildings/{building_id}/properties", lastmod, "weekly", "0.6")
+
+    properties = db.query(
+        MasterProperty.id, func.max(PropertyListing.updated_at)
+    ).join(
+        PropertyListing, PropertyListing.master_property_id == MasterProperty.id
+    ).group_by(
+        MasterProperty.id
+    ).having(
+        _has_active_listing()
+    ).order_by(
+        MasterProperty.id
+    ).yield_per(FETCH_SIZE)
+    for property_id, lastmod in properties:
+        yield SitemapUrl(f"{BASE_URL}/properties/{property_id}", lastmod, "weekly", "0.5")
+
+
+def count_sitemap_urls(db: Session) -> int:
+    """サイトマップに含めるURLの件数"""
+    building_count = db.query(MasterProperty.building_id).join(
+        PropertyListing, PropertyListing.master_property_id == MasterProperty.id
+    ).filter(
+        MasterProperty.building_id.isnot(None),
+        PropertyListing.is_active == True
+    ).distinct().count()
+    property_count = db.query(PropertyListing.master_property_id).filter(
+        PropertyListing.is_active == True
+    ).distinct().count()
+    return len(STATIC_PAGES) + building_count + property_count
+
+
+def _format_lastmod(value: datetime) -> str:
+    return value.date().isoformat()
+
+
+def render_url(url: SitemapUrl) -> str:
+    """<url>要素を生成"""
+    parts = [f"<url><loc>{escape(url.loc)}</loc>"]
+    if url.lastmod is not None:
+        parts.append(f"<lastmod>{_format_lastmod(url.lastmod)}</lastmod>")
+    if url.changefreq:
+        parts.append(f"<changefreq>{url.changefreq}</changefreq>")
+    if url.priority:
+        parts.append(f"<priority>{url.priority}</priority>")
+    parts.append("</url>\n")
+    return "".join(parts)
+
+
+def iter_urlset_xml(urls: Iterable[SitemapUrl]) -> Iterator[str]:
+    """<urlset>のXMLを断片ごとに返す"""
+    yield XML_DECLARATION
+    yield f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+    for url in urls:
+        yield render_url(url)
+    yield "</urlset>\n"
+
+
+def iter_shard_xml(db: Session, shard_number: int, max_urls: int = MAX_URLS_PER_SHARD) -> Iterator[str]:
+    """指定番号（1から）のファイルのXMLをその場で生成して断片ごとに返す"""
+    start = (shard_number - 1) * max_urls
+    return iter_urlset_xml(islice(iter_sitemap_urls(db), start, start + max_urls))
+
+
+def iter_sitemap_index_xml(shards: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    sitemap_index.xml のXMLを断片ごとに返す
+
+    Args:
+        shards: shard_number と lastmod（任意）を持つ辞書
+    """
+    yield XML_DECLARATION
+    yield f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'
+    for shard in shards:
+        lastmod = shard.get('lastmod')
+        lastmod_tag = f"<lastmod>{_format_lastmod(lastmod)}</lastmod>" if lastmod else ""
+        yield f"<sitemap><loc>{BASE_URL}/sitemap-{shard['shard_number']}.xml</loc>{lastmod_tag}</sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+def iter_shards(db: Session, max_urls: int = MAX_URLS_PER_SHARD) -> Iterator[Dict[str, Any]]:
+    """URLを順に読み込み、max_urls 件ごとのファイル（XMLと件数・lastmod）を返す"""
+    urls = iter_sitemap_urls(db)
+    shard_number = 0
+    while True:
+        chunk: List[SitemapUrl] = list(islice(urls, max_urls))
+        if not chunk:
+            return
+        shard_number += 1
+        lastmods = [url.lastmod for url in chunk if url.lastmod is not None]
+        yield {
+            'shard_number': shard_number,
+            'content': "".join(iter_urlset_xml(chunk)),
+            'url_count': len(chunk),
+            'lastmod': max(lastmods) if lastmods else None,
+        }
+
+
+def rebuild_sitemap_shards(db: Session, max_urls: int = MAX_URLS_PER_SHARD) -> Dict[str, int]:
+    """
+    サイトマップの全ファイルを生成して保存する（コミットまで行う）
+
+    入れ替えは1トランザクションで行うため、APIは生成中も前回のファイルを返す。
+    同時に実行された場合は、先に始めた生成のコミットを待ってから作り直す。
+    """
+    generated_at = datetime.now()
+    if db.get_bind().dialect.name == 'postgresql':
+        # 読み込み（SELECT）は妨げず、他の生成の削除・挿入だけを待たせる
+        db.execute(text("LOCK TABLE sitemap_shards IN EXCLUSIVE MODE"))
+    # セッションに読み込み済みの古いファイルも削除済みにして、同じ番号で追加できるようにする
+    db.query(SitemapShard).delete(synchronize_session='fetch')
+    shard_count = 0
+    url_count = 0
+    for shard in iter_shards(db, max_urls):
+        db.add(SitemapShard(generated_at=generated_at, **shard))
+        db.flush()
+        shard_count += 1
+        url_count += shard['url_count']
+    db.commit()
+    logger.info(f"サイトマップを生成しました: {shard_count}ファイル, {url_count}件")
+    return {'shard_count': shard_count, 'url_count': url_count}
@@ -0,0 +1,375 @@
+"""
+SSRのHTMLシェルとページキャッシュ
+
+SSRエンドポイント（api/ssr.py）で使用する。
+
+- シェル: フロントエンドのビルド済みindex.htmlを一度だけ取得・解析し、
+  メタタグ（<title>の位置）と初期データ（</head>の直前）を差し込む位置で
+  分割したテンプレートとして保持する。ページの生成は断片の連結だけで行う。
+  取得元の確認は SSR_SHELL_CHECK_SECONDS 秒ごとに1回だけ行い、
+  HTTPは ETag / Last-Modified による条件付きリクエスト、ファイルは更新日時と
+  サイズで変更を判定して、変わった場合だけ読み込み直す。
+- ページキャッシュ: 生成したページを建物・物件ごとのタグ付きでサーバーサイド
+  キャッシュ（utils/cache.py）に保存する。建物・物件の変更時は
+  invalidate_ssr_pages() でタグを指定して削除する（物件ページには建物のタグも
+  付けるため、建物を指定すると建物内の物件ページも削除される）。
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from .cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+# フロントエンドのビルド済みindex.htmlのパス
+# 本番環境：/app/frontend_dist/index.html（nginx経由でアクセス）
+# 開発環境：シンプルなテンプレートを使用（Vite devサーバーが別途動作）
+FRONTEND_DIST_PATH = os.getenv("FRONTEND_DIST_PATH", "/app/frontend_dist/index.html")
+
+# フロントエンドのHTMLの取得先（上から順に試す）
+FRONTEND_URLS = [
+    "http://frontend:3000/",  # 本番環境（docker-compose内部）
+    "http://localhost:3001/"   # 開発環境
+]
+
+# デフォルトのHTMLテンプレート（開発環境用）
+DEFAULT_HTML_TEMPLATE = """<!doctype html>
+<html lang="ja">
+  <head>
+    <meta charset="UTF-8" />
+    <link rel="icon" type="image/svg+xml" href="/vite.svg" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+
+    <!-- Google tag (gtag.js) -->
+    <script async src="https://www.googletagmanager.com/gtag/js?id=G-C985LS1W3F"></script>
+    <script>
+      window.dataLayer = window.dataLayer || [];
+      function gtag(){{dataLayer.push(arguments);}}
+      gtag('js', new Date());
+
+      gtag('config', 'G-C985LS1W3F');
+    </script>
+  </head>
+  <body>
+    <div id="root"></div>
+    <script type="module" src="/src/main.tsx"></script>
+  </body>
+</html>
+"""
+
+# ページキャッシュのタグ
+SSR_PROPERTIES_LIST_TAG = 'ssr:properties_list'
+
+# シェルに元々あるメタタグ（ページごとのメタタグに置き換えるため削除する）
+_EXISTING_META_PATTERNS = [
+    re.compile(r'<meta\s+name="description"[^>]*>'),
+    re.compile(r'<link\s+rel="canonical"[^>]*>'),
+    re.compile(r'<meta\s+property="og:[^"]*"[^>]*>'),
+    re.compile(r'<meta\s+name="twitter:[^"]*"[^>]*>'),
+]
+_TITLE_PATTERN = re.compile(r'<title[^>]*>.*?</title>', flags=re.DOTALL)
+_HEAD_OPEN_PATTERN = re.compile(r'(<head[^>]*>)')
+
+# テンプレートの差し込み位置
+_HEAD_BLOCK = object()
+_HEAD_END = object()
+_NOT_MODIFIED = object()
+
+
+def shell_version(html: str) -> str:
+    """シェルの内容から版を計算（ページキャッシュのキーに含める）"""
+    return hashlib.md5(html.encode('utf-8')).hexdigest()[:12]
+
+
+def build_head_block(meta_data: dict) -> str:
+    """<title>タグとページ固有のメタタグを生成"""
+    # data-rh="true" を追加してreact-helmetが既存タグとして認識し、重複を防ぐ
+    meta_tags = f"""<meta name="description" content="{meta_data['description']}" data-rh="true" />
+    <link rel="canonical" href="{meta_data['canonical']}" data-rh="true" />
+    <meta property="og:title" content="{meta_data['title']}" data-rh="true" />
+    <meta property="og:description" content="{meta_data['description']}" data-rh="true" />
+    <meta property="og:url" content="{meta_data['canonical']}" data-rh="true" />
+    <meta property="og:type" content="website" data-rh="true" />
+    <meta name="twitter:card" content="summary_large_image" data-rh="true" />
+    <meta name="twitter:title" content="{meta_data['title']}" data-rh="true" />
+    <meta name="twitter:description" content="{meta_data['description']}" data-rh="true" />"""
+    title_tag = f'<title data-rh="true">{meta_data["title"]}</title>'
+    return title_tag + '\n    ' + meta_tags
+
+
+class ShellTemplate:
+    """差し込み位置で分割したHTMLシェル"""
+
+    def __init__(self, html: str, source: str = ''):
+        self.html = html
+        self.source = source
+        self.version = shell_version(html)
+        self._fragments = self._compile(html)
+
+    @staticmethod
+    def _compile(html: str) -> List[Any]:
+        for pattern in _EXISTING_META_PATTERNS:
+            html = pattern.sub('', html)
+
+        # <title>をメタタグに置き換える（<title>がない場合は<head>の直後に追加）
+        fragments: List[Any] = []
+        if _TITLE_PATTERN.search(html):
+            for i, part in enumerate(_TITLE_PATTERN.split(html)):
+                if i:
+                    fragments.append(_HEAD_BLOCK)
+                fragments.append(part)
+        else:
+            for i, part in enumerate(_HEAD_OPEN_PATTERN.split(html)):
+                fragments.append(part)
+                if i % 2 == 1:
+                    fragments.extend(['\n    ', _HEAD_BLOCK])
+
+        # 初期データは</head>の直前に差し込む
+        compiled: List[Any] = []
+        for fragment in fragments:
+            if fragment is _HEAD_BLOCK:
+                compiled.append(fragment)
+                continue
+            for i, part in enumerate(fragment.split('</head>')):
+                if i:
+                    compiled.append(_HEAD_END)
+                if part:
+                    compiled.append(part)
+        return compiled
+
+    def render(self, meta_data: dict, initial_state_script: str = '') -> str:
+        """
+        メタタグと初期データを差し込んだHTMLを生成
+
+        Args:
+            meta_data: title / description / canonical
+            initial_state_script: </head>の直前に差し込むスクリプト（クローラー向けの初期データ）
+        """
+        head_block = build_head_block(meta_data)
+        head_end = f'{initial_state_script}\n  </head>' if initial_state_script else '</head>'
+        return ''.join(
+            head_block if fragment is _HEAD_BLOCK else head_end if fragment is _HEAD_END else fragment
+            for fragment in self._fragments
+        )
+
+
+class FrontendShell:
+    """フロントエンドのHTMLシェルの読み込みと変更の確認（スレッドセーフ）"""
+
+    def __init__(self, dist_path: str = FRONTEND_DIST_PATH, frontend_urls: Iterable[str] = FRONTEND_URLS,
+                 check_seconds: float = 30, fetch_timeout: float = 5,
+                 http_get: Optional[Callable[..., Any]] = None):
+        """
+        初期化
+
+        Args:
+            dist_path: ビルド済みindex.htmlのパス（HTTPで取得できない場合に使用）
+            frontend_urls: HTMLの取得先URL（上から順に試す）
+            check_seconds: 取得元の変更を確認する間隔（秒）
+            fetch_timeout: HTTPのタイムアウト（秒）
+            http_get: requests.get 互換の関数（テスト用。Noneの場合は requests.get）
+        """
+        self.dist_path = dist_path
+        self.frontend_urls = list(frontend_urls)
+        self.check_seconds = check_seconds
+        self.fetch_timeout = fetch_timeout
+        self._http_get = http_get
+
+        self._template: Optional[ShellTemplate] = None
+        self._source: Optional[str] = None
+        # 取得元ごとの変更判定の情報（URL: ETag / Last-Modified、ファイル: 更新日時とサイズ）
+        self._validators: Dict[str, Any] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def get_template(self) -> ShellTemplate:
+        """
+        現在のシェルを取得
+
+        確認の間隔が過ぎていれば取得元を確認する。確認中の他のリクエストは待たずに
+        読み込み済みのシェルを使う（初回の読み込みだけは全員が待つ）。
+        """
+        if self._template is not None and time.monotonic() - self._last_check < self.check_seconds:
+            return self._template
+
+        if self._template is None:
+            with self._lock:
+                if self._template is None:
+                    self._reload()
+            return self._template
+
+        if self._lock.acquire(blocking=False):
+            try:
+                if time.monotonic() - self._last_check >= self.check_seconds:
+                    self._reload()
+            finally:
+                self._lock.release()
+        return self._template
+
+    def get_html(self) -> str:
+        """メタタグを差し込む前のHTMLを取得"""
+        return self.get_template().html
+
+    def invalidate(self) -> None:
+        """次回の取得時に取得元を確認し直す（フロントエンドのデプロイ後など）"""
+        self._last_check = 0.0
+
+    def _reload(self) -> None:
+        self._last_check = time.monotonic()
+
+        for url in self.frontend_urls:
+            html = self._fetch_url(url)
+            if html is _NOT_MODIFIED:
+                return
+            if html is not None:
+                self._set_template(html, url)
+                return
+
+        html = self._read_file()
+        if html is _NOT_MODIFIED:
+            return
+        if html is not None:
+            self._set_template(html, self.dist_path)
+            return
+
+        # 一時的に取得できない場合は読み込み済みのシェルを使い続ける
+        if self._template is None:
+            logger.warning("フロントエンドのHTMLを取得できませんでした。デフォルトテンプレートを使用します。")
+            self._set_template(DEFAULT_HTML_TEMPLATE, 'default')
+
+    def _fetch_url(self, url: str):
+        headers = {}
+        validators = self._validators.get(url) if self._source == url else None
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        http_get = self._http_get
+        if http_get is None:
+            import requests
+            http_get = requests.get
+        try:
+            response = http_get(url, timeout=self.fetch_timeout, headers=headers)
+        except Exception as e:
+            logger.warning(f"{url}からHTMLを取得できませんでした: {e}")
+            return None
+
+        if response.status_code == 304 and headers:
+            return _NOT_MODIFIED
+        if response.status_code != 200:
+            return None
+        self._validators[url] = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        return response.text
+
+    def _read_file(self):
+        try:
+            stat = os.stat(self.dist_path)
+        except OSError:
+            return None
+        file_validator = (stat.st_mtime_ns, stat.st_size)
+        if self._source == self.dist_path and self._validators.get(self.dist_path) == file_validator:
+            return _NOT_MODIFIED
+        try:
+            with open(self.dist_path, 'r', encoding='utf-8') as f:
+                html = f.read()
+        except Exception as e:
+            logger.warning(f"ローカルファイルから読み込めませんでした: {e}")
+            return None
+        self._validators[self.dist_path] = file_validator
+        return html
+
+    def _set_template(self, html: str, source: str) -> None:
+        self._source = source
+        # 内容が同じ場合（ETagのない取得元など）は解析し直さない
+        if self._template is not None and self._template.version == shell_version(html):
+            self._template.source = source
+            return
+        self._template = ShellTemplate(html, source)
+        logger.info(f"フロントエンドのHTMLを読み込みました: {source}（version={self._template.version}）")
+
+
+# プロセス内で共有するインスタンス
+_frontend_shell: Optional[FrontendShell] = None
+_frontend_shell_lock = threading.Lock()
+
+
+def get_frontend_shell() -> FrontendShell:
+    """プロセス内で共有するHTMLシェルを取得"""
+    global _frontend_shell
+    if _frontend_shell is None:
+        with _frontend_shell_lock:
+            if _frontend_shell is None:
+                _frontend_shell = FrontendShell(
+                    check_seconds=float(os.getenv('SSR_SHELL_CHECK_SECONDS', '30'))
+                )
+    return _frontend_shell
+
+
+# ========== ページキャッシュ ==========
+
+def ssr_building_tag(building_id: int) -> str:
+    """建物ページ（と建物内の物件ページ）のキャッシュのタグ"""
+    return f'ssr:building:{building_id}'
+
+
+def ssr_property_tag(property_id: int) -> str:
+    """物件ページのキャッシュのタグ"""
+    return f'ssr:property:{property_id}'
+
+
+def invalidate_ssr_pages(building_ids: Iterable[Optional[int]] = (),
+                         property_ids: Iterable[Optional[int]] = (),
+                         include_lists: bool = False) -> None:
+    """
+    SSRのページキャッシュを削除（建物・物件の変更時に呼び出す）
+
+    Args:
+        building_ids: 建物ID（建物ページと建物内の物件ページを削除）
+        property_ids: 物件ID
+        include_lists: 物件一覧ページも削除する
+    """
+    tags = [ssr_building_tag(building_id) for building_id in building_ids if building_id is not None]
+    tags.extend(ssr_property_tag(property_id) for property_id in property_ids if property_id is not None)
+    if include_lists:
+        tags.append(SSR_PROPERTIES_LIST_TAG)
+    if tags:
+        get_cache().invalidate_tags(*tags)
+
+
+def invalidate_changed_ssr_pages(db: Session, since: datetime) -> int:
+    """
+    指定時刻以降に物件・掲載が更新された建物のページキャッシュを削除（スクレイピング完了後など）
+
+    Returns:
+        対象の建物数
+    """
+    from ..models import MasterProperty, PropertyListing
+
+    building_ids: Set[int] = set(
+        building_id for (building_id,) in db.query(MasterProperty.building_id).filter(
+            MasterProperty.updated_at >= since
+        ).distinct()
+    )
+    building_ids.update(
+        building_id for (building_id,) in db.query(MasterProperty.building_id).join(
+            PropertyListing, PropertyListing.master_property_id == MasterProperty.id
+        ).filter(
+            PropertyListing.updated_at >= since
+        ).distinct()
+    )
+    building_ids.discard(None)
+    invalidate_ssr_pages(building_ids=building_ids, include_lists=bool(building_ids))
+    return len(building_ids)
@@ -0,0 +1,158 @@
+"""
+統計情報のスナップショット（stats_snapshots）
+
+トップページの統計（GET /api/stats）と管理画面の掲載状態の統計
+（GET /admin/listing-status-stats）を、テーブルごとに1回の集計クエリ
+（count(*) FILTER (WHERE ...) で条件ごとの件数をまとめて数える）で計算し、
+stats_snapshots テーブルに保存する。
+
+- refresh_stats_snapshot(): 計算して保存する（スケジューラーで定期的に、
+  スクレイピング完了後・掲載状態の更新後に実行）
+- get_latest_stats_snapshot(): APIが返す最新のスナップショット
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from ..models import Building, ListingPriceHistory, MasterProperty, PropertyListing, StatsSnapshot
+
+logger = logging.getLogger(__name__)
+
+# 価格帯別の物件数の区分（下限, 上限（未満）, ラベル）
+PRICE_RANGES = [
+    (0, 3000, "3000万円未満"),
+    (3000, 5000, "3000-5000万円"),
+    (5000, 8000, "5000-8000万円"),
+    (8000, 10000, "8000万-1億円"),
+    (10000, None, "1億円以上")
+]
+
+# スナップショットを保持する期間
+SNAPSHOT_RETENTION = timedelta(days=7)
+
+
+def compute_stats(db: Session, now: Optional[datetime] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    統計情報を計算
+
+    Returns:
+        {'stats': /api/stats の内容, 'listing_status_stats': 掲載状態の統計}
+    """
+    now = now or datetime.now()
+    threshold_24h = now - timedelta(hours=24)
+    today_start = datetime.combine(now.date(), datetime.min.time())
+    is_active = PropertyListing.is_active == True
+
+    # 掲載（条件ごとの件数と日時を1回の集計で取得）
+    listings = db.query(
+        func.count().filter(is_active).label('active'),
+        func.count().filter(PropertyListing.is_active == False).label('inactive'),
+        func.count().filter(PropertyListing.last_confirmed_at >= today_start).label('checked_today'),
+        func.count().filter(
+            and_(is_active, PropertyListing.last_confirmed_at < threshold_24h)
+        ).label('not_checked_24h'),
+        func.min(PropertyListing.last_confirmed_at).filter(is_active).label('oldest_unchecked'),
+        func.max(PropertyListing.last_scraped_at).label('last_scraped'),
+    ).one()
+
+    # 物件
+    properties = db.query(
+        func.count().label('total'),
+        func.count().filter(MasterProperty.sold_at.isnot(None)).label('sold'),
+    ).one()
+
+    # サイト別の掲載数
+    by_source = db.query(
+        PropertyListing.source_site,
+        func.count(PropertyListing.id)
+    ).filter(
+        is_active
+    ).group_by(
+        PropertyListing.source_site
+    ).all()
+
+    # 価格帯別の物件数（物件ごとの販売中の掲載の最低価格で分類し、全区分を1回の集計で数える）
+    min_prices = db.query(
+        PropertyListing.master_property_id,
+        func.min(PropertyListing.current_price).label('min_price')
+    ).filter(
+        is_active
+    ).group_by(
+        PropertyListing.master_property_id
+    ).subquery()
+    range_counts = []
+    for min_p, max_p, label in PRICE_RANGES:
+        condition = min_prices.c.min_price >= min_p
+        if max_p is not None:
+            condition = and_(condition, min_prices.c.min_price < max_p)
+        range_counts.append(func.count().filter(condition).label(f'range_{len(range_counts)}'))
+    by_price = db.query(*range_counts).select_from(min_prices).one()
+
+    stats = {
+        "total_buildings": db.query(func.count(Building.id)).scalar() or 0,
+        "total_properties": properties.total or 0,
+        "total_listings": listings.active or 0,
+        "total_price_records": db.query(func.count(ListingPriceHistory.id)).scalar() or 0,
+        "by_source": {source: count for source, count in by_source},
+        "by_price_range": {label: by_price[i] or 0 for i, (_, _, label) in enumerate(PRICE_RANGES)},
+        "last_updated": str(listings.last_scraped) if listings.last_scraped else None,
+    }
+    listing_status_stats = {
+        "total_active_listings": listings.active or 0,
+        "total_inactive_listings": listings.inactive or 0,
+        "total_sold_properties": properties.sold or 0,
+        "listings_checked_today": listings.checked_today or 0,
+        "listings_not_checked_24h": listings.not_checked_24h or 0,
+        "oldest_unchecked_date": listings.oldest_unchecked.isoformat() if listings.oldest_unchecked else None
+    }
+    return {'stats': stats, 'listing_status_stats': listing_status_stats}
+
+
+def refresh_stats_snapshot(db: Session) -> StatsSnapshot:
+    """統計情報を計算してスナップショットを保存する（コミットまで行う）"""
+    started = time.perf_counter()
+    computed_at = datetime.now()
+    result = compute_stats(db, computed_at)
+
+    snapshot = StatsSnapshot(
+        computed_at=computed_at,
+        stats=result['stats'],
+        listing_status_stats=result['listing_status_stats'],
+        duration_ms=int((time.perf_counter() - started) * 1000)
+    )
+    db.add(snapshot)
+    db.query(StatsSnapshot).filter(
+        StatsSnapshot.computed_at < computed_at - SNAPSHOT_RETENTION
+    ).delete(synchronize_session=False)
+    db.commit()
+    logger.info(f"統計情報のスナップショットを保存しました（{snapshot.duration_ms}ms）")
+    return snapshot
+
+
+def get_latest_stats_snapshot(db: Session) -> Optional[StatsSnapshot]:
+    """最新のスナップショットを取得"""
+    return db.query(StatsSnapshot).order_by(StatsSnapshot.computed_at.desc()).first()
+
+
+def get_stats_with_freshness(db: Session, section: str, live: bool = False) -> Dict[str, Any]:
+    """
+    スナップショットの統計情報に、計算日時（snapshot_at）を付けて返す
+
+    Args:
+        section: 'stats' または 'listing_status_stats'
+        live: Trueの場合はその場で計算する（保存はしない）
+    """
+    if not live:
+        snapshot = get_latest_stats_snapshot(db)
+        if snapshot is None:
+            # 初回（まだスケジューラーが実行されていない場合）はここで保存する
+            snapshot = refresh_stats_snapshot(db)
+        return {**getattr(snapshot, section), "snapshot_at": snapshot.computed_at.isoformat(), "is_live": False}
+
+    computed_at = datetime.now()
+    result = compute_stats(db, computed_at)
+    return {**result[section], "snapshot_at": computed_at.isoformat(), "is_live": True}
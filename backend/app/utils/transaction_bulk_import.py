@@ -0,0 +1,162 @@
+"""
+成約価格情報（transaction_prices）の一括取り込み
+
+パース済みの取引を一時テーブル（ステージングテーブル）に流し込み、
+1回の INSERT ... SELECT ... ON CONFLICT (transaction_id) DO NOTHING で本テーブルに反映する。
+行ごとの存在確認（SELECT）やコミットは行わない。
+
+- PostgreSQL: ステージングテーブルへは COPY で CHUNK_SIZE 行ずつ流し込む
+- それ以外（テスト用のSQLite等）: ステージングテーブルへ executemany で挿入する
+
+同じ取引IDが複数回含まれる場合は最初の行を使う。
+"""
+import io
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+from sqlalchemy import Column, Integer, MetaData, Table, text
+from sqlalchemy.orm import Session
+
+from ..models import TransactionPrice
+
+logger = logging.getLogger(__name__)
+
+# ステージングテーブルへ一度に流し込む行数
+CHUNK_SIZE = 5000
+
+STAGING_TABLE = "transaction_prices_staging"
+
+# 取り込む列（id と作成・更新日時はDB側で設定する）
+IMPORT_COLUMNS = [
+    column.name for column in TransactionPrice.__table__.columns
+    if column.name not in ('id', 'created_at', 'updated_at')
+]
+
+
+def _staging_table() -> Table:
+    columns = TransactionPrice.__table__.columns
+    return Table(
+        STAGING_TABLE, MetaData(),
+        Column('seq', Integer, primary_key=True, autoincrement=True),
+        *[Column(name, columns[name].type) for name in IMPORT_COLUMNS],
+        prefixes=['TEMPORARY']
+    )
+
+
+def transaction_to_row(transaction: Union[TransactionPrice, Dict[str, Any]]) -> Dict[str, Any]:
+    """TransactionPriceオブジェクト（または辞書）を取り込む列の辞書に変換"""
+    if isinstance(transaction, dict):
+        return {name: transaction.get(name) for name in IMPORT_COLUMNS}
+    return {name: getattr(transaction, name) for name in IMPORT_COLUMNS}
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _copy_value(value: Any) -> str:
+    """COPY（CSV形式）の1項目に変換
+
+    NULL は引用符なしの空欄、それ以外はすべて引用符で囲む。
+    COPY は引用符で囲んだ値を NULL として扱わないため、空文字列や「\\N」も元の値のまま保存される。
+    """
+    if value is None:
+        return ''
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_chunk(db: Session, chunk: List[Dict[str, Any]]):
+    """COPY でステージングテーブルに流し込む（PostgreSQL）"""
+    buffer = io.StringIO()
+    for row in chunk:
+        buffer.write(','.join(_copy_value(row[name]) for name in IMPORT_COLUMNS))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {STAGING_TABLE} ({', '.join(IMPORT_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def bulk_import_transactions(
+    db: Session,
+    transactions: Iterable[Union[TransactionPrice, Dict[str, Any]]],
+    update_prices: bool = False,
+    chunk_size: int = CHUNK_SIZE
+) -> Dict[str, int]:
+    """
+    取引をまとめて取り込む（コミットまで行う）
+
+    Args:
+        transactions: TransactionPriceオブジェクト（セッションには追加しない）または列の辞書
+        update_prices: Trueの場合、既存の取引のうち価格が変わったものは価格と平米単価を更新する
+
+    Returns:
+        {'inserted': 追加件数, 'updated': 更新件数, 'skipped': スキップ件数（既存・重複）}
+    """
+    staging = _staging_table()
+    use_copy = db.get_bind().dialect.name == 'postgresql'
+    # 同じ取引IDの行のうち最初の行
+    first_rows = f"SELECT min(seq) FROM {STAGING_TABLE} GROUP BY transaction_id"
+
+    try:
+        staging.drop(bind=db.connection(), checkfirst=True)
+        staging.create(bind=db.connection())
+
+        total = 0
+        for chunk in _chunks((transaction_to_row(t) for t in transactions), chunk_size):
+            if use_copy:
+                _copy_chunk(db, chunk)
+            else:
+                db.execute(staging.insert(), chunk)
+            total += len(chunk)
+
+        updated = 0
+        if update_prices:
+            updated = db.execute(text(f"""
+                UPDATE transaction_prices
+                SET transaction_price = s.transaction_price,
+                    price_per_sqm = s.price_per_sqm,
+                    updated_at = :now
+                FROM {STAGING_TABLE} s
+                WHERE s.transaction_id = transaction_prices.transaction_id
+                  AND s.seq IN ({first_rows})
+                  AND transaction_prices.transaction_price IS DISTINCT FROM s.transaction_price
+            """), {'now': datetime.now()}).rowcount
+
+        columns = ', '.join(IMPORT_COLUMNS)
+        inserted = db.execute(text(f"""
+            INSERT INTO transaction_prices ({columns})
+            SELECT {columns}
+            FROM {STAGING_TABLE}
+            WHERE seq IN ({first_rows})
+            ORDER BY seq
+            ON CONFLICT (transaction_id) DO NOTHING
+        """)).rowcount
+
+        staging.drop(bind=db.connection())
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    result = {'inserted': inserted, 'updated': updated, 'skipped': total - inserted - updated}
+    logger.info(
+        f"成約価格情報を取り込みました: {result['inserted']}件追加、"
+        f"{result['updated']}件更新、{result['skipped']}件スキップ"
+    )
+    return result
@@ -0,0 +1,180 @@
+"""
+公開APIの同時アクセス時レイテンシのベンチマーク
+
+複数の一覧・詳細エンドポイントへ一定のレートでリクエストを送り、エンドポイント別の
+p50 / p95 / p99 レイテンシとスループットを表示する。
+
+DBアクセスを行うエンドポイントを async def で定義するとクエリ実行中は
+イベントループ全体が止まり、軽いエンドポイントまで遅い一覧クエリの完了待ちになる。
+def で定義するとFastAPIのスレッドプールで実行されるため、遅いクエリが他の
+リクエストを巻き込まない。--demo でこの違いをDBなしで再現できる。
+
+使用例:
+    # 起動中のAPIサーバーに対して計測
+    python backend/scripts/benchmark_api_concurrency.py --base-url http://localhost:8000 \\
+        --rate 100 --duration 30
+
+    # 遅いクエリ（50ms）を模したハンドラで async def と def を比較
+    python backend/scripts/benchmark_api_concurrency.py --demo --query-ms 50 --rate 40 --duration 5
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import httpx
+
+# プロジェクトルートのパスを追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+# 実サーバー計測で使うエンドポイント（重み付きで選ぶ）
+DEFAULT_ENDPOINTS = [
+    ("/api/properties?per_page=30&sort_by=updated_at", 4),
+    ("/api/properties?per_page=30&sort_by=price&sort_order=asc", 2),
+    ("/api/buildings?per_page=30", 2),
+    ("/api/properties-grouped-by-buildings?per_page=30", 2),
+    ("/api/properties/recent-updates?hours=24", 1),
+    ("/api/stats", 1),
+    ("/robots.txt", 1),
+]
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """パーセンタイル（最近傍法）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run_load(client: httpx.AsyncClient, endpoints, rate: float, duration: float,
+                   seed: int = 0) -> Dict[str, List[float]]:
+    """
+    一定間隔（rate 件/秒）でエンドポイントへリクエストを送る
+
+    応答を待たずに予定時刻どおり送り、レイテンシは予定時刻から応答までの時間で測る。
+    イベントループが止まって送信自体が遅れた分もレイテンシに含まれる。
+
+    Returns:
+        エンドポイント別のレイテンシ（ミリ秒）のリスト
+    """
+    rng = random.Random(seed)
+    paths = [path for path, _ in endpoints]
+    weights = [weight for _, weight in endpoints]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+
+    async def send(path: str, scheduled: float):
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors[path] += 1
+        except httpx.HTTPError:
+            errors[path] += 1
+        latencies[path].append((time.perf_counter() - scheduled) * 1000)
+
+    tasks = []
+    started = time.perf_counter()
+    for i in range(int(rate * duration)):
+        scheduled = started + i / rate
+        wait = scheduled - time.perf_counter()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        tasks.append(asyncio.create_task(send(rng.choices(paths, weights)[0], scheduled)))
+    await asyncio.gather(*tasks)
+
+    for path, count in errors.items():
+        print(f"  エラー {count}件: {path}")
+    return latencies
+
+
+def print_report(title: str, latencies: Dict[str, List[float]], elapsed: float) -> None:
+    """エンドポイント別のレイテンシを表示"""
+    total = sum(len(values) for values in latencies.values())
+    print(f"\n=== {title} ===  {total}件 / {elapsed:.1f}秒 ({total / elapsed:.1f} req/s)")
+    print(f"{'endpoint':<60} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    all_values = []
+    for path in sorted(latencies):
+        values = latencies[path]
+        all_values.extend(values)
+        print(f"{path:<60} {len(values):>6} {percentile(values, 50):>7.1f}ms "
+              f"{percentile(values, 95):>7.1f}ms {percentile(values, 99):>7.1f}ms")
+    print(f"{'(全体)':<58} {len(all_values):>6} {percentile(all_values, 50):>7.1f}ms "
+          f"{percentile(all_values, 95):>7.1f}ms {percentile(all_values, 99):>7.1f}ms")
+
+
+async def benchmark_server(base_url: str, rate: float, duration: float, connections: int) -> None:
+    """起動中のAPIサーバーを計測"""
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        started = time.perf_counter()
+        latencies = await run_load(client, DEFAULT_ENDPOINTS, rate, duration)
+        print_report(base_url, latencies, time.perf_counter() - started)
+
+
+def build_demo_app(query_ms: float, blocking: bool):
+    """
+    遅いクエリを模したハンドラを持つアプリを作成
+
+    blocking=True は変更前（async def 内で同期DBアクセス）、False は変更後（def）を再現する。
+    """
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    delay = query_ms / 1000
+
+    if blocking:
+        @app.get("/api/properties")
+        async def list_properties():
+            time.sleep(delay)  # 同期クエリ（イベントループを止める）
+            return {"properties": []}
+    else:
+        @app.get("/api/properties")
+        def list_properties():
+            time.sleep(delay)  # 同期クエリ（スレッドプールで実行）
+            return {"properties": []}
+
+    @app.get("/robots.txt")
+    async def robots():
+        return {"ok": True}
+
+    return app
+
+
+async def benchmark_demo(query_ms: float, rate: float, duration: float) -> None:
+    """async def（ブロッキング）と def（スレッドプール）の比較"""
+    endpoints = [("/api/properties", 1), ("/robots.txt", 1)]
+    for title, blocking in (("変更前: async def + 同期クエリ", True), ("変更後: def（スレッドプール）", False)):
+        transport = httpx.ASGITransport(app=build_demo_app(query_ms, blocking))
+        async with httpx.AsyncClient(transport=transport, base_url="http://demo") as client:
+            started = time.perf_counter()
+            latencies = await run_load(client, endpoints, rate, duration)
+            print_report(title, latencies, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="公開APIの同時アクセス時レイテンシを計測")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="計測するAPIサーバー")
+    parser.add_argument("--rate", type=float, default=50, help="1秒あたりのリクエスト数")
+    parser.add_argument("--duration", type=float, default=20, help="計測時間（秒）")
+    parser.add_argument("--connections", type=int, default=64, help="最大同時接続数")
+    parser.add_argument("--demo", action="store_true", help="DBなしで async def と def の違いを再現")
+    parser.add_argument("--query-ms", type=float, default=50, help="--demo で模す一覧クエリの時間（ミリ秒）")
+    args = parser.parse_args()
+
+    if args.demo:
+        asyncio.run(benchmark_demo(args.query_ms, args.rate, args.duration))
+    else:
+        asyncio.run(benchmark_server(args.base_url, args.rate, args.duration, args.connections))
+
+
+if __name__ == "__main__":
+    main()
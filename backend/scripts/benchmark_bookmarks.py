@@ -0,0 +1,141 @@
+"""
+ブックマーク一覧APIのベンチマーク
+
+インメモリのSQLiteに指定件数のブックマークを持つユーザーを作成し、
+GET /api/bookmarks/ の処理（グルーピングなし・エリア別・建物別）を実行して
+1リクエストあたりの処理時間と発行されたSQLの数を表示する。
+本番DBには接続しない。
+
+使用例:
+    python backend/scripts/benchmark_bookmarks.py --bookmarks 300
+    python backend/scripts/benchmark_bookmarks.py --bookmarks 1000 --listings 4 --repeat 5
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+# プロジェクトルートのパスを追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.api.bookmarks import get_bookmarks
+from backend.app.models import (
+    Building, MasterProperty, PropertyListing, PropertyPriceChange, PropertyBookmark, User
+)
+
+WARDS = ['港区', '千代田区', '中央区', '渋谷区', '新宿区', '文京区', '目黒区', '品川区']
+
+
+def create_dataset(session, bookmarks: int, listings_per_property: int, seed: int = 0) -> User:
+    """ブックマーク数 bookmarks のユーザーと関連データを作成"""
+    rng = random.Random(seed)
+    user = User(id=1, email='bench@example.com', is_active=True)
+    session.add(user)
+
+    building_count = max(1, bookmarks // 5)
+    for building_id in range(1, building_count + 1):
+        session.add(Building(
+            id=building_id,
+            normalized_name=f'ベンチマークタワー{building_id}',
+            address=f'東京都{WARDS[building_id % len(WARDS)]}芝浦{building_id}丁目',
+            total_floors=rng.randint(5, 40),
+            built_year=rng.randint(1980, 2024)
+        ))
+
+    now = datetime.now()
+    listing_id = 0
+    for property_id in range(1, bookmarks + 1):
+        sold = property_id % 7 == 0
+        price = rng.randint(3000, 20000)
+        session.add(MasterProperty(
+            id=property_id,
+            building_id=rng.randint(1, building_count),
+            floor_number=rng.randint(1, 30),
+            area=rng.uniform(30, 120),
+            layout='2LDK',
+            current_price=None if sold else price,
+            sold_at=now - timedelta(days=10) if sold else None,
+            final_price=price if sold else None
+        ))
+        for _ in range(listings_per_property):
+            listing_id += 1
+            session.add(PropertyListing(
+                id=listing_id,
+                master_property_id=property_id,
+                source_site='suumo',
+                site_property_id=str(listing_id),
+                url=f'https://example.com/{listing_id}',
+                current_price=price,
+                is_active=not sold,
+                first_published_at=now - timedelta(days=rng.randint(10, 300)),
+                last_scraped_at=now - timedelta(days=rng.randint(0, 10)),
+                last_confirmed_at=now,
+                delisted_at=now - timedelta(days=10) if sold else None
+            ))
+        for change in range(rng.randint(0, 3)):
+            session.add(PropertyPriceChange(
+                master_property_id=property_id,
+                change_date=date.today() - timedelta(days=30 * (change + 1)),
+                new_price=price,
+                old_price=price + 100,
+                price_diff=-100,
+                price_diff_rate=-100 / (price + 100) * 100
+            ))
+        session.add(PropertyBookmark(
+            user_id=user.id,
+            master_property_id=property_id,
+            created_at=now - timedelta(minutes=property_id)
+        ))
+
+    session.commit()
+    return user
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ブックマーク一覧APIのベンチマーク")
+    parser.add_argument("--bookmarks", type=int, default=300, help="ユーザーのブックマーク数")
+    parser.add_argument("--listings", type=int, default=3, help="物件あたりの掲載数")
+    parser.add_argument("--repeat", type=int, default=3, help="計測回数")
+    args = parser.parse_args()
+
+    engine = create_engine('sqlite://')
+    for model in (User, Building, MasterProperty, PropertyListing, PropertyPriceChange, PropertyBookmark):
+        model.__table__.create(engine)
+
+    query_count = 0
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_queries(conn, cursor, statement, parameters, context, executemany):
+        nonlocal query_count
+        query_count += 1
+
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        user = create_dataset(session, args.bookmarks, args.listings)
+        user_id = user.id
+
+    print(f"ブックマーク {args.bookmarks}件 / 物件あたり掲載 {args.listings}件")
+    print(f"{'group_by':<10} {'queries':>8} {'time':>10}")
+    for group_by in (None, "ward", "building"):
+        timings = []
+        for _ in range(args.repeat):
+            # 毎回新しいセッションで実行（ORMの識別マップのキャッシュを使わない）
+            with Session() as session:
+                current_user = session.get(User, user_id)
+                query_count = 0
+                started = time.perf_counter()
+                get_bookmarks(group_by=group_by, current_user=current_user, db=session)
+                timings.append(time.perf_counter() - started)
+                queries = query_count
+        print(f"{group_by or '(なし)':<10} {queries:>8} {min(timings) * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
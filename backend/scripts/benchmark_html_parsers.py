@@ -0,0 +1,133 @@
+"""
+HTML解析エンジンのベンチマーク
+
+保存済みのHTML（ページストアのオブジェクトやファイルに保存した詳細ページ）を
+各解析エンジンで解析し、1ページあたりの処理時間を比較する。
+ネットワークアクセスやDBアクセスは行わない。
+
+使用例:
+    # ページストアに保存されたSUUMOのページで比較
+    python backend/scripts/benchmark_html_parsers.py --site suumo --dir data/page_store/suumo/objects
+
+    # サイト別パーサーの詳細ページ解析まで含めて比較（結果の一致も確認）
+    python backend/scripts/benchmark_html_parsers.py --site nomu --dir fixtures/nomu --extract
+"""
+
+import argparse
+import gzip
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+# プロジェクトルートのパスを追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.scrapers.components.html_parser import (
+    HtmlParserComponent, PARSER_ENGINES, ENGINE_HTML_PARSER, is_engine_available
+)
+from backend.app.scrapers.parsers import (
+    SuumoParser, HomesParser, LivableParser, NomuParser, RehouseParser
+)
+
+
+PARSERS = {
+    'suumo': SuumoParser,
+    'homes': HomesParser,
+    'livable': LivableParser,
+    'nomu': NomuParser,
+    'rehouse': RehouseParser,
+}
+
+
+def load_pages(directory: Path, limit: int) -> List[Tuple[str, str]]:
+    """ディレクトリ以下の *.html / *.html.gz を読み込む"""
+    pages = []
+    paths = sorted(list(directory.rglob('*.html')) + list(directory.rglob('*.html.gz')))
+    for path in paths[:limit] if limit else paths:
+        if path.suffix == '.gz':
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                pages.append((path.name, f.read()))
+        else:
+            pages.append((path.name, path.read_text(encoding='utf-8', errors='replace')))
+    return pages
+
+
+def benchmark(site: str, pages: List[Tuple[str, str]], repeat: int, extract: bool) -> None:
+    """エンジンごとに解析時間を計測して表示"""
+    parser_class = PARSERS[site]
+    logger = logging.getLogger('benchmark')
+    logger.setLevel(logging.CRITICAL)
+
+    engines = [e for e in PARSER_ENGINES if e in parser_class.SUPPORTED_PARSER_ENGINES]
+    if ENGINE_HTML_PARSER not in engines:
+        engines.append(ENGINE_HTML_PARSER)
+
+    total_bytes = sum(len(html) for _, html in pages)
+    print(f"サイト: {site}  ページ数: {len(pages)}  合計サイズ: {total_bytes / 1024:.0f} KB  繰り返し: {repeat}")
+    print(f"対応エンジン: {', '.join(parser_class.SUPPORTED_PARSER_ENGINES)}")
+    print()
+
+    results = {}
+    baseline_outputs = None
+    for engine in reversed(engines):
+        if not is_engine_available(engine):
+            print(f"{engine:<12} (未インストールのためスキップ)")
+            continue
+
+        site_parser = parser_class(logger=logger)
+        site_parser.html_parser = HtmlParserComponent(
+            logger=logger,
+            engine=engine,
+            supported_engines=(engine,),
+            prune_tags=parser_class.PRUNE_TAGS
+        )
+
+        outputs = []
+        start = time.perf_counter()
+        for _ in range(repeat):
+            outputs = []
+            for _, html in pages:
+                soup = site_parser.html_parser.parse_html(html)
+                if extract:
+                    outputs.append(site_parser.parse_property_detail(soup))
+        elapsed = time.perf_counter() - start
+
+        per_page_ms = elapsed / (len(pages) * repeat) * 1000
+        results[engine] = per_page_ms
+
+        mismatch = ''
+        if extract:
+            if baseline_outputs is None:
+                baseline_outputs = outputs
+            else:
+                diff = sum(1 for a, b in zip(baseline_outputs, outputs) if a != b)
+                mismatch = f"  抽出結果の不一致: {diff}/{len(pages)}件"
+
+        speedup = ''
+        if ENGINE_HTML_PARSER in results and engine != ENGINE_HTML_PARSER:
+            speedup = f"  ({results[ENGINE_HTML_PARSER] / per_page_ms:.1f}倍)"
+        print(f"{engine:<12} {per_page_ms:8.2f} ms/ページ{speedup}{mismatch}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML解析エンジンのベンチマーク')
+    parser.add_argument('--site', required=True, choices=sorted(PARSERS.keys()), help='対象サイト')
+    parser.add_argument('--dir', required=True, help='HTMLファイル（*.html, *.html.gz）のディレクトリ')
+    parser.add_argument('--limit', type=int, default=0, help='使用するページ数の上限（0は全件）')
+    parser.add_argument('--repeat', type=int, default=3, help='繰り返し回数（デフォルト: 3）')
+    parser.add_argument('--extract', action='store_true', help='詳細ページのデータ抽出まで含めて計測する')
+    args = parser.parse_args()
+
+    pages = load_pages(Path(args.dir), args.limit)
+    if not pages:
+        print(f"HTMLファイルが見つかりません: {args.dir}")
+        sys.exit(1)
+
+    benchmark(args.site, pages, args.repeat, args.extract)
+
+
+if __name__ == "__main__":
+    main()
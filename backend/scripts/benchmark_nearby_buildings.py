@@ -0,0 +1,165 @@
+"""
+周辺建物検索のベンチマーク
+
+インメモリのSQLiteに指定件数の建物（東京都心付近のランダムな座標）と物件を作成し、
+従来の方式（全建物の販売中物件の集計 + 緯度経度の範囲での絞り込み + 全候補の距離計算）と、
+空間インデックスを使う GET /api/buildings/{id}/nearby の処理時間を比較する。
+両方の結果が一致することも確認する。本番DBには接続しない。
+
+使用例:
+    python backend/scripts/benchmark_nearby_buildings.py --buildings 20000
+    python backend/scripts/benchmark_nearby_buildings.py --buildings 50000 --radius 2000 --samples 50
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import create_engine, distinct, func
+from sqlalchemy.orm import sessionmaker
+
+# プロジェクトルートのパスを追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.api.buildings import NearbyBatchRequest, get_nearby_buildings, get_nearby_buildings_batch
+from backend.app.models import Building, MasterProperty, PropertyListing
+from backend.app.utils.building_spatial_index import BuildingSpatialIndex, haversine_distance
+
+
+def create_dataset(session, buildings: int, active_ratio: float, seed: int = 0) -> None:
+    """建物 buildings 件と、建物ごとに1〜3件の物件・掲載を作成"""
+    rng = random.Random(seed)
+    property_id = 0
+    for building_id in range(1, buildings + 1):
+        session.add(Building(
+            id=building_id,
+            normalized_name=f'ベンチマークタワー{building_id}',
+            built_year=rng.randint(1980, 2024),
+            latitude=35.60 + rng.random() * 0.15,
+            longitude=139.65 + rng.random() * 0.18
+        ))
+        is_active = rng.random() < active_ratio
+        for _ in range(rng.randint(1, 3)):
+            property_id += 1
+            session.add(MasterProperty(id=property_id, building_id=building_id, area=rng.uniform(30, 120)))
+            session.add(PropertyListing(
+                id=property_id, master_property_id=property_id, source_site='suumo',
+                site_property_id=str(property_id), url=f'https://example.com/{property_id}',
+                is_active=is_active, current_price=rng.randint(3000, 20000), created_at=datetime.now()
+            ))
+    session.commit()
+
+
+def legacy_nearby_ids(session, building: Building, radius_meters: int, limit: int):
+    """従来の方式の周辺建物ID（全建物の集計 + 範囲の絞り込み + Pythonでの距離計算）"""
+    lat_range = radius_meters / 111000
+    lon_range = radius_meters / (111000 * math.cos(math.radians(building.latitude)))
+    active_building_subquery = session.query(
+        MasterProperty.building_id,
+        func.count(distinct(MasterProperty.id)).label('property_count'),
+        func.avg(PropertyListing.current_price).label('avg_price')
+    ).join(
+        PropertyListing, MasterProperty.id == PropertyListing.master_property_id
+    ).filter(
+        PropertyListing.is_active == True
+    ).group_by(MasterProperty.building_id).subquery()
+
+    candidates = session.query(Building).join(
+        active_building_subquery, Building.id == active_building_subquery.c.building_id
+    ).filter(
+        Building.id != building.id,
+        Building.latitude.between(building.latitude - lat_range, building.latitude + lat_range),
+        Building.longitude.between(building.longitude - lon_range, building.longitude + lon_range)
+    ).all()
+
+    nearby = []
+    for b in candidates:
+        distance = haversine_distance(building.latitude, building.longitude, b.latitude, b.longitude)
+        if distance <= radius_meters:
+            nearby.append((distance, b.id))
+    nearby.sort()
+    return [building_id for _, building_id in nearby[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="周辺建物検索のベンチマーク")
+    parser.add_argument("--buildings", type=int, default=20000, help="建物数")
+    parser.add_argument("--active-ratio", type=float, default=0.3, help="販売中の物件がある建物の割合")
+    parser.add_argument("--radius", type=int, default=500, help="検索半径（メートル）")
+    parser.add_argument("--limit", type=int, default=10, help="最大件数")
+    parser.add_argument("--samples", type=int, default=20, help="検索元の建物数")
+    args = parser.parse_args()
+
+    engine = create_engine('sqlite://')
+    for model in (Building, MasterProperty, PropertyListing):
+        model.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+
+    with Session() as session:
+        create_dataset(session, args.buildings, args.active_ratio)
+        sample_ids = random.Random(1).sample(range(1, args.buildings + 1), min(args.samples, args.buildings))
+
+        # インデックスの全件読み込み
+        started = time.perf_counter()
+        index = BuildingSpatialIndex()
+        index.ensure_fresh(session)
+        print(f"建物 {args.buildings}件 / 半径 {args.radius}m / 上限 {args.limit}件")
+        print(f"インデックス読み込み: {(time.perf_counter() - started) * 1000:.1f}ms（{len(index)}件）")
+
+        # 半径検索だけの比較（全件の距離計算 vs グリッド）
+        points = {building_id: (lat, lon) for building_id, lat, lon in
+                  session.query(Building.id, Building.latitude, Building.longitude)}
+        started = time.perf_counter()
+        for building_id in sample_ids:
+            lat, lon = points[building_id]
+            [other for other, (lat2, lon2) in points.items()
+             if haversine_distance(lat, lon, lat2, lon2) <= args.radius]
+        brute_time = (time.perf_counter() - started) / len(sample_ids)
+        started = time.perf_counter()
+        for building_id in sample_ids:
+            index.within_radius(*points[building_id], args.radius)
+        index_time = (time.perf_counter() - started) / len(sample_ids)
+        print(f"半径検索（全件の距離計算）: {brute_time * 1000:8.2f}ms/件")
+        print(f"半径検索（空間インデックス）: {index_time * 1000:8.2f}ms/件")
+
+    # APIの処理の比較（毎回新しいセッション）
+    legacy_total = 0.0
+    api_total = 0.0
+    mismatches = 0
+    get_nearby_buildings(building_id=sample_ids[0], radius_meters=args.radius, limit=args.limit,
+                         db=Session())  # 共有インデックスの読み込み
+    for building_id in sample_ids:
+        with Session() as session:
+            building = session.get(Building, building_id)
+            started = time.perf_counter()
+            expected = legacy_nearby_ids(session, building, args.radius, args.limit)
+            legacy_total += time.perf_counter() - started
+        with Session() as session:
+            started = time.perf_counter()
+            result = get_nearby_buildings(building_id=building_id, radius_meters=args.radius,
+                                          limit=args.limit, db=session)
+            api_total += time.perf_counter() - started
+        if [item['id'] for item in result] != expected:
+            mismatches += 1
+
+    print(f"従来の方式:     {legacy_total / len(sample_ids) * 1000:8.2f}ms/件")
+    print(f"空間インデックス: {api_total / len(sample_ids) * 1000:8.2f}ms/件")
+
+    with Session() as session:
+        started = time.perf_counter()
+        get_nearby_buildings_batch(
+            request=NearbyBatchRequest(building_ids=sample_ids[:50], radius_meters=args.radius, limit=args.limit),
+            db=session
+        )
+        batch_time = time.perf_counter() - started
+    print(f"まとめて取得（{min(len(sample_ids), 50)}件）: {batch_time * 1000:8.2f}ms")
+    print(f"結果の不一致: {mismatches}件")
+
+
+if __name__ == "__main__":
+    main()
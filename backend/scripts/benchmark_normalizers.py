@@ -0,0 +1,131 @@
+"""
+建物名・住所の正規化のベンチマーク
+
+掲載情報の建物名・住所（DBの property_listings、またはファイル）を使い、
+メモ化なしの正規化、メモ化した正規化、normalize_many によるまとめての正規化の
+1件あたりの処理時間を比較する。メモ化の有無で結果が一致することも確認する。
+
+使用例:
+    # DBの掲載情報から最大20000件を使用
+    python backend/scripts/benchmark_normalizers.py --limit 20000
+
+    # 1行に1つの建物名を書いたファイルを使用（住所のベンチマークは行わない）
+    python backend/scripts/benchmark_normalizers.py --names-file listing_names.txt
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+# プロジェクトルートのパスを追加
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.utils.building_name_normalizer import (
+    canonicalize_building_name, normalize_building_name, remove_ad_text_from_building_name
+)
+from backend.app.utils.address_normalizer import (
+    normalize_address, normalize_address_for_comparison
+)
+from backend.app.utils.normalization_cache import (
+    clear_normalization_caches, normalize_many, normalization_cache_info
+)
+
+
+def load_corpus_from_db(limit: int) -> Tuple[List[str], List[str]]:
+    """掲載情報の建物名・住所を取得（スクレイピング時と同じく重複を含む）"""
+    from backend.app.database import SessionLocal
+    from backend.app.models import PropertyListing
+
+    session = SessionLocal()
+    try:
+        rows = session.query(
+            PropertyListing.listing_building_name, PropertyListing.listing_address
+        ).order_by(PropertyListing.id.desc()).limit(limit).all()
+    finally:
+        session.close()
+
+    names = [name for name, _ in rows if name]
+    addresses = [address for _, address in rows if address]
+    return names, addresses
+
+
+def load_corpus_from_file(path: Path) -> List[str]:
+    """1行に1つの文字列を書いたファイルを読み込む"""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def time_per_item(func: Callable[[], List[str]], count: int, repeat: int) -> Tuple[float, List[str]]:
+    """func を repeat 回実行し、1件あたりの処理時間（マイクロ秒）と最後の結果を返す"""
+    result = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    elapsed = time.perf_counter() - start
+    return elapsed / (count * repeat) * 1_000_000, result
+
+
+def benchmark(label: str, normalizer: Callable[[str], str], values: List[str], repeat: int) -> None:
+    """1つの正規化関数についてメモ化なし・メモ化あり・normalize_many を比較"""
+    uncached = normalizer.__wrapped__
+
+    clear_normalization_caches()
+    uncached_us, expected = time_per_item(lambda: [uncached(v) for v in values], len(values), repeat)
+
+    # 初回（キャッシュが空の状態）とキャッシュが温まった状態を分けて計測
+    clear_normalization_caches()
+    cold_us, _ = time_per_item(lambda: [normalizer(v) for v in values], len(values), 1)
+    warm_us, cached = time_per_item(lambda: [normalizer(v) for v in values], len(values), repeat)
+
+    clear_normalization_caches()
+    many_us, batched = time_per_item(lambda: normalize_many(values, normalizer), len(values), 1)
+
+    mismatch = sum(1 for a, b in zip(expected, cached) if a != b)
+    mismatch += sum(1 for a, b in zip(expected, batched) if a != b)
+
+    print(f"{label}")
+    print(f"  メモ化なし            {uncached_us:8.1f} µs/件")
+    print(f"  メモ化（初回）        {cold_us:8.1f} µs/件  ({uncached_us / cold_us:.1f}倍)")
+    print(f"  メモ化（2回目以降）   {warm_us:8.1f} µs/件  ({uncached_us / warm_us:.1f}倍)")
+    print(f"  normalize_many        {many_us:8.1f} µs/件  ({uncached_us / many_us:.1f}倍)")
+    if mismatch:
+        print(f"  結果の不一致: {mismatch}件")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='建物名・住所の正規化のベンチマーク')
+    parser.add_argument('--limit', type=int, default=20000, help='DBから取得する掲載数（デフォルト: 20000）')
+    parser.add_argument('--names-file', help='建物名のファイル（指定した場合はDBに接続しない）')
+    parser.add_argument('--repeat', type=int, default=3, help='繰り返し回数（デフォルト: 3）')
+    args = parser.parse_args()
+
+    if args.names_file:
+        names, addresses = load_corpus_from_file(Path(args.names_file)), []
+    else:
+        names, addresses = load_corpus_from_db(args.limit)
+
+    if not names:
+        print("建物名が見つかりません")
+        sys.exit(1)
+
+    print(f"建物名: {len(names)}件（重複除去後 {len(set(names))}件）  "
+          f"住所: {len(addresses)}件（重複除去後 {len(set(addresses))}件）  繰り返し: {args.repeat}")
+    print()
+
+    benchmark('remove_ad_text_from_building_name', remove_ad_text_from_building_name, names, args.repeat)
+    benchmark('normalize_building_name', normalize_building_name, names, args.repeat)
+    benchmark('canonicalize_building_name', canonicalize_building_name, names, args.repeat)
+    if addresses:
+        benchmark('normalize_address', normalize_address, addresses, args.repeat)
+        benchmark('normalize_address_for_comparison', normalize_address_for_comparison, addresses, args.repeat)
+
+    print()
+    for name, stats in normalization_cache_info().items():
+        print(f"{name}: {stats['size']}/{stats['max_size']}件")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ from typing import List, Dict, Optional
 from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker
 from app.models import TransactionPrice, TransactionDataFetchCompletion
+from app.utils.transaction_bulk_import import bulk_import_transactions
 from dotenv import load_dotenv
 
 # 環境変数を読み込み
@@ -250,44 +251,22 @@ class TransactionPriceAPIFetcher:
             print(f"データ: {json.dumps(raw_data, ensure_ascii=False, indent=2)}")
             return None
 
-    def save_to_database(self, transactions: List[TransactionPrice]):
+    def save_to_database(self, transactions: List[TransactionPrice]) -> Dict[str, int]:
         """
         取引価格情報をデータベースに保存（重複チェック付き）
 
+        ステージングテーブル経由でまとめて取り込む。既存の取引IDは、
+        価格が変わっている場合のみ価格と平米単価を更新する。
+
         Args:
             transactions: TransactionPriceオブジェクトのリスト
-        """
-        saved_count = 0
-        updated_count = 0
-        skipped_count = 0
-
-        for transaction in transactions:
-            try:
-                # 既存レコードチェック
-                existing = self.db.query(TransactionPrice).filter(
-                    TransactionPrice.transaction_id == transaction.transaction_id
-                ).first()
-
-                if existing:
-                    # 価格が変わっている場合は更新
-                    if existing.transaction_price != transaction.transaction_price:
-                        existing.transaction_price = transaction.transaction_price
-                        existing.price_per_sqm = transaction.price_per_sqm
-                        existing.updated_at = datetime.now()
-                        updated_count += 1
-                    else:
-                        skipped_count += 1
-                else:
-                    self.db.add(transaction)
-                    saved_count += 1
 
-            except Exception as e:
-                print(f"保存エラー: {e}")
-                self.db.rollback()
-                continue
-
-        self.db.commit()
-        print(f"保存完了: {saved_count}件追加、{updated_count}件更新、{skipped_count}件スキップ")
+        Returns:
+            {'inserted': 追加件数, 'updated': 更新件数, 'skipped': スキップ件数}
+        """
+        result = bulk_import_transactions(self.db, transactions, update_prices=True)
+        print(f"保存完了: {result['inserted']}件追加、{result['updated']}件更新、{result['skipped']}件スキップ")
+        return result
 
     def record_fetch_completion(self, city_code: str, city_name: str, year: int, quarter: int, record_count: int):
         """
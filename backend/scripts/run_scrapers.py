@@ -33,6 +33,7 @@ logger = logging.getLogger(__name__)
 
 def run_all_scrapers(area: str = "minato", max_properties: int = 100, force_detail_fetch: bool = False):
     """全てのスクレイパーを実行（タスクを作成してから実行）"""
+    started_at = datetime.now()
     # エリアコードに変換
     from backend.app.scrapers.area_config import get_area_code
     area_code = get_area_code(area)
@@ -126,6 +127,10 @@ def run_all_scrapers(area: str = "minato", max_properties: int = 100, force_deta
     if final_status == 'completed':
         logger.info("スクレイピング完了。価格改定履歴キューの処理を開始します...")
         process_price_change_queue()
+        refresh_duplicate_candidates()
+        refresh_ssr_page_cache(started_at)
+        refresh_sitemap()
+        refresh_stats_snapshot()
         
         # サーバーサイドキャッシュをクリア
         from backend.app.utils.cache import clear_recent_updates_cache
@@ -137,6 +142,7 @@ def run_all_scrapers(area: str = "minato", max_properties: int = 100, force_deta
 
 def run_single_scraper(scraper_name: str, area: str = "minato", max_properties: int = 100, force_detail_fetch: bool = False):
     """単一のスクレイパーを実行（タスクを作成してから実行）"""
+    started_at = datetime.now()
     # エリアコードに変換
     from backend.app.scrapers.area_config import get_area_code
     area_code = get_area_code(area)
@@ -201,6 +207,10 @@ def run_single_scraper(scraper_name: str, area: str = "minato", max_properties:
         # スクレイピング完了後に価格改定履歴キューを自動処理
         logger.info("スクレイピング完了。価格改定履歴キューの処理を開始します...")
         process_price_change_queue()
+        refresh_duplicate_candidates()
+        refresh_ssr_page_cache(started_at)
+        refresh_sitemap()
+        refresh_stats_snapshot()
 
         # サーバーサイドキャッシュをクリア
         from backend.app.utils.cache import clear_recent_updates_cache
@@ -444,38 +454,173 @@ def process_price_change_queue(limit: int = 1000):
         limit: 一度に処理する最大件数（デフォルト: 1000）
     """
     try:
-        from backend.app.database import SessionLocal
-        from backend.app.utils.price_change_calculator import PriceChangeCalculator
+        from backend.app.utils.price_change_calculator import process_queue_in_parallel
         
-        session = SessionLocal()
-        try:
-            calculator = PriceChangeCalculator(session)
-            
-            # キューに入っている物件を処理
-            logger.info(f"価格改定履歴キューの処理を開始（最大{limit}件）...")
-            stats = calculator.process_queue(limit)
-            
-            logger.info(
-                f"価格改定履歴キューの処理完了: "
-                f"処理={stats['processed']}件, "
-                f"失敗={stats['failed']}件, "
-                f"変更={stats['changes_found']}件"
-            )
-            
-            # サーバーサイドキャッシュをクリア
-            from backend.app.utils.cache import clear_recent_updates_cache
-            clear_recent_updates_cache()
-            logger.info("価格改定履歴キュー処理完了後: サーバーサイドキャッシュをクリアしました")
-            
-            return stats
-            
-        finally:
-            session.close()
+        # キューに入っている物件を処理（SKIP LOCKEDで取り出すため複数ワーカーで並列に処理できる）
+        workers = int(os.getenv('PRICE_CHANGE_QUEUE_WORKERS', '2'))
+        logger.info(f"価格改定履歴キューの処理を開始（最大{limit}件、ワーカー{workers}）...")
+        stats = process_queue_in_parallel(workers=workers, limit=limit)
+        
+        logger.info(
+            f"価格改定履歴キューの処理完了: "
+            f"処理={stats['processed']}件, "
+            f"失敗={stats['failed']}件, "
+            f"変更={stats['changes_found']}件"
+        )
+        
+        # サーバーサイドキャッシュをクリア
+        from backend.app.utils.cache import clear_recent_updates_cache
+        clear_recent_updates_cache()
+        logger.info("価格改定履歴キュー処理完了後: サーバーサイドキャッシュをクリアしました")
+        
+        return stats
     except Exception as e:
         logger.error(f"価格改定履歴キューの処理に失敗: {e}", exc_info=True)
         return {'processed': 0, 'failed': 0, 'changes_found': 0}
 
 
+def refresh_duplicate_candidates():
+    """スクレイピングで追加・更新された建物を含めて、管理画面の重複候補を計算し直す"""
+    from backend.app.database import SessionLocal
+    from backend.app.utils.building_duplicate_candidates import rebuild_building_duplicate_candidates
+    from backend.app.utils.property_duplicate_candidates import update_property_duplicate_candidates
+
+    session = SessionLocal()
+    try:
+        saved = rebuild_building_duplicate_candidates(session)
+        session.commit()
+        logger.info(f"建物重複候補を更新しました: {saved}ペア")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"建物重複候補の更新に失敗: {e}", exc_info=True)
+
+    # 物件重複候補は物件・掲載が変わった建物だけ更新する
+    try:
+        result = update_property_duplicate_candidates(session)
+        logger.info(
+            f"物件重複候補を更新しました: 建物{result['building_count']}件, 候補{result['candidate_count']}件"
+        )
+    except Exception as e:
+        session.rollback()
+        logger.error(f"物件重複候補の更新に失敗: {e}", exc_info=True)
+    finally:
+        session.close()
+
+
+def refresh_ssr_page_cache(since: datetime):
+    """
+    スクレイピングで物件・掲載が変わった建物のSSRページキャッシュを削除
+
+    APIサーバーのキャッシュに反映されるのは共有キャッシュ（CACHE_REDIS_URL）を使う場合のみ。
+    使わない場合は SSR_PAGE_CACHE_TTL_SECONDS の経過で更新される。
+    """
+    from backend.app.database import SessionLocal
+    from backend.app.utils.ssr_shell import invalidate_changed_ssr_pages
+
+    session = SessionLocal()
+    try:
+        count = invalidate_changed_ssr_pages(session, since)
+        logger.info(f"SSRのページキャッシュを削除しました: 建物{count}件")
+    except Exception as e:
+        logger.error(f"SSRのページキャッシュの削除に失敗: {e}", exc_info=True)
+    finally:
+        session.close()
+
+
+def refresh_sitemap():
+    """販売中の建物・物件のURLと掲載の更新日時を反映してサイトマップを作り直す"""
+    from backend.app.database import SessionLocal
+    from backend.app.utils.sitemap_builder import rebuild_sitemap_shards
+
+    session = SessionLocal()
+    try:
+        result = rebuild_sitemap_shards(session)
+        logger.info(f"サイトマップを更新しました: {result['shard_count']}ファイル, {result['url_count']}件")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"サイトマップの更新に失敗: {e}", exc_info=True)
+    finally:
+        session.close()
+
+
+def refresh_stats_snapshot():
+    """トップページ・管理画面の統計情報のスナップショットを更新"""
+    from backend.app.database import SessionLocal
+    from backend.app.utils.stats_snapshot import refresh_stats_snapshot as refresh
+
+    session = SessionLocal()
+    try:
+        snapshot = refresh(session)
+        logger.info(f"統計情報のスナップショットを更新しました（{snapshot.duration_ms}ms）")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"統計情報のスナップショットの更新に失敗: {e}", exc_info=True)
+    finally:
+        session.close()
+
+
+def check_sites(area: str = "minato") -> Dict[str, Any]:
+    """全サイトの検索ページを同時に取得して疎通を確認する
+    
+    非同期HTTPクライアントで各サイトへのリクエストを並行して送信するため、
+    サイトごとにスレッドを用意する必要がない。同一サイトへの間隔はスクレイパーと同じ遅延を使う。
+    """
+    import asyncio
+    import importlib.util
+    from urllib.parse import urlparse
+    from backend.app.scrapers.components.async_http_client import AsyncHttpClientComponent
+    from backend.app.scrapers.components.rate_limiter import RateLimiterComponent
+    
+    scraper_classes = {
+        'suumo': SuumoScraper,
+        'rehouse': RehouseScraper,
+        'homes': HomesScraper,
+        'nomu': NomuScraper,
+        'livable': LivableScraper,
+    }
+    # スクレイパーの実行に必要な追加パッケージ（未インストールのサイトは確認しない）
+    required_modules = {
+        'homes': ['playwright'],
+    }
+    
+    urls = {}
+    results = {}
+    for name, scraper_class in scraper_classes.items():
+        missing = [
+            module for module in required_modules.get(name, [])
+            if importlib.util.find_spec(module) is None
+        ]
+        if missing:
+            logger.warning(f"{name}: 必要なパッケージがないためスキップ（{', '.join(missing)}）")
+            results[name] = {'ok': None, 'skipped': True, 'missing_modules': missing}
+            continue
+        try:
+            urls[name] = scraper_class().get_search_url(area, 1)
+        except Exception as e:
+            logger.error(f"{name}: 検索URLの生成に失敗: {e}")
+    
+    delays = RateLimiterComponent.DEFAULT_DELAYS
+    min_interval_by_host = {
+        urlparse(url).netloc: delays.get(name, delays['default'])
+        for name, url in urls.items()
+    }
+    
+    async def fetch_all():
+        async with AsyncHttpClientComponent(logger=logger, retry_count=1,
+                                            min_interval_by_host=min_interval_by_host) as client:
+            return await client.fetch_many(list(urls.values()))
+    
+    fetched = asyncio.run(fetch_all()) if urls else []
+    for (name, url), (content, error_info) in zip(urls.items(), fetched):
+        if error_info:
+            logger.warning(f"{name}: 取得失敗 {url} - {error_info.get('type')}: {error_info.get('message')}")
+            results[name] = {'url': url, 'ok': False, 'error': error_info}
+        else:
+            logger.info(f"{name}: 取得成功 {url} ({len(content)} bytes)")
+            results[name] = {'url': url, 'ok': True, 'size': len(content)}
+    
+    return results
+
 
 def main():
     """メイン関数"""
@@ -489,9 +634,14 @@ def main():
     parser.add_argument('--schedule', action='store_true', help='スケジュール実行モード（非推奨）')
     parser.add_argument('--interval', type=int, default=6, help='スケジュール実行間隔（時間）（デフォルト: 6）')
     parser.add_argument('--force-detail-fetch', action='store_true', help='強制的にすべての物件の詳細を取得')
+    parser.add_argument('--check-sites', action='store_true', help='全サイトの検索ページを同時に取得して疎通を確認')
     
     args = parser.parse_args()
     
+    if args.check_sites:
+        check_sites(args.area)
+        return
+    
     if args.schedule:
         # スケジュール実行モードは非推奨
         logger.error("スケジュール実行モードは非推奨です。管理画面からスクレイピングを実行してください。")
@@ -137,6 +137,14 @@ def main():
             ('url_404_retries', 'Url404Retry'),
             ('scraper_alerts', 'ScraperAlert'),
             ('price_mismatch_history', 'PriceMismatchHistory'),
+            ('property_search_summary', 'PropertySearchSummary'),
+            ('property_vote_tallies', 'PropertyVoteTally'),
+            ('building_vote_tallies', 'BuildingVoteTally'),
+            ('building_duplicate_candidates', 'BuildingDuplicateCandidate'),
+            ('property_duplicate_candidates', 'PropertyDuplicateCandidate'),
+            ('property_duplicate_candidate_runs', 'PropertyDuplicateCandidateRun'),
+            ('sitemap_shards', 'SitemapShard'),
+            ('stats_snapshots', 'StatsSnapshot'),
         ]
         
         # 各テーブルを同期
@@ -14,6 +14,8 @@ sys.path.insert(0, str(project_root))
 
 from backend.app.database import SessionLocal
 from backend.app.models import PropertyListing, MasterProperty
+from backend.app.utils.majority_vote_tally import refresh_vote_tallies
+from backend.app.utils.property_search_summary import refresh_property_search_summary
 from sqlalchemy import func
 
 
@@ -34,7 +36,9 @@ def update_listing_status():
         
         print(f"24時間以上確認されていないアクティブな掲載: {len(inactive_listings)}件")
         
+        changed_property_ids = set()
         for listing in inactive_listings:
+            changed_property_ids.add(listing.master_property_id)
             listing.is_active = False
             listing.delisted_at = listing.last_confirmed_at  # 最終確認日を掲載終了日とする
             print(f"  - {listing.title} (最終確認: {listing.last_confirmed_at})")
@@ -55,6 +59,7 @@ def update_listing_status():
             print(f"  - 物件ID: {property.id}, 販売終了日をクリア（販売再開）")
             property.sold_at = None
             property.current_price = None  # スクレイパーが次回更新
+            changed_property_ids.add(property.id)
         
         # 3. 各物件について、全掲載が非アクティブになったものに販売終了日を設定
         # アクティブな掲載がない物件を取得
@@ -73,6 +78,7 @@ def update_listing_status():
             
             if latest_delisted:
                 property.sold_at = latest_delisted
+                changed_property_ids.add(property.id)
                 
                 # 最終販売価格を記録（最後にアクティブだった掲載の価格）
                 last_listing = db.query(PropertyListing).filter(
@@ -84,6 +90,12 @@ def update_listing_status():
                     property.last_sale_price = last_listing.current_price
                     print(f"  - 物件ID: {property.id}, 販売終了日: {property.sold_at}, 最終価格: {property.last_sale_price}万円")
         
+        # 物件一覧用の集計テーブルを更新
+        refresh_property_search_summary(db, changed_property_ids)
+
+        # 多数決用の票集計を更新（掲載中の票数が変わったため）
+        refresh_vote_tallies(db, property_ids=changed_property_ids)
+        
         # 変更をコミット
         db.commit()
         print("\nステータス更新が完了しました")
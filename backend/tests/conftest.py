@@ -0,0 +1,106 @@
+"""テスト共通設定"""
+import os
+import re
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'postgres: PostgreSQLが必要なテスト（環境変数 TEST_DATABASE_URL で接続先を指定。未設定時はスキップ）'
+    )
+
+
+def _regexp_replace(value, pattern, replacement, flags=''):
+    """PostgreSQLの regexp_replace（'g' は全置換）"""
+    if value is None:
+        return None
+    return re.sub(pattern, replacement, value, count=0 if 'g' in flags else 1)
+
+
+def _register_sqlite_functions(dbapi_connection, connection_record):
+    """SQLiteの接続にPostgreSQLの関数を登録する"""
+    dbapi_connection.create_function('regexp_replace', 3, _regexp_replace, deterministic=True)
+    dbapi_connection.create_function('regexp_replace', 4, _regexp_replace, deterministic=True)
+
+
+@pytest.fixture
+def sqlite_engine():
+    """
+    PostgreSQLの関数を登録したSQLiteのインメモリエンジン
+
+    生成列（PropertyDuplicateCandidate.base_layout）が regexp_replace を使うため、
+    SQLiteのテストはこのエンジン（または sqlite_tables / sqlite_session）を使う。
+    """
+    engine = create_engine('sqlite://')
+    event.listen(engine, 'connect', _register_sqlite_functions)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_tables(sqlite_engine):
+    """
+    指定したモデルのテーブルを sqlite_engine に作成し、エンジンを返す関数
+
+    例: engine = sqlite_tables(Building, MasterProperty)
+    """
+    def create(*models):
+        for model in models:
+            model.__table__.create(sqlite_engine)
+        return sqlite_engine
+    return create
+
+
+@pytest.fixture
+def sqlite_session(sqlite_tables):
+    """
+    指定したモデルのテーブルを作成したSQLiteのセッションを返す関数（テスト終了時に閉じる）
+
+    例: session = sqlite_session(Building, MasterProperty)
+    """
+    sessions = []
+
+    def create(*models):
+        session = sessionmaker(bind=sqlite_tables(*models))()
+        sessions.append(session)
+        return session
+
+    yield create
+    for session in sessions:
+        session.close()
+
+
+@pytest.fixture
+def pg_engine():
+    """
+    PostgreSQLのテスト用エンジン（テストごとに専用のスキーマを作成し、終了時に削除する）
+
+    TEST_DATABASE_URL が設定されていない場合はスキップする。
+    """
+    url = os.getenv('TEST_DATABASE_URL')
+    if not url:
+        pytest.skip('TEST_DATABASE_URL が設定されていません')
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin_engine = create_engine(url)
+    with admin_engine.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_engine(url, connect_args={
+        'options': f'-csearch_path={schema}', 'application_name': schema
+    })
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        with admin_engine.begin() as conn:
+            # テストが失敗して閉じられなかった接続があるとスキーマを削除できないため切断する
+            conn.execute(
+                text("SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE application_name = :name"),
+                {'name': schema}
+            )
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin_engine.dispose()
@@ -0,0 +1,173 @@
+"""
+価格改定履歴の計算の変更前の実装（テストで新しい実装と結果を比較するためのもの）
+
+backend/app/utils/price_change_calculator.py の calculate_price_changes を複数物件の
+一括計算（_PRICE_CHANGES_CTE）に置き換える前の実装をそのまま残している。
+"""
+
+from datetime import date
+from typing import List, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def reference_calculate_price_changes(db: Session, master_property_id: int,
+                                     start_date: Optional[date] = None) -> List[Dict]:
+    """
+    物件の価格改定履歴を計算（物件ごとに1件ずつ計算する変更前の実装）
+    
+    主な改善点：
+    1. 連続した日付範囲を生成して、記録がない日も含める
+    2. すべての掲載を対象とする（非掲載も含む）
+    3. 最新の状態（今日）も含めて価格変更を検出
+    
+    Args:
+        master_property_id: 物件ID
+        start_date: 計算開始日（Noneの場合は最初の掲載日から）
+        
+    Returns:
+        価格改定履歴のリスト
+    """
+    # まず対象物件の掲載期間を取得
+    period_query = text("""
+        SELECT 
+            MIN(DATE(COALESCE(
+                (SELECT MIN(recorded_at) FROM listing_price_history
+                 WHERE property_listing_id = pl.id),
+                pl.first_seen_at,
+                pl.created_at
+            ))) as start_date,
+            CURRENT_DATE as end_date
+        FROM property_listings pl
+        WHERE pl.master_property_id = :master_property_id
+    """)
+    
+    period = db.execute(period_query, {'master_property_id': master_property_id}).fetchone()
+    
+    if not period or not period[0]:
+        return []
+    
+    calc_start_date = start_date or period[0]
+    calc_end_date = period[1]
+    
+    # 改善されたSQL クエリ
+    query = text("""
+        WITH date_range AS (
+            -- 連続した日付範囲を生成（記録がない日も含める）
+            SELECT generate_series(
+                CAST(:start_date AS date),
+                CAST(:end_date AS date),
+                '1 day'::interval
+            )::date as price_date
+        ),
+        all_listings AS (
+            -- すべての掲載を対象とする（非掲載も含む）
+            SELECT * FROM property_listings
+            WHERE master_property_id = :master_property_id
+        ),
+        listing_prices_expanded AS (
+            -- 各掲載の価格を日付ごとに展開（掲載の有効期間のみ）
+            SELECT DISTINCT
+                al.master_property_id,
+                al.id as listing_id,
+                dr.price_date,
+                COALESCE(
+                    -- その日の価格履歴
+                    (SELECT price FROM listing_price_history
+                     WHERE property_listing_id = al.id
+                       AND DATE(recorded_at) = dr.price_date
+                     ORDER BY recorded_at DESC
+                     LIMIT 1),
+                    -- なければ直前の価格
+                    (SELECT price FROM listing_price_history
+                     WHERE property_listing_id = al.id
+                       AND DATE(recorded_at) < dr.price_date
+                     ORDER BY recorded_at DESC
+                     LIMIT 1),
+                    -- それもなければ現在価格（最新の状態）
+                    al.current_price
+                ) as price
+            FROM all_listings al
+            CROSS JOIN date_range dr
+            WHERE 
+                -- 掲載の有効期間内のみ
+                dr.price_date >= DATE(COALESCE(al.first_published_at, al.first_seen_at, al.created_at))
+                AND (
+                    al.is_active = true  -- アクティブな掲載は現在まで有効
+                    OR dr.price_date <= DATE(COALESCE(al.delisted_at, al.last_confirmed_at))  -- 非アクティブな掲載は終了日まで
+                )
+        ),
+        daily_majority_prices AS (
+            -- 各日付の多数決価格を計算
+            SELECT 
+                price_date,
+                price,
+                COUNT(*) as vote_count
+            FROM listing_prices_expanded
+            WHERE price IS NOT NULL
+            GROUP BY price_date, price
+        ),
+        daily_majority AS (
+            -- 各日付の最終的な多数決価格を決定
+            SELECT DISTINCT ON (price_date)
+                price_date,
+                price as majority_price,
+                vote_count
+            FROM daily_majority_prices
+            ORDER BY price_date, vote_count DESC, price ASC  -- 同票の場合は最低価格
+        ),
+        price_changes AS (
+            -- 価格変動を検出
+            SELECT 
+                dm1.price_date as change_date,
+                dm1.majority_price as new_price,
+                dm1.vote_count as new_price_votes,
+                dm2.majority_price as old_price,
+                dm2.vote_count as old_price_votes
+            FROM daily_majority dm1
+            LEFT JOIN LATERAL (
+                SELECT majority_price, vote_count
+                FROM daily_majority dm2
+                WHERE dm2.price_date < dm1.price_date
+                ORDER BY dm2.price_date DESC
+                LIMIT 1
+            ) dm2 ON true
+            WHERE dm2.majority_price IS NOT NULL
+              AND dm1.majority_price != dm2.majority_price
+        )
+        SELECT 
+            change_date,
+            new_price,
+            old_price,
+            new_price - old_price as price_diff,
+            CASE 
+                WHEN old_price > 0 THEN 
+                    ROUND(((new_price - old_price)::numeric / old_price * 100), 2)
+                ELSE 0
+            END as price_diff_rate,
+            new_price_votes,
+            old_price_votes
+        FROM price_changes
+        ORDER BY change_date
+    """)
+    
+    result = db.execute(query, {
+        'master_property_id': master_property_id,
+        'start_date': calc_start_date,
+        'end_date': calc_end_date
+    }).fetchall()
+    
+    changes = []
+    for row in result:
+        changes.append({
+            'change_date': row[0],
+            'new_price': row[1],
+            'old_price': row[2],
+            'price_diff': row[3],
+            'price_diff_rate': row[4],
+            'new_price_votes': row[5],
+            'old_price_votes': row[6]
+        })
+    
+    return changes
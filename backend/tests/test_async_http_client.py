@@ -0,0 +1,127 @@
+"""非同期HTTPクライアントのテスト"""
+import asyncio
+import time
+
+import httpx
+
+from backend.app.scrapers.components.async_http_client import AsyncHttpClientComponent
+from backend.app.scrapers.components.rate_limiter import RateLimiterComponent
+
+
+def _run(client, urls, **kwargs):
+    async def fetch():
+        async with client:
+            return await client.fetch_many(urls, **kwargs)
+    return asyncio.run(fetch())
+
+
+class TestAsyncHttpClient:
+    """AsyncHttpClientComponentのテスト"""
+
+    def test_fetch_many_keeps_order_and_error_contract(self):
+        """結果はURLの順序で (content, error_info) を返す"""
+        def handler(request):
+            if request.url.path == '/missing':
+                return httpx.Response(404)
+            if request.url.path == '/down':
+                return httpx.Response(503)
+            return httpx.Response(200, text=f"<html>{request.url.host}{request.url.path}</html>",
+                                  headers={'Content-Type': 'text/html; charset=utf-8'})
+
+        client = AsyncHttpClientComponent(transport=httpx.MockTransport(handler), retry_count=1)
+        results = _run(client, [
+            'https://a.example/ok',
+            'https://b.example/missing',
+            'https://c.example/down',
+        ])
+
+        assert results[0] == ('<html>a.example/ok</html>', None)
+        assert results[1][0] is None and results[1][1]['type'] == 'http_404'
+        assert results[2][0] is None and results[2][1]['status_code'] == 503
+
+    def test_retry_and_content_check(self):
+        """コンテンツ検証に失敗した場合はリトライする"""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            body = 'short' if len(calls) == 1 else 'x' * 200
+            return httpx.Response(200, text=body, headers={'Content-Type': 'text/html; charset=utf-8'})
+
+        client = AsyncHttpClientComponent(
+            transport=httpx.MockTransport(handler), retry_count=2, retry_delay=0, min_interval_per_host=0
+        )
+        results = _run(client, ['https://a.example/'], check_content=lambda html: len(html) > 100)
+
+        assert len(calls) == 2
+        assert results[0] == ('x' * 200, None)
+
+    def test_shift_jis_without_charset(self):
+        """Content-Typeに文字コードがない場合は推定して展開する"""
+        body = '<html><body>港区の中古マンション物件一覧ページです。' * 5 + '</body></html>'
+
+        def handler(request):
+            return httpx.Response(200, content=body.encode('shift_jis'),
+                                  headers={'Content-Type': 'text/html'})
+
+        client = AsyncHttpClientComponent(transport=httpx.MockTransport(handler), retry_count=1)
+        content, error_info = _run(client, ['https://a.example/'])[0]
+
+        assert error_info is None
+        assert '港区' in content
+
+    def test_min_interval_per_host(self):
+        """同一ホストへのリクエストは間隔を空け、別ホストは並行する"""
+        started = {}
+
+        async def handler(request):
+            started.setdefault(request.url.host, []).append(time.monotonic())
+            return httpx.Response(200, text='ok', headers={'Content-Type': 'text/plain; charset=utf-8'})
+
+        client = AsyncHttpClientComponent(
+            transport=httpx.MockTransport(handler), retry_count=1, min_interval_per_host=0.05,
+            min_interval_by_host={'c.example': 0}
+        )
+        _run(client, ['https://a.example/1', 'https://a.example/2', 'https://b.example/1',
+                      'https://c.example/1', 'https://c.example/2'])
+
+        a_times = sorted(started['a.example'])
+        assert a_times[1] - a_times[0] >= 0.04
+        assert abs(started['b.example'][0] - a_times[0]) < 0.04
+        c_times = sorted(started['c.example'])
+        assert c_times[1] - c_times[0] < 0.04
+
+
+def test_check_sites_skips_scrapers_with_missing_dependencies(monkeypatch, tmp_path):
+    """必要なパッケージがないサイト（PlaywrightがないHOMES）は確認せずにスキップする"""
+    import importlib.util
+    # run_scrapers はインポート時にカレントディレクトリへ scraper.log を作成する
+    monkeypatch.chdir(tmp_path)
+    from backend.app.scrapers.components import async_http_client
+    from backend.scripts import run_scrapers
+
+    requested = []
+    intervals = {}
+
+    def handler(request):
+        requested.append(request.url.host)
+        return httpx.Response(200, text='<html>' + 'x' * 200 + '</html>')
+
+    class MockClient(AsyncHttpClientComponent):
+        def __init__(self, **kwargs):
+            super().__init__(transport=httpx.MockTransport(handler), **kwargs)
+            intervals.update(self.min_interval_by_host)
+
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, 'find_spec',
+                        lambda name, *args: None if name == 'playwright' else find_spec(name, *args))
+    monkeypatch.setattr(async_http_client, 'AsyncHttpClientComponent', MockClient)
+
+    results = run_scrapers.check_sites('minato')
+
+    assert results['homes'] == {'ok': None, 'skipped': True, 'missing_modules': ['playwright']}
+    assert all(results[name]['ok'] for name in ('suumo', 'rehouse', 'nomu', 'livable'))
+    assert not any('homes' in host for host in requested)
+    # 同一サイトへの間隔はスクレイパーのサイト別の遅延と同じ
+    assert intervals['suumo.jp'] == RateLimiterComponent.DEFAULT_DELAYS['suumo']
+    assert len(intervals) == 4
@@ -0,0 +1,93 @@
+"""ブックマーク一覧APIのテスト"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.api.bookmarks import get_bookmarks
+from backend.app.models import (
+    Building, MasterProperty, PropertyListing, PropertyPriceChange, PropertyBookmark, User
+)
+
+
+@pytest.fixture
+def engine(sqlite_tables):
+    return sqlite_tables(User, Building, MasterProperty, PropertyListing, PropertyPriceChange,
+                         PropertyBookmark)
+
+
+def _add_bookmarks(session, count):
+    now = datetime.now()
+    session.add(User(id=1, email='user@example.com'))
+    session.add(Building(id=1, normalized_name='テストタワー', address='東京都港区芝浦1'))
+    session.add(Building(id=2, normalized_name='テストレジデンス', address='東京都渋谷区神宮前1'))
+    for property_id in range(1, count + 1):
+        sold = property_id % 3 == 0
+        session.add(MasterProperty(
+            id=property_id, building_id=property_id % 2 + 1, area=66.1,
+            current_price=None if sold else 6000, sold_at=now if sold else None,
+            final_price=5800 if sold else None
+        ))
+        for offset in range(2):
+            listing_id = property_id * 10 + offset
+            session.add(PropertyListing(
+                id=listing_id, master_property_id=property_id, source_site='suumo',
+                site_property_id=str(listing_id), url=f'https://example.com/{listing_id}',
+                is_active=not sold, first_published_at=now - timedelta(days=offset + 1),
+                last_scraped_at=now - timedelta(days=offset), delisted_at=now if sold else None
+            ))
+        session.add(PropertyPriceChange(
+            master_property_id=property_id, change_date=date(2026, 9, 1),
+            new_price=6000, old_price=6500, price_diff=-500, price_diff_rate=-7.692
+        ))
+        session.add(PropertyBookmark(user_id=1, master_property_id=property_id,
+                                     created_at=now - timedelta(minutes=property_id)))
+    # 掲載情報のない物件（統合済み）は一覧に含めない
+    session.add(MasterProperty(id=count + 1, building_id=1))
+    session.add(PropertyBookmark(user_id=1, master_property_id=count + 1))
+    session.commit()
+
+
+def _count_queries(engine, group_by):
+    queries = []
+    listener = lambda *args: queries.append(args[2])
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        with sessionmaker(bind=engine)() as session:
+            result = get_bookmarks(group_by=group_by, current_user=session.get(User, 1), db=session)
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+    return result, len(queries)
+
+
+@pytest.mark.parametrize('group_by', [None, 'ward', 'building'])
+def test_query_count_does_not_grow_with_bookmarks(engine, group_by):
+    with sessionmaker(bind=engine)() as session:
+        _add_bookmarks(session, 30)
+
+    result, queries = _count_queries(engine, group_by)
+    # User取得を含めても一定（ブックマーク数に比例しない）
+    assert queries <= 5
+    if group_by is None:
+        assert len(result) == 30
+    else:
+        assert sum(group['count'] for group in result['grouped_bookmarks'].values()) == 30
+
+
+def test_ungrouped_details(engine):
+    with sessionmaker(bind=engine)() as session:
+        _add_bookmarks(session, 3)
+
+    result, _ = _count_queries(engine, None)
+    assert [item['master_property_id'] for item in result] == [1, 2, 3]
+
+    active = result[0]['master_property']
+    assert active['current_price'] == 6000
+    assert active['price_per_tsubo'] == 300
+    assert active['price_change_info']['change_amount'] == -500
+
+    sold = result[2]['master_property']
+    assert sold['has_active_listing'] is False
+    assert sold['current_price'] == 5800
+    assert sold['delisted_at'] is not None
@@ -0,0 +1,89 @@
+"""建物候補インデックスのテスト"""
+import random
+
+import pytest
+
+from backend.app.models import Building
+from backend.app.utils.building_candidate_index import BuildingCandidateIndex
+
+
+def _brute_force(buildings, search_key, normalized_address):
+    """旧実装のLIKE条件と同じ判定"""
+    return sorted(
+        bid for bid, (name, addr) in buildings.items()
+        if (search_key in name or name in search_key)
+        and (normalized_address in addr or addr in normalized_address)
+    )
+
+
+class TestBuildingCandidateIndex:
+    """インデックス単体の検索"""
+
+    def test_matches_like_conditions(self):
+        rng = random.Random(0)
+        names = ['パークハウス', 'パークハウス南青山', '南青山パークタワー', 'ザ・パークハウス', 'タワー', 'ハウス', 'パ']
+        addrs = ['東京都港区南青山3', '東京都港区南青山3-4-5', '港区南青山3-4-5', '東京都港区', '東京都渋谷区神宮前1-2']
+
+        index = BuildingCandidateIndex()
+        buildings = {}
+        for bid in range(1, 200):
+            name, addr = rng.choice(names), rng.choice(addrs)
+            buildings[bid] = (name, addr)
+            index.add(bid, name, addr)
+
+        for key in names + ['パークハウス南青山レジデンス', '存在しない']:
+            for addr in addrs:
+                assert sorted(index.find_candidate_ids(key, addr, limit=None)) == _brute_force(buildings, key, addr)
+
+    def test_exact_name_first_and_limit(self):
+        index = BuildingCandidateIndex()
+        index.add(1, 'パークハウス南青山', '東京都港区南青山3')
+        index.add(2, 'パークハウス', '東京都港区南青山3')
+        index.add(3, 'パークハウス', '東京都港区南青山3')
+
+        assert index.find_candidate_ids('パークハウス', '東京都港区南青山3') == [2, 3, 1]
+        assert index.find_candidate_ids('パークハウス', '東京都港区南青山3', limit=1) == [2]
+
+    def test_update_and_remove(self):
+        index = BuildingCandidateIndex()
+        index.add(1, 'パークハウス', '東京都港区南青山3')
+        index.add(1, 'ブリリア', '東京都港区南青山3')
+        assert index.find_candidate_ids('パークハウス', '東京都港区南青山3') == []
+        assert index.find_candidate_ids('ブリリア', '東京都港区南青山3') == [1]
+
+        index.remove_many([1])
+        assert index.find_candidate_ids('ブリリア', '東京都港区南青山3') == []
+        assert len(index) == 0
+
+    def test_buildings_without_address_are_not_indexed(self):
+        index = BuildingCandidateIndex()
+        index.add(1, 'パークハウス', None)
+        assert len(index) == 0
+
+
+class TestFetchCandidates:
+    """DBとの同期と候補の再確認"""
+
+    @pytest.fixture
+    def session(self, sqlite_session):
+        return sqlite_session(Building)
+
+    def _add(self, session, name, address):
+        building = Building(normalized_name=name, canonical_name=name,
+                            address=address, normalized_address=address)
+        session.add(building)
+        session.flush()
+        return building
+
+    def test_loads_and_rechecks_rows(self, session):
+        b1 = self._add(session, 'パークハウス', '東京都港区南青山3')
+        self._add(session, 'ブリリア', '東京都港区南青山3')
+
+        index = BuildingCandidateIndex()
+        assert index.fetch_candidates(session, 'パークハウス', '東京都港区南青山3') == [b1]
+
+        # 他のプロセスで名前が変わった場合、古いインデックスからは候補として返さない
+        b1.canonical_name = 'ブリリア南青山'
+        session.flush()
+        assert index.fetch_candidates(session, 'パークハウス', '東京都港区南青山3') == []
+        assert index.find_candidate_ids('ブリリア', '東京都港区南青山3') == [2, 1]
@@ -0,0 +1,143 @@
+"""建物重複候補の事前計算（building_duplicate_candidates）のテスト"""
+import pytest
+
+from backend.app.models import (
+    Building, MasterProperty, BuildingListingName, BuildingMergeExclusion, BuildingDuplicateCandidate
+)
+from backend.app.utils import building_duplicate_candidates as candidates_module
+from backend.app.utils.building_duplicate_candidates import (
+    generate_candidate_pairs, load_candidate_buildings, load_listing_name_aliases,
+    rebuild_building_duplicate_candidates, refresh_building_duplicate_candidates,
+    DuplicateCandidateScorer
+)
+from backend.app.utils.enhanced_building_matcher import EnhancedBuildingMatcher
+
+
+BUILDINGS = [
+    # id, 建物名, 住所, 総階数, 総戸数, 築年, 築月
+    (1, 'パークタワー芝浦', '東京都港区芝浦1-2-3', 30, 200, 2010, 3),
+    (2, 'パークタワー芝浦', '東京都港区芝浦1-2-3', 30, 200, 2010, None),
+    (3, 'PARK TOWER SHIBAURA', '東京都港区芝浦1-2', 30, None, 2010, 3),
+    (4, 'パークタワー芝浦', '東京都港区芝浦3-1-1', 12, 40, 2001, None),
+    (5, 'シティハウス芝浦', '東京都港区芝浦1-5-5', 10, 80, 1995, None),
+    (6, 'パークタワー芝浦 B棟', '東京都港区芝浦1-2-4', 25, None, 2011, None),
+]
+
+
+@pytest.fixture
+def db(sqlite_session):
+    session = sqlite_session(Building, MasterProperty, BuildingListingName, BuildingMergeExclusion,
+                             BuildingDuplicateCandidate)
+    for building_id, name, address, floors, units, year, month in BUILDINGS:
+        session.add(Building(
+            id=building_id, normalized_name=name, canonical_name=name.replace(' ', '').lower(),
+            address=address, normalized_address=address, total_floors=floors, total_units=units,
+            built_year=year, built_month=month
+        ))
+        session.add(MasterProperty(id=building_id, building_id=building_id))
+    for listing_id, building_id, name, count in (
+        (1, 1, 'パークタワー芝浦', 3),
+        (2, 3, 'パークタワー芝浦', 1),
+        (3, 3, 'PARK TOWER SHIBAURA', 2),
+    ):
+        session.add(BuildingListingName(
+            id=listing_id, building_id=building_id, normalized_name=name,
+            canonical_name=name.replace(' ', '').lower(), occurrence_count=count
+        ))
+    session.commit()
+    return session
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def array_backend(request, monkeypatch):
+    """NumPyによる配列計算と、NumPyがない場合の1ペアずつの計算の両方をテストする"""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(candidates_module, 'np', None)
+    return request.param
+
+
+def _pair_ids(buildings, pairs):
+    return {(buildings[i].id, buildings[j].id) for i, j in pairs}
+
+
+def _stored(db):
+    return {
+        (row.building1_id, row.building2_id): row.similarity
+        for row in db.query(BuildingDuplicateCandidate)
+    }
+
+
+def test_blocking_selects_pairs_by_address_attributes_and_name(db):
+    """住所×属性と地域×建物名のブロック内で一致するペアだけを比較する"""
+    buildings = load_candidate_buildings(db)
+    pairs = _pair_ids(buildings, generate_candidate_pairs(buildings))
+
+    # 同じ丁目で総階数・築年が一致（建物名が違っても対象）
+    assert {(1, 2), (1, 3), (2, 3)} <= pairs
+    # 棟違いの同じ基本名
+    assert (1, 6) in pairs
+    # 同じ建物名でも築年が3年以上違う・属性も名前も一致しない
+    assert (1, 4) not in pairs
+    assert not any(5 in pair for pair in pairs)
+
+    # 対象の建物を指定した場合はその建物を含むペアだけ
+    assert _pair_ids(buildings, generate_candidate_pairs(buildings, target_ids={6})) == {(1, 6), (2, 6)}
+
+
+def test_scores_match_enhanced_building_matcher(db, array_backend):
+    """まとめて計算した類似度が calculate_comprehensive_similarity と一致する"""
+    buildings = load_candidate_buildings(db)
+    aliases_cache, global_name_counts = load_listing_name_aliases(db)
+    pairs = generate_candidate_pairs(buildings)
+    pair_buildings = [(buildings[i], buildings[j]) for i, j in pairs]
+
+    scorer = DuplicateCandidateScorer(aliases_cache, global_name_counts)
+    scores = scorer.score_pairs(pair_buildings, min_similarity=0.0)
+
+    matcher = EnhancedBuildingMatcher(aliases_cache=aliases_cache, global_name_counts=global_name_counts)
+    for (b1, b2), (similarity, _, _, _) in zip(pair_buildings, scores):
+        expected = matcher.calculate_comprehensive_similarity(db.get(Building, b1.id), db.get(Building, b2.id))
+        assert similarity == pytest.approx(expected, abs=1e-12), (b1.id, b2.id)
+
+
+def test_rebuild_and_refresh(db, array_backend):
+    """全件計算と、指定建物を含むペアだけの再計算"""
+    saved = rebuild_building_duplicate_candidates(db)
+    db.commit()
+    stored = _stored(db)
+    assert saved == len(stored)
+    assert stored[(1, 2)] >= 0.9
+    assert all(similarity >= candidates_module.STORE_MIN_SIMILARITY for similarity in stored.values())
+
+    # 築年が大きく変わった建物のペアだけが消え、他のペアは残る
+    db.get(Building, 3).built_year = 1990
+    refresh_building_duplicate_candidates(db, [3])
+    db.commit()
+    refreshed = _stored(db)
+    assert not any(3 in pair for pair in refreshed)
+    assert refreshed == {pair: similarity for pair, similarity in stored.items() if 3 not in pair}
+
+
+def test_admin_endpoint_reads_precomputed_candidates(db):
+    """管理画面の重複候補は事前計算したペアから作成し、除外設定はその場で反映する"""
+    from backend.app.api.admin.duplicates import get_duplicate_buildings
+
+    rebuild_building_duplicate_candidates(db)
+    db.commit()
+
+    result = get_duplicate_buildings(search=None, min_similarity=0.7, limit=30, db=db)
+    assert 'computed_at' in result
+    group_ids = [
+        {group['primary']['id']} | {candidate['id'] for candidate in group['candidates']}
+        for group in result['duplicate_groups']
+    ]
+    assert any({1, 2} <= ids for ids in group_ids)
+
+    db.add(BuildingMergeExclusion(building1_id=1, building2_id=2))
+    db.commit()
+    result = get_duplicate_buildings(search=None, min_similarity=0.7, limit=30, db=db)
+    for group in result['duplicate_groups']:
+        ids = {group['primary']['id']} | {candidate['id'] for candidate in group['candidates']}
+        assert not {1, 2} <= ids
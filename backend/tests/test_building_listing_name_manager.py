@@ -5,19 +5,15 @@ BuildingListingNameManagerのテストコード
 
 import pytest
 from datetime import datetime
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from backend.app.models import Base, Building, MasterProperty, PropertyListing, BuildingListingName
 from backend.app.utils.building_listing_name_manager import BuildingListingNameManager
 
-# テスト用のデータベース設定
-TEST_DATABASE_URL = "sqlite:///:memory:"
-
 
 @pytest.fixture
-def db_session():
-    """テスト用のデータベースセッションを作成"""
-    engine = create_engine(TEST_DATABASE_URL)
+def db_session(sqlite_engine):
+    """テスト用のデータベースセッションを作成（全テーブルを作成するため関数を登録したエンジンを使う）"""
+    engine = sqlite_engine
     Base.metadata.create_all(bind=engine)
     
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,135 @@
+"""建物の空間インデックス（周辺建物検索）のテスト"""
+import random
+from datetime import datetime
+
+import pytest
+
+from backend.app.models import Building, MasterProperty, PropertyListing
+from backend.app.utils import building_spatial_index as spatial_module
+from backend.app.utils.building_spatial_index import BuildingSpatialIndex, haversine_distance
+
+
+def _random_points(count, seed=0):
+    rng = random.Random(seed)
+    # 東京都心付近（約10km四方）
+    return {
+        building_id: (35.62 + rng.random() * 0.09, 139.68 + rng.random() * 0.11)
+        for building_id in range(1, count + 1)
+    }
+
+
+def _brute_force(points, latitude, longitude, max_distance=None, exclude=()):
+    distances = [
+        (haversine_distance(latitude, longitude, lat, lon), building_id)
+        for building_id, (lat, lon) in points.items() if building_id not in exclude
+    ]
+    return [
+        (building_id, distance) for distance, building_id in sorted(distances)
+        if max_distance is None or distance <= max_distance
+    ]
+
+
+@pytest.mark.parametrize('cell_degrees', [0.001, 0.005, 0.05])
+def test_queries_match_brute_force(cell_degrees):
+    """半径検索・k近傍検索の結果が全件の距離計算と一致する"""
+    points = _random_points(500)
+    index = BuildingSpatialIndex(cell_degrees=cell_degrees)
+    for building_id, (lat, lon) in points.items():
+        index.add(building_id, lat, lon)
+
+    for building_id in (1, 50, 250):
+        lat, lon = points[building_id]
+        for radius in (100, 500, 2000, 5000):
+            assert index.within_radius(lat, lon, radius, exclude_ids=(building_id,)) == \
+                _brute_force(points, lat, lon, radius, exclude=(building_id,))
+        assert index.nearest(lat, lon, 10) == _brute_force(points, lat, lon)[:10]
+
+    # データの範囲外の地点からでも全件を距離順に返す
+    assert index.nearest(35.0, 139.0, 500) == _brute_force(points, 35.0, 139.0)
+
+
+def test_add_remove_and_sync(sqlite_session):
+    """登録・削除と、updated_at による差分更新"""
+    session = sqlite_session(Building)
+    loaded_at = datetime(2026, 10, 1)
+    session.add(Building(id=1, normalized_name='A', latitude=35.65, longitude=139.75, updated_at=loaded_at))
+    session.add(Building(id=2, normalized_name='B', latitude=35.651, longitude=139.751, updated_at=loaded_at))
+    session.add(Building(id=3, normalized_name='C', updated_at=loaded_at))
+    session.commit()
+
+    index = BuildingSpatialIndex(refresh_seconds=0)
+    index.ensure_fresh(session)
+    assert len(index) == 2
+    assert [building_id for building_id, _ in index.nearest(35.65, 139.75, 5)] == [1, 2]
+
+    # 座標のクリア（住所変更）とジオコーディングが差分更新で反映される
+    updated_at = datetime(2026, 10, 2)
+    session.get(Building, 1).latitude = None
+    session.get(Building, 1).updated_at = updated_at
+    session.get(Building, 3).latitude = 35.6501
+    session.get(Building, 3).longitude = 139.7501
+    session.get(Building, 3).updated_at = updated_at
+    session.commit()
+    index.ensure_fresh(session)
+    assert [building_id for building_id, _ in index.nearest(35.65, 139.75, 5)] == [3, 2]
+
+    index.remove_many([2])
+    assert [building_id for building_id, _ in index.nearest(35.65, 139.75, 5)] == [3]
+
+
+@pytest.fixture
+def db(sqlite_session, monkeypatch):
+    session = sqlite_session(Building, MasterProperty, PropertyListing)
+
+    # 建物1から東へ約90mずつ離れた建物（5は販売中の物件なし、6は座標なし）
+    for building_id in range(1, 7):
+        session.add(Building(
+            id=building_id, normalized_name=f'建物{building_id}', built_year=2000,
+            latitude=35.65 if building_id != 6 else None,
+            longitude=139.75 + 0.001 * (building_id - 1) if building_id != 6 else None
+        ))
+        session.add(MasterProperty(id=building_id, building_id=building_id, area=70.0))
+        session.add(PropertyListing(
+            id=building_id, master_property_id=building_id, source_site='suumo',
+            site_property_id=str(building_id), url=f'https://example.com/{building_id}',
+            is_active=building_id != 5, current_price=7000, created_at=datetime(2026, 10, 1)
+        ))
+    session.commit()
+
+    # テストごとに新しいインデックスを使う
+    monkeypatch.setattr(spatial_module, '_spatial_index', None)
+    return session
+
+
+def test_nearby_endpoint(db, monkeypatch):
+    """販売中物件がある建物を距離順に返す（集計は近い順に必要な分だけ読み込む）"""
+    from backend.app.api import buildings as buildings_api
+
+    monkeypatch.setattr(buildings_api, 'NEARBY_FETCH_CHUNK_SIZE', 2)
+    result = buildings_api.get_nearby_buildings(building_id=1, radius_meters=500, limit=3, db=db)
+    assert [item['id'] for item in result] == [2, 3, 4]
+    assert result[0]['distance_meters'] == round(haversine_distance(35.65, 139.75, 35.65, 139.751))
+    assert result[0]['property_count'] == 1
+    assert result[0]['avg_price_per_tsubo'] == round(7000 * 3.30578 / 70.0)
+    assert result[0]['area_range'] == {'min': 70.0, 'max': 70.0}
+
+    # 販売中物件がない建物5は飛ばす
+    result = buildings_api.get_nearby_buildings(building_id=1, radius_meters=500, limit=10, db=db)
+    assert [item['id'] for item in result] == [2, 3, 4]
+
+    # 半径で絞り込む
+    result = buildings_api.get_nearby_buildings(building_id=1, radius_meters=100, limit=10, db=db)
+    assert [item['id'] for item in result] == [2]
+
+
+def test_nearby_batch_endpoint(db):
+    """複数建物の周辺建物をまとめて取得する"""
+    from backend.app.api.buildings import NearbyBatchRequest, get_nearby_buildings, get_nearby_buildings_batch
+
+    request = NearbyBatchRequest(building_ids=[1, 4, 6, 999], radius_meters=200, limit=5)
+    result = get_nearby_buildings_batch(request=request, db=db)
+    assert list(result) == [1, 4, 6, 999]
+    assert [item['id'] for item in result[1]] == [2, 3]
+    assert [item['id'] for item in result[4]] == [3, 2]
+    assert result[6] == [] and result[999] == []
+    assert result[4] == get_nearby_buildings(building_id=4, radius_meters=200, limit=5, db=db)
@@ -0,0 +1,50 @@
+"""建物名検索（トライグラム検索層・建物名フィルタ）のテスト"""
+import pytest
+
+from backend.app.models import Building, BuildingListingName
+from backend.app.utils.building_filters import apply_building_name_filter
+from backend.app.utils.building_trigram_search import is_trigram_search_available
+
+
+@pytest.fixture
+def db(sqlite_session):
+    session = sqlite_session(Building, BuildingListingName)
+
+    session.add_all([
+        Building(id=1, normalized_name='パークハウス南青山', canonical_name='パークハウス南青山'),
+        Building(id=2, normalized_name='ブリリア赤坂', canonical_name='ブリリア赤坂'),
+        Building(id=3, normalized_name='赤坂タワー', canonical_name='赤坂タワー'),
+    ])
+    session.add_all([
+        BuildingListingName(building_id=2, normalized_name='BRILLIA赤坂', canonical_name='brillia赤坂'),
+        BuildingListingName(building_id=3, normalized_name='赤坂タワーレジデンス', canonical_name='赤坂タワーレジデンス'),
+    ])
+    session.commit()
+    return session
+
+
+def _ids(db, building_name):
+    query = apply_building_name_filter(db.query(Building), db, building_name)
+    return sorted(b.id for b in query.all())
+
+
+class TestApplyBuildingNameFilter:
+    """建物名・掲載名のどちらかに全検索語を含む建物に絞り込む"""
+
+    def test_direct_name(self, db):
+        assert _ids(db, 'パークハウス') == [1]
+
+    def test_listing_alias(self, db):
+        assert _ids(db, 'BRILLIA') == [2]
+        assert _ids(db, 'レジデンス') == [3]
+
+    def test_hiragana_and_multiple_terms(self, db):
+        assert _ids(db, 'ぱーくはうす') == [1]
+        assert _ids(db, '赤坂 タワー') == [3]
+
+    def test_no_filter(self, db):
+        assert _ids(db, '') == [1, 2, 3]
+
+
+def test_trigram_search_is_disabled_on_sqlite(db):
+    assert is_trigram_search_available(db) is False
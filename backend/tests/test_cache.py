@@ -0,0 +1,135 @@
+"""サーバーサイドキャッシュのテスト"""
+import fnmatch
+import threading
+import time
+
+import pytest
+
+from backend.app.utils.cache import SimpleCache, LocalLRUCache, RedisCacheBackend, serialize_value, deserialize_value
+
+
+class LocalRedis:
+    """テスト用のRedis互換クライアント（キャッシュが使うコマンドのみ）"""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            return value if isinstance(value, bytes) else None
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        with self._lock:
+            if nx and key in self._data:
+                return None
+            self._data[key] = value
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+
+    def sadd(self, key, *members):
+        with self._lock:
+            self._data.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        with self._lock:
+            return set(self._data.get(key, set()))
+
+    def expire(self, key, seconds):
+        return True
+
+    def scan_iter(self, match='*'):
+        with self._lock:
+            return [key for key in list(self._data) if fnmatch.fnmatchcase(key, match)]
+
+
+@pytest.fixture
+def redis_client():
+    try:
+        import fakeredis
+        return fakeredis.FakeRedis()
+    except ImportError:
+        return LocalRedis()
+
+
+def test_serialize_roundtrip():
+    value = {'items': [{'id': i, 'name': f'物件{i}'} for i in range(200)]}
+    data = serialize_value(value)
+    assert len(data) < len(repr(value).encode())
+    assert deserialize_value(data) == value
+
+
+class TestLocalLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LocalLRUCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert len(cache) == 2
+
+    def test_expiry_and_tags(self):
+        cache = LocalLRUCache()
+        cache.set('short', 1, ttl_seconds=0.01)
+        cache.set('tagged', 2, tags=['recent_updates'])
+        cache.set('other', 3)
+        time.sleep(0.02)
+        assert cache.get('short') is None
+
+        cache.invalidate_tags(['recent_updates'])
+        assert cache.get('tagged') is None
+        assert cache.get('other') == 3
+
+
+class TestSharedCache:
+    """共有層を使う2つのワーカーを想定"""
+
+    def test_values_and_invalidation_are_shared(self, redis_client):
+        worker1 = SimpleCache(shared=RedisCacheBackend(redis_client), local_ttl_seconds=60)
+        worker2 = SimpleCache(shared=RedisCacheBackend(redis_client), local_ttl_seconds=60)
+
+        worker1.set('recent_updates_24h', {'total': 1}, ttl_seconds=1800, tags=['recent_updates'])
+        assert worker2.get('recent_updates_24h') == {'total': 1}
+
+        worker1.invalidate_tags('recent_updates')
+        assert worker1.get('recent_updates_24h') is None
+        # worker2はローカル層の保持期間が過ぎると共有層の無効化が反映される
+        worker2.local.clear()
+        assert worker2.get('recent_updates_24h') is None
+
+    def test_clear_pattern(self, redis_client):
+        cache = SimpleCache(shared=RedisCacheBackend(redis_client))
+        cache.set('recent_updates_24h', 1)
+        cache.set('other', 2)
+        cache.clear_pattern('recent_updates')
+        cache.local.clear()
+        assert cache.get('recent_updates_24h') is None
+        assert cache.get('other') == 2
+
+
+def test_get_or_set_computes_once(redis_client):
+    cache = SimpleCache(shared=RedisCacheBackend(redis_client))
+    calls = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return {'total': 10}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_set('key', loader, 60)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(hit for _, hit in results) == [False] + [True] * 7
+    assert all(value == {'total': 10} for value, _ in results)
@@ -0,0 +1,124 @@
+"""詳細ページ先読みパイプラインのテスト"""
+import threading
+import time
+
+from backend.app.scrapers.components.detail_pipeline import DetailPrefetchPipeline
+from backend.app.scrapers.components.rate_limiter import RateLimiterComponent
+
+
+def _make_pipeline(fetch_func, **kwargs):
+    return DetailPrefetchPipeline(
+        fetch_func=fetch_func,
+        parse_func=lambda html: f"parsed:{html}",
+        **kwargs
+    )
+
+
+class TestDetailPrefetchPipeline:
+    """DetailPrefetchPipelineのテスト"""
+
+    def test_fetch_then_parse(self):
+        """取得と解析の結果がURL単位で受け取れる"""
+        pipeline = _make_pipeline(lambda url: (f"<html>{url}</html>", None, 0.1, False))
+        try:
+            assert pipeline.submit("https://example.com/a")
+            page = pipeline.take("https://example.com/a", timeout=5)
+            assert page.content == "<html>https://example.com/a</html>"
+            assert page.soup == "parsed:<html>https://example.com/a</html>"
+            assert page.error_info is None
+        finally:
+            pipeline.close()
+
+    def test_error_result_is_not_parsed(self):
+        """取得エラーの場合は解析せずにエラー情報を返す"""
+        error = {'type': 'http_404', 'status_code': 404}
+        pipeline = _make_pipeline(lambda url: (None, error, 0.0, False))
+        try:
+            pipeline.submit("https://example.com/missing")
+            page = pipeline.take("https://example.com/missing", timeout=5)
+            assert page.soup is None
+            assert page.error_info == error
+        finally:
+            pipeline.close()
+
+    def test_fetch_exception_becomes_error_info(self):
+        """取得関数の例外はエラー情報として返される"""
+        def fetch(url):
+            raise RuntimeError("boom")
+
+        pipeline = _make_pipeline(fetch)
+        try:
+            pipeline.submit("https://example.com/x")
+            page = pipeline.take("https://example.com/x", timeout=5)
+            assert page.content is None
+            assert page.error_info['type'] == 'unknown_error'
+        finally:
+            pipeline.close()
+
+    def test_max_pending_and_discard(self):
+        """先読み数の上限と破棄"""
+        release = threading.Event()
+
+        def fetch(url):
+            release.wait(5)
+            return "<html></html>", None, 0.0, False
+
+        pipeline = _make_pipeline(fetch, max_pending=2)
+        try:
+            assert pipeline.submit("u1")
+            assert pipeline.submit("u2")
+            assert not pipeline.submit("u3")
+            assert not pipeline.submit("u1")
+
+            pipeline.discard("u1")
+            assert pipeline.has_capacity()
+            assert pipeline.submit("u3")
+            assert pipeline.take("unknown") is None
+        finally:
+            release.set()
+            pipeline.close()
+
+    def test_not_modified_page_is_not_parsed(self):
+        """前回から変更のないページは解析しない"""
+        pipeline = _make_pipeline(lambda url: ("<html></html>", None, 0.0, True))
+        try:
+            pipeline.submit("u1")
+            page = pipeline.take("u1", timeout=5)
+            assert page.not_modified
+            assert page.soup is None
+        finally:
+            pipeline.close()
+
+    def test_take_unsubmitted_url(self):
+        """予約されていないURLはNoneを返す"""
+        pipeline = _make_pipeline(lambda url: ("<html></html>", None, 0.0, False))
+        pipeline.close()
+        assert pipeline.take("https://example.com/") is None
+        assert not pipeline.submit("https://example.com/")
+
+
+class TestRateLimiterThreadSafety:
+    """複数スレッドからのレート制限"""
+
+    def test_delay_is_shared_between_threads(self):
+        """同時に呼び出しても送信間隔が遅延設定以上になる"""
+        limiter = RateLimiterComponent(adaptive=False)
+        limiter.current_delays['test'] = 0.05
+        send_times = []
+        lock = threading.Lock()
+
+        def worker():
+            limiter.wait_if_needed('test')
+            with lock:
+                send_times.append(time.time())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(send_times) == 4
+        # 4リクエストなら少なくとも3回分の遅延が必要
+        assert max(send_times) - min(send_times) >= 0.14
+        assert limiter.request_counts['test'] == 4
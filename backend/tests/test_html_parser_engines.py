@@ -0,0 +1,74 @@
+"""HTML解析エンジン切り替えのテスト"""
+import pytest
+
+from backend.app.scrapers.components.html_parser import (
+    HtmlParserComponent, select_engine, ENGINE_HTML_PARSER, ENGINE_LXML, ENGINE_SELECTOLAX
+)
+from backend.app.scrapers.parsers import (
+    SuumoParser, NomuParser, RehouseParser, HomesParser, LivableParser
+)
+
+
+HTML = """
+<html><head><style>.a{color:red}</style><script>var muki = "南";</script></head>
+<body>
+  <table class="data"><tr><th>価格</th><td>5,000万円</td></tr><tr><th>階</th><td>3階</td></tr></table>
+  <svg><path d="M0 0"/></svg>
+</body></html>
+"""
+
+
+class TestSelectEngine:
+    """解析エンジンの決定"""
+
+    def test_requested_engine_is_used_when_supported(self):
+        assert select_engine((ENGINE_LXML, ENGINE_HTML_PARSER), ENGINE_HTML_PARSER) == ENGINE_HTML_PARSER
+
+    def test_unsupported_request_falls_back_to_preferred(self):
+        assert select_engine((ENGINE_LXML, ENGINE_HTML_PARSER), ENGINE_SELECTOLAX) == ENGINE_LXML
+
+    def test_unknown_engines_fall_back_to_html_parser(self):
+        assert select_engine(('unknown',)) == ENGINE_HTML_PARSER
+
+    def test_default_is_html_parser(self):
+        assert select_engine((ENGINE_SELECTOLAX, ENGINE_LXML, ENGINE_HTML_PARSER)) == ENGINE_HTML_PARSER
+
+    @pytest.mark.parametrize('parser_class', [SuumoParser, NomuParser, RehouseParser, HomesParser, LivableParser])
+    def test_site_parsers_default_to_html_parser(self, parser_class, monkeypatch):
+        """SCRAPER_PARSER_ENGINE 未設定時はサイトにかかわらずhtml.parser（tbodyを補完しない）"""
+        monkeypatch.delenv('SCRAPER_PARSER_ENGINE', raising=False)
+        parser = parser_class()
+        assert parser.html_parser.engine == ENGINE_HTML_PARSER
+        soup = parser.html_parser.parse_html(HTML)
+        assert soup.find('tbody') is None
+        assert len(soup.select('table.data > tr')) == 2
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv('SCRAPER_PARSER_ENGINE', ENGINE_HTML_PARSER)
+        assert RehouseParser().html_parser.engine == ENGINE_HTML_PARSER
+
+
+class TestEngines:
+    """各エンジンで同じ要素が取得できる"""
+
+    @pytest.mark.parametrize('engine', [ENGINE_HTML_PARSER, ENGINE_LXML, ENGINE_SELECTOLAX])
+    def test_table_rows(self, engine):
+        if engine == ENGINE_SELECTOLAX:
+            pytest.importorskip('selectolax')
+        component = HtmlParserComponent(engine=engine, supported_engines=(engine,))
+        soup = component.parse_html(HTML)
+        rows = soup.select('table.data tr')
+        assert [component.extract_text(r.find('td')) for r in rows] == ['5,000万円', '3階']
+
+    def test_selectolax_prunes_declared_tags(self):
+        pytest.importorskip('selectolax')
+        suumo = SuumoParser().html_parser.parse_html(HTML, ENGINE_SELECTOLAX)
+        nomu = NomuParser().html_parser.parse_html(HTML, ENGINE_SELECTOLAX)
+
+        assert suumo.find('style') is None and suumo.find('svg') is None
+        # SUUMOは向き情報をscriptから読むため残す
+        assert suumo.find('script') is not None
+        assert nomu.find('script') is None
+
+    def test_rehouse_does_not_use_selectolax(self):
+        assert ENGINE_SELECTOLAX not in RehouseParser.SUPPORTED_PARSER_ENGINES
@@ -0,0 +1,119 @@
+"""掲載状態の一括更新のテスト"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.models import Building, MasterProperty, PropertyListing, ListingPriceHistory
+from backend.app.utils.listing_status_updater import ListingStatusUpdater
+
+NOW = datetime.now()
+STALE = NOW - timedelta(days=2)
+FRESH = NOW - timedelta(hours=1)
+
+
+def _run(db):
+    result = ListingStatusUpdater(db).run(now=NOW)
+    db.commit()
+    return result
+
+
+@pytest.fixture
+def db(sqlite_session):
+    session = sqlite_session(Building, MasterProperty, PropertyListing, ListingPriceHistory)
+    session.add(Building(id=1, normalized_name='テストマンション'))
+    return session
+
+
+def _listing(db, listing_id, property_id, active, last_confirmed_at, price, delisted_at=None, prices=()):
+    db.add(PropertyListing(
+        id=listing_id, master_property_id=property_id, source_site='suumo',
+        site_property_id=str(listing_id), url=f'https://example.com/{listing_id}',
+        is_active=active, last_confirmed_at=last_confirmed_at, current_price=price,
+        delisted_at=delisted_at, first_published_at=datetime(2026, 1, listing_id)
+    ))
+    for recorded_at, history_price in prices:
+        db.add(ListingPriceHistory(property_listing_id=listing_id, price=history_price, recorded_at=recorded_at))
+
+
+def test_bulk_status_update(db):
+    # 1: 確認されていない掲載 → 掲載終了・販売終了（最終価格は直前1週間の多数決）
+    db.add(MasterProperty(id=1, building_id=1))
+    _listing(db, 1, 1, True, STALE, 5200, prices=[
+        (STALE - timedelta(days=30), 5800), (STALE - timedelta(days=3), 5500),
+        (STALE - timedelta(days=2), 5500), (STALE - timedelta(days=1), 5200)
+    ])
+    # 2: 販売終了物件の掲載が再確認された → 販売再開
+    db.add(MasterProperty(id=2, building_id=1, sold_at=STALE, final_price=3000, final_price_updated_at=STALE))
+    _listing(db, 2, 2, False, FRESH, 3000, delisted_at=STALE)
+    # 3: 全掲載が終了しているのにsold_at未設定 → 設定漏れの修正（履歴がないので掲載価格）
+    db.add(MasterProperty(id=3, building_id=1))
+    _listing(db, 3, 3, False, STALE, 4100, delisted_at=STALE)
+    # 4: 販売終了済みでfinal_price未設定 → final_priceの修正
+    db.add(MasterProperty(id=4, building_id=1, sold_at=STALE))
+    _listing(db, 4, 4, False, STALE, 6000, delisted_at=STALE, prices=[(STALE - timedelta(days=1), 6100)])
+    # 5: 販売中の物件は変更しない
+    db.add(MasterProperty(id=5, building_id=1, current_price=7000))
+    _listing(db, 5, 5, True, FRESH, 7000)
+    # 6: 一部の掲載だけが終了 → 販売中のまま
+    db.add(MasterProperty(id=6, building_id=1))
+    _listing(db, 6, 6, True, STALE, 8000)
+    _listing(db, 7, 6, True, FRESH, 8000)
+    db.commit()
+
+    result = _run(db)
+
+    assert result.pop("affected_property_ids") == {1, 2, 3, 4, 6}
+    assert result == {
+        "reactivated_listings": 1,
+        "reopened_properties": 1,
+        "inactive_listings": 2,
+        "sold_properties": 1,
+        "fixed_sold_properties": 1,
+        "fixed_final_price": 1,
+    }
+
+    db.expire_all()
+    properties = {p.id: p for p in db.query(MasterProperty)}
+    listings = {l.id: l for l in db.query(PropertyListing)}
+
+    assert listings[1].is_active is False and listings[1].delisted_at is not None
+    assert properties[1].sold_at == listings[1].delisted_at
+    assert properties[1].final_price == 5500
+    assert properties[1].earliest_listing_date == datetime(2026, 1, 1)
+
+    assert listings[2].is_active is True and listings[2].delisted_at is None
+    assert properties[2].sold_at is None and properties[2].final_price is None
+    assert properties[2].final_price_updated_at is None
+
+    assert properties[3].sold_at == STALE
+    assert properties[3].final_price == 4100
+    assert properties[4].final_price == 6100
+
+    assert properties[5].sold_at is None and listings[5].is_active is True
+    assert listings[6].is_active is False
+    assert properties[6].sold_at is None
+
+
+def test_reopened_missing_final_price_is_affected(db):
+    """final_price未設定のままアクティブな掲載が残っていた販売終了物件は、販売再開に戻して集計の更新対象に含める"""
+    db.add(MasterProperty(id=1, building_id=1, sold_at=STALE))
+    _listing(db, 1, 1, True, FRESH, 5000)
+    db.commit()
+
+    result = _run(db)
+
+    assert result["affected_property_ids"] == {1}
+    db.expire_all()
+    assert db.get(MasterProperty, 1).sold_at is None
+
+
+def test_second_run_is_noop(db):
+    db.add(MasterProperty(id=1, building_id=1))
+    _listing(db, 1, 1, True, STALE, 5000)
+    db.commit()
+
+    _run(db)
+    result = _run(db)
+
+    assert result.pop("affected_property_ids") == set()
+    assert all(count == 0 for count in result.values())
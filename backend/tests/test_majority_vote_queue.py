@@ -0,0 +1,180 @@
+"""多数決更新キューのテスト"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.models import (
+    Building, MasterProperty, PropertyListing, PropertyVoteTally, BuildingVoteTally,
+    PropertyPriceChangeQueue
+)
+from backend.app.scrapers.components.majority_vote_queue import MajorityVoteQueue
+from backend.app.utils import majority_vote_updater
+from backend.app.utils.majority_vote_tally import refresh_vote_tallies
+
+
+@pytest.fixture
+def session_factory():
+    # 複数のセッション（ワーカースレッドを含む）から同じインメモリDBを使う
+    engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+    for model in (Building, MasterProperty, PropertyListing, PropertyVoteTally, BuildingVoteTally,
+                  PropertyPriceChangeQueue):
+        model.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+
+    session = factory()
+    session.add(Building(id=1, normalized_name='テストタワー'))
+    session.add(Building(id=2, normalized_name='別のタワー'))
+    for property_id, building_id in ((1, 1), (2, 1), (3, 2)):
+        session.add(MasterProperty(id=property_id, building_id=building_id))
+    session.commit()
+    session.close()
+    return factory
+
+
+@pytest.fixture
+def recorded_votes(monkeypatch):
+    """実行された多数決更新を記録する"""
+    calls = []
+
+    class RecordingUpdater:
+        def __init__(self, session):
+            pass
+
+        def update_property_building_name_by_majority(self, property_id):
+            calls.append(('property_building_name', property_id))
+
+        def update_building_by_majority(self, building):
+            calls.append(('building', building.id))
+
+        def update_master_property_by_majority(self, master_property):
+            calls.append(('property', master_property.id))
+
+    monkeypatch.setattr(majority_vote_updater, 'MajorityVoteUpdater', RecordingUpdater)
+    return calls
+
+
+class TestMajorityVoteQueue:
+    """MajorityVoteQueueのテスト"""
+
+    def test_duplicates_are_coalesced_and_grouped_by_building(self, session_factory, recorded_votes):
+        """同じ物件は1回、同じ建物は1バッチにつき1回だけ更新する"""
+        queue = MajorityVoteQueue(session_factory)
+        for _ in range(3):
+            queue.add(1, 1)
+            queue.add(2, 1)
+        queue.add(3, 2)
+        assert queue.pending_count() == 3
+
+        queue.close()
+
+        assert recorded_votes == [
+            ('property_building_name', 1), ('property_building_name', 2), ('building', 1),
+            ('property', 1), ('property', 2),
+            ('property_building_name', 3), ('building', 2), ('property', 3),
+        ]
+        assert queue.stats['requested'] == 7
+        assert queue.stats['coalesced'] == 4
+        assert queue.stats['buildings_updated'] == 2
+        assert queue.pending_count() == 0
+
+    def test_batches_are_limited_by_batch_size(self, session_factory, recorded_votes):
+        """バッチサイズごとに分けて処理する"""
+        queue = MajorityVoteQueue(session_factory, batch_size=2)
+        for property_id, building_id in ((1, 1), (2, 1), (3, 2)):
+            queue.add(property_id, building_id)
+        queue.flush()
+
+        assert queue.stats['batches'] == 2
+        assert recorded_votes.count(('building', 1)) == 1
+        queue.close()
+
+    def test_worker_processes_in_background(self, session_factory, recorded_votes):
+        """ワーカースレッドが処理し、close() で残りを処理する"""
+        queue = MajorityVoteQueue(session_factory, use_worker=True, flush_interval=0.01)
+        queue.add(3, 2)
+        queue.close()
+        assert ('property', 3) in recorded_votes
+
+        # クローズ後に追加された場合はその場で処理する
+        queue.add(1, 1)
+        assert ('property', 1) in recorded_votes
+        assert queue.pending_count() == 0
+
+    def test_error_rolls_back_only_that_building(self, session_factory, recorded_votes, monkeypatch):
+        """1つの建物でエラーが発生しても他の建物の更新は続ける"""
+        def fail_for_building_1(self, building):
+            if building.id == 1:
+                raise RuntimeError('lock timeout')
+            recorded_votes.append(('building', building.id))
+
+        monkeypatch.setattr(majority_vote_updater.MajorityVoteUpdater, 'update_building_by_majority',
+                            fail_for_building_1)
+        queue = MajorityVoteQueue(session_factory)
+        queue.add(1, 1)
+        queue.add(3, 2)
+        queue.close()
+
+        assert queue.stats['errors'] == 1
+        assert ('property', 3) in recorded_votes
+        assert ('property', 1) not in recorded_votes
+
+
+def test_queue_updates_master_property(session_factory):
+    """キューの処理で掲載の多数決が物件・建物に反映される"""
+    session = session_factory()
+    for listing_id, site, floor in ((1, 'suumo', 10), (2, 'homes', 10), (3, 'rehouse', 12)):
+        session.add(PropertyListing(
+            id=listing_id, master_property_id=1, source_site=site, site_property_id=str(listing_id),
+            url=f'https://example.com/{listing_id}', is_active=True, created_at=datetime(2026, 10, 1),
+            listing_floor_number=floor, listing_total_floors=20, current_price=8000
+        ))
+    session.flush()
+    refresh_vote_tallies(session, property_ids=[1])
+    session.commit()
+    session.close()
+
+    queue = MajorityVoteQueue(session_factory)
+    queue.add(1, 1)
+    queue.close()
+
+    session = session_factory()
+    assert session.get(MasterProperty, 1).floor_number == 10
+    assert session.get(Building, 1).total_floors == 20
+    session.close()
+
+
+@pytest.mark.postgres
+def test_queue_refreshes_search_summary(pg_engine):
+    """多数決で変わった値が物件検索用の集計にも反映される"""
+    from backend.app.models import Base, PropertySearchSummary
+    from backend.app.utils.property_search_summary import rebuild_property_search_summary
+
+    Base.metadata.create_all(pg_engine)
+    factory = sessionmaker(bind=pg_engine)
+    session = factory()
+    session.add(Building(id=1, normalized_name='テストタワー'))
+    session.add(MasterProperty(id=1, building_id=1, area=50.0))
+    for listing_id, site in ((1, 'suumo'), (2, 'homes')):
+        session.add(PropertyListing(
+            id=listing_id, master_property_id=1, source_site=site, site_property_id=str(listing_id),
+            url=f'https://example.com/{listing_id}', is_active=True, created_at=datetime(2026, 10, 1),
+            listing_area=70.5, current_price=8000
+        ))
+    session.flush()
+    refresh_vote_tallies(session, property_ids=[1])
+    rebuild_property_search_summary(session)
+    session.commit()
+    assert session.get(PropertySearchSummary, 1).area == 50.0
+    session.close()
+
+    queue = MajorityVoteQueue(factory)
+    queue.add(1, 1)
+    queue.close()
+
+    session = factory()
+    assert session.get(MasterProperty, 1).area == 70.5
+    assert session.get(PropertySearchSummary, 1).area == 70.5
+    session.close()
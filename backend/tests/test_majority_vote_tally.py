@@ -0,0 +1,170 @@
+"""多数決用の票集計テーブル（majority_vote_tally）のテスト"""
+from datetime import datetime
+
+import pytest
+
+from backend.app.models import (
+    Building, MasterProperty, PropertyListing, PropertyVoteTally, BuildingVoteTally,
+    PropertyPriceChangeQueue
+)
+from backend.app.utils.majority_vote_tally import (
+    ListingVoteTracker, load_building_votes, load_property_votes,
+    rebuild_vote_tallies, refresh_vote_tallies
+)
+from backend.app.utils.majority_vote_updater import MajorityVoteUpdater
+
+
+@pytest.fixture
+def db(sqlite_session):
+    session = sqlite_session(Building, MasterProperty, PropertyListing, PropertyVoteTally,
+                             BuildingVoteTally, PropertyPriceChangeQueue)
+    session.add(Building(id=1, normalized_name='テストタワー'))
+    session.add(Building(id=2, normalized_name='別のタワー'))
+    session.add(MasterProperty(id=1, building_id=1))
+    session.add(MasterProperty(id=2, building_id=1))
+    session.commit()
+    return session
+
+
+def _listing(db, listing_id, property_id, source_site, active=True, **values):
+    listing = PropertyListing(
+        id=listing_id, master_property_id=property_id, source_site=source_site,
+        site_property_id=str(listing_id), url=f'https://example.com/{listing_id}',
+        is_active=active, created_at=datetime(2026, 10, 1), **values
+    )
+    db.add(listing)
+    return listing
+
+
+def _tallies(db):
+    """集計テーブルの全行（比較用）"""
+    return {
+        'property': sorted(
+            (t.master_property_id, t.field, t.source_site, t.value, t.listing_count, t.active_count)
+            for t in db.query(PropertyVoteTally)
+        ),
+        'building': sorted(
+            (t.building_id, t.field, t.source_site, t.value, t.listing_count, t.active_count)
+            for t in db.query(BuildingVoteTally)
+        ),
+    }
+
+
+def _sorted_votes(votes):
+    return {field: sorted(values) for field, values in votes.items()}
+
+
+def test_tracker_matches_refresh(db):
+    """掲載ごとの差分反映の結果が、掲載情報からの作り直しと一致する"""
+    tracker = ListingVoteTracker(db)
+    for listing in (
+        _listing(db, 1, 1, 'suumo', listing_area=70.0, listing_layout='3LDK', current_price=8000,
+                 listing_total_floors=20),
+        _listing(db, 2, 1, 'homes', listing_area=70, listing_layout='3LDK', current_price=7980,
+                 listing_total_floors=20),
+        _listing(db, 3, 2, 'suumo', listing_area=55.5, listing_layout='2LDK', current_price=6000),
+    ):
+        db.flush()
+        tracker.track_new(listing)
+    tracker.apply()
+
+    # 値の変更・掲載終了・物件の付け替え
+    listing1, listing2, listing3 = (db.get(PropertyListing, i) for i in (1, 2, 3))
+    tracker.track(listing1)
+    tracker.track(listing2)
+    tracker.track(listing3)
+    listing1.current_price = 7900
+    listing2.is_active = False
+    listing3.master_property_id = 1
+    tracker.apply()
+    db.commit()
+
+    incremental = _tallies(db)
+    rebuild_vote_tallies(db)
+    db.commit()
+    assert incremental == _tallies(db)
+
+    # 面積の 70 と 70.0 は同じ値として集計される
+    assert ('areas', '70.0', 'homes', 1, 0) in [
+        (field, value, site, count, active) for pid, field, site, value, count, active in incremental['property']
+        if pid == 1
+    ]
+    # 票がなくなった物件の集計は削除される
+    assert not [row for row in incremental['property'] if row[0] == 2]
+
+
+def test_load_votes_matches_listing_collection(db):
+    """集計から組み立てた票が、掲載情報から収集した票と一致する"""
+    _listing(db, 1, 1, 'suumo', listing_floor_number=10, listing_area=70.0, listing_direction='南',
+             listing_address='東京都港区芝浦1-1', listing_total_floors=20, listing_built_year=2010,
+             listing_station_info='田町駅 徒歩5分')
+    _listing(db, 2, 1, 'homes', listing_floor_number=10, listing_area=70.1, listing_direction='南',
+             listing_address='東京都港区芝浦1-1', listing_total_floors=21, listing_built_year=2010)
+    _listing(db, 3, 1, 'rehouse', active=False, listing_floor_number=11,
+             listing_station_info='芝浦ふ頭駅 徒歩8分')
+    _listing(db, 4, 2, 'suumo', active=False, listing_floor_number=3, listing_built_year=2009)
+    db.flush()
+    refresh_vote_tallies(db, property_ids=[1, 2])
+
+    updater = MajorityVoteUpdater(db, use_vote_tallies=False)
+    for property_id, active_only in ((1, True), (2, False)):
+        expected = updater.collect_property_info_from_listings(db.get(MasterProperty, property_id))
+        votes = load_property_votes(db, property_id, active_only=active_only, fields=expected.keys())
+        assert _sorted_votes(votes) == _sorted_votes(expected)
+
+    expected = updater.collect_building_info_from_listings(1)
+    votes = MajorityVoteUpdater(db, use_vote_tallies=True).collect_building_votes(1)
+    assert _sorted_votes(votes) == _sorted_votes(expected)
+    # 交通情報はアクティブな掲載のみの票
+    assert load_building_votes(db, 1, active_only=True, fields=['station_infos']) == {
+        'station_infos': [('田町駅 徒歩5分', 'suumo')]
+    }
+
+
+def test_majority_update_uses_tallies(db):
+    """票集計から多数決を取り、物件・建物の値を更新する"""
+    for listing_id, site in ((1, 'suumo'), (2, 'homes'), (3, 'rehouse')):
+        _listing(db, listing_id, 1, site, listing_floor_number=10 if listing_id != 3 else 12,
+                 listing_area=70.0, listing_total_floors=20, current_price=8000)
+    db.flush()
+    refresh_vote_tallies(db, property_ids=[1])
+
+    updater = MajorityVoteUpdater(db, use_vote_tallies=True)
+    master_property = db.get(MasterProperty, 1)
+    updater.update_master_property_by_majority(master_property)
+    updater.update_building_by_majority(db.get(Building, 1))
+
+    assert master_property.floor_number == 10
+    assert master_property.area == 70.0
+    assert db.get(Building, 1).total_floors == 20
+
+
+@pytest.mark.parametrize('areas', [(70.5, 70.1), (70.1, 70.5)])
+def test_tie_break_does_not_depend_on_listing_order(db, areas):
+    """同じサイト・同じ票数の値は、掲載の順序によらず値の昇順で先にくる方が選ばれる"""
+    for listing_id, area in enumerate(areas, start=1):
+        _listing(db, listing_id, 1, 'suumo', listing_area=area)
+    db.flush()
+    refresh_vote_tallies(db, property_ids=[1])
+
+    assert load_property_votes(db, 1, active_only=True, fields=['areas']) == {
+        'areas': [(70.1, 'suumo'), (70.5, 'suumo')]
+    }
+    master_property = db.get(MasterProperty, 1)
+    MajorityVoteUpdater(db, use_vote_tallies=True).update_master_property_by_majority(master_property)
+    assert master_property.area == 70.1
+
+
+def test_refresh_after_building_move(db):
+    """物件の建物移動後に作り直すと、移動元・移動先の建物の集計が入れ替わる"""
+    _listing(db, 1, 2, 'suumo', listing_total_floors=30)
+    db.flush()
+    refresh_vote_tallies(db, property_ids=[2])
+
+    db.get(MasterProperty, 2).building_id = 2
+    refresh_vote_tallies(db, property_ids=[2], building_ids=[1])
+
+    assert load_building_votes(db, 1, active_only=False, fields=['total_floors']) == {'total_floors': []}
+    assert load_building_votes(db, 2, active_only=False, fields=['total_floors']) == {
+        'total_floors': [(30, 'suumo')]
+    }
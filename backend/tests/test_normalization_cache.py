@@ -0,0 +1,74 @@
+"""
+正規化結果のメモ化（normalization_cache）のテスト
+"""
+
+from backend.app.utils.address_normalizer import (
+    AddressNormalizer,
+    get_address_normalizer,
+    normalize_address_for_comparison,
+)
+from backend.app.utils.normalization_cache import (
+    clear_normalization_caches,
+    memoize_normalizer,
+    normalize_many,
+    normalization_cache_info,
+)
+
+
+class TestNormalizationCache:
+    """メモ化とまとめての正規化のテスト"""
+
+    def setup_method(self):
+        clear_normalization_caches()
+
+    def test_memoized_result_matches_uncached(self):
+        """メモ化した結果がメモ化なしの結果と一致する"""
+        addresses = [
+            "東京都港区芝浦１丁目３番地５号",
+            "東京都港区芝浦一丁目三番地五号",
+            "東京都千代田区一番町26-1 地図を見る",
+            "",
+        ]
+        for address in addresses:
+            expected = normalize_address_for_comparison.__wrapped__(address)
+            assert normalize_address_for_comparison(address) == expected
+            assert normalize_address_for_comparison(address) == expected
+
+    def test_address_normalizer_uses_memoized_functions(self):
+        """AddressNormalizer のメソッドもメモ化された結果を返す"""
+        normalizer = AddressNormalizer()
+        assert normalizer.normalize_for_comparison("東京都港区芝浦１－３－５") == "東京都港区芝浦1-3-5"
+        assert normalizer.normalize_for_comparison("東京都港区芝浦１丁目３番５号") == "東京都港区芝浦1-3-5"
+
+        info = normalization_cache_info()
+        key = f"{normalize_address_for_comparison.__module__}.{normalize_address_for_comparison.__qualname__}"
+        assert info[key]["misses"] == 2
+        assert get_address_normalizer() is get_address_normalizer()
+
+    def test_normalize_many_keeps_order_and_normalizes_duplicates_once(self):
+        """normalize_many は入力順に結果を返し、重複する入力は1回だけ正規化する"""
+        calls = []
+
+        def upper(value):
+            calls.append(value)
+            return value.upper()
+
+        assert normalize_many(["b", "a", "b", "c", "a"], upper) == ["B", "A", "B", "C", "A"]
+        assert calls == ["b", "a", "c"]
+
+    def test_clear_normalization_caches(self):
+        """clear_normalization_caches で全てのキャッシュが空になる"""
+        calls = []
+
+        @memoize_normalizer
+        def normalize(value):
+            calls.append(value)
+            return value.strip()
+
+        normalize(" x ")
+        normalize(" x ")
+        assert calls == [" x "]
+
+        clear_normalization_caches()
+        normalize(" x ")
+        assert calls == [" x ", " x "]
@@ -0,0 +1,52 @@
+"""ページストアのテスト"""
+from backend.app.scrapers.components.page_store import PageStoreComponent
+
+
+class TestPageStore:
+    """PageStoreComponentのテスト"""
+
+    def test_save_and_load(self, tmp_path):
+        """保存した本文とバリデータを読み出せる"""
+        store = PageStoreComponent(str(tmp_path))
+        body_hash, changed = store.save(
+            'https://example.com/a', '<html>港区</html>',
+            etag='"abc"', last_modified='Wed, 01 Jan 2025 00:00:00 GMT'
+        )
+
+        assert changed
+        assert store.load_body('https://example.com/a') == '<html>港区</html>'
+        assert store.get_conditional_headers('https://example.com/a') == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT',
+        }
+        assert store.get_entry('https://example.com/a')['body_hash'] == body_hash
+
+    def test_identical_body_is_not_changed(self, tmp_path):
+        """同一本文の再保存は変更なしとして扱い、履歴も増やさない"""
+        store = PageStoreComponent(str(tmp_path))
+        store.save('https://example.com/a', '<html>v1</html>')
+        _, changed = store.save('https://example.com/a', '<html>v1</html>')
+        assert not changed
+
+        _, changed = store.save('https://example.com/a', '<html>v2</html>')
+        assert changed
+
+        versions = store.get_versions('https://example.com/a')
+        assert len(versions) == 2
+        assert store.load_object(versions[0]['body_hash']) == '<html>v1</html>'
+        assert store.load_body('https://example.com/a') == '<html>v2</html>'
+
+    def test_content_addressed_objects_are_shared(self, tmp_path):
+        """同じ本文は1つのオブジェクトとして保存される"""
+        store = PageStoreComponent(str(tmp_path))
+        hash_a, _ = store.save('https://example.com/a', '<html>same</html>')
+        hash_b, _ = store.save('https://example.com/b', '<html>same</html>')
+
+        assert hash_a == hash_b
+        assert len(list((tmp_path / 'objects').rglob('*.html.gz'))) == 1
+
+    def test_no_conditional_headers_for_unknown_url(self, tmp_path):
+        """未保存のURLには条件付きヘッダーを付けない"""
+        store = PageStoreComponent(str(tmp_path))
+        assert store.get_conditional_headers('https://example.com/unknown') == {}
+        assert store.load_body('https://example.com/unknown') is None
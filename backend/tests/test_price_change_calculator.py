@@ -0,0 +1,176 @@
+"""価格改定履歴の一括計算（PriceChangeCalculator）のテスト"""
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import (
+    Base, Building, MasterProperty, PropertyListing, ListingPriceHistory,
+    PropertyPriceChange, PropertyPriceChangeQueue
+)
+from backend.app.utils.price_change_calculator import (
+    PriceChangeCalculator, process_queue_in_parallel, _CLAIM_QUEUE_SQL
+)
+from backend.tests.price_change_reference import reference_calculate_price_changes
+
+
+SOURCES = ['suumo', 'homes', 'rehouse', 'nomu', 'livable']
+
+
+@pytest.fixture
+def pg_session_factory(pg_engine):
+    Base.metadata.create_all(pg_engine)
+    factory = sessionmaker(bind=pg_engine)
+    session = factory()
+    session.add(Building(id=1, normalized_name='テストタワー'))
+    session.commit()
+    session.close()
+    return factory
+
+
+def _seed_price_histories(session, rng: random.Random, property_count: int):
+    """再掲載・掲載終了・履歴のない掲載を含む価格履歴をランダムに作成"""
+    today = datetime.combine(date.today(), datetime.min.time())
+    listing_id = 0
+    for property_id in range(1, property_count + 1):
+        session.add(MasterProperty(id=property_id, building_id=1))
+        base_price = rng.choice([5000, 6980, 8000])
+        prices = [base_price + step * 100 for step in range(-2, 2)]
+        for _ in range(rng.randint(1, 5)):
+            listing_id += 1
+            start = today - timedelta(days=rng.randint(0, 90), hours=rng.randint(0, 23))
+            is_active = rng.random() < 0.6
+            delisted_at = None
+            if not is_active and rng.random() < 0.8:
+                delisted_at = start + timedelta(days=rng.randint(-3, 60))
+            session.add(PropertyListing(
+                id=listing_id, master_property_id=property_id, source_site=rng.choice(SOURCES),
+                site_property_id=str(listing_id), url=f'https://example.com/{listing_id}',
+                is_active=is_active, current_price=rng.choice(prices + [None]),
+                first_published_at=start if rng.random() < 0.7 else None,
+                first_seen_at=start if rng.random() < 0.8 else None,
+                created_at=start, delisted_at=delisted_at,
+                last_confirmed_at=start + timedelta(days=rng.randint(0, 60))
+            ))
+            for _ in range(rng.randint(0, 6)):
+                session.add(ListingPriceHistory(
+                    property_listing_id=listing_id, price=rng.choice(prices),
+                    recorded_at=start + timedelta(days=rng.randint(-5, 70), hours=rng.randint(0, 23))
+                ))
+    session.commit()
+
+
+def _normalize(changes):
+    return [
+        (c['change_date'], c['new_price'], c['old_price'], c['price_diff'], float(c['price_diff_rate']),
+         c['new_price_votes'], c['old_price_votes'])
+        for c in changes
+    ]
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize('seed', range(3))
+def test_recalculate_matches_reference(pg_session_factory, seed):
+    """一括計算で保存した履歴が、物件ごとに計算する変更前の実装と一致する"""
+    session = pg_session_factory()
+    _seed_price_histories(session, random.Random(seed), property_count=30)
+    property_ids = list(range(1, 31))
+
+    calculator = PriceChangeCalculator(session)
+    assert calculator.recalculate_price_changes(property_ids) > 0
+    session.commit()
+
+    stored = {pid: [] for pid in property_ids}
+    for change in session.query(PropertyPriceChange).order_by(
+        PropertyPriceChange.master_property_id, PropertyPriceChange.change_date
+    ):
+        stored[change.master_property_id].append({
+            column: getattr(change, column) for column in (
+                'change_date', 'new_price', 'old_price', 'price_diff', 'price_diff_rate',
+                'new_price_votes', 'old_price_votes'
+            )
+        })
+
+    start_date = date.today() - timedelta(days=30)
+    batch = calculator.calculate_price_changes_batch(property_ids, start_date)
+    for property_id in property_ids:
+        assert _normalize(stored[property_id]) == _normalize(
+            reference_calculate_price_changes(session, property_id)
+        )
+        assert _normalize(batch[property_id]) == _normalize(
+            reference_calculate_price_changes(session, property_id, start_date)
+        )
+    session.close()
+
+
+def _add_queue_items(session, count: int, **values):
+    for property_id in range(1, count + 1):
+        session.add(MasterProperty(id=property_id, building_id=1))
+    session.flush()
+    for property_id in range(1, count + 1):
+        session.add(PropertyPriceChangeQueue(master_property_id=property_id, reason='test', **values))
+    session.commit()
+
+
+@pytest.mark.postgres
+def test_concurrent_claims_do_not_overlap(pg_session_factory):
+    """他のワーカーが取り出し中の行は飛ばし、同じ行を2回取り出さない"""
+    session = pg_session_factory()
+    _add_queue_items(session, 10, status='pending')
+
+    # ワーカー1が取り出したままコミットしていない状態で、ワーカー2が取り出す
+    first = pg_session_factory()
+    first_claimed = first.execute(text(_CLAIM_QUEUE_SQL), {'batch_size': 4}).fetchall()
+    second = pg_session_factory()
+    second_claimed = PriceChangeCalculator(second).claim_queue_items(10)
+    first.commit()
+
+    first_ids = {row.id for row in first_claimed}
+    second_ids = {queue_id for queue_id, _ in second_claimed}
+    assert len(first_ids) == 4 and len(second_ids) == 6
+    assert not first_ids & second_ids
+    assert PriceChangeCalculator(second).claim_queue_items(10) == []
+
+    first.close()
+    second.close()
+    session.close()
+
+
+@pytest.mark.postgres
+def test_parallel_workers_process_each_item_once(pg_session_factory):
+    """複数のワーカーで並列に処理しても、各キューは1回だけ処理される"""
+    session = pg_session_factory()
+    _add_queue_items(session, 30, status='pending')
+
+    stats = process_queue_in_parallel(workers=4, limit=100, batch_size=3,
+                                      session_factory=pg_session_factory)
+
+    assert stats == {'processed': 30, 'failed': 0, 'changes_found': 0}
+    statuses = [status for (status,) in session.query(PropertyPriceChangeQueue.status)]
+    assert statuses == ['completed'] * 30
+    session.close()
+
+
+@pytest.mark.postgres
+def test_requeue_stale_items(pg_session_factory):
+    """一定時間以上 processing のまま残ったキューだけを pending に戻す"""
+    session = pg_session_factory()
+    for property_id in (1, 2, 3, 4):
+        session.add(MasterProperty(id=property_id, building_id=1))
+    session.flush()
+    for property_id, status, minutes_ago in (
+        (1, 'processing', 45), (2, 'processing', 5), (3, 'completed', 45), (4, 'pending', 45),
+    ):
+        session.add(PropertyPriceChangeQueue(
+            master_property_id=property_id, reason='test', status=status,
+            updated_at=func.now() - timedelta(minutes=minutes_ago)
+        ))
+    session.commit()
+
+    assert PriceChangeCalculator(session).requeue_stale_items(minutes=30) == 1
+
+    statuses = dict(session.query(PropertyPriceChangeQueue.master_property_id, PropertyPriceChangeQueue.status))
+    assert statuses == {1: 'pending', 2: 'processing', 3: 'completed', 4: 'pending'}
+    session.close()
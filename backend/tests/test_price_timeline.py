@@ -0,0 +1,76 @@
+"""統合価格タイムライン（create_unified_price_timeline）のテスト"""
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from backend.app.api.price_analysis import create_unified_price_timeline
+from backend.tests.price_timeline_reference import reference_unified_price_timeline
+
+
+SOURCES = ['suumo', 'homes', 'rehouse', 'nomu', 'livable']
+
+
+def _random_price_records(rng: random.Random):
+    """get_property_details と同じ形式の価格履歴レコードをランダムに作成"""
+    today = date.today()
+    base_price = rng.choice([5000, 6980, 8000, 12800])
+    prices = [base_price + step * 100 for step in range(-3, 2)]
+
+    records = []
+    for listing_id in range(1, rng.randint(1, 8) + 1):
+        # 再掲載を含む長期間の掲載と、開始日より前の履歴・未来の日付の履歴も作る
+        start = datetime.combine(today - timedelta(days=rng.randint(0, 400)), datetime.min.time())
+        is_active = rng.random() < 0.6
+        delisted_at = None
+        if not is_active and rng.random() < 0.8:
+            delisted_at = start + timedelta(days=rng.randint(-5, 200))
+        current_price = rng.choice(prices + [None])
+        listing_start_date = start if rng.random() < 0.9 else None
+        source = rng.choice(SOURCES)
+
+        for _ in range(rng.randint(0, 12)):
+            recorded_at = start + timedelta(days=rng.randint(-10, 420), hours=rng.randint(0, 23))
+            records.append({
+                'recorded_at': recorded_at,
+                'price': rng.choice(prices),
+                'source_site': source,
+                'listing_id': listing_id,
+                'is_active': is_active,
+                'current_price': current_price,
+                'listing_start_date': listing_start_date,
+                'delisted_at': delisted_at,
+            })
+    records.sort(key=lambda record: record['recorded_at'])
+    return records
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_matches_reference_implementation(seed):
+    """日付ごとに全掲載の履歴を走査する変更前の実装と同じ結果になる"""
+    records = _random_price_records(random.Random(seed))
+    assert create_unified_price_timeline(records) == reference_unified_price_timeline(records)
+
+
+def test_majority_follows_delisting():
+    """掲載終了の翌日から残った掲載の多数決になり、価格変更として記録される"""
+    start = datetime(2026, 1, 1)
+    records = []
+    for listing_id, source, price, delisted_at in (
+        (1, 'suumo', 5000, datetime(2026, 2, 1)),
+        (2, 'homes', 5000, datetime(2026, 2, 1)),
+        (3, 'rehouse', 4800, None),
+    ):
+        records.append({
+            'recorded_at': start, 'price': price, 'source_site': source, 'listing_id': listing_id,
+            'is_active': delisted_at is None, 'current_price': price, 'listing_start_date': start,
+            'delisted_at': delisted_at,
+        })
+
+    result = create_unified_price_timeline(records)
+    assert [(entry['date'], entry['price']) for entry in result['timeline']][:3] == [
+        ('2026-01-01', 5000), ('2026-02-01', 5000), ('2026-02-02', 4800)
+    ]
+    assert result['timeline'][0]['sources'] == {'suumo': 5000, 'homes': 5000, 'rehouse': 4800}
+    assert result['price_changes'][0]['date'] == '2026-02-02'
+    assert result == reference_unified_price_timeline(records)
@@ -0,0 +1,144 @@
+"""物件重複候補の事前計算（property_duplicate_candidates）のテスト"""
+from datetime import datetime
+
+import pytest
+
+from backend.app.models import (
+    Building, MasterProperty, PropertyListing, PropertyMergeExclusion,
+    PropertyDuplicateCandidate, PropertyDuplicateCandidateRun
+)
+from backend.app.utils.property_duplicate_candidates import (
+    refresh_property_duplicate_candidates, update_property_duplicate_candidates
+)
+
+
+OLD = datetime(2026, 1, 1)
+
+PROPERTIES = [
+    # id, 建物ID, 階, 面積, 間取り, 販売中の掲載の価格
+    (1, 1, 5, 60.4, '2LDK', [8000, 8000, 8200]),
+    (2, 1, 5, 60.9, '2LDK+S', [8100]),
+    (3, 1, 5, 61.2, '2LDK', [8300]),         # 面積が1㎡単位で違う
+    (4, 1, 5, 60.5, '2LDK', []),             # 販売中の掲載なし
+    (5, 1, 8, 45.0, '3LD', [6000]),
+    (6, 1, 8, 45.3, '3SLDK', [6100]),
+    (7, 2, 3, 30.0, '1K', [3000]),
+    (8, 2, 3, 30.8, '1DK', [3100]),
+    (9, 2, 3, 30.2, '1S+S', [3200]),
+]
+
+
+@pytest.fixture
+def db(sqlite_session):
+    # 生成列（base_layout）の regexp_replace は conftest.py の sqlite_engine で登録している
+    session = sqlite_session(Building, MasterProperty, PropertyListing, PropertyMergeExclusion,
+                             PropertyDuplicateCandidate, PropertyDuplicateCandidateRun)
+
+    session.add(Building(id=1, normalized_name='テストタワー', updated_at=OLD))
+    session.add(Building(id=2, normalized_name='別のマンション', updated_at=OLD))
+    listing_id = 0
+    for property_id, building_id, floor, area, layout, prices in PROPERTIES:
+        session.add(MasterProperty(
+            id=property_id, building_id=building_id, floor_number=floor, area=area, layout=layout,
+            created_at=OLD, updated_at=OLD
+        ))
+        for i, price in enumerate(prices or [None]):
+            listing_id += 1
+            session.add(PropertyListing(
+                id=listing_id, master_property_id=property_id, source_site=f'site{i}',
+                site_property_id=str(listing_id), url=f'https://example.com/{listing_id}',
+                is_active=bool(prices), current_price=price, agency_name=f'不動産{i}',
+                created_at=OLD, updated_at=OLD
+            ))
+    session.commit()
+    return session
+
+
+def _groups(db):
+    groups = {}
+    for row in db.query(PropertyDuplicateCandidate):
+        groups.setdefault(row.group_id, set()).add(row.master_property_id)
+    return sorted(groups.values(), key=min)
+
+
+def test_full_update_groups_by_generated_columns(db):
+    """面積（1㎡単位）と基本間取り（生成列）でグループ化し、2件以上のグループだけ保存する"""
+    result = update_property_duplicate_candidates(db)
+    assert result['is_full'] is True
+
+    assert _groups(db) == [{1, 2}, {5, 6}, {7, 8}]
+    rows = {row.master_property_id: row for row in db.query(PropertyDuplicateCandidate)}
+    assert (rows[2].rounded_area, rows[2].base_layout, rows[2].group_id, rows[2].group_size) == (60, '2LDK', 1, 2)
+    assert rows[5].base_layout == rows[6].base_layout == '3LDK'
+    assert rows[7].base_layout == '1DK'
+    assert result['candidate_count'] == 6
+
+
+def test_incremental_update_reevaluates_only_changed_buildings(db):
+    """前回の更新以降に物件・掲載が変わった建物と、整合性が崩れた建物だけ再評価する"""
+    update_property_duplicate_candidates(db)
+
+    # 変更なし
+    assert update_property_duplicate_candidates(db)['building_count'] == 0
+
+    # 建物1の物件の面積が変わった（updated_at が更新される）
+    db.get(MasterProperty, 3).area = 60.1
+    db.commit()
+    result = update_property_duplicate_candidates(db)
+    assert result['is_full'] is False
+    assert result['building_count'] == 1
+    assert _groups(db) == [{1, 2, 3}, {5, 6}, {7, 8}]
+
+    # updated_at を更新せずに物件が別の建物に移動した場合も保存済みの候補から検出する
+    db.query(MasterProperty).filter(MasterProperty.id == 8).update(
+        {'building_id': 1, 'updated_at': OLD}, synchronize_session=False
+    )
+    db.commit()
+    result = update_property_duplicate_candidates(db)
+    assert result['building_count'] == 2
+    assert _groups(db) == [{1, 2, 3}, {5, 6}]
+
+    assert db.query(PropertyDuplicateCandidateRun).count() == 4
+
+
+def test_refresh_specified_buildings(db):
+    """指定建物だけ作り直す（販売終了した物件はグループから外れる）"""
+    update_property_duplicate_candidates(db)
+
+    db.query(PropertyListing).filter(PropertyListing.master_property_id == 6).update(
+        {'is_active': False}, synchronize_session=False
+    )
+    refresh_property_duplicate_candidates(db, [1])
+    db.commit()
+    assert _groups(db) == [{1, 2}, {7, 8}]
+
+
+def test_admin_endpoint_pages_precomputed_groups(db):
+    """管理画面の物件重複候補は物件数順にページングし、除外設定はその場で反映する"""
+    from backend.app.api.admin.duplicates import get_duplicate_properties
+
+    db.get(MasterProperty, 3).area = 60.1
+    db.commit()
+    update_property_duplicate_candidates(db)
+
+    result = get_duplicate_properties(limit=2, offset=0, building_name=None, db=db)
+    assert result['optimization'] == 'v4_precomputed'
+    assert result['total'] == 3
+    first = result['groups'][0]
+    assert (first['group_id'], first['property_count'], first['building_name']) == ('group_1', 3, 'テストタワー')
+    assert (first['floor_number'], first['layout'], first['area']) == (5, '2LDK', 60.0)
+    assert first['property_ids'] == [1, 2, 3]
+    details = first['properties']
+    assert [detail['id'] for detail in details] == [1, 2, 3]   # 掲載数の多い順
+    assert details[0]['current_price'] == 8000                  # 最頻値
+    assert (details[0]['listing_count'], details[0]['source_count']) == ('3', '3')
+    assert details[0]['agency_names'] == '不動産0, 不動産1, 不動産2'
+
+    second_page = get_duplicate_properties(limit=2, offset=2, building_name=None, db=db)
+    assert [group['group_id'] for group in second_page['groups']] == ['group_3']
+
+    db.add(PropertyMergeExclusion(property1_id=6, property2_id=5))
+    db.commit()
+    result = get_duplicate_properties(limit=50, offset=0, building_name=None, db=db)
+    assert result['total'] == 2
+    assert [group['property_ids'] for group in result['groups']] == [[1, 2, 3], [7, 8]]
@@ -0,0 +1,152 @@
+"""物件一覧API（検索用集計テーブル）のテスト"""
+from datetime import datetime, date
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.api.properties import get_properties
+from backend.app.models import Building, MasterProperty, PropertySearchSummary
+
+
+@pytest.fixture
+def db(sqlite_session):
+    session = sqlite_session(Building, MasterProperty, PropertySearchSummary)
+
+    session.add(Building(id=1, normalized_name='テストタワー', address='東京都港区芝浦1', built_year=2010))
+    rows = [
+        # (物件ID, 販売中, 現在価格, 最終価格, 表示価格, 面積, 価格改定日, 売出確認日)
+        (1, True, 5000, None, 5000, 50.0, date(2026, 10, 1), datetime(2026, 9, 1)),
+        (2, True, None, None, 6000, 60.0, None, datetime(2026, 10, 5)),
+        (3, False, None, 7000, 7000, 70.0, None, datetime(2026, 8, 1)),
+        (4, True, 8000, None, 8000, 80.0, date(2026, 10, 1), datetime(2026, 7, 1)),
+    ]
+    for property_id, active, current_price, final_price, display_price, area, price_update, published in rows:
+        session.add(MasterProperty(
+            id=property_id, building_id=1, area=area, current_price=current_price,
+            final_price=final_price, sold_at=None if active else datetime(2026, 9, 30)
+        ))
+        session.add(PropertySearchSummary(
+            master_property_id=property_id, building_id=1,
+            listing_count=1 if active else 0, has_active_listing=active, has_listing=True,
+            active_source_sites='SUUMO' if active else None, all_source_sites='SUUMO,HOMES',
+            earliest_published_at=published, latest_price_update=price_update,
+            latest_price_update_time=datetime(2026, 10, 1, property_id) if price_update else None,
+            has_price_change=price_update is not None,
+            current_price=current_price, final_price=final_price, display_price=display_price,
+            area=area, built_year=2010, tsubo_price=(current_price or final_price) / (area / 3.30578)
+            if (current_price or final_price) else None,
+            sort_updated_at=datetime.combine(price_update, datetime.min.time()) if price_update else published,
+            is_sold=not active
+        ))
+    session.commit()
+    return session
+
+
+def _list(db, **params):
+    defaults = dict(
+        min_price=None, max_price=None, min_area=None, max_area=None, layouts=None,
+        building_name=None, max_building_age=None, wards=None, land_rights_types=None,
+        include_inactive=False, page=1, per_page=30, sort_by='updated_at', sort_order='desc',
+        cursor=None, count_mode='exact'
+    )
+    defaults.update(params)
+    return get_properties(db=db, **defaults)
+
+
+def test_active_properties_sorted_by_update(db):
+    result = _list(db)
+    # 価格改定日（なければ売出確認日）の新しい順、同日は価格改定時刻の新しい順
+    assert [p['id'] for p in result['properties']] == [2, 4, 1]
+    assert result['total'] == 3
+    assert result['sold_count'] == 0
+    assert result['properties'][0]['source_sites'] == ['SUUMO']
+
+
+def test_display_price_falls_back_to_summary(db):
+    prices = {p['id']: p['current_price'] for p in _list(db)['properties']}
+    assert prices[2] == 6000
+
+
+def test_include_inactive_counts_sold(db):
+    result = _list(db, include_inactive=True, sort_by='price', sort_order='asc')
+    assert result['total'] == 4
+    assert result['sold_count'] == 1
+    sold = next(p for p in result['properties'] if p['id'] == 3)
+    assert sold['current_price'] == 7000
+    assert sold['source_sites'] == ['SUUMO', 'HOMES']
+
+
+def test_price_filter_uses_final_price_for_sold(db):
+    result = _list(db, include_inactive=True, min_price=6500, max_price=7500)
+    assert [p['id'] for p in result['properties']] == [3]
+
+
+def test_pagination(db):
+    result = _list(db, per_page=2, page=2, sort_by='area', sort_order='asc')
+    assert [p['id'] for p in result['properties']] == [4]
+    assert result['total_pages'] == 2
+
+
+@pytest.mark.parametrize('sort_by', ['updated_at', 'price', 'area', 'building_age', 'tsubo_price', 'earliest_published_at'])
+@pytest.mark.parametrize('sort_order', ['desc', 'asc'])
+def test_cursor_pages_match_offset_order(db, sort_by, sort_order):
+    expected = [p['id'] for p in _list(db, include_inactive=True, sort_by=sort_by, sort_order=sort_order)['properties']]
+
+    ids, cursor = [], None
+    while True:
+        result = _list(db, include_inactive=True, sort_by=sort_by, sort_order=sort_order,
+                       per_page=1, cursor=cursor, count_mode='none')
+        ids.extend(p['id'] for p in result['properties'])
+        cursor = result['next_cursor']
+        if not result['has_more']:
+            break
+    assert ids == expected
+    assert result['total'] is None
+
+
+def test_cursor_from_other_sort_is_rejected(db):
+    from fastapi import HTTPException
+
+    cursor = _list(db, per_page=1, sort_by='price')['next_cursor']
+    with pytest.raises(HTTPException):
+        _list(db, per_page=1, sort_by='area', cursor=cursor)
+
+
+@pytest.mark.postgres
+def test_admin_edits_refresh_summary(pg_engine):
+    """管理画面での物件・建物・掲載の変更が検索用集計に反映される"""
+    import asyncio
+    from backend.app.api.admin_buildings import update_building
+    from backend.app.api.admin_listings import delete_listing
+    from backend.app.api.admin_properties import update_property
+    from backend.app.models import Base, PropertyListing
+    from backend.app.utils.property_search_summary import rebuild_property_search_summary
+
+    Base.metadata.create_all(pg_engine)
+    db = sessionmaker(bind=pg_engine)()
+    db.add(Building(id=1, normalized_name='テストタワー', built_year=2010))
+    db.add(MasterProperty(id=1, building_id=1, area=50.0, current_price=5000))
+    for listing_id, source in ((1, 'suumo'), (2, 'homes')):
+        db.add(PropertyListing(
+            id=listing_id, master_property_id=1, source_site=source, site_property_id=str(listing_id),
+            url=f'https://example.com/{listing_id}', is_active=True, current_price=5000
+        ))
+    db.commit()
+    rebuild_property_search_summary(db)
+    db.commit()
+
+    def summary():
+        db.expire_all()
+        return db.get(PropertySearchSummary, 1)
+
+    assert (summary().listing_count, summary().active_source_sites) == (2, 'homes,suumo')
+
+    asyncio.run(delete_listing(listing_id=2, db=db))
+    assert (summary().listing_count, summary().active_source_sites) == (1, 'suumo')
+
+    asyncio.run(update_property(property_id=1, data={'area': 66.12}, db=db))
+    assert summary().area == 66.12
+
+    asyncio.run(update_building(building_id=1, data={'built_year': 2015}, db=db))
+    assert summary().built_year == 2015
+    db.close()
@@ -0,0 +1,96 @@
+"""スクレイパーエラーログ（JSON Lines）のテスト"""
+import json
+import multiprocessing
+from datetime import datetime, timedelta
+
+from backend.app.utils.scraper_error_logger import ErrorLogStore, ScraperErrorLogger
+
+
+def _write_records(path, worker, count):
+    store = ErrorLogStore(path, max_bytes=4096, backup_count=1000)
+    for i in range(count):
+        store.append({
+            "timestamp": datetime.now().isoformat(),
+            "scraper": f"worker{worker}",
+            "error_type": "parsing",
+            "url": f"https://example.com/{worker}/{i}",
+            "html_snippet": "x" * 100,
+        })
+    store.close()
+
+
+def test_summary_and_selector_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    logger = ScraperErrorLogger("suumo")
+
+    # 期間外のエラーは集計しない
+    logger.store.append({
+        "timestamp": (datetime.now() - timedelta(hours=30)).isoformat(),
+        "scraper": "suumo", "error_type": "validation", "url": "https://example.com/old"
+    })
+    for _ in range(12):
+        logger.log_parsing_error("https://example.com/1", ["div.price"], html_snippet="<div>")
+    logger.log_validation_error({"building_name": "テストタワー"}, ["価格なし"], url="https://example.com/2")
+
+    summary = logger.get_error_summary(hours=24)
+    assert summary["total_errors"] == 13
+    assert summary["error_types"] == {"parsing": 12, "validation": 1}
+    assert summary["top_error_urls"][0] == ("https://example.com/1", 12)
+
+    assert logger.check_selector_changes() == [
+        {"selector": "div.price", "error_count": 12, "possible_change": True}
+    ]
+
+    # 追記分だけが読み込まれて集計に反映される
+    logger.log_parsing_error("https://example.com/3", ["h1.title"])
+    assert logger.get_error_summary(hours=24)["total_errors"] == 14
+
+
+def test_rotation_keeps_backup_count(tmp_path):
+    path = tmp_path / "errors.jsonl"
+    store = ErrorLogStore(path, max_bytes=1024, backup_count=2)
+    for i in range(100):
+        store.append({"timestamp": datetime.now().isoformat(), "error_type": "parsing", "url": str(i)})
+
+    assert len(store.rotated_segments()) == 2
+    for segment in store.segments():
+        assert segment.stat().st_size < 1024 + 200
+
+    # 残っているのは最新のエラー
+    urls = [record["url"] for record in store.iter_records()]
+    assert urls == [str(i) for i in range(100 - len(urls), 100)]
+
+
+def test_concurrent_appends_from_processes(tmp_path):
+    path = tmp_path / "errors.jsonl"
+    processes = [
+        multiprocessing.Process(target=_write_records, args=(path, worker, 200))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    lines = [
+        line
+        for segment in ErrorLogStore(path).segments()
+        for line in segment.read_text(encoding="utf-8").splitlines()
+    ]
+    # 行が混ざらず、全件が1行ずつ残る
+    assert len(lines) == 800
+    assert len({json.loads(line)["url"] for line in lines}) == 800
+
+
+def test_migrates_legacy_json(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "scraper_errors.json").write_text(json.dumps([
+        {"timestamp": datetime.now().isoformat(), "scraper": "homes", "error_type": "saving"}
+    ]), encoding="utf-8")
+
+    logger = ScraperErrorLogger("homes")
+
+    assert logger.get_error_summary()["error_types"] == {"saving": 1}
+    assert not (tmp_path / "logs" / "scraper_errors.json").exists()
+    assert (tmp_path / "logs" / "scraper_errors.json.bak").exists()
@@ -0,0 +1,176 @@
+"""サイトマップの生成（sitemap_shards）のテスト"""
+import asyncio
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.app.models import Building, MasterProperty, PropertyListing, SitemapShard
+from backend.app.utils.sitemap_builder import (
+    count_sitemap_urls, iter_shard_xml, iter_sitemap_urls, rebuild_sitemap_shards
+)
+
+NS = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    for model in (Building, MasterProperty, PropertyListing, SitemapShard):
+        model.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+
+    session = Session()
+    # 建物1: 販売中2件、建物2: 販売終了のみ、建物3: 販売中1件
+    for building_id in (1, 2, 3):
+        session.add(Building(id=building_id, normalized_name=f'建物{building_id}'))
+    listings = [
+        # 物件ID, 建物ID, 販売中, 更新日時
+        (10, 1, True, datetime(2026, 10, 1, 9)),
+        (11, 1, True, datetime(2026, 10, 3, 9)),
+        (11, 1, False, datetime(2026, 10, 5, 9)),
+        (20, 2, False, datetime(2026, 10, 7, 9)),
+        (30, 3, True, datetime(2026, 9, 1, 9)),
+    ]
+    for listing_id, (property_id, building_id, is_active, updated_at) in enumerate(listings, start=1):
+        if session.get(MasterProperty, property_id) is None:
+            session.add(MasterProperty(id=property_id, building_id=building_id))
+            session.flush()
+        session.add(PropertyListing(
+            id=listing_id, master_property_id=property_id, source_site='suumo',
+            site_property_id=str(listing_id), url=f'https://example.com/{listing_id}',
+            is_active=is_active, updated_at=updated_at
+        ))
+    session.commit()
+    session.close()
+    return Session
+
+
+def _locs(xml):
+    root = ET.fromstring(xml.encode('utf-8'))
+    return [(url.find('sm:loc', NS).text, getattr(url.find('sm:lastmod', NS), 'text', None))
+            for url in root.findall('sm:url', NS)]
+
+
+def test_urls_include_active_buildings_and_properties(session_factory):
+    """販売中の掲載がある建物・物件を、掲載の更新日時（販売終了を含む）を lastmod として含める"""
+    db = session_factory()
+    urls = [(url.loc, url.lastmod) for url in iter_sitemap_urls(db)]
+    assert urls == [
+        ('https://mscan.jp/', None),
+        ('https://mscan.jp/transaction-prices', None),
+        ('https://mscan.jp/buildings/1/properties', datetime(2026, 10, 5, 9)),
+        ('https://mscan.jp/buildings/3/properties', datetime(2026, 9, 1, 9)),
+        ('https://mscan.jp/properties/10', datetime(2026, 10, 1, 9)),
+        ('https://mscan.jp/properties/11', datetime(2026, 10, 5, 9)),
+        ('https://mscan.jp/properties/30', datetime(2026, 9, 1, 9)),
+    ]
+    assert count_sitemap_urls(db) == len(urls)
+    db.close()
+
+
+@pytest.mark.filterwarnings('error::sqlalchemy.exc.SAWarning')
+def test_rebuild_shards_matches_live_generation(session_factory):
+    """上限件数ごとに分割して保存し、その場で生成した内容と一致する"""
+    db = session_factory()
+    assert rebuild_sitemap_shards(db, max_urls=3) == {'shard_count': 3, 'url_count': 7}
+
+    shards = db.query(SitemapShard).order_by(SitemapShard.shard_number).all()
+    assert [shard.url_count for shard in shards] == [3, 3, 1]
+    assert shards[1].lastmod == datetime(2026, 10, 5, 9)
+    for shard in shards:
+        assert shard.content == ''.join(iter_shard_xml(db, shard.shard_number, max_urls=3))
+    assert _locs(shards[1].content) == [
+        ('https://mscan.jp/buildings/3/properties', '2026-09-01'),
+        ('https://mscan.jp/properties/10', '2026-10-01'),
+        ('https://mscan.jp/properties/11', '2026-10-05'),
+    ]
+
+    # 作り直すと前回のファイルは置き換わる
+    assert rebuild_sitemap_shards(db)['shard_count'] == 1
+    assert db.query(SitemapShard).count() == 1
+    db.close()
+
+
+def _read_body(response):
+    async def collect():
+        return ''.join([chunk async for chunk in response.body_iterator])
+    return asyncio.run(collect())
+
+
+def test_endpoints_serve_precomputed_or_live(session_factory, monkeypatch):
+    """生成済みのファイルはそのまま返し、ない場合はその場で生成してストリーミングする"""
+    from backend.app.api import sitemap as sitemap_api
+
+    monkeypatch.setattr(sitemap_api, 'SessionLocal', session_factory)
+    db = session_factory()
+
+    # 生成前はその場で生成する
+    index = sitemap_api.get_sitemap_index(db=db).body.decode()
+    assert [loc.text for loc in ET.fromstring(index.encode()).iter(f"{{{NS['sm']}}}loc")] == \
+        ['https://mscan.jp/sitemap-1.xml']
+    live = _read_body(sitemap_api.get_sitemap_shard(1, db=db))
+    assert len(_locs(live)) == 7
+    with pytest.raises(HTTPException):
+        sitemap_api.get_sitemap_shard(2, db=db)
+
+    rebuild_sitemap_shards(db, max_urls=3)
+    index = sitemap_api.get_sitemap_index(db=db).body.decode()
+    assert '<sitemap><loc>https://mscan.jp/sitemap-2.xml</loc><lastmod>2026-10-05</lastmod></sitemap>' in index
+    assert index.count('<sitemap>') == 3
+    assert sitemap_api.get_sitemap_shard(3, db=db).body.decode() == \
+        db.get(SitemapShard, 3).content
+    with pytest.raises(HTTPException):
+        sitemap_api.get_sitemap_shard(4, db=db)
+    db.close()
+
+
+@pytest.mark.postgres
+def test_concurrent_rebuilds_wait_for_each_other(pg_engine):
+    """生成中に別の生成が始まっても、先の生成のコミットを待ってから作り直す"""
+    import threading
+    import time
+    from backend.app.models import Base
+
+    Base.metadata.create_all(pg_engine)
+    Session = sessionmaker(bind=pg_engine)
+    session = Session()
+    session.add(Building(id=1, normalized_name='建物1'))
+    session.add(MasterProperty(id=10, building_id=1))
+    session.add(PropertyListing(id=1, master_property_id=10, source_site='suumo', site_property_id='1',
+                                url='https://example.com/1', is_active=True))
+    session.commit()
+
+    # 先の生成がファイルを入れ替えてまだコミットしていない状態
+    first = Session()
+    first.query(SitemapShard).delete()
+    first.add(SitemapShard(shard_number=1, content='first', url_count=0))
+    first.flush()
+
+    results = []
+
+    def rebuild():
+        second = Session()
+        try:
+            results.append(rebuild_sitemap_shards(second))
+        except Exception as e:
+            results.append(e)
+        finally:
+            second.close()
+
+    thread = threading.Thread(target=rebuild)
+    thread.start()
+    time.sleep(0.5)
+    assert not results  # 先の生成のコミットを待っている
+    first.commit()
+    thread.join(timeout=10)
+
+    assert results == [{'shard_count': 1, 'url_count': 4}]
+    session.expire_all()
+    assert [shard.content != 'first' for shard in session.query(SitemapShard)] == [True]
+    first.close()
+    session.close()
@@ -0,0 +1,258 @@
+"""SSRのHTMLシェルとページキャッシュのテスト"""
+import os
+from datetime import datetime
+
+import pytest
+from starlette.requests import Request
+
+from backend.app.models import Building, MasterProperty, PropertyListing
+from backend.app.utils import ssr_shell as shell_module
+from backend.app.utils.cache import get_cache
+from backend.app.utils.ssr_shell import FrontendShell, ShellTemplate, invalidate_ssr_pages
+
+
+VITE_HTML = """<!doctype html>
+<html lang="ja">
+  <head>
+    <meta charset="UTF-8" />
+    <meta name="description" content="ビルド時の説明" />
+    <meta property="og:title" content="ビルド時のタイトル" />
+    <title>都心マンション価格チェッカー</title>
+    <script type="module" crossorigin src="/assets/index-abc123.js"></script>
+  </head>
+  <body>
+    <div id="root"></div>
+  </body>
+</html>
+"""
+
+META = {
+    "title": "テストタワーの物件一覧",
+    "description": "テストタワーの販売中マンション",
+    "canonical": "https://mscan.jp/buildings/1/properties",
+}
+
+
+def test_render_replaces_title_and_meta_tags():
+    """ビルド時のメタタグを除き、<title>の位置にページ固有のメタタグを差し込む"""
+    html = ShellTemplate(VITE_HTML).render(META, '\n    <script>window.__INITIAL_STATE__ = {};</script>')
+
+    assert 'ビルド時' not in html
+    assert html.count('<title') == 1
+    assert '<meta charset="UTF-8" />\n    \n    \n    <title data-rh="true">テストタワーの物件一覧</title>\n' \
+           '    <meta name="description" content="テストタワーの販売中マンション" data-rh="true" />' in html
+    assert '<link rel="canonical" href="https://mscan.jp/buildings/1/properties" data-rh="true" />' in html
+    assert '<script type="module" crossorigin src="/assets/index-abc123.js"></script>\n' \
+           '  \n    <script>window.__INITIAL_STATE__ = {};</script>\n  </head>' in html
+
+    # 初期データがない場合は</head>をそのまま残す
+    assert '</script>\n  </head>\n  <body>' in ShellTemplate(VITE_HTML).render(META)
+
+
+def test_render_without_title_inserts_after_head():
+    """<title>がないシェルでは<head>の直後にメタタグを追加する"""
+    html = ShellTemplate('<html><head lang="ja"><meta charset="UTF-8" /></head><body></body></html>').render(META)
+    assert html.startswith('<html><head lang="ja">\n    <title data-rh="true">テストタワーの物件一覧</title>')
+    assert html.endswith('<meta charset="UTF-8" /></head><body></body></html>')
+
+
+def test_file_shell_reloads_only_when_changed(tmp_path):
+    """ファイルは更新日時・サイズが変わった場合だけ読み込み直す"""
+    path = tmp_path / 'index.html'
+    path.write_text(VITE_HTML, encoding='utf-8')
+    shell = FrontendShell(dist_path=str(path), frontend_urls=[], check_seconds=0)
+
+    template = shell.get_template()
+    assert template.source == str(path)
+    assert shell.get_template() is template
+
+    path.write_text(VITE_HTML.replace('index-abc123', 'index-def456'), encoding='utf-8')
+    os.utime(path, ns=(1, 1))
+    reloaded = shell.get_template()
+    assert reloaded is not template
+    assert reloaded.version != template.version
+    assert 'index-def456' in shell.get_html()
+
+    # ファイルが消えても読み込み済みのシェルを使い続ける
+    path.unlink()
+    assert shell.get_template() is reloaded
+
+
+class _Response:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+
+def test_http_shell_uses_conditional_requests(tmp_path):
+    """HTTPの取得元はETagによる条件付きリクエストで変更を確認する"""
+    calls = []
+    responses = {'etag': '"v1"', 'html': VITE_HTML}
+
+    def http_get(url, timeout, headers):
+        calls.append((url, dict(headers)))
+        if url.startswith('http://down'):
+            raise ConnectionError('接続できません')
+        if headers.get('If-None-Match') == responses['etag']:
+            return _Response(304)
+        return _Response(200, responses['html'], {'ETag': responses['etag']})
+
+    shell = FrontendShell(dist_path=str(tmp_path / 'missing.html'),
+                          frontend_urls=['http://down/', 'http://frontend/'],
+                          check_seconds=0, http_get=http_get)
+    template = shell.get_template()
+    assert template.source == 'http://frontend/'
+    assert calls[-1] == ('http://frontend/', {})
+
+    assert shell.get_template() is template
+    assert calls[-1] == ('http://frontend/', {'If-None-Match': '"v1"'})
+
+    responses.update(etag='"v2"', html=VITE_HTML.replace('index-abc123', 'index-def456'))
+    assert shell.get_template() is not template
+    assert 'index-def456' in shell.get_html()
+
+
+def test_default_template_when_no_source(tmp_path):
+    shell = FrontendShell(dist_path=str(tmp_path / 'missing.html'), frontend_urls=[], check_seconds=0)
+    assert shell.get_template().source == 'default'
+    assert '<div id="root"></div>' in shell.get_template().render(META)
+
+
+def _request(path, user_agent='Mozilla/5.0', query=''):
+    return Request({
+        'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode(),
+        'headers': [(b'user-agent', user_agent.encode())],
+    })
+
+
+@pytest.fixture
+def db(sqlite_session, tmp_path, monkeypatch):
+    session = sqlite_session(Building, MasterProperty, PropertyListing)
+    session.add(Building(id=1, normalized_name='テストタワー'))
+    session.add(Building(id=2, normalized_name='別のマンション'))
+    session.add(MasterProperty(id=10, building_id=1, layout='2LDK', area=60.0, display_building_name='テストタワー'))
+    session.add(MasterProperty(id=20, building_id=2, layout='1K', area=25.0, display_building_name='別のマンション'))
+    session.commit()
+
+    path = tmp_path / 'index.html'
+    path.write_text(VITE_HTML, encoding='utf-8')
+    monkeypatch.setattr(shell_module, '_frontend_shell', FrontendShell(dist_path=str(path), frontend_urls=[]))
+    get_cache().clear()
+    yield session
+    get_cache().clear()
+
+
+def _rename_building(db, building_id, name):
+    db.get(Building, building_id).normalized_name = name
+    db.get(MasterProperty, building_id * 10).display_building_name = name
+    db.commit()
+
+
+def test_pages_are_cached_until_invalidated(db):
+    """建物・物件ページはキャッシュし、建物を指定した削除で建物内の物件ページも作り直す"""
+    from backend.app.api.ssr import render_building_page, render_property_page
+
+    def building_page(building_id):
+        return render_building_page(building_id, _request(f'/buildings/{building_id}/properties'),
+                                    include_inactive=False, db=db).body.decode()
+
+    def property_page(property_id):
+        return render_property_page(property_id, _request(f'/properties/{property_id}'), db=db).body.decode()
+
+    assert '<title data-rh="true">テストタワーの物件一覧' in building_page(1)
+    assert '<title data-rh="true">テストタワー 2LDK 60.0㎡' in property_page(10)
+    assert '別のマンション 1K' in property_page(20)
+
+    _rename_building(db, 1, 'リネームタワー')
+    _rename_building(db, 2, 'リネームハウス')
+    assert 'テストタワーの物件一覧' in building_page(1)
+    assert 'テストタワー 2LDK' in property_page(10)
+
+    invalidate_ssr_pages(building_ids=[1])
+    assert 'リネームタワーの物件一覧' in building_page(1)
+    assert 'リネームタワー 2LDK' in property_page(10)
+    # 他の建物のページは残る
+    assert '別のマンション 1K' in property_page(20)
+
+    invalidate_ssr_pages(property_ids=[20])
+    assert 'リネームハウス 1K' in property_page(20)
+
+
+def test_changed_buildings_are_invalidated(db):
+    """スクレイピング完了後は物件が更新された建物のページだけ削除する"""
+    from backend.app.api.ssr import render_property_page
+    from backend.app.utils.ssr_shell import invalidate_changed_ssr_pages
+
+    for property_id in (10, 20):
+        render_property_page(property_id, _request(f'/properties/{property_id}'), db=db)
+
+    _rename_building(db, 1, 'リネームタワー')
+    _rename_building(db, 2, 'リネームハウス')
+    db.get(MasterProperty, 10).updated_at = datetime(2026, 10, 2)
+    db.get(MasterProperty, 20).updated_at = datetime(2026, 9, 1)
+    db.commit()
+    assert invalidate_changed_ssr_pages(db, datetime(2026, 10, 1)) == 1
+
+    assert 'リネームタワー' in render_property_page(10, _request('/properties/10'), db=db).body.decode()
+    assert '別のマンション' in render_property_page(20, _request('/properties/20'), db=db).body.decode()
+
+
+def test_admin_listing_delete_invalidates_pages(db):
+    """管理画面で掲載を削除すると、その物件と建物のページを作り直す"""
+    import asyncio
+    from backend.app.api.admin_listings import delete_listing
+    from backend.app.api.ssr import render_building_page, render_property_page
+    from backend.app.models import ListingPriceHistory
+
+    ListingPriceHistory.__table__.create(db.get_bind())
+    db.add(PropertyListing(id=1, master_property_id=10, source_site='suumo', site_property_id='1',
+                           url='https://example.com/1', is_active=True))
+    db.commit()
+    render_building_page(1, _request('/buildings/1/properties'), include_inactive=False, db=db)
+    render_property_page(10, _request('/properties/10'), db=db)
+
+    _rename_building(db, 1, 'リネームタワー')
+    asyncio.run(delete_listing(listing_id=1, db=db))
+
+    assert 'リネームタワー' in render_property_page(10, _request('/properties/10'), db=db).body.decode()
+    assert 'リネームタワー' in render_building_page(
+        1, _request('/buildings/1/properties'), include_inactive=False, db=db
+    ).body.decode()
+
+
+def test_properties_list_cache_key_uses_only_search_params(db, monkeypatch):
+    """物件一覧ページは検索条件だけをキーにキャッシュし、未知のパラメータごとにページを作らない"""
+    from backend.app.api import ssr
+
+    renders = []
+    generate = ssr.generate_properties_list_meta_tags
+    monkeypatch.setattr(ssr, 'generate_properties_list_meta_tags',
+                        lambda request: renders.append(request) or generate(request))
+
+    first = ssr.render_properties_list_page(
+        _request('/properties', query='min_price=5000&utm_source=x&foo=1'), db=db
+    ).body.decode()
+    ssr.render_properties_list_page(_request('/properties', query='foo=2&min_price=5000'), db=db)
+    ssr.render_properties_list_page(_request('/properties', query='min_price=6000'), db=db)
+
+    assert len(renders) == 2
+    assert 'https://mscan.jp/properties?min_price=5000"' in first
+    assert 'foo' not in first and 'utm_source' not in first
+
+
+def test_failed_initial_state_is_not_cached(db, monkeypatch):
+    """クローラー向けの初期データの取得に失敗したページはキャッシュしない"""
+    from backend.app.api import ssr
+
+    calls = []
+    scripts = ['', '', '<script>window.__INITIAL_STATE__ = {};</script>']
+    monkeypatch.setattr(ssr, '_properties_list_initial_state_script',
+                        lambda request, db: calls.append(request) or scripts[len(calls) - 1])
+    googlebot = 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)'
+
+    for _ in range(4):
+        ssr.render_properties_list_page(_request('/properties', user_agent=googlebot), db=db)
+
+    # 失敗した2回はキャッシュせず、3回目に取得できたページを4回目に使う
+    assert len(calls) == 3
@@ -0,0 +1,107 @@
+"""統計情報のスナップショット（stats_snapshots）のテスト"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.app.models import (
+    Building, ListingPriceHistory, MasterProperty, PropertyListing, StatsSnapshot
+)
+from backend.app.utils.stats_snapshot import compute_stats, refresh_stats_snapshot
+
+
+NOW = datetime(2026, 10, 16, 12, 0)
+
+
+@pytest.fixture
+def db(sqlite_session):
+    session = sqlite_session(Building, MasterProperty, PropertyListing, ListingPriceHistory,
+                             StatsSnapshot)
+
+    session.add(Building(id=1, normalized_name='テストタワー'))
+    session.add(Building(id=2, normalized_name='別のマンション'))
+    # 物件ID, 販売終了日, 掲載（サイト, 販売中, 価格, 最終確認日時）
+    properties = [
+        (1, None, [('suumo', True, 2980, NOW - timedelta(hours=1)), ('homes', True, 3100, NOW - timedelta(hours=30))]),
+        (2, None, [('suumo', True, 5000, NOW - timedelta(days=2))]),
+        (3, None, [('rehouse', True, 12800, NOW - timedelta(hours=2))]),
+        (4, NOW - timedelta(days=3), [('suumo', False, 7000, NOW - timedelta(days=4))]),
+        (5, None, [('nomu', True, None, NOW - timedelta(hours=3))]),
+    ]
+    listing_id = 0
+    for property_id, sold_at, listings in properties:
+        session.add(MasterProperty(id=property_id, building_id=1 + property_id % 2, sold_at=sold_at))
+        for source, is_active, price, confirmed in listings:
+            listing_id += 1
+            session.add(PropertyListing(
+                id=listing_id, master_property_id=property_id, source_site=source,
+                site_property_id=str(listing_id), url=f'https://example.com/{listing_id}',
+                is_active=is_active, current_price=price, last_confirmed_at=confirmed,
+                last_scraped_at=confirmed
+            ))
+            session.add(ListingPriceHistory(property_listing_id=listing_id, price=price or 0, recorded_at=confirmed))
+    session.commit()
+    return session
+
+
+def test_compute_stats(db):
+    """トップページと管理画面の統計を条件付き集計でまとめて計算する"""
+    result = compute_stats(db, NOW)
+
+    assert result['stats'] == {
+        "total_buildings": 2,
+        "total_properties": 5,
+        "total_listings": 5,
+        "total_price_records": 6,
+        "by_source": {'suumo': 2, 'homes': 1, 'rehouse': 1, 'nomu': 1},
+        "by_price_range": {
+            "3000万円未満": 1,      # 物件1（販売中の掲載の最低価格）
+            "3000-5000万円": 0,
+            "5000-8000万円": 1,     # 物件2（販売終了の物件4は含めない）
+            "8000万-1億円": 0,
+            "1億円以上": 1,
+        },
+        "last_updated": str(NOW - timedelta(hours=1)),
+    }
+    assert result['listing_status_stats'] == {
+        "total_active_listings": 5,
+        "total_inactive_listings": 1,
+        "total_sold_properties": 1,
+        "listings_checked_today": 3,
+        "listings_not_checked_24h": 2,
+        "oldest_unchecked_date": (NOW - timedelta(days=2)).isoformat(),
+    }
+
+
+def test_endpoints_serve_snapshot_or_live(db):
+    """エンドポイントは最新のスナップショットを集計日時付きで返し、管理画面のAPIだけ live=true でその場で集計する"""
+    from backend.app.api.admin.status_updates import get_listing_status_stats
+    from backend.app.api.stats import get_stats
+
+    # スナップショットがない場合は保存してから返す
+    stats = get_stats(db=db)
+    assert stats['total_listings'] == 5
+    assert stats['is_live'] is False
+    snapshot = db.query(StatsSnapshot).one()
+    assert stats['snapshot_at'] == snapshot.computed_at.isoformat()
+
+    db.get(PropertyListing, 1).is_active = False
+    db.commit()
+    assert get_stats(db=db)['total_listings'] == 5
+    live = asyncio.run(get_listing_status_stats(live=True, current_user={}, db=db))
+    assert (live['total_active_listings'], live['is_live']) == (4, True)
+    assert db.query(StatsSnapshot).count() == 1
+
+    refresh_stats_snapshot(db)
+    assert get_stats(db=db)['total_listings'] == 4
+    status = asyncio.run(get_listing_status_stats(live=False, current_user={}, db=db))
+    assert (status['total_active_listings'], status['total_inactive_listings']) == (4, 2)
+    assert status['is_live'] is False
+
+
+def test_old_snapshots_are_pruned(db):
+    db.add(StatsSnapshot(computed_at=datetime.now() - timedelta(days=8), stats={}, listing_status_stats={}))
+    db.add(StatsSnapshot(computed_at=datetime.now() - timedelta(days=1), stats={}, listing_status_stats={}))
+    db.commit()
+    latest = refresh_stats_snapshot(db)
+    assert [s.id for s in db.query(StatsSnapshot).order_by(StatsSnapshot.computed_at)] == [2, latest.id]
@@ -0,0 +1,87 @@
+"""成約価格情報の一括取り込みのテスト"""
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.models import TransactionPrice
+from backend.app.utils.transaction_bulk_import import bulk_import_transactions
+
+
+@pytest.fixture
+def db(sqlite_session):
+    session = sqlite_session(TransactionPrice)
+    session.add(TransactionPrice(transaction_id='13103_2024Q1_赤坂_70.0_9800', transaction_price=9800, price_per_sqm=1400000))
+    session.add(TransactionPrice(transaction_id='13103_2024Q1_六本木_55.0_8000', transaction_price=8000, price_per_sqm=1454545))
+    session.commit()
+    return session
+
+
+def _transaction(transaction_id, price, area_name='赤坂'):
+    return TransactionPrice(
+        transaction_id=transaction_id, district_code='13103', district_name='港区',
+        area_name=area_name, transaction_price=price, price_per_sqm=price * 100, floor_area=None
+    )
+
+
+def test_inserts_new_and_skips_existing(db):
+    """既存の取引IDと、同じ取り込み内で重複する取引IDはスキップする（最初の行を使う）"""
+    result = bulk_import_transactions(db, [
+        _transaction('13103_2024Q1_赤坂_70.0_9800', 9900),
+        _transaction('13103_2024Q2_青山_40.0_6000', 6000, area_name='青山'),
+        {'transaction_id': '13103_2024Q2_三田_60.0_7000', 'transaction_price': 7000, 'area_name': ''},
+        _transaction('13103_2024Q2_青山_40.0_6000', 6100, area_name='南青山'),
+    ], chunk_size=2)
+
+    assert result == {'inserted': 2, 'updated': 0, 'skipped': 2}
+    rows = {t.transaction_id: t for t in db.query(TransactionPrice)}
+    assert len(rows) == 4
+    assert rows['13103_2024Q1_赤坂_70.0_9800'].transaction_price == 9800
+    assert (rows['13103_2024Q2_青山_40.0_6000'].transaction_price, rows['13103_2024Q2_青山_40.0_6000'].area_name) == (6000, '青山')
+    assert rows['13103_2024Q2_三田_60.0_7000'].area_name == ''
+    assert rows['13103_2024Q2_三田_60.0_7000'].district_code is None
+
+    # 同じ内容をもう一度取り込むとすべてスキップされる
+    again = bulk_import_transactions(db, [_transaction('13103_2024Q2_青山_40.0_6000', 6000)])
+    assert again == {'inserted': 0, 'updated': 0, 'skipped': 1}
+
+
+def test_update_prices(db):
+    """update_prices=True の場合は価格が変わった既存の取引だけ更新する"""
+    result = bulk_import_transactions(db, [
+        _transaction('13103_2024Q1_赤坂_70.0_9800', 9900),
+        _transaction('13103_2024Q1_六本木_55.0_8000', 8000),
+        _transaction('13103_2024Q3_白金_80.0_12000', 12000),
+    ], update_prices=True)
+
+    assert result == {'inserted': 1, 'updated': 1, 'skipped': 1}
+    updated = db.query(TransactionPrice).filter_by(transaction_id='13103_2024Q1_赤坂_70.0_9800').one()
+    assert (updated.transaction_price, updated.price_per_sqm) == (9900, 990000)
+    assert updated.updated_at is not None
+    assert db.query(TransactionPrice).filter_by(transaction_id='13103_2024Q1_六本木_55.0_8000').one().updated_at is None
+
+
+@pytest.mark.postgres
+def test_copy_round_trips_special_values(pg_engine):
+    """COPY で取り込んでも NULL・空文字列・引用符・カンマ・改行などが元の値のまま保存される"""
+    TransactionPrice.__table__.create(pg_engine)
+    session = sessionmaker(bind=pg_engine)()
+    values = {
+        '13103_NULL': None,
+        '13103_EMPTY': '',
+        '13103_QUOTE': 'O\'Reilly "赤坂" タワー',
+        '13103_COMMA': '赤坂,六本木',
+        '13103_NEWLINE': '1行目\n2行目\r\n\t3行目',
+        '13103_BACKSLASH': 'C:\\path\\',
+        '13103_NULL_MARKER': '\\N',
+        '13103_SPACES': '  ',
+    }
+
+    result = bulk_import_transactions(session, [
+        {'transaction_id': transaction_id, 'area_name': area_name, 'transaction_price': 5000, 'floor_area': 70.5}
+        for transaction_id, area_name in values.items()
+    ], chunk_size=3)
+
+    assert result == {'inserted': len(values), 'updated': 0, 'skipped': 0}
+    rows = {t.transaction_id: t for t in session.query(TransactionPrice)}
+    assert {transaction_id: row.area_name for transaction_id, row in rows.items()} == values
+    assert {(row.transaction_price, row.floor_area, row.district_code) for row in rows.values()} == {(5000, 70.5, None)}
+    session.close()